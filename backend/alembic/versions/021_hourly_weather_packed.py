@@ -0,0 +1,62 @@
+"""hourly_weather_packed — lokasyon × ay kolonsal saatlik depo
+
+Her satır bir lokasyonun bir ayı: zlib sıkıştırılmış float32 matris
+(kolon × saat). hourly_weather_store yazar, get_hourly_arrays_for_pin okur.
+scripts/build_hourly_packed.py ilk doldurmayı yapar; scheduler saatlik
+çekimden sonra son saatleri yamalar.
+
+Revision ID: 021_hourly_weather_packed
+Revises: 020_weather_precip_cloud
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '021_hourly_weather_packed'
+down_revision = '020_weather_precip_cloud'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'hourly_weather_packed',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=False),
+        sa.Column('longitude', sa.Float(), nullable=False),
+        sa.Column('city_name', sa.String(), nullable=True),
+        sa.Column('district_name', sa.String(), nullable=True),
+        sa.Column('location_code', sa.String(length=10), nullable=True),
+        sa.Column('month_start', sa.DateTime(), nullable=False),
+        sa.Column('n_hours', sa.Integer(), nullable=False),
+        sa.Column('n_present', sa.Integer(), nullable=True),
+        sa.Column('codec', sa.String(), nullable=False,
+                  server_default='f32-shuf-zlib'),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True),
+                  server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('latitude', 'longitude', 'month_start',
+                            name='uq_hourly_packed_loc_month'),
+    )
+    op.create_index('ix_hourly_weather_packed_id', 'hourly_weather_packed',
+                    ['id'])
+    op.create_index('ix_hourly_weather_packed_city_name',
+                    'hourly_weather_packed', ['city_name'])
+    op.create_index('ix_hourly_packed_month', 'hourly_weather_packed',
+                    ['month_start'])
+    # Paketli blob zaten sıkıştırılmış — TOAST'un ikinci kez pglz denemesi boşa CPU.
+    op.execute(
+        "ALTER TABLE hourly_weather_packed ALTER COLUMN data SET STORAGE EXTERNAL"
+    )
+
+
+def downgrade():
+    op.drop_index('ix_hourly_packed_month', table_name='hourly_weather_packed')
+    op.drop_index('ix_hourly_weather_packed_city_name',
+                  table_name='hourly_weather_packed')
+    op.drop_index('ix_hourly_weather_packed_id',
+                  table_name='hourly_weather_packed')
+    op.drop_table('hourly_weather_packed')
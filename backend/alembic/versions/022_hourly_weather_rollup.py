@@ -0,0 +1,61 @@
+"""hourly_weather_rollup — günlük/aylık il × ilçe × metrik rollup
+
+Choropleth pencere modları ham saatlik tabloyu taramasın diye. Scheduler
+saatlik çekimden sonra yeni saatlerin günlerini/aylarını yeniden hesaplar;
+scripts/build_weather_rollups.py ilk doldurmayı yapar.
+
+Revision ID: 022_hourly_weather_rollup
+Revises: 021_hourly_weather_packed
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '022_hourly_weather_rollup'
+down_revision = '021_hourly_weather_packed'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'hourly_weather_rollup',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('period_type', sa.String(), nullable=False),
+        sa.Column('period_start', sa.Date(), nullable=False),
+        sa.Column('city_name', sa.String(), nullable=False),
+        sa.Column('district_name', sa.String(), nullable=False),
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('n_hours', sa.Integer(), nullable=False),
+        sa.Column('sum_value', sa.Float(), nullable=True),
+        sa.Column('avg_value', sa.Float(), nullable=True),
+        sa.Column('max_value', sa.Float(), nullable=True),
+        sa.Column('peak_sum', sa.Float(), nullable=True),
+        sa.Column('peak_days', sa.Integer(), nullable=True),
+        sa.Column('computed_at', sa.DateTime(timezone=True),
+                  server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'period_type', 'period_start', 'city_name', 'district_name',
+            'metric',
+            name='uq_hourly_rollup_key',
+        ),
+    )
+    op.create_index('ix_hourly_weather_rollup_id', 'hourly_weather_rollup',
+                    ['id'])
+    op.create_index('ix_hourly_weather_rollup_city_name',
+                    'hourly_weather_rollup', ['city_name'])
+    op.create_index('ix_hourly_rollup_lookup', 'hourly_weather_rollup',
+                    ['period_type', 'metric', 'period_start'])
+
+
+def downgrade():
+    op.drop_index('ix_hourly_rollup_lookup',
+                  table_name='hourly_weather_rollup')
+    op.drop_index('ix_hourly_weather_rollup_city_name',
+                  table_name='hourly_weather_rollup')
+    op.drop_index('ix_hourly_weather_rollup_id',
+                  table_name='hourly_weather_rollup')
+    op.drop_table('hourly_weather_rollup')
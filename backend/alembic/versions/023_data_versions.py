@@ -0,0 +1,41 @@
+"""data_versions — veri seti sürüm sayaçları
+
+Cache anahtarları veri sürümünü taşır; saatlik çekim, tematik/ML batch'leri
+ve climatology refresh veriyi yazınca sayacı artırır, eski anahtarlar
+kendiliğinden kullanılmaz olur (TTL'e bağlı geçersizleştirme yerine).
+
+Revision ID: 023_data_versions
+Revises: 022_hourly_weather_rollup
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '023_data_versions'
+down_revision = '022_hourly_weather_rollup'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'data_versions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('dataset', sa.String(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False,
+                  server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True),
+                  server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index('ix_data_versions_id', 'data_versions', ['id'])
+    op.create_index('ix_data_versions_dataset', 'data_versions', ['dataset'],
+                    unique=True)
+
+
+def downgrade():
+    op.drop_index('ix_data_versions_dataset', table_name='data_versions')
+    op.drop_index('ix_data_versions_id', table_name='data_versions')
+    op.drop_table('data_versions')
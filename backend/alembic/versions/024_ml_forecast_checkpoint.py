@@ -0,0 +1,49 @@
+"""ml_forecast_checkpoint — ML batch seri bazlı ilerleme kaydı
+
+scripts/build_ml_forecasts.py paralel koşuda her seriyi ml_forecast
+satırlarıyla aynı transaction'da buraya işler; `--resume` yarıda kalan
+koşuyu tamamlanan serileri atlayarak sürdürür.
+
+Revision ID: 024_ml_forecast_checkpoint
+Revises: 023_data_versions
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '024_ml_forecast_checkpoint'
+down_revision = '023_data_versions'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ml_forecast_checkpoint',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_key', sa.String(), nullable=False),
+        sa.Column('series_key', sa.String(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('rows', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('method', sa.String(), nullable=True),
+        sa.Column('seconds', sa.Float(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True),
+                  server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_key', 'series_key',
+                            name='uq_ml_checkpoint_key'),
+    )
+    op.create_index('ix_ml_forecast_checkpoint_id', 'ml_forecast_checkpoint',
+                    ['id'])
+    op.create_index('ix_ml_forecast_checkpoint_run_key',
+                    'ml_forecast_checkpoint', ['run_key'])
+
+
+def downgrade():
+    op.drop_index('ix_ml_forecast_checkpoint_run_key',
+                  table_name='ml_forecast_checkpoint')
+    op.drop_index('ix_ml_forecast_checkpoint_id',
+                  table_name='ml_forecast_checkpoint')
+    op.drop_table('ml_forecast_checkpoint')
@@ -0,0 +1,48 @@
+"""ml_forecast_cube — /ml/choropleth için önceden dilimlenmiş forecast küpü
+
+(metric, resource, scenario, level) başına lokasyon × yıl × ay değerleri,
+baseline norm aralıkları ve alias-genişletilmiş anahtarlar. ML batch sonunda
+ml_forecast'tan yeniden üretilir; endpoint sorgu atmadan dilimler.
+
+Revision ID: 025_ml_forecast_cube
+Revises: 024_ml_forecast_checkpoint
+Create Date: 2026-10-17
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '025_ml_forecast_cube'
+down_revision = '024_ml_forecast_checkpoint'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'ml_forecast_cube',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('metric', sa.String(), nullable=False),
+        sa.Column('resource', sa.String(), nullable=False),
+        sa.Column('scenario', sa.String(), nullable=False),
+        sa.Column('level', sa.String(), nullable=False),
+        sa.Column('year0', sa.Integer(), nullable=False),
+        sa.Column('n_years', sa.Integer(), nullable=False),
+        sa.Column('keys', sa.JSON(), nullable=False),
+        sa.Column('aliases', sa.JSON(), nullable=False),
+        sa.Column('codec', sa.String(), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('norm', sa.LargeBinary(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True),
+                  server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('metric', 'resource', 'scenario', 'level',
+                            name='uq_ml_forecast_cube_key'),
+    )
+    op.create_index('ix_ml_forecast_cube_id', 'ml_forecast_cube', ['id'])
+
+
+def downgrade():
+    op.drop_index('ix_ml_forecast_cube_id', table_name='ml_forecast_cube')
+    op.drop_table('ml_forecast_cube')
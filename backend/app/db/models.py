@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Boolean, Text, Date, Index, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, JSON, Boolean, Text, Date, Index, UniqueConstraint, LargeBinary
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from .database import UserBase, SystemBase
@@ -212,6 +212,88 @@ class HourlyWeatherData(SystemBase):
     location_code = Column(String(10), nullable=True, index=True)
 
 
+# --- KOLONSAL SAATLİK DEPO (lokasyon × ay paketli float32) ---
+class HourlyWeatherPacked(SystemBase):
+    """`hourly_weather_data`'nın kolonsal, sıkıştırılmış kopyası.
+
+    Her satır bir lokasyonun bir takvim ayıdır. `data` = zlib(float32 matris
+    [len(PACKED_COLUMNS) × ayın saat sayısı]) — saat indeksi ay başından
+    itibaren; kayıt olmayan saat NaN. Timestamp/lokasyon/id tekrarı olmadığı
+    için tablo ham satırlardan ~10-20× küçük, okuma tek satır/ay.
+
+    `hourly_weather_store` yazar/okur (kolon sırası ve codec orada); ham tablo
+    kaynak olmaya devam eder — bu tablo her zaman ondan yeniden üretilebilir.
+
+    Migration: 021_hourly_weather_packed
+    """
+    __tablename__ = "hourly_weather_packed"
+    __table_args__ = (
+        UniqueConstraint("latitude", "longitude", "month_start",
+                         name="uq_hourly_packed_loc_month"),
+        Index("ix_hourly_packed_month", "month_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    city_name = Column(String, nullable=True, index=True)
+    district_name = Column(String, nullable=True)
+    location_code = Column(String(10), nullable=True)
+
+    month_start = Column(DateTime, nullable=False)   # ayın ilk saati (naive UTC)
+    n_hours = Column(Integer, nullable=False)        # ayın saat sayısı (matris genişliği)
+    n_present = Column(Integer, nullable=True)       # dolu saat sayısı
+    codec = Column(String, nullable=False, default="f32-shuf-zlib")
+    data = Column(LargeBinary, nullable=False)
+
+    updated_at = Column(DateTime(timezone=True),
+                        server_default=func.now(), onupdate=func.now())
+
+
+# --- SAATLİK VERİ ROLLUP (günlük / aylık, il × ilçe × metrik) ---
+class HourlyWeatherRollup(SystemBase):
+    """Saatlik verinin günlük ve aylık özetleri — pencere sorguları için.
+
+    Scheduler her saatlik çekimden sonra yalnızca yeni saatlerin günlerini
+    (ve aylarını) yeniden hesaplar (`weather_rollup_service.refresh_since`).
+    Choropleth week/month/threeMonth/sixMonth/yearly/season modları ham
+    saatler yerine bu tablodan okur.
+
+    Anahtar = (period_type, period_start, city_name, district_name, metric).
+    - period_type: "day" | "month"
+    - metric: wind | solar | temp | precip
+    - peak_sum / peak_days: pozitif günlük piklerin toplamı / gün sayısı
+      (solar günlük peak ortalaması = peak_sum / peak_days)
+
+    Migration: 022_hourly_weather_rollup
+    """
+    __tablename__ = "hourly_weather_rollup"
+    __table_args__ = (
+        UniqueConstraint(
+            "period_type", "period_start", "city_name", "district_name", "metric",
+            name="uq_hourly_rollup_key",
+        ),
+        Index("ix_hourly_rollup_lookup", "period_type", "metric", "period_start"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    period_type = Column(String, nullable=False)
+    period_start = Column(Date, nullable=False)
+    city_name = Column(String, nullable=False, index=True)
+    district_name = Column(String, nullable=False)
+    metric = Column(String, nullable=False)
+
+    n_hours = Column(Integer, nullable=False)
+    sum_value = Column(Float, nullable=True)
+    avg_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+    peak_sum = Column(Float, nullable=True)
+    peak_days = Column(Integer, nullable=True)
+
+    computed_at = Column(DateTime(timezone=True),
+                         server_default=func.now(), onupdate=func.now())
+
+
 # --- İL × KAYNAK SKOR TABLOSU (Faz 1 — Tek Kaynak) ---
 class ProvinceAnalysis(SystemBase):
     """
@@ -376,13 +458,73 @@ class MlForecast(SystemBase):
     upper = Column(Float, nullable=True)        # 95% CI üst
 
     # Model meta (en iyi seçilen)
-    method = Column(String, nullable=True)      # sarimax_auto|sarimax_default|holt_winters|linear_seasonal|fallback
+    method = Column(String, nullable=True)      # sarimax_auto|sarimax_default|holt_winters|holt_winters_grid|linear_seasonal|fallback
     mape = Column(Float, nullable=True)         # holdout MAPE (model seçim skoru)
 
     computed_at = Column(DateTime(timezone=True),
                          server_default=func.now(), onupdate=func.now())
 
 
+class MlForecastCheckpoint(SystemBase):
+    """`build_ml_forecasts.py` seri bazlı ilerleme kaydı (devam ettirilebilir koşu).
+
+    Her seri (il/ilçe × kaynak × metrik) bittiğinde ml_forecast satırlarıyla
+    AYNI transaction'da yazılır. `--resume` ile aynı `run_key`'li (ufuk +
+    mod + filtre) koşu, ok/skipped serileri atlayarak kaldığı yerden sürer.
+
+    Migration: 024_ml_forecast_checkpoint
+    """
+    __tablename__ = "ml_forecast_checkpoint"
+    __table_args__ = (
+        UniqueConstraint("run_key", "series_key", name="uq_ml_checkpoint_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_key = Column(String, nullable=False, index=True)
+    series_key = Column(String, nullable=False)
+    status = Column(String, nullable=False)      # ok | skipped | error
+    rows = Column(Integer, nullable=False, default=0)
+    method = Column(String, nullable=True)
+    seconds = Column(Float, nullable=True)
+    finished_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class MlForecastCube(SystemBase):
+    """`/ml/choropleth` için ml_forecast'ın önceden dilimlenmiş küpü.
+
+    (metric, resource, scenario, level) başına tek satır. `data` =
+    zlib(float64 [lokasyon × yıl × 13]) — 0-11 aylar, 12 yıllık ortalama;
+    `norm` baseline 5-95 persentil aralıkları [yıl × 13 × 2]. `keys` yanıt
+    anahtarları (il / "İl|İlçe"), `aliases` GADM eşleşmesi için önceden
+    genişletilmiş [anahtar, lokasyon] çiftleri. Endpoint yalnız dilimler.
+
+    `ml_forecast_cube.rebuild_all` (build_ml_forecasts.py sonunda) yazar;
+    ml_forecast'tan her zaman yeniden üretilebilir.
+
+    Migration: 025_ml_forecast_cube
+    """
+    __tablename__ = "ml_forecast_cube"
+    __table_args__ = (
+        UniqueConstraint("metric", "resource", "scenario", "level",
+                         name="uq_ml_forecast_cube_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    metric = Column(String, nullable=False)
+    resource = Column(String, nullable=False)
+    scenario = Column(String, nullable=False)
+    level = Column(String, nullable=False)       # province | district
+    year0 = Column(Integer, nullable=False)
+    n_years = Column(Integer, nullable=False)
+    keys = Column(JSON, nullable=False)
+    aliases = Column(JSON, nullable=False)
+    codec = Column(String, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    norm = Column(LargeBinary, nullable=False)
+    computed_at = Column(DateTime(timezone=True),
+                         server_default=func.now(), onupdate=func.now())
+
+
 # --- TEMATİK HARİTA PRECOMPUTE AGREGAT (2026-05-28) ---
 class ThematicAggregate(SystemBase):
     """Ayda bir hesaplanan ağır tematik harita pencereleri.
@@ -534,6 +676,20 @@ class SchedulerMeta(SystemBase):
     run_count = Column(Integer, default=0)
 
 
+class DataVersion(SystemBase):
+    """
+    Veri seti başına sürüm sayacı (olay güdümlü cache geçersizleştirme).
+    Veriyi yazan iş (saatlik çekim, tematik/ML batch, climatology refresh)
+    sayacı artırır; cache anahtarları sürümü taşır — bkz. data_versions.py.
+    """
+    __tablename__ = "data_versions"
+
+    id = Column(Integer, primary_key=True, index=True)
+    dataset = Column(String, unique=True, nullable=False, index=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 # ===============================================
 # C) KULLANICI PIN VERİLERİ (UserPinsBase) - user_pins_data.db
 # ===============================================
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean
+from sqlalchemy import Column, Integer, String, Float, Boolean, Index
 from geoalchemy2 import Geometry
 from .database import SystemBase
 
@@ -25,3 +25,22 @@ class EnergyCorridor(SystemBase):
     min_zoom = Column(Integer, default=5)
     feature_type = Column(String)  # 'Rüzgar Koridoru', 'Güneş Sahası' vs.
     energy_capacity_mw = Column(Float, nullable=True)
+
+class MvtFeature(SystemBase):
+    """Tile üretimi için genelleştirilmiş katman geometrisi (EPSG:3857).
+    Her kaynak feature her zoom bandında bir kez, o bandın piksel
+    toleransıyla sadeleştirilmiş olarak tutulur (bkz. services/mvt_generalize)."""
+    __tablename__ = "mvt_features"
+    id = Column(Integer, primary_key=True)
+    layer = Column(String, nullable=False)       # 'hydro' | 'restricted' | 'energy'
+    zoom_band = Column(Integer, nullable=False)  # bandın ilk zoom'u
+    priority = Column(Float, nullable=False)     # büyük → önce çizilir / son elenir
+    min_zoom = Column(Integer, default=0)
+    feature_type = Column(String)
+    description = Column(String, nullable=True)
+    energy_capacity_mw = Column(Float, nullable=True)
+    geom = Column(Geometry('GEOMETRY', srid=3857))
+
+    __table_args__ = (
+        Index("ix_mvt_features_band_layer", "zoom_band", "layer"),
+    )
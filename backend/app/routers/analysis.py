@@ -34,6 +34,9 @@ from app.services.district_scoring_service import (
 )
 from app.services.climatology_service import _tr_ascii_fold
 from app.services.province_aliases import province_aliases
+from app.services import data_versions
+from app.services.data_versions import versioned_key
+from app.services.redis_cache import get_or_compute
 
 router = APIRouter(prefix="/analysis", tags=["analysis"])
 
@@ -232,15 +235,20 @@ def projection(
             status_code=400,
             detail=f"horizon_days {sorted(VALID_HORIZONS)} arasında olmalı",
         )
+    # Günlük veri günde bir değişir — 6 saat cache; eşzamanlı aynı istekler
+    # tek projeksiyon hesaplar (get_or_compute)
     try:
-        proj = project_province(province, metric, horizon_days)
+        return get_or_compute(
+            f"analysis:projection:{province}:{metric}:{horizon_days}",
+            lambda: project_to_dict(project_province(province, metric, horizon_days)),
+            ttl_seconds=6 * 3600,
+        )
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except RuntimeError as re:
         raise HTTPException(status_code=503, detail=str(re))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Projeksiyon hatası: {e}")
-    return project_to_dict(proj)
 
 
 # ── R1: Landing Tab Data ─────────────────────────────────────────────────────
@@ -287,6 +295,17 @@ def landing(
     - `top_provinces`: Her kaynak (wind/solar/hydro) için top-N il
     - `overall_top`: Tüm kaynaklar arasında en yüksek skorlu top-N il
     """
+    # climatology yarı-statik — refresh sürümü artırana kadar cache
+    # (21 sorgu tek pakette)
+    return get_or_compute(
+        versioned_key(f"analysis:landing:{top_n}", data_versions.CLIMATOLOGY),
+        lambda: _landing_payload(db, top_n),
+        ttl_seconds=data_versions.VERSIONED_TTL,
+    )
+
+
+def _landing_payload(db: Session, top_n: int) -> Dict:
+    """``/landing`` paketini DB'den hesapla (cache'siz)."""
     stats = _tr_stats()
     regions_meta = _tr_regions()
 
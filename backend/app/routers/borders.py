@@ -10,25 +10,39 @@ geometri kayması yaşanmaz.
 GET /geo/borders/provinces  → 81 il sınırı
 GET /geo/borders/districts  → ~960 ilçe sınırı
 GET /geo/borders/regions    → 7 coğrafi bölge sınırı (il dissolve)
+
+Önceden üretilmiş varlıklar (scripts/build_border_assets.py → data/vector/borders/)
+varsa GeoPandas hiç yüklenmez: her katman (+ il/bölge alt kümeleri) üç detay
+seviyesinde (``?detail=low|medium|high``) GeoJSON ve TopoJSON (paylaşılan
+yaylar) olarak, ``.gz`` / ``.br`` ön-sıkıştırılmış kopyalarıyla diskte durur.
+Biçim ``Accept: application/topo+json`` veya ``?format=topojson`` ile, kodlama
+``Accept-Encoding`` ile seçilir; güçlü ETag + ``If-None-Match`` → 304.
+Varlık yoksa eski yol (GeoPandas + bellek cache, yalnızca GeoJSON) çalışır.
 """
 
 import json
 import logging
+import re
 import unicodedata
 from pathlib import Path
 
-from fastapi import APIRouter
-from fastapi.responses import Response
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import JSONResponse, Response
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/geo/borders", tags=["🗺️ Borders"])
 
 _VECTOR_DIR = Path(__file__).parent.parent.parent / "data" / "vector"
+_ASSET_DIR  = _VECTOR_DIR / "borders"
 _EMPTY_FC   = json.dumps({"type": "FeatureCollection", "features": []})
 
+# Detay seviyesi → varsayılan (eski sabit) toleransın çarpanı
+DETAIL_FACTORS: dict[str, float] = {"low": 4.0, "medium": 1.0, "high": 0.25}
+
 # ── Lazy cache ────────────────────────────────────────────────────────────────
-_cache: dict[str, str] = {}
+# Canlı GeoJSON string'leri + önceden üretilmiş varlık baytları (+ manifest)
+_cache: dict[str, object] = {}
 
 # ── Türkiye 7 Coğrafi Bölge → OSM NAME_1 eşlemesi ────────────────────────────
 # OSM name:tr / name tag değerleri — _ascii_key() ile normalize edilerek eşleştirilir.
@@ -103,6 +117,66 @@ def _resolve_source_path(level: int) -> tuple[Path, bool]:
     return gadm_path, False
 
 
+def _slug(name: str) -> str:
+    """'İç Anadolu' → 'ic-anadolu' (varlık dosya adları için)."""
+    return re.sub(r"[^a-z0-9]+", "-", _ascii_key(name)).strip("-")
+
+
+def _read_level_gdf(level: int):
+    """İl (level=1) / ilçe (level=2) sınırlarını temizlenmiş (sadeleştirilmemiş)
+    GeoDataFrame olarak oku. Returns: (gdf, is_osm) — dosya yoksa (None, is_osm)."""
+    src_path, is_osm = _resolve_source_path(level)
+    if not src_path.exists():
+        logger.warning("Sınır verisi bulunamadı (level=%d): %s", level, src_path)
+        return None, is_osm
+
+    import geopandas as gpd
+
+    source_label = "OSM" if is_osm else "GADM"
+    logger.info("%s verisi yükleniyor (level=%d): %s", source_label, level, src_path)
+    gdf = gpd.read_file(src_path)
+
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(epsg=4326)
+
+    # Gerekli sütunları seç (OSM'de GID_* sütunları olmayabilir — sorun değil)
+    if level == 1:
+        keep = [c for c in ["NAME_1", "GID_1"] if c in gdf.columns]
+    else:
+        keep = [c for c in ["NAME_1", "NAME_2", "GID_2"] if c in gdf.columns]
+    gdf = gdf[keep + ["geometry"]].copy()
+
+    # OSM il olmayan relation'ları filtrele (örn. "Ege" — il değil, coğrafi bölge)
+    if level == 1 and is_osm and "NAME_1" in gdf.columns:
+        before = len(gdf)
+        gdf = gdf[~gdf["NAME_1"].isin(_OSM_NON_PROVINCE_NAMES)].copy()
+        removed = before - len(gdf)
+        if removed:
+            logger.info("OSM il olmayan %d relation filtrelendi: %s", removed,
+                        list(_OSM_NON_PROVINCE_NAMES))
+
+    # İllere bölge adı ekle (JS filtreleme için kullanılır)
+    # ASCII normalize edilerek eşleştirme: GADM "Gumushane" ve OSM "Gümüşhane"
+    # her ikisi de "gumushane" → doğru bölgeye eşlenir
+    if level == 1:
+        gdf["REGION"] = gdf["NAME_1"].map(
+            lambda x: _PROVINCE_TO_REGION.get(_ascii_key(x), "Diğer")
+        )
+        # OSM bazen Türkiye dışı ilçe/bölge relation'larını (örn. Yunan adaları
+        # "Περιφερειακή Ενότητα ...") admin_level=4 sonucuna karıştırır.
+        # Bilinen 81 il dışındakiler "Diğer"e düşer → hem İl Modu'nda hayalet
+        # poligon, hem Bölge Modu'nda sahte bir "Diğer" dissolve'u yaratır.
+        before = len(gdf)
+        gdf = gdf[gdf["REGION"] != "Diğer"].copy()
+        dropped = before - len(gdf)
+        if dropped:
+            logger.info(
+                "Türkiye dışı %d il/relation filtrelendi (REGION=='Diğer')",
+                dropped,
+            )
+    return gdf, is_osm
+
+
 def _load_geojson(level: int, tolerance: float) -> str:
     """
     İl (level=1) veya ilçe (level=2) sınırlarını yükle, basitleştir, GeoJSON döndür.
@@ -110,61 +184,16 @@ def _load_geojson(level: int, tolerance: float) -> str:
     Aksi halde GADM shapefile'ına geri döner.
     Sonuç belleğe alınır (cache).
     """
-    key = str(level)
+    key = f"{level}:{tolerance}"
     if key in _cache:
         return _cache[key]
 
-    src_path, is_osm = _resolve_source_path(level)
-    if not src_path.exists():
-        logger.warning("Sınır verisi bulunamadı (level=%d): %s", level, src_path)
-        return _EMPTY_FC
-
-    source_label = "OSM" if is_osm else "GADM"
-
+    source_label = "GADM"
     try:
-        import geopandas as gpd
-
-        logger.info("%s verisi yükleniyor (level=%d): %s", source_label, level, src_path)
-        gdf = gpd.read_file(src_path)
-
-        if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
-            gdf = gdf.to_crs(epsg=4326)
-
-        # Gerekli sütunları seç (OSM'de GID_* sütunları olmayabilir — sorun değil)
-        if level == 1:
-            keep = [c for c in ["NAME_1", "GID_1"] if c in gdf.columns]
-        else:
-            keep = [c for c in ["NAME_1", "NAME_2", "GID_2"] if c in gdf.columns]
-        gdf = gdf[keep + ["geometry"]].copy()
-
-        # OSM il olmayan relation'ları filtrele (örn. "Ege" — il değil, coğrafi bölge)
-        if level == 1 and is_osm and "NAME_1" in gdf.columns:
-            before = len(gdf)
-            gdf = gdf[~gdf["NAME_1"].isin(_OSM_NON_PROVINCE_NAMES)].copy()
-            removed = before - len(gdf)
-            if removed:
-                logger.info("OSM il olmayan %d relation filtrelendi: %s", removed,
-                            list(_OSM_NON_PROVINCE_NAMES))
-
-        # İllere bölge adı ekle (JS filtreleme için kullanılır)
-        # ASCII normalize edilerek eşleştirme: GADM "Gumushane" ve OSM "Gümüşhane"
-        # her ikisi de "gumushane" → doğru bölgeye eşlenir
-        if level == 1:
-            gdf["REGION"] = gdf["NAME_1"].map(
-                lambda x: _PROVINCE_TO_REGION.get(_ascii_key(x), "Diğer")
-            )
-            # OSM bazen Türkiye dışı ilçe/bölge relation'larını (örn. Yunan adaları
-            # "Περιφερειακή Ενότητα ...") admin_level=4 sonucuna karıştırır.
-            # Bilinen 81 il dışındakiler "Diğer"e düşer → hem İl Modu'nda hayalet
-            # poligon, hem Bölge Modu'nda sahte bir "Diğer" dissolve'u yaratır.
-            before = len(gdf)
-            gdf = gdf[gdf["REGION"] != "Diğer"].copy()
-            dropped = before - len(gdf)
-            if dropped:
-                logger.info(
-                    "Türkiye dışı %d il/relation filtrelendi (REGION=='Diğer')",
-                    dropped,
-                )
+        gdf, is_osm = _read_level_gdf(level)
+        if gdf is None:
+            return _EMPTY_FC
+        source_label = "OSM" if is_osm else "GADM"
 
         # Geometri basitleştirme (OSM verisi zaten optimize — küçük tolerans yeterli)
         tol = tolerance * 0.5 if is_osm else tolerance
@@ -183,49 +212,57 @@ def _load_geojson(level: int, tolerance: float) -> str:
         return _EMPTY_FC
 
 
-def _load_regions_geojson() -> str:
+def _read_regions_gdf():
+    """İl poligonlarını bölgeye göre dissolve et (sadeleştirilmemiş).
+    Returns: (gdf, is_osm) — dosya yoksa (None, is_osm)."""
+    src_path, is_osm = _resolve_source_path(level=1)
+    if not src_path.exists():
+        logger.warning("Bölge için veri dosyası bulunamadı: %s", src_path)
+        return None, is_osm
+
+    import geopandas as gpd
+
+    gdf = gpd.read_file(src_path)
+    if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
+        gdf = gdf.to_crs(epsg=4326)
+
+    gdf = gdf[["NAME_1", "geometry"]].copy()
+    gdf["REGION"] = gdf["NAME_1"].map(
+        lambda x: _PROVINCE_TO_REGION.get(_ascii_key(x), "Diğer")
+    )
+
+    # Türkiye dışı relation'lar "Diğer"e düşer → dissolve öncesi at,
+    # aksi halde Bölge Modu'nda Yunan adaları vb. "Diğer" bölgesi olarak çıkar.
+    before = len(gdf)
+    gdf = gdf[gdf["REGION"] != "Diğer"].copy()
+    dropped = before - len(gdf)
+    if dropped:
+        logger.info(
+            "Bölge dissolve öncesi Türkiye dışı %d relation atıldı", dropped,
+        )
+
+    # Bölgeye göre dissolve et (union)
+    return gdf.dissolve(by="REGION", as_index=False)[["REGION", "geometry"]], is_osm
+
+
+def _load_regions_geojson(factor: float = 1.0) -> str:
     """
     7 coğrafi bölge poligonunu döndürür.
     İl poligonları bölgeye göre dissolve edilir.
     OSM GeoJSON varsa tercih eder, yoksa GADM'a geri döner.
     Sonuç cache'lenir.
     """
-    key = "regions"
+    key = f"regions:{factor}"
     if key in _cache:
         return _cache[key]
 
-    src_path, is_osm = _resolve_source_path(level=1)
-    if not src_path.exists():
-        logger.warning("Bölge için veri dosyası bulunamadı: %s", src_path)
-        return _EMPTY_FC
-
     try:
-        import geopandas as gpd
-
-        gdf = gpd.read_file(src_path)
-        if gdf.crs is not None and gdf.crs.to_epsg() != 4326:
-            gdf = gdf.to_crs(epsg=4326)
-
-        gdf = gdf[["NAME_1", "geometry"]].copy()
-        gdf["REGION"] = gdf["NAME_1"].map(
-            lambda x: _PROVINCE_TO_REGION.get(_ascii_key(x), "Diğer")
-        )
-
-        # Türkiye dışı relation'lar "Diğer"e düşer → dissolve öncesi at,
-        # aksi halde Bölge Modu'nda Yunan adaları vb. "Diğer" bölgesi olarak çıkar.
-        before = len(gdf)
-        gdf = gdf[gdf["REGION"] != "Diğer"].copy()
-        dropped = before - len(gdf)
-        if dropped:
-            logger.info(
-                "Bölge dissolve öncesi Türkiye dışı %d relation atıldı", dropped,
-            )
-
-        # Bölgeye göre dissolve et (union)
-        regions_gdf = gdf.dissolve(by="REGION", as_index=False)[["REGION", "geometry"]]
+        regions_gdf, is_osm = _read_regions_gdf()
+        if regions_gdf is None:
+            return _EMPTY_FC
 
         # OSM verisi daha doğru geometriye sahip — daha düşük tolerans kullan
-        tol = 0.0015 if is_osm else 0.003
+        tol = (0.0015 if is_osm else 0.003) * factor
         regions_gdf["geometry"] = regions_gdf["geometry"].simplify(tol, preserve_topology=True)
 
         result = regions_gdf.to_json(ensure_ascii=True)
@@ -241,34 +278,153 @@ def _load_regions_geojson() -> str:
         return _EMPTY_FC
 
 
+# ── Önceden üretilmiş varlıklar (build_border_assets.py) ──────────────────────
+#   <ad>.<detay>.<geojson|topojson>[.gz|.br]  +  manifest.json (içerik özetleri)
+
+_MEDIA_TYPES = {"geojson": "application/geo+json", "topojson": "application/topo+json"}
+_ENCODING_SUFFIX = {"br": ".br", "gzip": ".gz"}
+
+
+def _manifest() -> dict:
+    manifest = _cache.get("manifest")
+    if manifest is None:
+        path = _ASSET_DIR / "manifest.json"
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        except Exception as exc:
+            logger.warning("Sınır manifest'i okunamadı: %s", exc)
+            manifest = {}
+        _cache["manifest"] = manifest
+    return manifest
+
+
+def _asset_bytes(filename: str) -> bytes:
+    key = f"asset:{filename}"
+    data = _cache.get(key)
+    if data is None:
+        data = _cache[key] = (_ASSET_DIR / filename).read_bytes()
+    return data
+
+
+def _negotiate_format(request: Request, fmt: str | None) -> str:
+    if fmt:
+        return "topojson" if fmt.lower() in ("topojson", "topo") else "geojson"
+    accept = request.headers.get("accept", "")
+    return "topojson" if "application/topo+json" in accept else "geojson"
+
+
+def _accepted_encodings(request: Request) -> set[str]:
+    out = set()
+    for part in request.headers.get("accept-encoding", "").split(","):
+        token, _, params = part.strip().partition(";")
+        if token and params.replace(" ", "") not in ("q=0", "q=0.0"):
+            out.add(token.lower())
+    return out
+
+
+def _serve_asset(request: Request, name: str, detail: str, fmt: str,
+                 max_age: int = 86400) -> Response | None:
+    """Önceden üretilmiş varlığı içerik pazarlığıyla sun; varlık yoksa None."""
+    filename = f"{name}.{detail}.{fmt}"
+    entry = _manifest().get(filename)
+    if entry is None:
+        return None
+    accepted = _accepted_encodings(request)
+    encoding = next(
+        (enc for enc in ("br", "gzip") if enc in accepted and enc in entry.get("encodings", [])),
+        None,
+    )
+    etag = f'"{entry["sha"]}-{encoding}"' if encoding else f'"{entry["sha"]}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={max_age}",
+        "Vary": "Accept, Accept-Encoding",
+    }
+    inm = request.headers.get("if-none-match", "")
+    if inm and (inm.strip() == "*" or etag in [t.strip() for t in inm.split(",")]):
+        return Response(status_code=304, headers=headers)
+    try:
+        content = _asset_bytes(filename + (_ENCODING_SUFFIX[encoding] if encoding else ""))
+    except OSError as exc:
+        logger.warning("Sınır varlığı okunamadı (%s): %s", filename, exc)
+        return None
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=content, media_type=_MEDIA_TYPES[fmt], headers=headers)
+
+
+def _asset_missing(fmt: str) -> Response:
+    """TopoJSON yalnızca önceden üretilir — canlı yolda yok."""
+    return JSONResponse(
+        {"detail": f"{fmt} varlığı yok — python scripts/build_border_assets.py ile üretin"},
+        status_code=404,
+    )
+
+
 # ── Endpoint'ler ───────────────────────────────────────────────────────────────
 
+_DETAIL_QUERY = Query("medium", pattern="^(low|medium|high)$",
+                      description="Sadeleştirme seviyesi (low=4× tolerans, high=¼)")
+_FORMAT_QUERY = Query(None, alias="format", pattern="^(geojson|topojson|topo)$",
+                      description="geojson (varsayılan) | topojson — Accept ile de seçilir")
+
+
 @router.get("/provinces", summary="81 il sınırı (GADM TUR-1)")
-def get_province_borders():
+def get_province_borders(request: Request, detail: str = _DETAIL_QUERY,
+                         fmt: str | None = _FORMAT_QUERY):
     """
-    Türkiye'nin 81 il sınırını GeoJSON FeatureCollection olarak döndürür.
-    Her feature'da NAME_1 (il adı) ve REGION (bölge adı) özellikleri bulunur.
-    Geometri tolerance=0.002° ile basitleştirilmiştir (~200 m hassasiyet).
+    Türkiye'nin 81 il sınırını GeoJSON FeatureCollection (veya TopoJSON)
+    olarak döndürür. Her feature'da NAME_1 (il adı) ve REGION (bölge adı)
+    özellikleri bulunur. Geometri medium'da tolerance=0.002° ile
+    basitleştirilmiştir (~200 m hassasiyet).
     """
+    fmt = _negotiate_format(request, fmt)
+    served = _serve_asset(request, "provinces", detail, fmt)
+    if served is not None:
+        return served
+    if fmt != "geojson":
+        return _asset_missing(fmt)
     return Response(
-        content=_load_geojson(level=1, tolerance=0.002),
+        content=_load_geojson(level=1, tolerance=0.002 * DETAIL_FACTORS[detail]),
         media_type="application/geo+json",
         headers={"Cache-Control": "public, max-age=86400"},
     )
 
 
 @router.get("/districts", summary="957 ilçe sınırı (GADM TUR-2)")
-def get_district_borders(province: str | None = None, region: str | None = None):
+def get_district_borders(request: Request, province: str | None = None,
+                         region: str | None = None, detail: str = _DETAIL_QUERY,
+                         fmt: str | None = _FORMAT_QUERY):
     """
-    Türkiye'nin ilçe sınırlarını GeoJSON FeatureCollection olarak döndürür.
-    Her feature'da NAME_1 (il) ve NAME_2 (ilçe) özellikleri bulunur.
-    Geometri tolerance=0.001° ile basitleştirilmiştir (~100 m hassasiyet).
+    Türkiye'nin ilçe sınırlarını GeoJSON FeatureCollection (veya TopoJSON)
+    olarak döndürür. Her feature'da NAME_1 (il) ve NAME_2 (ilçe) özellikleri
+    bulunur. Geometri medium'da tolerance=0.001° ile basitleştirilmiştir
+    (~100 m hassasiyet).
 
     2026-05-27 (N4): `province=Marmaris` veya `region=Marmara` query parametre
     ile filtrelenebilir → Raporlar haritası 10 MB tüm GeoJSON yerine sadece
-    seçili ilin/bölgenin ilçelerini ~50-500 KB döndürür.
+    seçili ilin/bölgenin ilçelerini ~50-500 KB döndürür. Varlıklar üretilmişse
+    il/bölge alt kümeleri de hazır dosyadan gelir (filtreleme yok).
     """
-    raw = _load_geojson(level=2, tolerance=0.001)
+    fmt = _negotiate_format(request, fmt)
+    if province:
+        name, max_age = f"districts.province-{_slug(province)}", 3600
+    elif region:
+        name, max_age = f"districts.region-{_slug(region)}", 3600
+    else:
+        name, max_age = "districts", 86400
+    served = _serve_asset(request, name, detail, fmt, max_age=max_age)
+    if served is not None:
+        return served
+    if _manifest() and (province or region):
+        # Varlıklar var ama bu il/bölge yok → eski davranış: boş koleksiyon
+        served = _serve_asset(request, "districts.empty", detail, fmt, max_age=max_age)
+        if served is not None:
+            return served
+    if fmt != "geojson":
+        return _asset_missing(fmt)
+
+    raw = _load_geojson(level=2, tolerance=0.001 * DETAIL_FACTORS[detail])
 
     # Filter yoksa tüm GeoJSON
     if not province and not region:
@@ -324,14 +480,21 @@ def clear_borders_cache():
 
 
 @router.get("/regions", summary="7 coğrafi bölge sınırı")
-def get_region_borders():
+def get_region_borders(request: Request, detail: str = _DETAIL_QUERY,
+                       fmt: str | None = _FORMAT_QUERY):
     """
-    Türkiye'nin 7 coğrafi bölge sınırını GeoJSON olarak döndürür.
+    Türkiye'nin 7 coğrafi bölge sınırını GeoJSON (veya TopoJSON) olarak döndürür.
     İl poligonları bölgeye göre birleştirilerek (dissolve) oluşturulur.
     Her feature'da REGION (bölge adı) özelliği bulunur.
     """
+    fmt = _negotiate_format(request, fmt)
+    served = _serve_asset(request, "regions", detail, fmt)
+    if served is not None:
+        return served
+    if fmt != "geojson":
+        return _asset_missing(fmt)
     return Response(
-        content=_load_regions_geojson(),
+        content=_load_regions_geojson(DETAIL_FACTORS[detail]),
         media_type="application/geo+json",
         headers={"Cache-Control": "public, max-age=86400"},
     )
@@ -11,20 +11,31 @@ saklanır.
 **MBTiles formatı:** SQLite veritabanı. `tiles` tablosu TMS y-ekseni kullanır
 (alttan yukarı), XYZ ise üstten aşağı → y dönüşümü: `tms_y = (2^z - 1) - y`.
 
+**PMTiles (tercih edilen):** `contour.pmtiles` varsa tile'lar mmap'lenmiş
+arşivden async handler içinde okunur (`services/pmtiles.py`) — threadpool,
+SQLite bağlantısı veya SELECT yok. Arşivdeki gzip'li baytlar olduğu gibi
+`Content-Encoding: gzip` ile gönderilir (ETag'e `-gz` eki, `Vary:
+Accept-Encoding`); güçlü ETag + `If-None-Match` → 304.
+Üretim: `scripts/build_contour_mvt.py --pmtiles`. PMTiles yoksa MBTiles
+yolu (threadpool'da) kullanılır.
+
 mbtiles dosyası yoksa endpoint 404/empty döner; frontend otomatik OpenTopoMap
 fallback'ine geçer (feature flag).
 """
 from __future__ import annotations
 
+import gzip
 import os
 import sqlite3
 import threading
 from typing import Optional
 
-from fastapi import APIRouter, Path
+from fastapi import APIRouter, Path, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import JSONResponse, Response
 
 from app.core.logger import logger
+from app.services.pmtiles import COMPRESSION_GZIP, PMTilesReader
 
 router = APIRouter()
 
@@ -39,6 +50,40 @@ _MBTILES_PATH = os.environ.get(
     ),
 )
 
+_PMTILES_PATH = os.environ.get(
+    "SRRP_CONTOUR_PMTILES",
+    os.path.splitext(_MBTILES_PATH)[0] + ".pmtiles",
+)
+
+_TILE_CACHE_CONTROL = "public, max-age=86400"  # 1 gün
+
+# PMTiles okuyucu — dosya değişirse (mtime/boyut) yeniden açılır
+_pm_lock = threading.Lock()
+_pm_state: tuple = (None, None)  # (stat anahtarı, PMTilesReader | None)
+
+
+def _get_pmtiles() -> Optional[PMTilesReader]:
+    """Süreç başına tek mmap'li okuyucu (dosya yoksa / bozuksa None)."""
+    global _pm_state
+    try:
+        st = os.stat(_PMTILES_PATH)
+    except OSError:
+        return None
+    key = (st.st_size, st.st_mtime_ns)
+    if _pm_state[0] != key:
+        with _pm_lock:
+            if _pm_state[0] != key:
+                reader = None
+                try:
+                    reader = PMTilesReader(_PMTILES_PATH)
+                except Exception as e:
+                    logger.warning("[contour] pmtiles açılamadı: {}", e)
+                # Eski okuyucunun mmap'i kapatılmaz: eşzamanlı istekler hâlâ
+                # slice alıyor olabilir; referans kalmayınca GC kapatır.
+                _pm_state = (key, reader)
+    return _pm_state[1]
+
+
 # Thread-local SQLite bağlantısı — sqlite3 connection thread-safe değil.
 _local = threading.local()
 
@@ -62,7 +107,24 @@ def _get_conn() -> Optional[sqlite3.Connection]:
 
 @router.get("/contour/meta", summary="Contour mbtiles metadata")
 def contour_meta():
-    """mbtiles hazır mı + metadata (bounds, minzoom, maxzoom)."""
+    """mbtiles/pmtiles hazır mı + metadata (bounds, minzoom, maxzoom)."""
+    reader = _get_pmtiles()
+    if reader is not None:
+        h = reader.header
+        meta = reader.metadata()
+        return {
+            "ready": True,
+            "format": "pmtiles",
+            "path": _PMTILES_PATH,
+            "metadata": meta,
+            "tilejson": {
+                "tiles": ["/api/v1/tiles/contour/{z}/{x}/{y}.pbf"],
+                "minzoom": h.min_zoom,
+                "maxzoom": h.max_zoom,
+                "format": "pbf",
+                "vector_layers": meta.get("vector_layers", [{"id": "contour"}]),
+            },
+        }
     if not os.path.isfile(_MBTILES_PATH):
         return JSONResponse(
             {
@@ -84,6 +146,7 @@ def contour_meta():
         return JSONResponse({"ready": False, "reason": str(e)})
     return {
         "ready": True,
+        "format": "mbtiles",
         "path": _MBTILES_PATH,
         "metadata": meta,
         "tilejson": {
@@ -109,16 +172,43 @@ def _safe_vector_layers(meta: dict) -> list:
         return [{"id": "contour"}]
 
 
-@router.get(
-    "/contour/{z}/{x}/{y}.pbf",
-    summary="Contour vektör tile (MVT/PBF)",
-)
-def contour_tile(
-    z: int = Path(..., ge=0, le=22),
-    x: int = Path(..., ge=0),
-    y: int = Path(..., ge=0),
-):
-    """Tek bir contour MVT tile döner. mbtiles yoksa 404."""
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags or f"W/{etag}" in tags
+
+
+def _pmtiles_tile(reader: PMTilesReader, request: Request,
+                  z: int, x: int, y: int) -> Response:
+    loc = reader.locate(z, x, y)
+    if loc is None:
+        # Boş tile — 204 (içerik yok ama hata da değil)
+        return Response(status_code=204)
+    gzipped = reader.header.tile_compression == COMPRESSION_GZIP
+    passthrough = gzipped and "gzip" in request.headers.get("accept-encoding", "")
+    # Gzip'li ve açılmış gövde farklı temsil — aynı güçlü ETag'i taşıyamaz
+    etag = reader.etag(*loc)
+    if passthrough:
+        etag = f'{etag[:-1]}-gz"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": _TILE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+
+    data = reader.read(*loc)
+    if passthrough:
+        headers["Content-Encoding"] = "gzip"   # sıkıştırılmış bayt aynen
+    elif gzipped:
+        data = gzip.decompress(data)
+    return Response(content=data, media_type="application/x-protobuf", headers=headers)
+
+
+def _mbtiles_tile(z: int, x: int, y: int) -> Response:
+    """MBTiles yolu (SQLite, threadpool'da çalışır)."""
     conn = _get_conn()
     if conn is None:
         return Response(status_code=404)
@@ -143,9 +233,29 @@ def contour_tile(
     data: bytes = row[0]
     headers = {
         "Content-Type": "application/x-protobuf",
-        "Cache-Control": "public, max-age=86400",  # 1 gün
+        "Cache-Control": _TILE_CACHE_CONTROL,
     }
     # tippecanoe çıktısı gzip'li olabilir → mbtiles spec gereği header ekle
     if data[:2] == b"\x1f\x8b":
         headers["Content-Encoding"] = "gzip"
     return Response(content=data, headers=headers)
+
+
+@router.get(
+    "/contour/{z}/{x}/{y}.pbf",
+    summary="Contour vektör tile (MVT/PBF)",
+)
+async def contour_tile(
+    request: Request,
+    z: int = Path(..., ge=0, le=22),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+):
+    """Tek bir contour MVT tile döner. PMTiles varsa event loop içinde
+    mmap'ten, yoksa MBTiles'tan (threadpool); ikisi de yoksa 404."""
+    reader = _get_pmtiles()
+    if reader is not None:
+        if x >= (1 << z) or y >= (1 << z):
+            return Response(status_code=204)
+        return _pmtiles_tile(reader, request, z, x, y)
+    return await run_in_threadpool(_mbtiles_tile, z, x, y)
@@ -1,6 +1,9 @@
+from typing import List
+
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from app.services.geo_service import GeoService as GeoAnalyzer
+from app.services import reverse_geocoder
 from app.core.logger import logger
 
 # Router'ı oluştur
@@ -20,19 +23,22 @@ class GeoCheckRequest(BaseModel):
     longitude: float
 
 
+# Toplu tarama üst sınırı — tablo başına tek sorgu, ama yanıt nokta başına ~2 KB
+MAX_BATCH_POINTS = 500
+
+
+class GeoBatchCheckRequest(BaseModel):
+    points: List[GeoCheckRequest] = Field(..., min_length=1, max_length=MAX_BATCH_POINTS)
+
+
 @router.get("/city")
 def get_city_for_coords(lat: float, lon: float):
     """
     Koordinata göre il ve ilçe adını döndürür (reverse geocoding).
     Örnek: GET /geo/city?lat=39.92&lon=32.85
     """
-    if analyzer is None:
-        logger.error("GeoAnalyzer None — shapefile yüklenememiş! Backend'i yeniden başlatın.")
-        return {"province": "", "district": "", "error": "geo_service_not_initialized"}
     try:
-        from shapely.geometry import Point
-        point = Point(lon, lat)
-        info = analyzer._get_location_info(point, lat, lon)
+        info = reverse_geocoder.locate(lat, lon)
         if not info.get("province"):
             logger.debug("Reverse geocoding: boş sonuç ({}, {}) — nokta Türkiye dışında olabilir", lat, lon)
         return info
@@ -53,3 +59,23 @@ def check_geo_suitability(request: GeoCheckRequest):
     except Exception as e:
         logger.error("Geo suitability hatası ({}, {}): {}", request.latitude, request.longitude, e)
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/check-suitability/batch")
+def check_geo_suitability_batch(request: GeoBatchCheckRequest):
+    """
+    Çoklu koordinat için `/check-suitability` — yanıt, giriş sırasıyla nokta
+    başına aynı şemadaki sonuçların listesi.
+
+    Nokta başına ayrı sorgular yerine her PostGIS tablosu için tek
+    `unnest` + `LATERAL` sorgusu çalışır (toplu saha taraması).
+    """
+    if analyzer is None:
+        raise HTTPException(status_code=503, detail="geo_service_not_initialized")
+    try:
+        return analyzer.analyze_locations(
+            [(p.latitude, p.longitude) for p in request.points]
+        )
+    except Exception as e:
+        logger.error("Geo batch suitability hatası ({} nokta): {}", len(request.points), e)
+        raise HTTPException(status_code=500, detail=str(e))
@@ -17,7 +17,11 @@ import json
 import logging
 from typing import Optional
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+
+from app.services import data_versions
+from app.services.data_versions import versioned_key
+from app.services.ndjson_stream import ndjson_response, wants_ndjson
 
 logger = logging.getLogger(__name__)
 
@@ -27,21 +31,11 @@ router = APIRouter(prefix="/ml", tags=["🧠 ML Forecast"])
 
 # ── Cache helpers ────────────────────────────────────────────────────────────
 
-def _cache_get(key: str) -> Optional[dict]:
-    """Redis cache get — yoksa None."""
-    try:
-        from app.services.redis_cache import cache_get
-        return cache_get(key)
-    except Exception:
-        return None
-
-
-def _cache_set(key: str, value: dict, ttl_seconds: int) -> None:
-    try:
-        from app.services.redis_cache import cache_set
-        cache_set(key, value, ttl_seconds=ttl_seconds)
-    except Exception as e:
-        logger.debug("cache_set fail: %s", e)
+def _cached(key: str, compute, ttl_seconds: int) -> dict:
+    """Stampede korumalı cache — eşzamanlı aynı istekler tek SARIMAX/sorgu
+    çalıştırır, süre dolunca bayat yanıt sunulurken biri yeniler."""
+    from app.services.redis_cache import get_or_compute
+    return get_or_compute(key, compute, ttl_seconds=ttl_seconds)
 
 
 # ── Pin Forecast ─────────────────────────────────────────────────────────────
@@ -67,19 +61,16 @@ def project_pin(
     Redis cache: 24 saat (pin verisi sık değişmez).
     """
     cache_key = f"ml:pin:{pin_id}:y{years}"
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
-
     try:
         from app.services.ml_sarimax_service import (
             project_pin_generation,
             forecast_to_dict,
         )
-        forecast = project_pin_generation(pin_id, years_ahead=years)
-        result = forecast_to_dict(forecast)
-        _cache_set(cache_key, result, ttl_seconds=24 * 3600)
-        return result
+        return _cached(
+            cache_key,
+            lambda: forecast_to_dict(project_pin_generation(pin_id, years_ahead=years)),
+            ttl_seconds=24 * 3600,
+        )
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except RuntimeError as re:
@@ -106,14 +97,13 @@ def project_pin_financial_endpoint(
     Redis cache: 24 saat.
     """
     cache_key = f"ml:pinfin:{pin_id}:y{years}"
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
     try:
         from app.services.ml_sarimax_service import project_pin_financial
-        result = project_pin_financial(pin_id, years_ahead=years)
-        _cache_set(cache_key, result, ttl_seconds=24 * 3600)
-        return result
+        return _cached(
+            cache_key,
+            lambda: project_pin_financial(pin_id, years_ahead=years),
+            ttl_seconds=24 * 3600,
+        )
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except RuntimeError as re:
@@ -150,24 +140,21 @@ def project_province_endpoint(
     Redis cache: 7 gün (climatology yarı-statik, R0 refresh 6 ayda bir).
     """
     cache_key = f"ml:prov:{province}:{resource}:{metric}:y{years}"
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
-
     try:
         from app.services.ml_sarimax_service import (
             project_climatology,
             forecast_to_dict,
         )
-        forecast = project_climatology(
-            province=province,
-            resource=resource,
-            years_ahead=years,
-            metric=metric,
+        return _cached(
+            cache_key,
+            lambda: forecast_to_dict(project_climatology(
+                province=province,
+                resource=resource,
+                years_ahead=years,
+                metric=metric,
+            )),
+            ttl_seconds=7 * 24 * 3600,
         )
-        result = forecast_to_dict(forecast)
-        _cache_set(cache_key, result, ttl_seconds=7 * 24 * 3600)
-        return result
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except RuntimeError as re:
@@ -209,50 +196,48 @@ def scenario_province_endpoint(
     Redis cache: 7 gün (climatology + sabit deltalar → deterministik).
     """
     cache_key = f"ml:scenario:{province}:{resource}:{metric}:y{years}"
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
-
     try:
-        from app.services.ml_sarimax_service import project_climatology
-        from app.services.climate_scenarios import (
-            build_scenarios,
-            scenarios_to_dict,
-        )
-        from datetime import date as _date
+        def _compute():
+            from app.services.ml_sarimax_service import project_climatology
+            from app.services.climate_scenarios import (
+                build_scenarios,
+                scenarios_to_dict,
+            )
+            from datetime import date as _date
 
-        baseline = project_climatology(
-            province=province,
-            resource=resource,
-            years_ahead=years,
-            metric=metric,
-        )
-        # Forecast point'lerini (date_obj, value) tuple'a çevir
-        baseline_tuples = []
-        for p in baseline.points:
-            try:
-                d = _date.fromisoformat(p.date)
-            except Exception:
-                continue
-            baseline_tuples.append((d, p.value))
-
-        series_map = build_scenarios(baseline_tuples, metric=metric)
-        result = {
-            "province": province,
-            "resource": resource,
-            "metric": metric,
-            "horizon_months": baseline.horizon_months,
-            "baseline_meta": {
-                "order": list(baseline.order),
-                "seasonal_order": list(baseline.seasonal_order),
-                "method": baseline.method,
-                "mape": baseline.mape,
-                "annual_trend_pct": baseline.annual_trend_pct,
-            },
-            **scenarios_to_dict(series_map),
-        }
-        _cache_set(cache_key, result, ttl_seconds=7 * 24 * 3600)
-        return result
+            baseline = project_climatology(
+                province=province,
+                resource=resource,
+                years_ahead=years,
+                metric=metric,
+            )
+            # Forecast point'lerini (date_obj, value) tuple'a çevir
+            baseline_tuples = []
+            for p in baseline.points:
+                try:
+                    d = _date.fromisoformat(p.date)
+                except Exception:
+                    continue
+                baseline_tuples.append((d, p.value))
+
+            series_map = build_scenarios(baseline_tuples, metric=metric)
+            result = {
+                "province": province,
+                "resource": resource,
+                "metric": metric,
+                "horizon_months": baseline.horizon_months,
+                "baseline_meta": {
+                    "order": list(baseline.order),
+                    "seasonal_order": list(baseline.seasonal_order),
+                    "method": baseline.method,
+                    "mape": baseline.mape,
+                    "annual_trend_pct": baseline.annual_trend_pct,
+                },
+                **scenarios_to_dict(series_map),
+            }
+            return result
+
+        return _cached(cache_key, _compute, ttl_seconds=7 * 24 * 3600)
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
     except RuntimeError as re:
@@ -288,148 +273,156 @@ def ml_choropleth(
     `level=district` istenirse ve ilçe verisi yoksa **ilin değeri** her ilçeye
     atanır (downscaling yok — bkz. plan kısıtı).
 
-    Redis cache: 24 saat (precompute deterministik).
+    Önce batch'in yazdığı forecast küpü (`ml_forecast_cube`) dilimlenir —
+    sorgu yok, yıl slider'ı DB'ye gitmez. Küp yoksa sorgu yolu:
+
+    Redis cache: anahtar ML forecast sürümünü taşır — `build_ml_forecasts.py`
+    yeni tahmin yazana kadar geçerli (precompute deterministik).
     """
     month_key = month if month else "y"
-    cache_key = (f"ml:choro:{metric}:{resource}:{scenario}:{level}:{year}"
-                 f":m{month_key}")
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
-
+    cache_key = versioned_key(
+        f"ml:choro:{metric}:{resource}:{scenario}:{level}:{year}:m{month_key}",
+        data_versions.ML_FORECAST)
     valid_metrics = {"sunshine", "precipitation", "cloud", "discharge", "wind"}
     if metric not in valid_metrics:
         raise HTTPException(status_code=400, detail=f"metric geçersiz: {metric}")
 
     try:
-        from app.db.database import SystemSessionLocal
-        from app.db.models import MlForecast
-        from sqlalchemy import func
-
-        with SystemSessionLocal() as db:
-            # M-H.4: ay verilirse tek değer, yoksa 12-ay AVG (önceki davranış)
-            prov_q = db.query(
-                MlForecast.province_name,
-                func.avg(MlForecast.value).label("avg_val"),
-            ).filter(
-                MlForecast.scope == "province",
-                MlForecast.resource == resource,
-                MlForecast.metric == metric,
-                MlForecast.scenario == scenario,
-                MlForecast.year == year,
-            )
-            if month is not None:
-                prov_q = prov_q.filter(MlForecast.month == month)
-            prov_rows = prov_q.group_by(MlForecast.province_name).all()
-
-            # M-F: ilçe bazlı (varsa) — "İl|İlçe" anahtarı
-            dist_rows = []
-            if level == "district":
-                dist_q = db.query(
+        from app.services.ml_forecast_cube import get_cube
+        cube = get_cube(metric, resource, scenario, level)
+        if cube is not None:
+            return cube.slice(year, month)
+
+        def _compute():
+            from app.db.database import SystemSessionLocal
+            from app.db.models import MlForecast
+            from sqlalchemy import func
+
+            with SystemSessionLocal() as db:
+                # M-H.4: ay verilirse tek değer, yoksa 12-ay AVG (önceki davranış)
+                prov_q = db.query(
                     MlForecast.province_name,
-                    MlForecast.district_name,
                     func.avg(MlForecast.value).label("avg_val"),
                 ).filter(
-                    MlForecast.scope == "district",
+                    MlForecast.scope == "province",
                     MlForecast.resource == resource,
                     MlForecast.metric == metric,
                     MlForecast.scenario == scenario,
                     MlForecast.year == year,
-                    MlForecast.district_name.isnot(None),
                 )
                 if month is not None:
-                    dist_q = dist_q.filter(MlForecast.month == month)
-                dist_rows = dist_q.group_by(
-                    MlForecast.province_name, MlForecast.district_name).all()
-
-            # ── Scenario-BAĞIMSIZ renk ölçeği (RCP renklendirme fix) ──────────
-            # RCP delta'sı bir yıl için TÜM lokasyonlara AYNI çarpan uygular.
-            # Her senaryoyu kendi min/max'ına göre normalize edince çarpan
-            # normalizasyonda sadeleşir → baseline/rcp45/rcp85 renkleri AYNI
-            # çıkar ("RCP renklendirmiyor"). Çözüm: tüm senaryolar BASELINE
-            # değer aralığına göre normalize edilir → RCP magnitüd kayması renge
-            # yansır (örn. rcp85 yağış↓ → harita topluca koyulaşır). Aşağıda
-            # baseline değerleri (aynı yıl/ay/level) çekilir; norm aralığı = 5-95
-            # persentili (frontend ile aynı), response'ta norm_min/norm_max.
-            def _baseline_avg_vals(sc_level):
-                bq = db.query(func.avg(MlForecast.value)).filter(
-                    MlForecast.resource == resource,
-                    MlForecast.metric == metric,
-                    MlForecast.scenario == "baseline",
-                    MlForecast.year == year,
-                )
-                if month is not None:
-                    bq = bq.filter(MlForecast.month == month)
-                if sc_level == "district":
-                    bq = bq.filter(
+                    prov_q = prov_q.filter(MlForecast.month == month)
+                prov_rows = prov_q.group_by(MlForecast.province_name).all()
+
+                # M-F: ilçe bazlı (varsa) — "İl|İlçe" anahtarı
+                dist_rows = []
+                if level == "district":
+                    dist_q = db.query(
+                        MlForecast.province_name,
+                        MlForecast.district_name,
+                        func.avg(MlForecast.value).label("avg_val"),
+                    ).filter(
                         MlForecast.scope == "district",
+                        MlForecast.resource == resource,
+                        MlForecast.metric == metric,
+                        MlForecast.scenario == scenario,
+                        MlForecast.year == year,
                         MlForecast.district_name.isnot(None),
-                    ).group_by(
-                        MlForecast.province_name, MlForecast.district_name)
-                else:
-                    bq = bq.filter(MlForecast.scope == "province").group_by(
-                        MlForecast.province_name)
-                return [float(r[0]) for r in bq.all() if r[0] is not None]
-
-            baseline_vals = _baseline_avg_vals(level)
-            if not baseline_vals and level == "district":
-                baseline_vals = _baseline_avg_vals("province")
-
-        scores: dict = {}
-        # İlçe verisi (varsa) önce — "İl|İlçe" anahtarı
-        for prov, dist, v in dist_rows:
-            if v is not None:
-                scores[f"{prov}|{dist}"] = round(float(v), 2)
-        # İl verisi — düz "İl" anahtarı (frontend district key tutmazsa fallback)
-        for prov, v in prov_rows:
-            if v is not None:
-                scores[prov] = round(float(v), 2)
-        # İl adlarını GADM ile eşleştir: 'Afyon'→'Afyonkarahisar',
-        # 'K. Maras'→'Kahramanmaraş'. Frontend choropleth NAME_1 ile eşleştirir;
-        # canonical + alias varyantları ekle ki polygon tutsun (siyah delik önleme).
-        try:
-            from app.services.province_aliases import province_aliases, to_canonical
-            expanded = dict(scores)
-            for prov, val in scores.items():
-                keys = {to_canonical(prov)}
-                keys.update(province_aliases(prov))
-                keys.update(province_aliases(to_canonical(prov)))
-                for k in keys:
-                    expanded.setdefault(k, val)
-            scores = expanded
-        except Exception as e:
-            logger.debug("ml_choropleth alias expand fail: %s", e)
-        vals = list(scores.values())
-        # Scenario-bağımsız norm aralığı = baseline 5-95 persentili (frontend ile
-        # aynı). Frontend bu aralığı kullanırsa RCP magnitüd kayması renge yansır.
-        def _pct(arr, p):
-            return arr[min(len(arr) - 1, max(0, round((len(arr) - 1) * p)))]
-        norm_min = norm_max = None
-        if baseline_vals:
-            bs = sorted(baseline_vals)
-            norm_min = round(_pct(bs, 0.05), 2)
-            norm_max = round(_pct(bs, 0.95), 2)
-            if norm_max - norm_min < 1e-9:
-                norm_min, norm_max = round(bs[0], 2), round(bs[-1], 2)
-        result = {
-            "metric": metric,
-            "resource": resource,
-            "scenario": scenario,
-            "level": level,
-            "year": year,
-            "count": len(scores),
-            "min": min(vals) if vals else None,
-            "max": max(vals) if vals else None,
-            "norm_min": norm_min,
-            "norm_max": norm_max,
-            "scores": scores,
-            "note": (
-                "İlçe verisi yok; il değerleri kullanılıyor"
-                if level == "district" else None
-            ),
-        }
-        _cache_set(cache_key, result, ttl_seconds=24 * 3600)
-        return result
+                    )
+                    if month is not None:
+                        dist_q = dist_q.filter(MlForecast.month == month)
+                    dist_rows = dist_q.group_by(
+                        MlForecast.province_name, MlForecast.district_name).all()
+
+                # ── Scenario-BAĞIMSIZ renk ölçeği (RCP renklendirme fix) ──────────
+                # RCP delta'sı bir yıl için TÜM lokasyonlara AYNI çarpan uygular.
+                # Her senaryoyu kendi min/max'ına göre normalize edince çarpan
+                # normalizasyonda sadeleşir → baseline/rcp45/rcp85 renkleri AYNI
+                # çıkar ("RCP renklendirmiyor"). Çözüm: tüm senaryolar BASELINE
+                # değer aralığına göre normalize edilir → RCP magnitüd kayması renge
+                # yansır (örn. rcp85 yağış↓ → harita topluca koyulaşır). Aşağıda
+                # baseline değerleri (aynı yıl/ay/level) çekilir; norm aralığı = 5-95
+                # persentili (frontend ile aynı), response'ta norm_min/norm_max.
+                def _baseline_avg_vals(sc_level):
+                    bq = db.query(func.avg(MlForecast.value)).filter(
+                        MlForecast.resource == resource,
+                        MlForecast.metric == metric,
+                        MlForecast.scenario == "baseline",
+                        MlForecast.year == year,
+                    )
+                    if month is not None:
+                        bq = bq.filter(MlForecast.month == month)
+                    if sc_level == "district":
+                        bq = bq.filter(
+                            MlForecast.scope == "district",
+                            MlForecast.district_name.isnot(None),
+                        ).group_by(
+                            MlForecast.province_name, MlForecast.district_name)
+                    else:
+                        bq = bq.filter(MlForecast.scope == "province").group_by(
+                            MlForecast.province_name)
+                    return [float(r[0]) for r in bq.all() if r[0] is not None]
+
+                baseline_vals = _baseline_avg_vals(level)
+                if not baseline_vals and level == "district":
+                    baseline_vals = _baseline_avg_vals("province")
+
+            scores: dict = {}
+            # İlçe verisi (varsa) önce — "İl|İlçe" anahtarı
+            for prov, dist, v in dist_rows:
+                if v is not None:
+                    scores[f"{prov}|{dist}"] = round(float(v), 2)
+            # İl verisi — düz "İl" anahtarı (frontend district key tutmazsa fallback)
+            for prov, v in prov_rows:
+                if v is not None:
+                    scores[prov] = round(float(v), 2)
+            # İl adlarını GADM ile eşleştir: 'Afyon'→'Afyonkarahisar',
+            # 'K. Maras'→'Kahramanmaraş'. Frontend choropleth NAME_1 ile eşleştirir;
+            # canonical + alias varyantları ekle ki polygon tutsun (siyah delik önleme).
+            try:
+                from app.services.province_aliases import province_aliases, to_canonical
+                expanded = dict(scores)
+                for prov, val in scores.items():
+                    keys = {to_canonical(prov)}
+                    keys.update(province_aliases(prov))
+                    keys.update(province_aliases(to_canonical(prov)))
+                    for k in keys:
+                        expanded.setdefault(k, val)
+                scores = expanded
+            except Exception as e:
+                logger.debug("ml_choropleth alias expand fail: %s", e)
+            vals = list(scores.values())
+            # Scenario-bağımsız norm aralığı = baseline 5-95 persentili (frontend ile
+            # aynı). Frontend bu aralığı kullanırsa RCP magnitüd kayması renge yansır.
+            def _pct(arr, p):
+                return arr[min(len(arr) - 1, max(0, round((len(arr) - 1) * p)))]
+            norm_min = norm_max = None
+            if baseline_vals:
+                bs = sorted(baseline_vals)
+                norm_min = round(_pct(bs, 0.05), 2)
+                norm_max = round(_pct(bs, 0.95), 2)
+                if norm_max - norm_min < 1e-9:
+                    norm_min, norm_max = round(bs[0], 2), round(bs[-1], 2)
+            result = {
+                "metric": metric,
+                "resource": resource,
+                "scenario": scenario,
+                "level": level,
+                "year": year,
+                "count": len(scores),
+                "min": min(vals) if vals else None,
+                "max": max(vals) if vals else None,
+                "norm_min": norm_min,
+                "norm_max": norm_max,
+                "scores": scores,
+                "note": (
+                    "İlçe verisi yok; il değerleri kullanılıyor"
+                    if level == "district" else None
+                ),
+            }
+            return result
+
+        return _cached(cache_key, _compute, ttl_seconds=data_versions.VERSIONED_TTL)
     except Exception as e:
         logger.exception("Choropleth hatası %s/%s", metric, year)
         raise HTTPException(status_code=500, detail=f"Choropleth hatası: {e}")
@@ -465,6 +458,88 @@ def ml_choropleth_years(
 # ── Birleşik Seri: Historical + Forecast (M-H.1) ─────────────────────────────
 
 
+def _iter_series_historical(db, province, district, metric, history_years):
+    """`weather_data` günlüğünden son `history_years` yılın aylık noktaları —
+    sunucu tarafı cursor'dan satır satır (liste kurulmaz)."""
+    from app.services.ml_batch_service import monthly_daily_series_sql
+    from app.services.ndjson_stream import STREAM_BATCH
+
+    query = monthly_daily_series_sql(province, district, metric,
+                                     last_months=history_years * 12)
+    if query is None:
+        return
+    sql, params = query
+    result = db.execute(sql.execution_options(yield_per=STREAM_BATCH), params)
+    for m, v in result:
+        if v is None:
+            continue
+        yield {"date": f"{m.year:04d}-{m.month:02d}-01", "value": round(float(v), 3)}
+
+
+def _series_historical(province, district, metric, history_years) -> list:
+    """`_iter_series_historical`'ın liste hali (JSON yanıtı / cache için)."""
+    from app.db.database import SystemSessionLocal
+
+    with SystemSessionLocal() as db:
+        return list(_iter_series_historical(db, province, district, metric, history_years))
+
+
+def _series_forecast_query(db, province, district, metric, horizon_years, scenario):
+    """`ml_forecast` precompute tablosundan (yıl, ay) sıralı projeksiyon sorgusu."""
+    from app.db.models import MlForecast
+    from sqlalchemy import asc
+
+    # Resource mapping (sunshine→solar, wind→wind, temperature→solar)
+    resource_map = {"sunshine": "solar", "wind": "wind", "temperature": "solar"}
+    resource = resource_map.get(metric, "solar")
+    scope = "district" if district else "province"
+
+    q = (db.query(MlForecast.year, MlForecast.month,
+                  MlForecast.value, MlForecast.lower, MlForecast.upper)
+         .filter(
+            MlForecast.scope == scope,
+            MlForecast.province_name == province,
+            MlForecast.metric == metric,
+            MlForecast.resource == resource,
+            MlForecast.scenario == scenario,
+         ))
+    if district:
+        q = q.filter(MlForecast.district_name == district)
+    else:
+        q = q.filter(MlForecast.district_name.is_(None))
+    q = q.order_by(asc(MlForecast.year), asc(MlForecast.month))
+    return q.limit(horizon_years * 12)
+
+
+def _series_forecast_point(row) -> dict:
+    y, m, v, lo, up = row
+    return {
+        "date": f"{y:04d}-{m:02d}-01",
+        "value": round(float(v), 3),
+        "lower": round(float(lo), 3) if lo is not None else None,
+        "upper": round(float(up), 3) if up is not None else None,
+    }
+
+
+def _stream_ml_series(province, district, metric, history_years, horizon_years, scenario):
+    """`ml_series` NDJSON akışı — geçmiş noktaları, ardından forecast satırları."""
+    from app.db.database import SystemSessionLocal
+    from app.services.ndjson_stream import STREAM_BATCH
+
+    yield {"type": "meta", "province": province, "district": district,
+           "metric": metric, "scenario": scenario}
+    n_hist = n_fc = 0
+    with SystemSessionLocal() as db:
+        for point in _iter_series_historical(db, province, district, metric, history_years):
+            n_hist += 1
+            yield {"type": "historical", **point}
+        q = _series_forecast_query(db, province, district, metric, horizon_years, scenario)
+        for row in q.yield_per(STREAM_BATCH):
+            n_fc += 1
+            yield {"type": "forecast", **_series_forecast_point(row)}
+    yield {"type": "end", "history_months": n_hist, "forecast_months": n_fc}
+
+
 @router.get(
     "/series/{province}",
     summary="10 yıl geçmiş + 10 yıl projeksiyon birleşik aylık seri",
@@ -476,6 +551,8 @@ def ml_series(
     history_years: int = Query(10, ge=1, le=10),
     horizon_years: int = Query(10, ge=1, le=10),
     scenario: str = Query("baseline", regex="^(baseline|rcp45|rcp85)$"),
+    stream: bool = Query(False, description="NDJSON akış modu (nokta başına bir satır)"),
+    accept: Optional[str] = Header(default=None),
 ):
     """Tek ilin/ilçenin gerçek aylık geçmişi + ML projeksiyonu (Reports için).
 
@@ -485,94 +562,48 @@ def ml_series(
 
     Aynı seri olarak iki bölüm — Reports/Projeksiyon "10 yıl + 10 yıl" trend
     grafiği için.
-    """
-    cache_key = (f"ml:series:{province}:{district or '-'}:{metric}:"
-                 f"{history_years}:{horizon_years}:{scenario}")
-    cached = _cache_get(cache_key)
-    if cached:
-        return cached
 
+    `?stream=true` / `Accept: application/x-ndjson` → NDJSON akışı:
+    meta → `{"type": "historical", "date", "value"}`… →
+    `{"type": "forecast", "date", "value", "lower", "upper"}`… →
+    end{history_months, forecast_months}. Forecast satırları sunucu tarafı
+    cursor ile okunur.
+    """
+    if wants_ndjson(accept, stream):
+        return ndjson_response(_stream_ml_series(
+            province, district, metric, history_years, horizon_years, scenario,
+        ))
+
+    # Geçmiş günlük tablodan, tahmin ml_forecast'tan — ikisinin sürümü de anahtarda
+    cache_key = versioned_key(
+        f"ml:series:{province}:{district or '-'}:{metric}:"
+        f"{history_years}:{horizon_years}:{scenario}",
+        data_versions.ML_FORECAST, data_versions.DAILY)
     try:
-        from app.services.ml_batch_service import get_monthly_series_from_daily
-        from app.db.database import SystemSessionLocal
-        from app.db.models import MlForecast
-        from sqlalchemy import asc
-
-        # Geçmiş (gerçek daily aggregate)
-        hist_values, hist_start = get_monthly_series_from_daily(
-            province, district, metric,
-        )
-        # Son history_years aya kadar kırp
-        if hist_values:
-            max_points = history_years * 12
-            if len(hist_values) > max_points:
-                hist_values = hist_values[-max_points:]
-                # start_date'i ileri kaydır
-                from datetime import date as _d
-                offset_months = len(hist_values) - max_points
-                # Actually simpler: re-derive start by shifting
-                y, m = hist_start.year, hist_start.month
-                m_new = m + offset_months
-                hist_start = _d(y + (m_new - 1) // 12, ((m_new - 1) % 12) + 1, 1)
-
-        historical = []
-        if hist_values and hist_start:
-            y, m = hist_start.year, hist_start.month
-            for v in hist_values:
-                historical.append({
-                    "date": f"{y:04d}-{m:02d}-01",
-                    "value": round(v, 3),
-                })
-                m += 1
-                if m > 12:
-                    m = 1
-                    y += 1
-
-        # Forecast (ml_forecast tablosundan)
-        # Resource mapping (sunshine→solar, wind→wind, temperature→solar)
-        resource_map = {"sunshine": "solar", "wind": "wind", "temperature": "solar"}
-        resource = resource_map.get(metric, "solar")
-        scope = "district" if district else "province"
-
-        with SystemSessionLocal() as db:
-            q = (db.query(MlForecast.year, MlForecast.month,
-                          MlForecast.value, MlForecast.lower, MlForecast.upper)
-                 .filter(
-                    MlForecast.scope == scope,
-                    MlForecast.province_name == province,
-                    MlForecast.metric == metric,
-                    MlForecast.resource == resource,
-                    MlForecast.scenario == scenario,
-                 ))
-            if district:
-                q = q.filter(MlForecast.district_name == district)
-            else:
-                q = q.filter(MlForecast.district_name.is_(None))
-            q = q.order_by(asc(MlForecast.year), asc(MlForecast.month))
-            fc_rows = q.limit(horizon_years * 12).all()
-
-        forecast = [
-            {
-                "date": f"{y:04d}-{m:02d}-01",
-                "value": round(float(v), 3),
-                "lower": round(float(lo), 3) if lo is not None else None,
-                "upper": round(float(up), 3) if up is not None else None,
+        def _compute():
+            from app.db.database import SystemSessionLocal
+
+            historical = _series_historical(province, district, metric, history_years)
+
+            with SystemSessionLocal() as db:
+                fc_rows = _series_forecast_query(
+                    db, province, district, metric, horizon_years, scenario,
+                ).all()
+            forecast = [_series_forecast_point(r) for r in fc_rows]
+
+            result = {
+                "province": province,
+                "district": district,
+                "metric": metric,
+                "scenario": scenario,
+                "history_months": len(historical),
+                "forecast_months": len(forecast),
+                "historical": historical,
+                "forecast": forecast,
             }
-            for y, m, v, lo, up in fc_rows
-        ]
-
-        result = {
-            "province": province,
-            "district": district,
-            "metric": metric,
-            "scenario": scenario,
-            "history_months": len(historical),
-            "forecast_months": len(forecast),
-            "historical": historical,
-            "forecast": forecast,
-        }
-        _cache_set(cache_key, result, ttl_seconds=24 * 3600)
-        return result
+            return result
+
+        return _cached(cache_key, _compute, ttl_seconds=data_versions.VERSIONED_TTL)
     except Exception as e:
         logger.exception("ml_series hatası %s/%s", province, district)
         raise HTTPException(status_code=500, detail=f"Seri hatası: {e}")
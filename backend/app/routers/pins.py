@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query
 from fastapi.concurrency import run_in_threadpool # <--- SİHİRLİ İMPORT
 from sqlalchemy.orm import Session
 from typing import List, Optional, cast, Dict, Any
@@ -9,8 +9,11 @@ from app.schemas import schemas
 from app.db import models
 from app.services import solar_service as solar_calculations, wind_service as wind_calculations
 from app.services.hydro_service import calculate_annual_hydro_production, suggest_turbine_type, analyze_two_points
-from app.services.hourly_weather_helper import get_hourly_weather_for_pin
-from app.db.database import get_db, get_system_db, get_user_pins_db
+from app.services.hourly_weather_helper import get_hourly_arrays_for_pin
+from app.services import yield_engine
+from app.services.ndjson_stream import ndjson_response, wants_ndjson
+from app.services.pin_batch_service import PinJob, run_batch
+from app.db.database import get_db, get_system_db, UserSessionLocal, UserPinsSessionLocal
 from app.schemas.schemas import PinCalculationResponse, SolarCalculationResponse, WindCalculationResponse, HydroCalculationResponse, PinBase, FinancialAnalysis
 
 router = APIRouter()
@@ -332,10 +335,10 @@ async def calculate_pin_potential(
     """
     # 1. Hava Verilerini Çek — önce saatlik, bulamazsa grid fallback
     hourly_result = await run_in_threadpool(
-        get_hourly_weather_for_pin,
+        get_hourly_arrays_for_pin,
         system_db, float(pin_data.latitude), float(pin_data.longitude), 365
     )
-    hourly_data = hourly_result.get("hours", []) if hourly_result else []
+    hourly_data = hourly_result if hourly_result and hourly_result.get("count") else None
 
     # Fallback: saatlik veri yoksa eski grid ortalaması
     weather_stats = crud.get_weather_stats(system_db, float(pin_data.latitude), float(pin_data.longitude))
@@ -502,10 +505,10 @@ async def analyze_pin(
     
     # 3. Hesaplama yap — önce saatlik veri, sonra fallback
     hourly_result = await run_in_threadpool(
-        get_hourly_weather_for_pin,
+        get_hourly_arrays_for_pin,
         system_db, float(pin_data.latitude), float(pin_data.longitude), 365
     )
-    hourly_data = hourly_result.get("hours", []) if hourly_result else []
+    hourly_data = hourly_result if hourly_result and hourly_result.get("count") else None
 
     weather_stats = crud.get_weather_stats(system_db, float(pin_data.latitude), float(pin_data.longitude))
     if weather_stats is None: weather_stats = {}
@@ -714,16 +717,140 @@ async def hydro_elevation_analysis(
 
 # ── Toplu Pin Re-Analiz ──────────────────────────────────────────────────────
 
+def _reanalyze_jobs(system_db: Session, pins: list) -> List[PinJob]:
+    """ORM pinlerini worker'lara taşınabilir `PinJob`'lara çevirir; güneş
+    ekipman verimleri tek sorguda çözülür."""
+    eq_ids = {int(p.equipment_id) for p in pins if p.equipment_id}  # type: ignore
+    efficiencies: Dict[int, float] = {}
+    if eq_ids:
+        for eq in system_db.query(models.Equipment).filter(models.Equipment.id.in_(eq_ids)).all():
+            if str(eq.type) == "Solar" and eq.efficiency:
+                efficiencies[int(eq.id)] = float(eq.efficiency)  # type: ignore
+    return [
+        PinJob(
+            pin_id=int(p.id),  # type: ignore
+            latitude=float(p.latitude),  # type: ignore
+            longitude=float(p.longitude),  # type: ignore
+            pin_type=str(p.type),  # type: ignore
+            panel_area=float(p.panel_area) if p.panel_area else None,  # type: ignore
+            capacity_mw=float(p.capacity_mw) if p.capacity_mw else None,  # type: ignore
+            efficiency=efficiencies.get(int(p.equipment_id or 0), 0.20),  # type: ignore
+        )
+        for p in pins
+    ]
+
+
+def _reanalyze_compute(job: PinJob, hourly_data: Optional[dict], weather_stats_fn):
+    """Tek pin verim + finans hesabı (batch worker thread'inde çalışır).
+
+    Returns: (result_data | None, pin alan güncellemeleri)
+    """
+    # weather_stats yalnızca saatlik veri yetersizken (≤100 saat) kullanılır
+    weather_stats = weather_stats_fn() if yield_engine.hour_count(hourly_data) <= 100 else {}
+
+    if job.pin_type == "Güneş Paneli":
+        panel_area = job.panel_area or 10.0
+        results = solar_calculations.calculate_solar_power_production(
+            latitude=job.latitude, longitude=job.longitude,
+            panel_area=panel_area, panel_efficiency=job.efficiency,
+            weather_stats=weather_stats, hourly_data=hourly_data,
+        )
+        if "error" in results:
+            return None, {}
+        annual_kwh = float(results["predicted_annual_production_kwh"])
+        capacity_kw = panel_area * job.efficiency
+        financials = calculate_financials(annual_kwh, "Solar", capacity_kw)
+        return {
+            "resource_type": "Güneş Paneli",
+            "solar_calculation": {
+                "solar_irradiance_kw_m2": results["daily_avg_potential_kwh_m2"],
+                "potential_kwh_annual": annual_kwh,
+                "monthly_production": results.get("month_by_month_prediction"),
+                "financials": financials,
+                "method": results.get("method"),
+            },
+        }, {"avg_solar_irradiance": results["daily_avg_potential_kwh_m2"]}
+
+    if job.pin_type == "Rüzgar Türbini":
+        results = wind_calculations.calculate_wind_power_production(
+            latitude=job.latitude, longitude=job.longitude,
+            weather_stats=weather_stats, hourly_data=hourly_data,
+        )
+        if "error" in results:
+            return None, {}
+        annual_kwh = float(results["predicted_annual_production_kwh"])
+        capacity_kw = (job.capacity_mw or 3.3) * 1000.0
+        financials = calculate_financials(annual_kwh, "Wind", capacity_kw)
+        return {
+            "resource_type": "Rüzgar Türbini",
+            "wind_calculation": {
+                "wind_speed_m_s": results["avg_wind_speed_ms"],
+                "potential_kwh_annual": annual_kwh,
+                "capacity_factor": results.get("capacity_factor"),
+                "monthly_production": results.get("month_by_month_prediction"),
+                "financials": financials,
+                "method": results.get("method"),
+            },
+        }, {"avg_wind_speed": results["avg_wind_speed_ms"]}
+
+    # HES pinlerini atla (yağış verisi zaten uzun süreli)
+    return None, {}
+
+
+def _reanalyze_progress(jobs: List[PinJob]):
+    """`run_batch` sonuçlarını yazar ve pin başına ilerleme satırı yield eder.
+
+    Yazım kendi oturumlarıyla yapılır (akış modunda istek oturumları
+    yanıt gönderilirken kapanmış olabilir). Pin alanları sonda tek commit.
+    """
+    total = len(jobs)
+    done = updated = errors = 0
+    pin_updates: Dict[int, Dict[str, Any]] = {}
+    with UserPinsSessionLocal() as pins_db:
+        for outcome in run_batch(jobs, _reanalyze_compute):
+            done += 1
+            if outcome.status == "ok":
+                crud.create_or_update_pin_analysis(pins_db, outcome.pin_id, outcome.result_data)
+                pin_updates[outcome.pin_id] = outcome.pin_updates
+                updated += 1
+            elif outcome.status == "error":
+                errors += 1
+            line = {"type": "pin", "pin_id": outcome.pin_id, "status": outcome.status,
+                    "done": done, "total": total}
+            if outcome.msg:
+                line["msg"] = outcome.msg
+            yield line
+
+    if pin_updates:
+        with UserSessionLocal() as user_db:
+            try:
+                for pin_id, values in pin_updates.items():
+                    if values:
+                        user_db.query(models.Pin).filter(models.Pin.id == pin_id).update(values)
+                user_db.commit()
+            except Exception:
+                user_db.rollback()
+
+    yield {"type": "end", "updated": updated, "errors": errors, "total": total}
+
+
 @router.post("/batch/reanalyze")
 async def batch_reanalyze_pins(
+    stream: bool = Query(False, description="NDJSON ilerleme akışı (pin başına bir satır)"),
+    accept: Optional[str] = Header(default=None),
     db: Session = Depends(get_db),
     system_db: Session = Depends(get_system_db),
-    user_pins_db: Session = Depends(get_user_pins_db),
     current_user: models.User = Depends(auth.get_current_active_user),
 ):
     """
     Kullanıcının tüm pinlerini güncel saatlik verilerle yeniden analiz eder.
     Frontend'den "Tüm Pinleri Güncelle" butonu ile tetiklenir.
+
+    Pinler en yakın hava lokasyonuna göre gruplanır, her lokasyonun serisi
+    bir kez okunur, hesap sınırlı worker havuzunda yapılır
+    (`pin_batch_service`). `?stream=true` / `Accept: application/x-ndjson`
+    → pin tamamlandıkça `{"type": "pin", "pin_id", "status", "done", "total"}`
+    satırları, sonda `{"type": "end", "updated", "errors", "total"}`.
     """
     user_id = cast(int, current_user.id)
     pins = crud.get_pins_by_owner(db, user_id, limit=500)
@@ -731,98 +858,27 @@ async def batch_reanalyze_pins(
     if not pins:
         return {"updated": 0, "errors": 0, "message": "Pin bulunamadı"}
 
-    updated = 0
-    errors = 0
-    details: list = []
-
-    for pin_obj in pins:
-        try:
-            lat = float(pin_obj.latitude)  # type: ignore
-            lon = float(pin_obj.longitude)  # type: ignore
-            pin_type = str(pin_obj.type)  # type: ignore
-
-            # Saatlik veri çek
-            hourly_result = await run_in_threadpool(
-                get_hourly_weather_for_pin, system_db, lat, lon, 365
-            )
-            hourly_data = hourly_result.get("hours", []) if hourly_result else []
-            weather_stats = crud.get_weather_stats(system_db, lat, lon) or {}
-
-            result_data: Optional[dict] = None
-
-            if pin_type == "Güneş Paneli":
-                panel_area = float(pin_obj.panel_area or 10.0)  # type: ignore
-                efficiency = 0.20
-                eq = crud.get_equipment(system_db, pin_obj.equipment_id) if pin_obj.equipment_id else None  # type: ignore
-                if eq and str(eq.type) == "Solar" and eq.efficiency:
-                    efficiency = float(eq.efficiency)
-
-                results = await run_in_threadpool(
-                    solar_calculations.calculate_solar_power_production,
-                    latitude=lat, longitude=lon,
-                    panel_area=panel_area, panel_efficiency=efficiency,
-                    weather_stats=weather_stats, hourly_data=hourly_data,
-                )
-                if "error" not in results:
-                    annual_kwh = float(results["predicted_annual_production_kwh"])
-                    capacity_kw = panel_area * efficiency
-                    financials = calculate_financials(annual_kwh, "Solar", capacity_kw)
-                    result_data = {
-                        "resource_type": "Güneş Paneli",
-                        "solar_calculation": {
-                            "solar_irradiance_kw_m2": results["daily_avg_potential_kwh_m2"],
-                            "potential_kwh_annual": annual_kwh,
-                            "monthly_production": results.get("month_by_month_prediction"),
-                            "financials": financials,
-                            "method": results.get("method"),
-                        },
-                    }
-                    pin_obj.avg_solar_irradiance = results["daily_avg_potential_kwh_m2"]  # type: ignore
-
-            elif pin_type == "Rüzgar Türbini":
-                results = await run_in_threadpool(
-                    wind_calculations.calculate_wind_power_production,
-                    latitude=lat, longitude=lon,
-                    weather_stats=weather_stats, hourly_data=hourly_data,
-                )
-                if "error" not in results:
-                    annual_kwh = float(results["predicted_annual_production_kwh"])
-                    capacity_kw = float(pin_obj.capacity_mw or 3.3) * 1000.0  # type: ignore
-                    financials = calculate_financials(annual_kwh, "Wind", capacity_kw)
-                    result_data = {
-                        "resource_type": "Rüzgar Türbini",
-                        "wind_calculation": {
-                            "wind_speed_m_s": results["avg_wind_speed_ms"],
-                            "potential_kwh_annual": annual_kwh,
-                            "capacity_factor": results.get("capacity_factor"),
-                            "monthly_production": results.get("month_by_month_prediction"),
-                            "financials": financials,
-                            "method": results.get("method"),
-                        },
-                    }
-                    pin_obj.avg_wind_speed = results["avg_wind_speed_ms"]  # type: ignore
-
-            # HES pinlerini atla (yağış verisi zaten uzun süreli)
-
-            if result_data:
-                crud.create_or_update_pin_analysis(user_pins_db, int(pin_obj.id), result_data)  # type: ignore
-                updated += 1
-                details.append({"pin_id": pin_obj.id, "status": "ok"})  # type: ignore
-            else:
-                details.append({"pin_id": pin_obj.id, "status": "skipped"})  # type: ignore
-
-        except Exception as e:
-            errors += 1
-            details.append({"pin_id": pin_obj.id, "status": "error", "msg": str(e)})  # type: ignore
-
-    try:
-        db.commit()
-    except Exception:
-        db.rollback()
-
-    return {
-        "updated": updated,
-        "errors": errors,
-        "total": len(pins),
-        "details": details,
-    }
\ No newline at end of file
+    jobs = await run_in_threadpool(_reanalyze_jobs, system_db, pins)
+
+    if wants_ndjson(accept, stream):
+        return ndjson_response(_reanalyze_progress(jobs))
+
+    def _collect() -> dict:
+        details: list = []
+        summary: dict = {}
+        for line in _reanalyze_progress(jobs):
+            if line["type"] == "end":
+                summary = line
+                continue
+            item = {"pin_id": line["pin_id"], "status": line["status"]}
+            if "msg" in line:
+                item["msg"] = line["msg"]
+            details.append(item)
+        return {
+            "updated": summary.get("updated", 0),
+            "errors": summary.get("errors", 0),
+            "total": len(jobs),
+            "details": details,
+        }
+
+    return await run_in_threadpool(_collect)
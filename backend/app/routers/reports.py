@@ -9,39 +9,28 @@ from app import auth
 from app.db import models
 from app.schemas import schemas
 from app.db.database import get_system_db, get_db
+from app.services import reverse_geocoder
 # Yeni yapıdaki fonksiyonları ve veri setini import ediyoruz
 from app.core.constants import (
-    TURKEY_CITIES, get_location_by_name,
+    get_location_by_name,
     REGION_CITIES, CITY_TO_REGION, REGION_ALIASES,  # tek kaynak
 )
 
 router = APIRouter(prefix="/reports")
 
-def _haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-    from math import radians, sin, cos, sqrt, atan2
-    R = 6371.0
-    d_lat = radians(lat2 - lat1)
-    d_lon = radians(lon2 - lon1)
-    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
-    c = 2 * atan2(sqrt(a), sqrt(1 - a))
-    return R * c
-
 def _normalize(value: str) -> str:
     # Türkçe karakter düzeltmesi (İ -> i)
     value = value.replace("İ", "i").replace("I", "ı")
     key = value.strip().casefold()
     return REGION_ALIASES.get(key, key)
 
-def _find_nearest_location(lat: float, lon: float) -> str:
-    """Koordinata en yakın lokasyonun benzersiz adını (name - İlçe veya Merkez) döner."""
-    best = None
-    best_dist = 1e9
-    for loc in TURKEY_CITIES:
-        dist = _haversine(lat, lon, loc["lat"], loc["lon"])
-        if dist < best_dist:
-            best_dist = dist
-            best = loc["name"]
-    return best or "Bilinmiyor"
+def _find_nearest_locations(lats: List[float], lons: List[float]) -> List[str]:
+    """Koordinatlara en yakın lokasyonların benzersiz adları (name - İlçe veya
+    Merkez) — ortak `reverse_geocoder` KD-tree'si, tek toplu sorgu."""
+    return [
+        loc["name"] if loc else "Bilinmiyor"
+        for loc in reverse_geocoder.nearest_named_locations(lats, lons)
+    ]
 
 @router.get("/regional", response_model=schemas.RegionalReportResponse)
 def get_regional_report(
@@ -154,11 +143,12 @@ def get_regional_report(
             .all()
         )
 
-        for row in rows:
-            r_lat = cast(float, row.latitude)
-            r_lon = cast(float, row.longitude)
-            
-            matched_name = _find_nearest_location(r_lat, r_lon)
+        matched_names = _find_nearest_locations(
+            [cast(float, r.latitude) for r in rows],
+            [cast(float, r.longitude) for r in rows],
+        )
+
+        for row, matched_name in zip(rows, matched_names):
             loc_data = get_location_by_name(matched_name)
             
             if not loc_data:
@@ -64,3 +64,21 @@ def system_status(db: Session = Depends(get_system_db)):
         "status": primary.get("last_status") if primary else "unknown",
         "jobs": jobs,
     }
+
+
+@router.get("/cache")
+def cache_stats():
+    """
+    Süreç içi bellek cache'lerinin sayaçları (bu worker için): kayıt sayısı,
+    bayt / bütçe, hit-miss oranı, LRU atma ve TTL süpürme sayıları; cache
+    anahtarlarına giren veri seti sürümleri.
+    """
+    from app.routers.tiles import _TILE_CACHE
+    from app.services.data_versions import versions
+    from app.services.redis_cache import REDIS_AVAILABLE, mem_cache_stats
+
+    return {
+        "redis_available": REDIS_AVAILABLE,
+        "caches": [mem_cache_stats(), _TILE_CACHE.stats()],
+        "data_versions": versions(),
+    }
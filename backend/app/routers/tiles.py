@@ -1,6 +1,7 @@
 import asyncio
 import time
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, Path, Request
 from fastapi.responses import Response
@@ -8,75 +9,31 @@ from sqlalchemy import text
 from app.core.logger import logger
 
 from ..db.database import SystemSessionLocal
-from ..services.redis_cache import REDIS_URL, REDIS_AVAILABLE
-
-try:
-    import redis as _redis_lib
-    _REDIS_MODULE_AVAILABLE = True
-except ImportError:
-    _redis_lib = None
-    _REDIS_MODULE_AVAILABLE = False
+from ..services import mvt_generalize, tile_store
+from ..services.mem_cache import SizedLRU, budget_from_env
+from ..services.redis_cache import redis_binary_client
 
 router = APIRouter()
 
-# Binary Redis client — decode_responses=False PBF için zorunlu
-binary_redis = None
-if REDIS_AVAILABLE and _REDIS_MODULE_AVAILABLE:
-    try:
-        binary_redis = _redis_lib.from_url(REDIS_URL, decode_responses=False)
-    except Exception:
-        pass
+# Binary Redis client — decode_responses=False PBF için zorunlu (cache
+# servisininkiyle aynı; Redis yoksa None)
+binary_redis = redis_binary_client
 
 # ---------------------------------------------------------------------------
 # In-memory tile cache (Redis yoksa fallback, Redis varsa ek hız katmanı)
 # ---------------------------------------------------------------------------
-_TILE_CACHE: dict[str, tuple[bytes, float]] = {}
-_TILE_TTL    = 300   # 5 dakika
-_TILE_MAX    = 500   # maksimum entry sayısı
-
-def _mem_get(key: str) -> Optional[bytes]:
-    entry = _TILE_CACHE.get(key)
-    if entry and time.monotonic() < entry[1]:
-        return entry[0]
-    return None
-
-def _mem_set(key: str, data: bytes) -> None:
-    if len(_TILE_CACHE) >= _TILE_MAX:
-        now = time.monotonic()
-        expired = [k for k, (_, exp) in _TILE_CACHE.items() if now >= exp]
-        for k in expired[:max(1, _TILE_MAX // 5)]:
-            _TILE_CACHE.pop(k, None)
-        if len(_TILE_CACHE) >= _TILE_MAX:
-            for k in list(_TILE_CACHE.keys())[:_TILE_MAX // 5]:
-                del _TILE_CACHE[k]
-    _TILE_CACHE[key] = (data, time.monotonic() + _TILE_TTL)
+# Bayt bütçeli LRU (SRRP_TILE_MEM_CACHE_MB, varsayılan 64 MB) — sık bakılan
+# tile'lar kalır, eski sözlükteki gibi ekleme sırasına göre atılmaz.
+_TILE_TTL = 300   # 5 dakika
+_TILE_CACHE = SizedLRU(budget_from_env("SRRP_TILE_MEM_CACHE_MB", 64),
+                       default_ttl=_TILE_TTL, sizeof=len, name="tiles")
 
 # ---------------------------------------------------------------------------
-# Katman tanımları
+# Katman tanımları → services/mvt_generalize.LAYERS
 #   min_zoom  : Bu zoom seviyesinin altında katman hiç sorgulanmaz.
-#   limit     : Tile başına maksimum feature sayısı (büyük tile'ları önler).
+#   budget    : Tile başına feature bütçesi; öncelik (alan) sırasıyla dolar.
 # ---------------------------------------------------------------------------
-_LAYERS = {
-    "hydro": {
-        "table":      "hydro_features",
-        "properties": "t.feature_type, COALESCE(t.min_zoom, 0) AS min_zoom, t.energy_capacity_mw",
-        "min_zoom":   6,    # Su kütleleri düşük zoom'da da görünür
-        "limit":      500,
-    },
-    "restricted": {
-        "table":      "restricted_zones",
-        "properties": "t.feature_type, COALESCE(t.min_zoom, 0) AS min_zoom, t.description",
-        "min_zoom":   7,
-        "limit":      300,
-    },
-    "energy": {
-        "table":      "energy_corridors",
-        "properties": "t.feature_type, COALESCE(t.min_zoom, 0) AS min_zoom",
-        # Tarım/endüstriyel arazi çok büyük — sadece çok yakın zoom'da göster
-        "min_zoom":   11,
-        "limit":      200,
-    },
-}
+_LAYERS = mvt_generalize.LAYERS
 
 # ---------------------------------------------------------------------------
 # Startup — GIST mekansal indeksler (main.py lifespan'dan çağrılır)
@@ -113,56 +70,140 @@ async def ensure_spatial_indexes() -> None:
 # ---------------------------------------------------------------------------
 # Senkron DB işlevi — thread pool içinde çalışır, event loop'u bloke etmez
 # ---------------------------------------------------------------------------
-def _fetch_combined_tile(z: int, x: int, y: int) -> Optional[bytes]:
+_GENERALIZED_CHECK_TTL = 60.0
+_generalized_state: tuple[frozenset, float] = (frozenset(), 0.0)
+
+# Katman başına ayrı EXISTS — yalnız bir katmanı kuran yükleyiciden sonra
+# (ör. backfill_restricted_zones) diğerleri ham tablolardan üretilmeye devam
+# eder. Son bant diğer bantların üst kümesidir (en küçük boyut eşiği) →
+# ix_mvt_features_band_layer ile tek index araması.
+_GENERALIZED_LAYERS_SQL = text(
+    "SELECT l.name FROM unnest(CAST(:names AS text[])) AS l(name) "
+    "WHERE EXISTS (SELECT 1 FROM mvt_features f "
+    "WHERE f.zoom_band = :band AND f.layer = l.name)"
+)
+
+
+def _generalized_layers(db) -> frozenset:
+    """``mvt_features``'ta kurulmuş katmanlar (60 sn önbellekli). Kurulmamış
+    katman ham tablosundan üretilir — yükleyici/kurulum script'i çalışana kadar."""
+    global _generalized_state
+    layers, checked = _generalized_state
+    if time.monotonic() - checked < _GENERALIZED_CHECK_TTL:
+        return layers
+    try:
+        if db.execute(text("SELECT to_regclass('mvt_features') IS NOT NULL")).scalar():
+            layers = frozenset(db.execute(
+                _GENERALIZED_LAYERS_SQL,
+                {"names": list(_LAYERS), "band": mvt_generalize.ZOOM_BANDS[-1][0]},
+            ).scalars())
+        else:
+            layers = frozenset()
+    except Exception:
+        db.rollback()
+        layers = frozenset()
+    _generalized_state = (layers, time.monotonic())
+    return layers
+
+
+def _layer_cte(name: str, cfg: dict, generalized: bool) -> str:
+    props = [p.strip() for p in cfg["properties"].split(",")]
+    if generalized:
+        cols = ", ".join(f"f.{p}" for p in props)
+        return f"""
+            {name} AS (
+                SELECT ST_AsMVTGeom(f.geom, b.env, 4096, 256, true) AS geom, {cols}
+                FROM mvt_features f, bounds b
+                WHERE f.layer = '{name}' AND f.zoom_band = :band
+                  AND f.geom && b.clip
+                  AND ST_Intersects(f.geom, b.clip)
+                  AND f.min_zoom <= :z
+                ORDER BY f.priority DESC
+                LIMIT {cfg['budget']}
+            )"""
+    expr = {
+        "feature_type": cfg["feature_type"],
+        "min_zoom": "COALESCE(t.min_zoom, 0)",
+        "description": cfg["description"],
+        "energy_capacity_mw": cfg["capacity"],
+    }
+    cols = ", ".join(f"{expr[p]} AS {p}" for p in props)
+    return f"""
+            {name} AS (
+                SELECT ST_AsMVTGeom(ST_Transform(t.geom, 3857), b.env, 4096, 256, true) AS geom, {cols}
+                FROM {cfg['table']} t, bounds b
+                WHERE t.geom && b.clip_4326
+                  AND ST_Intersects(t.geom, b.clip_4326)
+                  AND COALESCE(t.min_zoom, 0) <= :z
+                ORDER BY ST_Area(t.geom) DESC
+                LIMIT {cfg['budget']}
+            )"""
+
+
+@lru_cache(maxsize=32)
+def _combined_tile_sql(layers: tuple[str, ...], generalized: frozenset = frozenset()):
+    """Aktif katmanlar için tek SQL: katman başına CTE, sonuç ST_AsMVT
+    parçalarının birleşimi (MVT katmanları bayt düzeyinde eklenebilir).
+    ``generalized`` içindeki katmanlar ``mvt_features``'tan, diğerleri ham
+    tablolardan okunur."""
+    ctes = ",".join(_layer_cte(n, _LAYERS[n], n in generalized) for n in layers)
+    parts = " || ".join(
+        f"COALESCE((SELECT ST_AsMVT(l.*, '{n}') FROM {n} l), ''::bytea)"
+        for n in layers
+    )
+    return text(f"""
+        WITH bounds AS (
+            SELECT env, clip, ST_Transform(clip, 4326) AS clip_4326
+            FROM (
+                SELECT ST_TileEnvelope(:z, :x, :y) AS env,
+                       ST_Expand(ST_TileEnvelope(:z, :x, :y), :buf) AS clip
+            ) e
+        ),{ctes}
+        SELECT {parts} AS tile
+    """)
+
+
+def _stored_tile(z: int, x: int, y: int) -> Tuple[Optional[bytes], int]:
+    """Tohumlanmış tile (yoksa None) + vektör veri versiyonu — ikisi de
+    senkron okuma, event loop dışında çağrılır."""
+    return tile_store.get_tile(z, x, y), tile_store.current_version()
+
+
+def _fetch_combined_tile(z: int, x: int, y: int, raise_errors: bool = False) -> Optional[bytes]:
     """
-    Tüm katmanları tek bir PBF içinde birleştirir.
+    Tüm katmanları tek SQL ifadesiyle tek bir PBF içinde üretir.
     Kendi SQLAlchemy session'ını açıp kapatır → thread-safe.
 
     Optimizasyonlar:
-      • &&  operatörü : GIST indeksini kullanır (bbox ön-filtresi)
-      • ST_Intersects  : && sonrası sadece aday geometrileri kontrol eder
-      • LIMIT          : Tile başına feature sayısını sınırlar
-      • min_zoom eşiği : Düşük zoom'da büyük tabloları tamamen atlar
+      • Tek round trip  : katman başına ayrı sorgu yerine CTE + ``||``
+      • mvt_features    : zoom bandına göre önceden sadeleştirilmiş, 3857'de
+                          saklanan geometri (tile başına ST_Transform yok)
+      • &&  operatörü   : GIST indeksini kullanır (bbox ön-filtresi)
+      • Öncelik bütçesi : LIMIT keyfi satırları değil en küçük feature'ları eler
+      • min_zoom eşiği  : Düşük zoom'da büyük tabloları tamamen atlar
     """
+    layers = tuple(n for n, cfg in _LAYERS.items() if z >= cfg["min_zoom"])
+    if not layers:
+        return None
+    band = mvt_generalize.band_of(z)
+    # Tile kenarında kesilen çizgiler için 256/4096'lık tampon (ST_AsMVTGeom buffer)
+    buf = mvt_generalize.grid_resolution_m(z) * 256
     db = SystemSessionLocal()
-    parts: list[bytes] = []
     try:
-        for layer_name, cfg in _LAYERS.items():
-            # Düşük zoom'da heavy katmanları sorgulama
-            if z < cfg["min_zoom"]:
-                continue
-
-            query = text(f"""
-                WITH bounds AS (
-                    SELECT ST_TileEnvelope(:z, :x, :y) AS geom
-                ),
-                mvtgeom AS (
-                    SELECT ST_AsMVTGeom(
-                        ST_Transform(t.geom, 3857),
-                        bounds.geom,
-                        4096, 256, true
-                    ) AS geom,
-                    {cfg['properties']}
-                    FROM {cfg['table']} t, bounds
-                    WHERE t.geom && ST_Transform(bounds.geom, 4326)
-                      AND ST_Intersects(t.geom, ST_Transform(bounds.geom, 4326))
-                      AND COALESCE(t.min_zoom, 0) <= :z
-                    LIMIT {cfg['limit']}
-                )
-                SELECT ST_AsMVT(mvtgeom.*, :layer_name) AS tile
-                FROM mvtgeom;
-            """)
-            result = db.execute(
-                query,
-                {"z": z, "x": x, "y": y, "layer_name": layer_name}
-            ).fetchone()
-            if result and result[0]:
-                parts.append(bytes(result[0]))
+        ready = _generalized_layers(db)
+        query = _combined_tile_sql(layers, ready.intersection(layers))
+        tile = db.execute(
+            query, {"z": z, "x": x, "y": y, "band": band[0], "buf": buf}
+        ).scalar()
+        return bytes(tile) if tile else None
     except Exception:
-        pass  # Tablo yok veya PostGIS bağlantı hatası → boş tile dön
+        # Tablo yok veya PostGIS bağlantı hatası → boş tile dön. Seeder hatayı
+        # görmeli: aksi halde boş tile depoya "bilinen boş" olarak girerdi.
+        if raise_errors:
+            raise
+        return None
     finally:
         db.close()
-    return b"".join(parts) if parts else None
 
 
 # ---------------------------------------------------------------------------
@@ -205,7 +246,20 @@ async def get_combined_tile(
     x: int = Path(..., description="X tile coordinate"),
     y: int = Path(..., description="Y tile coordinate"),
 ):
-    cache_key = f"mvt:all:{z}:{x}:{y}"
+    # 0. Tohumlanmış MBTiles deposu (scripts/seed_tiles.py) — güncel veri
+    #    versiyonunda ve tohumlanan zoom/bbox içindeyse DB'ye hiç gidilmez.
+    #    Boş tile b"" döner (seeder boş tile yazmaz).
+    #    SQLite okuması ve sürüm kaydı senkron → thread pool'da.
+    stored, version = await asyncio.to_thread(_stored_tile, z, x, y)
+    if stored is not None:
+        return Response(
+            content=stored,
+            media_type="application/x-protobuf",
+            headers={"X-Cache": "HIT-STORE", "Access-Control-Allow-Origin": "*"},
+        )
+
+    # Veri versiyonu anahtarda → yükleyici versiyonu artırınca eski tile'lar okunmaz
+    cache_key = f"mvt:all:v{version}:{z}:{x}:{y}"
 
     # 1. Redis cache
     if binary_redis:
@@ -221,7 +275,7 @@ async def get_combined_tile(
             pass
 
     # 2. In-memory cache
-    cached = _mem_get(cache_key)
+    cached = _TILE_CACHE.get(cache_key)
     if cached:
         return Response(
             content=cached,
@@ -248,7 +302,7 @@ async def get_combined_tile(
             binary_redis.setex(cache_key, 86400, tile)  # Redis: 24 saat
         except Exception:
             pass
-    _mem_set(cache_key, tile)  # Memory: 5 dakika
+    _TILE_CACHE.set(cache_key, tile)  # Memory: 5 dakika
 
     return Response(
         content=tile,
@@ -7,11 +7,14 @@
 
 import unicodedata
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import Response
 from sqlalchemy import func, select, text, or_, extract
 from typing import List, Optional
 from datetime import datetime, timedelta, timezone, date as date_type
-from collections import defaultdict
+from collections import defaultdict, namedtuple
+from itertools import groupby
+from operator import attrgetter, itemgetter
 from pydantic import BaseModel
 
 from app.db.database import SystemSessionLocal
@@ -22,7 +25,16 @@ from app.core.constants import TURKEY_CITIES, CITY_TO_REGION, PROVINCE_GEO_TO_CO
 from app.core.time_window import (
     resolve_time_window, MODE_REGEX, SEASON_REGEX, PRECOMPUTED_MODES,
 )
-from app.services.redis_cache import cache_get, cache_set
+from app.services import data_versions
+from app.services.data_versions import versioned_key
+from app.services.redis_cache import cache_get, cache_set, get_or_compute
+from app.services.frame_codec import (
+    FrameGrid, MEDIA_TYPE as FRAMES_MEDIA_TYPE, encode_frames,
+    negotiate as negotiate_frames,
+)
+from app.services.ndjson_stream import (
+    STREAM_BATCH, RunningRange, ndjson_response, wants_ndjson,
+)
 
 router = APIRouter(
     prefix="/weather",
@@ -61,7 +73,8 @@ def thematic_precomputed(
             status_code=400, detail="mode=season için season zorunlu")
 
     season_key = season if mode == "season" else "-"
-    cache_key = f"weather:thematic-pre:{mode}:{season_key}:{level}"
+    cache_key = versioned_key(f"weather:thematic-pre:{mode}:{season_key}:{level}",
+                              data_versions.THEMATIC)
     cached = cache_get(cache_key)
     if cached:
         return cached
@@ -137,7 +150,7 @@ def thematic_precomputed(
         "level": level,
         "location_count": len(out) - 1 if out else 0,
     }
-    cache_set(cache_key, out, ttl_seconds=24 * 3600)
+    cache_set(cache_key, out, ttl_seconds=data_versions.VERSIONED_TTL)
     return out
 
 
@@ -154,6 +167,8 @@ def animation_precomputed(
     period: str = Query("month", regex="^(month|week)$"),
     years: int = Query(5, ge=1, le=10, description="Son N yıl"),
     scope: str = Query("district", regex="^(province|district)$"),
+    stream: bool = Query(False, description="NDJSON akış modu (frame başına bir satır)"),
+    accept: Optional[str] = Header(default=None),
 ):
     """`thematic_timeseries`'ten hafta/ay başına frame'ler (anında).
 
@@ -163,6 +178,9 @@ def animation_precomputed(
 
     weekly sadece il bazında precompute edilir (ilçe×haftalık pratik değil) →
     period=week istenirse scope province'a zorlanır.
+
+    `?stream=true` / `Accept: application/x-ndjson` → `/weather/animation`
+    ile aynı NDJSON akış protokolü (10y ilçe ≈ 120 frame × 975 ilçe).
     """
     ts_metric = _ANIM_METRIC_MAP[metric]
     eff_scope = "province" if period == "week" else scope
@@ -175,13 +193,8 @@ def animation_precomputed(
     except ValueError:
         cutoff = cutoff.replace(year=cutoff.year - years, day=1)
 
-    cache_key = f"weather:anim-pre:{ts_metric}:{period}:{years}:{eff_scope}"
-    cached = cache_get(cache_key)
-    if cached:
-        return cached
-
-    with SystemSessionLocal() as db:
-        rows = (
+    def _query(db):
+        return (
             db.query(
                 ThematicTimeseries.period_start,
                 ThematicTimeseries.location_key,
@@ -195,9 +208,40 @@ def animation_precomputed(
                 ThematicTimeseries.value.isnot(None),
             )
             .order_by(ThematicTimeseries.period_start)
-            .all()
         )
 
+    if wants_ndjson(accept, stream):
+        def _lines():
+            rng = RunningRange()
+            total = 0
+            yield {"type": "meta", "metric": metric, "interval": period,
+                   "scope": eff_scope, "precomputed": True}
+            with SystemSessionLocal() as db:
+                rows = _query(db).yield_per(STREAM_BATCH)
+                for ps, group in groupby(rows, key=itemgetter(0)):
+                    vals = {}
+                    for _, loc, val in group:
+                        vals[loc] = round(float(val), 3)
+                        rng.add(float(val))
+                    total += 1
+                    yield {"type": "frame", "ts": ps.isoformat(), "vals": vals}
+            yield {
+                "type": "end",
+                "total_frames": total,
+                "metric_min": round(rng.lo, 3) if rng.lo is not None else None,
+                "metric_max": round(rng.hi, 3) if rng.hi is not None else None,
+            }
+        return ndjson_response(_lines())
+
+    cache_key = versioned_key(f"weather:anim-pre:{ts_metric}:{period}:{years}:{eff_scope}",
+                              data_versions.THEMATIC)
+    cached = cache_get(cache_key)
+    if cached:
+        return cached
+
+    with SystemSessionLocal() as db:
+        rows = _query(db).all()
+
     frames_map: dict = {}
     all_vals = []
     for ps, loc, val in rows:
@@ -219,7 +263,7 @@ def animation_precomputed(
         "metric_max": round(max(all_vals), 3) if all_vals else None,
         "frames": frames,
     }
-    cache_set(cache_key, result, ttl_seconds=12 * 3600)
+    cache_set(cache_key, result, ttl_seconds=data_versions.VERSIONED_TTL)
     return result
 
 
@@ -585,46 +629,46 @@ def get_province_summary(
         months = None
         cache_key_window = f"hours={hours}"
 
-    # ── Cache kontrolü (TTL: 30 dakika) ──────────────────────────────────────
-    cache_key = f"weather:province-summary:{cache_key_window}"
-    cached = cache_get(cache_key)
-    if cached is not None:
-        return [ProvinceSummary(**item) for item in cached]
-
-    db = SystemSessionLocal()
-    try:
-        query = db.query(
-            HourlyWeatherData.city_name,
-            func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
-            func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
-            func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
-            func.count(HourlyWeatherData.id).label("record_count"),
-        ).filter(
-            HourlyWeatherData.timestamp >= cutoff,
-            HourlyWeatherData.city_name.isnot(None),
-            or_(HourlyWeatherData.district_name.is_(None), HourlyWeatherData.district_name == "Merkez"),  # Sadece il merkezi kayıtları
-        )
-        if end_ts is not None:
-            query = query.filter(HourlyWeatherData.timestamp <= end_ts)
-        if months:
-            query = query.filter(extract("month", HourlyWeatherData.timestamp).in_(months))
-        results = query.group_by(HourlyWeatherData.city_name).all()
+    # ── Cache kontrolü (TTL: 30 dakika; anahtar saatlik veri sürümünü taşır) ──
+    cache_key = versioned_key(f"weather:province-summary:{cache_key_window}",
+                              data_versions.HOURLY)
 
-        result = [
-            ProvinceSummary(
-                province_name=r.city_name,
-                avg_wind_speed=round(r.avg_wind, 2) if r.avg_wind else None,
-                avg_radiation=round(r.avg_radiation, 1) if r.avg_radiation else None,
-                avg_temperature=round(r.avg_temp, 2) if r.avg_temp else None,
-                record_count=int(r.record_count),
+    def _compute():
+        db = SystemSessionLocal()
+        try:
+            query = db.query(
+                HourlyWeatherData.city_name,
+                func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
+                func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
+                func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
+                func.count(HourlyWeatherData.id).label("record_count"),
+            ).filter(
+                HourlyWeatherData.timestamp >= cutoff,
+                HourlyWeatherData.city_name.isnot(None),
+                or_(HourlyWeatherData.district_name.is_(None), HourlyWeatherData.district_name == "Merkez"),  # Sadece il merkezi kayıtları
             )
-            for r in results
-            if r.city_name
-        ]
-        cache_set(cache_key, [r.model_dump() for r in result], ttl_seconds=1800)
-        return result
-    finally:
-        db.close()
+            if end_ts is not None:
+                query = query.filter(HourlyWeatherData.timestamp <= end_ts)
+            if months:
+                query = query.filter(extract("month", HourlyWeatherData.timestamp).in_(months))
+            results = query.group_by(HourlyWeatherData.city_name).all()
+
+            result = [
+                ProvinceSummary(
+                    province_name=r.city_name,
+                    avg_wind_speed=round(r.avg_wind, 2) if r.avg_wind else None,
+                    avg_radiation=round(r.avg_radiation, 1) if r.avg_radiation else None,
+                    avg_temperature=round(r.avg_temp, 2) if r.avg_temp else None,
+                    record_count=int(r.record_count),
+                )
+                for r in results
+                if r.city_name
+            ]
+            return [r.model_dump() for r in result]
+        finally:
+            db.close()
+
+    return [ProvinceSummary(**item) for item in get_or_compute(cache_key, _compute, ttl_seconds=1800)]
 
 
 @router.get("/district-summary", response_model=List[DistrictSummary])
@@ -681,68 +725,68 @@ def get_district_summary(
         months = None
         cache_key_window = f"hours={hours}"
 
-    # ── Cache kontrolü (TTL: 15 dakika) ──────────────────────────────────────
-    cache_key = f"weather:district-summary:{resolved_code}:{cache_key_window}"
-    cached = cache_get(cache_key)
-    if cached is not None:
-        return [DistrictSummary(**item) for item in cached]
-
-    db = SystemSessionLocal()
-    try:
-        # Hem gerçek ilçeler (district_name IS NOT NULL) hem de il merkezi
-        # (location_code = "{code}0", district_name IS NULL) dahil edilir.
-        # Merkez kayıt "Merkez" district_name ile döndürülür.
-        query = db.query(
-            HourlyWeatherData.city_name,
-            HourlyWeatherData.district_name,
-            HourlyWeatherData.location_code,
-            func.avg(HourlyWeatherData.latitude).label("lat"),
-            func.avg(HourlyWeatherData.longitude).label("lon"),
-            func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
-            func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
-            func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
-            func.count(HourlyWeatherData.id).label("record_count"),
-        ).filter(
-            HourlyWeatherData.timestamp >= cutoff,
-            HourlyWeatherData.location_code.like(f"{resolved_code}%"),
-        )
-        if end_ts is not None:
-            query = query.filter(HourlyWeatherData.timestamp <= end_ts)
-        if months:
-            query = query.filter(extract("month", HourlyWeatherData.timestamp).in_(months))
-        results = query.group_by(
-            HourlyWeatherData.city_name,
-            HourlyWeatherData.district_name,
-            HourlyWeatherData.location_code,
-        ).all()
+    # ── Cache kontrolü (TTL: 15 dakika; anahtar saatlik veri sürümünü taşır) ──
+    cache_key = versioned_key(f"weather:district-summary:{resolved_code}:{cache_key_window}",
+                              data_versions.HOURLY)
 
-        # İlçe merkezlerinin sabit koordinatlarını kullan (DB ortalaması yerine)
-        # LOCATION_CODE_MAP: location_code → TURKEY_CITIES girişi (lat, lon, name, ...)
-        from app.core.constants import LOCATION_CODE_MAP
+    def _compute():
+        db = SystemSessionLocal()
+        try:
+            # Hem gerçek ilçeler (district_name IS NOT NULL) hem de il merkezi
+            # (location_code = "{code}0", district_name IS NULL) dahil edilir.
+            # Merkez kayıt "Merkez" district_name ile döndürülür.
+            query = db.query(
+                HourlyWeatherData.city_name,
+                HourlyWeatherData.district_name,
+                HourlyWeatherData.location_code,
+                func.avg(HourlyWeatherData.latitude).label("lat"),
+                func.avg(HourlyWeatherData.longitude).label("lon"),
+                func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
+                func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
+                func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
+                func.count(HourlyWeatherData.id).label("record_count"),
+            ).filter(
+                HourlyWeatherData.timestamp >= cutoff,
+                HourlyWeatherData.location_code.like(f"{resolved_code}%"),
+            )
+            if end_ts is not None:
+                query = query.filter(HourlyWeatherData.timestamp <= end_ts)
+            if months:
+                query = query.filter(extract("month", HourlyWeatherData.timestamp).in_(months))
+            results = query.group_by(
+                HourlyWeatherData.city_name,
+                HourlyWeatherData.district_name,
+                HourlyWeatherData.location_code,
+            ).all()
 
-        result = []
-        for r in results:
-            # Sabit koordinat: TURKEY_CITIES'den al, yoksa DB ortalaması kullan
-            fixed = LOCATION_CODE_MAP.get(r.location_code)
-            use_lat = round(fixed["lat"], 4) if fixed else (round(float(r.lat), 4) if r.lat else None)
-            use_lon = round(fixed["lon"], 4) if fixed else (round(float(r.lon), 4) if r.lon else None)
+            # İlçe merkezlerinin sabit koordinatlarını kullan (DB ortalaması yerine)
+            # LOCATION_CODE_MAP: location_code → TURKEY_CITIES girişi (lat, lon, name, ...)
+            from app.core.constants import LOCATION_CODE_MAP
 
-            result.append(DistrictSummary(
-                # district_name = NULL ise bu il merkezidir → "Merkez" olarak göster
-                district_name=r.district_name if r.district_name else "Merkez",
-                province_name=r.city_name,
-                lat=use_lat,
-                lon=use_lon,
-                avg_wind_speed=round(r.avg_wind, 2) if r.avg_wind else None,
-                avg_radiation=round(r.avg_radiation, 1) if r.avg_radiation else None,
-                avg_temperature=round(r.avg_temp, 2) if r.avg_temp else None,
-                record_count=int(r.record_count),
-                location_code=r.location_code,
-            ))
-        cache_set(cache_key, [r.model_dump() for r in result], ttl_seconds=900)
-        return result
-    finally:
-        db.close()
+            result = []
+            for r in results:
+                # Sabit koordinat: TURKEY_CITIES'den al, yoksa DB ortalaması kullan
+                fixed = LOCATION_CODE_MAP.get(r.location_code)
+                use_lat = round(fixed["lat"], 4) if fixed else (round(float(r.lat), 4) if r.lat else None)
+                use_lon = round(fixed["lon"], 4) if fixed else (round(float(r.lon), 4) if r.lon else None)
+
+                result.append(DistrictSummary(
+                    # district_name = NULL ise bu il merkezidir → "Merkez" olarak göster
+                    district_name=r.district_name if r.district_name else "Merkez",
+                    province_name=r.city_name,
+                    lat=use_lat,
+                    lon=use_lon,
+                    avg_wind_speed=round(r.avg_wind, 2) if r.avg_wind else None,
+                    avg_radiation=round(r.avg_radiation, 1) if r.avg_radiation else None,
+                    avg_temperature=round(r.avg_temp, 2) if r.avg_temp else None,
+                    record_count=int(r.record_count),
+                    location_code=r.location_code,
+                ))
+            return [r.model_dump() for r in result]
+        finally:
+            db.close()
+
+    return [DistrictSummary(**item) for item in get_or_compute(cache_key, _compute, ttl_seconds=900)]
 
 
 @router.get("/region-summary", response_model=List[RegionSummary])
@@ -773,64 +817,64 @@ def get_region_summary(
         months = None
         cache_key_window = f"hours={hours}"
 
-    # ── Cache kontrolü (TTL: 30 dakika) ──────────────────────────────────────
-    cache_key = f"weather:region-summary:{cache_key_window}"
-    cached = cache_get(cache_key)
-    if cached is not None:
-        return [RegionSummary(**item) for item in cached]
-
-    db = SystemSessionLocal()
-    try:
-        query = db.query(
-            HourlyWeatherData.city_name,
-            func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
-            func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
-            func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
-        ).filter(
-            HourlyWeatherData.timestamp >= cutoff,
-            HourlyWeatherData.city_name.isnot(None),
-            or_(HourlyWeatherData.district_name.is_(None), HourlyWeatherData.district_name == "Merkez"),
-        )
-        if end_ts is not None:
-            query = query.filter(HourlyWeatherData.timestamp <= end_ts)
-        if months:
-            query = query.filter(extract("month", HourlyWeatherData.timestamp).in_(months))
-        province_results = query.group_by(HourlyWeatherData.city_name).all()
-
-        region_buckets: dict = defaultdict(lambda: {
-            "winds": [], "rads": [], "temps": [], "provinces": set()
-        })
-
-        for r in province_results:
-            region = CITY_TO_REGION.get(r.city_name.casefold() if r.city_name else "")
-            if not region:
-                continue
-            b = region_buckets[region]
-            b["provinces"].add(r.city_name)
-            if r.avg_wind is not None:
-                b["winds"].append(float(r.avg_wind))
-            if r.avg_radiation is not None:
-                b["rads"].append(float(r.avg_radiation))
-            if r.avg_temp is not None:
-                b["temps"].append(float(r.avg_temp))
-
-        def _avg(lst):
-            return round(sum(lst) / len(lst), 2) if lst else None
+    # ── Cache kontrolü (TTL: 30 dakika; anahtar saatlik veri sürümünü taşır) ──
+    cache_key = versioned_key(f"weather:region-summary:{cache_key_window}",
+                              data_versions.HOURLY)
 
-        result = [
-            RegionSummary(
-                region_name=region,
-                province_count=len(b["provinces"]),
-                avg_wind_speed=_avg(b["winds"]),
-                avg_radiation=_avg(b["rads"]),
-                avg_temperature=_avg(b["temps"]),
+    def _compute():
+        db = SystemSessionLocal()
+        try:
+            query = db.query(
+                HourlyWeatherData.city_name,
+                func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
+                func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
+                func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
+            ).filter(
+                HourlyWeatherData.timestamp >= cutoff,
+                HourlyWeatherData.city_name.isnot(None),
+                or_(HourlyWeatherData.district_name.is_(None), HourlyWeatherData.district_name == "Merkez"),
             )
-            for region, b in sorted(region_buckets.items())
-        ]
-        cache_set(cache_key, [r.model_dump() for r in result], ttl_seconds=1800)
-        return result
-    finally:
-        db.close()
+            if end_ts is not None:
+                query = query.filter(HourlyWeatherData.timestamp <= end_ts)
+            if months:
+                query = query.filter(extract("month", HourlyWeatherData.timestamp).in_(months))
+            province_results = query.group_by(HourlyWeatherData.city_name).all()
+
+            region_buckets: dict = defaultdict(lambda: {
+                "winds": [], "rads": [], "temps": [], "provinces": set()
+            })
+
+            for r in province_results:
+                region = CITY_TO_REGION.get(r.city_name.casefold() if r.city_name else "")
+                if not region:
+                    continue
+                b = region_buckets[region]
+                b["provinces"].add(r.city_name)
+                if r.avg_wind is not None:
+                    b["winds"].append(float(r.avg_wind))
+                if r.avg_radiation is not None:
+                    b["rads"].append(float(r.avg_radiation))
+                if r.avg_temp is not None:
+                    b["temps"].append(float(r.avg_temp))
+
+            def _avg(lst):
+                return round(sum(lst) / len(lst), 2) if lst else None
+
+            result = [
+                RegionSummary(
+                    region_name=region,
+                    province_count=len(b["provinces"]),
+                    avg_wind_speed=_avg(b["winds"]),
+                    avg_radiation=_avg(b["rads"]),
+                    avg_temperature=_avg(b["temps"]),
+                )
+                for region, b in sorted(region_buckets.items())
+            ]
+            return [r.model_dump() for r in result]
+        finally:
+            db.close()
+
+    return [RegionSummary(**item) for item in get_or_compute(cache_key, _compute, ttl_seconds=1800)]
 
 
 # ─── Animasyon endpoint'leri ──────────────────────────────────────────────────
@@ -925,6 +969,203 @@ def _resolve_province_canonical(db_province_name: str) -> str:
     return canonical or db_province_name
 
 
+# ─── Animasyon sorguları / frame kurucuları ────────────────────────────────
+# Bellek-içi yanıt (`.all()`) ve NDJSON akışı (`.yield_per()`) aynı sorguları
+# ve aynı frame kurallarını paylaşır.
+
+def _anim_daily_district_query(db, start_date, end_date, metric_col):
+    """(tarih, il, ilçe) bazlı günlük AVG — tarih sıralı."""
+    return db.query(
+        WeatherData.date.label("date"),
+        WeatherData.province_name.label("province_name"),
+        WeatherData.district_name.label("district_name"),
+        func.avg(metric_col).label("val"),
+    ).filter(
+        WeatherData.date >= start_date,
+        WeatherData.date <= end_date,
+        metric_col.isnot(None),
+        WeatherData.province_name.isnot(None),
+    ).group_by(
+        WeatherData.date,
+        WeatherData.province_name,
+        WeatherData.district_name,
+    ).order_by(WeatherData.date)
+
+
+def _anim_daily_points_query(db, start_date, end_date, metric_col):
+    """Legacy points — il × tarih AVG, tarih sıralı."""
+    return db.query(
+        WeatherData.date.label("date"),
+        WeatherData.province_name.label("province_name"),
+        func.avg(metric_col).label("val"),
+    ).filter(
+        WeatherData.date >= start_date,
+        WeatherData.date <= end_date,
+        metric_col.isnot(None),
+        WeatherData.province_name.isnot(None),
+    ).group_by(
+        WeatherData.date, WeatherData.province_name,
+    ).order_by(WeatherData.date)
+
+
+def _anim_hourly_query(db, start_ts, end_ts, metric_col, use_districts):
+    """Saatlik ham satırlar — timestamp sıralı."""
+    base_query = db.query(
+        HourlyWeatherData.latitude,
+        HourlyWeatherData.longitude,
+        HourlyWeatherData.timestamp,
+        HourlyWeatherData.city_name,
+        HourlyWeatherData.district_name,
+        metric_col.label("val"),
+    ).filter(
+        HourlyWeatherData.timestamp >= start_ts,
+        HourlyWeatherData.timestamp <= end_ts,
+        metric_col.isnot(None),
+    )
+    if use_districts:
+        base_query = base_query.filter(
+            HourlyWeatherData.city_name.isnot(None),
+            HourlyWeatherData.district_name.isnot(None),
+        )
+    else:
+        base_query = base_query.filter(
+            or_(
+                HourlyWeatherData.district_name.is_(None),
+                HourlyWeatherData.district_name == "Merkez",
+            )
+        )
+    return base_query.order_by(HourlyWeatherData.timestamp)
+
+
+def _daily_district_frame(day_rows):
+    """Tek günün (il, ilçe, AVG) satırları → ({"İl|İlçe": val}, katkı değerleri).
+
+    2026-06-10 (daily ilçe fix): Backfill sonrası `weather_data` ARTIK
+    ilçe-bazlı satırlar içeriyor (`district_name` dolu, ~975 GADM ilçesi).
+    Eski kod il AVG'ini tüm ilçelere AYNI değerle yayıyordu → harita il-bazlı
+    tek renk görünüyordu. Yeni: (date, province, district) bazlı AVG → gerçek
+    ilçe değeri. İlçe satırı olmayan / GADM eşleşmeyen iller için
+    il-ortalaması fallback ile tüm GADM ilçeleri doldurulur (renk boşluğu
+    olmasın).
+    """
+    from app.services.gadm_lookup import (
+        resolve_province as _gadm_resolve_province,
+        resolve_district as _gadm_resolve_district,
+        get_districts as _gadm_get_districts,
+    )
+    vals: dict = {}
+    contributed: list = []
+    prov_fallback = defaultdict(list)   # gadm_prov → [değerler]
+    for row in day_rows:
+        v = round(float(row.val), 3)
+        gadm_prov = _gadm_resolve_province(row.province_name) or row.province_name
+        if row.district_name and row.district_name != "Merkez":
+            gadm_dist = _gadm_resolve_district(gadm_prov, row.district_name)
+            if gadm_prov and gadm_dist:
+                vals[f"{gadm_prov}|{gadm_dist}"] = v
+                contributed.append(v)
+        # GADM eşleşse de eşleşmese de fallback havuzuna kat
+        prov_fallback[gadm_prov].append(v)
+
+    # Veri/eşleşme olmayan GADM ilçelerini il-ortalaması ile doldur
+    for gadm_prov, pvals in prov_fallback.items():
+        if not pvals:
+            continue
+        fb = round(sum(pvals) / len(pvals), 3)
+        for d in _gadm_get_districts(gadm_prov):
+            key = f"{gadm_prov}|{d}"
+            if key not in vals:
+                vals[key] = fb
+                contributed.append(fb)
+    return vals, contributed
+
+
+def _hourly_frame(hour_rows, use_districts):
+    """Tek saatin satırları → (vals dict | pts list, min/max'a giren değerler).
+
+    1.A2.c-fix4: GADM-driven key çevrimi (hourly). DB'den gelen ham
+    (city_name, district_name) GADM kanonik adlara çevrilir → frontend
+    MapLibre polygon source ile birebir. Match olmayan satır atlanır
+    (ör. DB'de "Merkez" ama GADM'de yok).
+    """
+    from app.services.gadm_lookup import (
+        resolve_province as _gadm_resolve_province,
+        resolve_district as _gadm_resolve_district,
+    )
+    vals: dict = {}
+    pts: list = []
+    seen: list = []
+    for row in hour_rows:
+        v = round(float(row.val), 3)
+        if use_districts:
+            gadm_prov = _gadm_resolve_province(row.city_name)
+            gadm_dist = _gadm_resolve_district(gadm_prov, row.district_name) if gadm_prov else None
+            if gadm_prov and gadm_dist:
+                vals[f"{gadm_prov}|{gadm_dist}"] = v
+        else:
+            pts.append([
+                round(row.latitude, 4),
+                round(row.longitude, 4),
+                v,
+                row.city_name or "",
+            ])
+        seen.append(v)
+    return (vals if use_districts else pts), seen
+
+
+def _stream_animation(start_date, end_date, metric, interval, use_districts):
+    """`get_animation_frames` NDJSON akışı — frame'ler üretildikçe yield edilir.
+
+    Satırlar `yield_per` ile sunucu tarafı cursor'dan partiler halinde gelir;
+    sorgular zaman sıralı olduğundan `groupby` ile bir frame'in satırları
+    bitince frame hemen gönderilir. Bellekte tek frame + min/max tutulur.
+    """
+    fmt = "districts" if use_districts else "points"
+    field = "vals" if use_districts else "pts"
+    rng = RunningRange()
+    total = 0
+    yield {"type": "meta", "metric": metric, "interval": interval, "format": fmt,
+           "start": start_date.isoformat(), "end": end_date.isoformat()}
+
+    with SystemSessionLocal() as db:
+        if interval == "daily":
+            metric_col = _DAILY_METRIC_COL[metric]
+            if use_districts:
+                q = _anim_daily_district_query(db, start_date, end_date, metric_col)
+            else:
+                q = _anim_daily_points_query(db, start_date, end_date, metric_col)
+            for d, day_rows in groupby(q.yield_per(STREAM_BATCH), key=attrgetter("date")):
+                if use_districts:
+                    payload, seen = _daily_district_frame(day_rows)
+                else:
+                    payload = []
+                    for row in day_rows:
+                        v = round(float(row.val), 3)
+                        payload.append([0.0, 0.0, v, row.province_name or ""])
+                    seen = [p[2] for p in payload]
+                rng.extend(seen)
+                total += 1
+                yield {"type": "frame", "ts": d.isoformat(), field: payload}
+        else:
+            start_ts = datetime.combine(start_date, datetime.min.time())
+            end_ts = datetime.combine(end_date, datetime.max.time().replace(microsecond=0))
+            q = _anim_hourly_query(db, start_ts, end_ts, _HOURLY_METRIC_COL[metric], use_districts)
+            for ts, hour_rows in groupby(q.yield_per(STREAM_BATCH), key=attrgetter("timestamp")):
+                payload, seen = _hourly_frame(hour_rows, use_districts)
+                rng.extend(seen)
+                if not payload:
+                    continue
+                total += 1
+                yield {"type": "frame", "ts": ts.strftime("%Y-%m-%dT%H:%M"), field: payload}
+
+    yield {
+        "type": "end",
+        "total_frames": total,
+        "metric_min": round(rng.lo, 3) if rng.lo is not None else 0.0,
+        "metric_max": round(rng.hi, 3) if rng.hi is not None else 1.0,
+    }
+
+
 @router.get("/animation")
 def get_animation_frames(
     start: str = Query(..., description="Başlangıç tarihi (YYYY-MM-DD)"),
@@ -941,6 +1182,9 @@ def get_animation_frames(
             "eski IDW heatmap path için (deprecated, geri uyum)."
         ),
     ),
+    stream: bool = Query(False, description="NDJSON akış modu (frame başına bir satır)"),
+    response: Response = None,
+    accept: Optional[str] = Header(default=None),
 ):
     """
     Hava durumu animasyonu için frame verisi döndürür.
@@ -968,6 +1212,16 @@ def get_animation_frames(
     .. code-block:: json
 
         {"frames": [{"ts": "...", "pts": [[lat, lon, val, name], ...]}]}
+
+    **İkili format** (`format=districts` + `Accept: application/vnd.srrp.frames`):
+    ilçe anahtarları bir kez, her frame uint16-kuantalanmış dizi; opsiyonel
+    delta + zlib/zstd. Tel formatı: `app/services/frame_codec.py`. Accept
+    eşleşmezse JSON döner (fallback).
+
+    **Akış modu** (`?stream=true` veya `Accept: application/x-ndjson`):
+    frame'ler üretildikçe NDJSON satırı olarak gönderilir (meta → frame… →
+    end{total_frames, metric_min, metric_max}). Protokol:
+    `app/services/ndjson_stream.py`. Cache atlanır.
     """
     # --- Parametre doğrulama ---
     if metric not in ("wind", "temperature", "radiation"):
@@ -986,214 +1240,158 @@ def get_animation_frames(
 
     use_districts = format == "districts"
 
-    # 1.D: Daily mode için Redis cache (TTL 30 dk).
-    # Hourly mode'da payload 50K+ satır ve veri tazeliği kritik — cache atlanır.
-    # `:v6` suffix — daily ilçe-bazlı payload (2026-06-10; v5 il-bazlı yayım).
-    cache_key = (
-        f"weather:animation:v6:{start}:{end}:{metric}:{interval}:{format}"
-        if interval == "daily" else None
-    )
-    if cache_key:
-        cached = cache_get(cache_key)
-        if cached is not None:
-            return cached
-
-    db = SystemSessionLocal()
-    try:
-        if interval == "daily":
-            # Frame sınırı kontrolü
-            day_diff = (end_date - start_date).days + 1
-            if day_diff > _DAILY_MAX_FRAMES:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Günlük modda maksimum {_DAILY_MAX_FRAMES} gün seçilebilir"
-                )
-
-            metric_col = _DAILY_METRIC_COL[metric]
-            frames_vals = defaultdict(dict)   # ts → {"İl|İlçe": val}
-            frames_pts = defaultdict(list)    # ts → [[lat, lon, val, name]]
-            all_vals = []
-
-            if use_districts:
-                # 2026-06-10 (daily ilçe fix): Backfill sonrası `weather_data`
-                # ARTIK ilçe-bazlı satırlar içeriyor (`district_name` dolu, ~975
-                # GADM ilçesi). Eski kod il AVG'ini tüm ilçelere AYNI değerle
-                # yayıyordu → harita il-bazlı tek renk görünüyordu (kullanıcı:
-                # "günlük modda il olarak gösteriyor, ilçe olarak değil").
-                # Yeni: (date, province, district) bazlı AVG → gerçek ilçe değeri.
-                # İlçe satırı olmayan / GADM eşleşmeyen iller için il-ortalaması
-                # fallback ile tüm GADM ilçeleri doldurulur (renk boşluğu olmasın).
-                from app.services.gadm_lookup import (
-                    resolve_province as _gadm_resolve_province,
-                    resolve_district as _gadm_resolve_district,
-                    get_districts as _gadm_get_districts,
-                )
-                rows = db.query(
-                    WeatherData.date.label("date"),
-                    WeatherData.province_name.label("province_name"),
-                    WeatherData.district_name.label("district_name"),
-                    func.avg(metric_col).label("val"),
-                ).filter(
-                    WeatherData.date >= start_date,
-                    WeatherData.date <= end_date,
-                    metric_col.isnot(None),
-                    WeatherData.province_name.isnot(None),
-                ).group_by(
-                    WeatherData.date,
-                    WeatherData.province_name,
-                    WeatherData.district_name,
-                ).order_by(WeatherData.date).all()
-
-                # ts → gadm_prov → [değerler] (il-ortalaması fallback için)
-                prov_fallback = defaultdict(lambda: defaultdict(list))
-                for row in rows:
-                    v = round(float(row.val), 3)
-                    ts_key = row.date.isoformat()
-                    gadm_prov = _gadm_resolve_province(row.province_name) or row.province_name
-                    if row.district_name and row.district_name != "Merkez":
-                        gadm_dist = _gadm_resolve_district(gadm_prov, row.district_name)
-                        if gadm_prov and gadm_dist:
-                            frames_vals[ts_key][f"{gadm_prov}|{gadm_dist}"] = v
-                            all_vals.append(v)
-                    # GADM eşleşse de eşleşmese de fallback havuzuna kat
-                    prov_fallback[ts_key][gadm_prov].append(v)
-
-                # Veri/eşleşme olmayan GADM ilçelerini il-ortalaması ile doldur
-                for ts_key, provs in prov_fallback.items():
-                    for gadm_prov, vals in provs.items():
-                        if not vals:
-                            continue
-                        fb = round(sum(vals) / len(vals), 3)
-                        for d in _gadm_get_districts(gadm_prov):
-                            key = f"{gadm_prov}|{d}"
-                            if key not in frames_vals[ts_key]:
-                                frames_vals[ts_key][key] = fb
-                                all_vals.append(fb)
-            else:
-                # Legacy points format — il × tarih AVG (display amaçlı, lat/lon 0)
-                rows = db.query(
-                    WeatherData.date.label("date"),
-                    WeatherData.province_name.label("province_name"),
-                    func.avg(metric_col).label("val"),
-                ).filter(
-                    WeatherData.date >= start_date,
-                    WeatherData.date <= end_date,
-                    metric_col.isnot(None),
-                    WeatherData.province_name.isnot(None),
-                ).group_by(
-                    WeatherData.date, WeatherData.province_name,
-                ).order_by(WeatherData.date).all()
-                for row in rows:
-                    v = round(float(row.val), 3)
-                    ts_key = row.date.isoformat()
-                    frames_pts[ts_key].append([0.0, 0.0, v, row.province_name or ""])
-                    all_vals.append(v)
-
-        else:  # hourly
-            # Saatlik mod için gün sınırı kontrolü
-            day_diff = (end_date - start_date).days + 1
-            max_hourly_days = _HOURLY_MAX_FRAMES // 24  # 30 gün
-            if day_diff > max_hourly_days:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Saatlik modda maksimum {max_hourly_days} gün seçilebilir"
-                )
+    # Frame sınırı kontrolü (akış başlamadan — sonra HTTP durumu değişmez)
+    day_diff = (end_date - start_date).days + 1
+    if interval == "daily" and day_diff > _DAILY_MAX_FRAMES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Günlük modda maksimum {_DAILY_MAX_FRAMES} gün seçilebilir"
+        )
+    max_hourly_days = _HOURLY_MAX_FRAMES // 24  # 30 gün
+    if interval == "hourly" and day_diff > max_hourly_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Saatlik modda maksimum {max_hourly_days} gün seçilebilir"
+        )
 
-            start_ts = datetime.combine(start_date, datetime.min.time())
-            end_ts = datetime.combine(end_date, datetime.max.time().replace(microsecond=0))
+    if wants_ndjson(accept, stream):
+        return ndjson_response(
+            _stream_animation(start_date, end_date, metric, interval, use_districts)
+        )
 
-            metric_col = _HOURLY_METRIC_COL[metric]
+    binary_opts = negotiate_frames(accept) if use_districts else None
+    if response is not None:
+        response.headers["Vary"] = "Accept"
 
-            base_query = db.query(
-                HourlyWeatherData.latitude,
-                HourlyWeatherData.longitude,
-                HourlyWeatherData.timestamp,
-                HourlyWeatherData.city_name,
-                HourlyWeatherData.district_name,
-                metric_col.label("val"),
-            ).filter(
-                HourlyWeatherData.timestamp >= start_ts,
-                HourlyWeatherData.timestamp <= end_ts,
-                metric_col.isnot(None),
+    def _districts_response(grid: FrameGrid, metric_min: float, metric_max: float):
+        meta = {
+            "metric": metric,
+            "interval": interval,
+            "format": "districts",
+            "total_frames": len(grid.ts),
+            "metric_min": metric_min,
+            "metric_max": metric_max,
+        }
+        if binary_opts is not None:
+            return Response(
+                content=encode_frames(grid, meta, **binary_opts),
+                media_type=FRAMES_MEDIA_TYPE,
+                headers={"Vary": "Accept"},
             )
-            if use_districts:
-                base_query = base_query.filter(
-                    HourlyWeatherData.city_name.isnot(None),
-                    HourlyWeatherData.district_name.isnot(None),
-                )
-            else:
-                base_query = base_query.filter(
-                    or_(
-                        HourlyWeatherData.district_name.is_(None),
-                        HourlyWeatherData.district_name == "Merkez",
-                    )
-                )
-            rows = base_query.order_by(HourlyWeatherData.timestamp).all()
+        return {**meta, "frames": grid.to_json_frames()}
 
-            frames_vals = defaultdict(dict)
-            frames_pts = defaultdict(list)
+    # 1.D: Daily mode için Redis cache — anahtar günlük veri sürümünü taşır,
+    # grid güncellemesi yeni gün yazana kadar geçerli (data_versions.DAILY).
+    # Hourly mode'da payload 50K+ satır ve veri tazeliği kritik — cache atlanır.
+    # `:v6` suffix — daily ilçe-bazlı payload (2026-06-10; v5 il-bazlı yayım).
+    # `:v7` — districts formatı frame ızgarası olarak cache'lenir (JSON ve
+    # ikili yanıt aynı girdiden üretilir).
+    if interval != "daily":
+        cache_key = None
+    elif use_districts:
+        cache_key = versioned_key(
+            f"weather:animation:v7:grid:{start}:{end}:{metric}:{interval}",
+            data_versions.DAILY)
+    else:
+        cache_key = versioned_key(
+            f"weather:animation:v6:{start}:{end}:{metric}:{interval}:{format}",
+            data_versions.DAILY)
+
+    def _build(cacheable: bool) -> dict:
+        db = SystemSessionLocal()
+        try:
+            grid = FrameGrid()                # ts × "İl|İlçe" → val
+            frames_pts = defaultdict(list)    # ts → [[lat, lon, val, name]]
             all_vals = []
-            # 1.A2.c-fix4: GADM-driven key çevrimi (hourly).
-            # DB'den gelen ham (city_name, district_name) GADM kanonik
-            # adlara çevrilir → frontend MapLibre polygon source ile birebir.
-            # Match olmayan satır atlanır (ör. DB'de var ama GADM'de yok).
-            from app.services.gadm_lookup import (
-                resolve_province as _gadm_resolve_province,
-                resolve_district as _gadm_resolve_district,
-            )
-            for row in rows:
-                v = round(float(row.val), 3)
-                ts_key = row.timestamp.strftime("%Y-%m-%dT%H:%M")
+
+            if interval == "daily":
+                metric_col = _DAILY_METRIC_COL[metric]
                 if use_districts:
-                    gadm_prov = _gadm_resolve_province(row.city_name)
-                    gadm_dist = _gadm_resolve_district(gadm_prov, row.district_name) if gadm_prov else None
-                    if gadm_prov and gadm_dist:
-                        key = f"{gadm_prov}|{gadm_dist}"
-                        frames_vals[ts_key][key] = v
-                    # else: GADM'de karşılığı yok — sessizce atla
-                    #       (ör. DB'de "Merkez" ama GADM'de yok)
+                    rows = _anim_daily_district_query(db, start_date, end_date, metric_col).all()
+                    for d, day_rows in groupby(rows, key=attrgetter("date")):
+                        ts_key = d.isoformat()
+                        vals, contributed = _daily_district_frame(day_rows)
+                        grid.row(ts_key)
+                        for key, v in vals.items():
+                            grid.set(ts_key, key, v)
+                        all_vals.extend(contributed)
                 else:
-                    frames_pts[ts_key].append([
-                        round(row.latitude, 4),
-                        round(row.longitude, 4),
-                        v,
-                        row.city_name or "",
-                    ])
-                all_vals.append(v)
-
-        # Frame listesini sırala + payload'a çevir
-        if use_districts:
-            frames = [
-                {"ts": ts, "vals": vals}
-                for ts, vals in sorted(frames_vals.items())
-            ]
-        else:
+                    # Legacy points format — il × tarih AVG (display amaçlı, lat/lon 0)
+                    rows = _anim_daily_points_query(db, start_date, end_date, metric_col).all()
+                    for row in rows:
+                        v = round(float(row.val), 3)
+                        ts_key = row.date.isoformat()
+                        frames_pts[ts_key].append([0.0, 0.0, v, row.province_name or ""])
+                        all_vals.append(v)
+
+            else:  # hourly
+                start_ts = datetime.combine(start_date, datetime.min.time())
+                end_ts = datetime.combine(end_date, datetime.max.time().replace(microsecond=0))
+                metric_col = _HOURLY_METRIC_COL[metric]
+                rows = _anim_hourly_query(db, start_ts, end_ts, metric_col, use_districts).all()
+                for ts, hour_rows in groupby(rows, key=attrgetter("timestamp")):
+                    ts_key = ts.strftime("%Y-%m-%dT%H:%M")
+                    payload, seen = _hourly_frame(hour_rows, use_districts)
+                    if use_districts:
+                        for key, v in payload.items():
+                            grid.set(ts_key, key, v)
+                    elif payload:
+                        frames_pts[ts_key].extend(payload)
+                    all_vals.extend(seen)
+
+            # Global min/max (frontend tarafında normalize için)
+            metric_min = round(min(all_vals), 3) if all_vals else 0.0
+            metric_max = round(max(all_vals), 3) if all_vals else 1.0
+
+            if use_districts:
+                grid.finalize()
+                return {
+                    "grid": grid.to_cacheable() if cacheable else grid,
+                    "metric_min": metric_min,
+                    "metric_max": metric_max,
+                }
+
+            # Frame listesini sırala + payload'a çevir (legacy points)
             frames = [
                 {"ts": ts, "pts": pts}
                 for ts, pts in sorted(frames_pts.items())
             ]
 
-        # Global min/max (frontend tarafında normalize için)
-        metric_min = round(min(all_vals), 3) if all_vals else 0.0
-        metric_max = round(max(all_vals), 3) if all_vals else 1.0
-
-        payload = {
-            "metric": metric,
-            "interval": interval,
-            "format": "districts" if use_districts else "points",
-            "total_frames": len(frames),
-            "metric_min": metric_min,
-            "metric_max": metric_max,
-            "frames": frames,
-        }
+            payload = {
+                "metric": metric,
+                "interval": interval,
+                "format": "points",
+                "total_frames": len(frames),
+                "metric_min": metric_min,
+                "metric_max": metric_max,
+                "frames": frames,
+            }
 
-        if cache_key:
-            cache_set(cache_key, payload, ttl_seconds=1800)
+            return payload
 
-        return payload
+        finally:
+            db.close()
 
-    finally:
-        db.close()
+    # Eşzamanlı aynı istekler tek hesapta birleşir; süre dolunca bayat
+    # yanıt sunulurken tek bir işçi yeniler (get_or_compute)
+    if cache_key and not use_districts:
+        # Legacy points: cache'teki JSON çözülmeden gönderilir
+        return Response(
+            content=get_or_compute(cache_key, lambda: _build(cacheable=True),
+                                   ttl_seconds=data_versions.VERSIONED_TTL, raw=True),
+            media_type="application/json",
+        )
+    if cache_key:
+        data = get_or_compute(cache_key, lambda: _build(cacheable=True),
+                              ttl_seconds=data_versions.VERSIONED_TTL)
+    else:
+        data = _build(cacheable=False)
+    if use_districts:
+        grid = data["grid"]
+        if not isinstance(grid, FrameGrid):
+            grid = FrameGrid.from_cacheable(grid)
+        return _districts_response(grid, data["metric_min"], data["metric_max"])
+    return data
 
 
 @router.post("/refresh")
@@ -1203,7 +1401,12 @@ async def refresh_hourly_data():
         from ..hourly_collector import update_hourly_data
         import asyncio
 
-        await asyncio.to_thread(update_hourly_data)
+        from app.services.scheduler import publish_hourly_update
+
+        refresh_from = await asyncio.to_thread(update_hourly_data)
+        if refresh_from is not None:
+            # Scheduler ile aynı sıra: paket + rollup + indeks, sonra sürüm
+            await asyncio.to_thread(publish_hourly_update, refresh_from)
 
         return {"status": "success", "message": "Saatlik veriler güncellendi"}
     except Exception as e:
@@ -1223,7 +1426,7 @@ def get_available_years():
     Saatlik veri tablosunda kayıtlı yılları döndürür.
     Flutter zaman aralığı seçicisi bu listeyi kullanarak dinamik yıl dropdown'u oluşturur.
     """
-    cache_key = "weather:available-years"
+    cache_key = versioned_key("weather:available-years", data_versions.HOURLY)
     cached = cache_get(cache_key)
     if cached is not None:
         return cached
@@ -1265,7 +1468,8 @@ def get_monthly_trend(
 
     # ASCII normalize: "İstanbul" → "istanbul" (U+0130 vs ASCII I farkını giderir)
     city_ascii = _ascii_normalize(city)
-    cache_key = f"weather:monthly-trend:{city_ascii}:{metric}:{year}:{month}"
+    cache_key = versioned_key(f"weather:monthly-trend:{city_ascii}:{metric}:{year}:{month}",
+                              data_versions.HOURLY)
     cached = cache_get(cache_key)
     if cached is not None:
         return [TrendPoint(**p) for p in cached]
@@ -1370,7 +1574,8 @@ def get_province_summary_range(
     if start_dt > end_dt:
         raise HTTPException(status_code=400, detail="start tarihi end'den büyük olamaz")
 
-    cache_key = f"weather:province-summary-range:{start}:{end}"
+    cache_key = versioned_key(f"weather:province-summary-range:{start}:{end}",
+                              data_versions.HOURLY)
     cached = cache_get(cache_key)
     if cached is not None:
         return [ProvinceSummary(**item) for item in cached]
@@ -1530,6 +1735,13 @@ _MERKEZ_SPLIT: dict[str, list[str]] = {
 }
 
 
+# Rollup okuma yolunda ham sorgu satırıyla aynı attribute'lar
+_ChoroplethRow = namedtuple(
+    "_ChoroplethRow",
+    ["city_name", "district_name", "avg_wind", "avg_radiation", "avg_temp"],
+)
+
+
 @router.get("/district-choropleth")
 def get_district_choropleth(
     hours: int = Query(
@@ -1576,11 +1788,27 @@ def get_district_choropleth(
                    "(winter|spring|summer|autumn).",
         )
 
-    cache_key = f"weather:district-choropleth:{hours}:{effective_mode}:{season or '-'}"
-    cached = cache_get(cache_key)
-    if cached is not None:
-        return cached
+    # Anahtar saatlik veri sürümünü taşır — çekim yeni satır yazınca "current"
+    # modu TTL'i beklemeden yenilenir. Tek hesap + bayat sunum
+    # (get_or_compute); boş sonuç (veri yok) 60 sn.
+    cache_key = versioned_key(
+        f"weather:district-choropleth:{hours}:{effective_mode}:{season or '-'}",
+        data_versions.HOURLY)
+    # ~1 MB'lık yanıt cache'ten JSON bayt olarak çözülmeden gönderilir.
+    return Response(
+        content=get_or_compute(
+            cache_key,
+            lambda: _district_choropleth_payload(hours, mode, effective_mode, season),
+            ttl_seconds=lambda result: 900 if result else 60,
+            raw=True,
+        ),
+        media_type="application/json",
+    )
+
 
+def _district_choropleth_payload(hours: int, mode: str, effective_mode: str,
+                                 season: str | None) -> dict:
+    """``/district-choropleth`` yanıtını DB'den hesapla (cache'siz)."""
     db = SystemSessionLocal()
     try:
         if effective_mode == "latest":
@@ -1628,7 +1856,6 @@ def get_district_choropleth(
             )
 
             if not rows:
-                cache_set(cache_key, {}, ttl_seconds=60)
                 return {}
 
             # Meta için: tüm ilçeler arasında en eski ve en yeni saat
@@ -1692,71 +1919,91 @@ def get_district_choropleth(
 
             tw = resolve_time_window(effective_mode, season)
 
-            # Ortak WHERE filtresi: tarih aralığı + ilçe doğrulaması + opsiyonel
-            # mevsim ay filtresi (DJF/MAM/JJA/SON)
-            base_filters = [
-                HourlyWeatherData.timestamp >= tw.start,
-                HourlyWeatherData.timestamp <= tw.end,
-                HourlyWeatherData.district_name.isnot(None),
-            ]
-            if tw.months:
-                base_filters.append(
-                    extract("month", HourlyWeatherData.timestamp).in_(tw.months)
-                )
+            # Önce günlük/aylık rollup: pencere ham saatler yerine birkaç bin
+            # rollup satırından okunur (tam aylar aylık, kenarlar günlük).
+            # Rollup henüz kurulmadıysa ({} döner) ham sorguya düşülür.
+            from app.services.weather_rollup_service import window_aggregates
+
+            rollup = window_aggregates(db, tw.start, tw.end, tw.months)
+            if rollup:
+                rows = []
+                _solar_lookup: dict[str, float] = {}
+                for (c, d), mvals in rollup.items():
+                    rows.append(_ChoroplethRow(
+                        c, d,
+                        (mvals.get("wind") or {}).get("avg"),
+                        (mvals.get("solar") or {}).get("avg"),
+                        (mvals.get("temp") or {}).get("avg"),
+                    ))
+                    peak = (mvals.get("solar") or {}).get("peak_avg")
+                    if c and d and peak and peak > 0:
+                        _solar_lookup[f"{c}|{d}"] = float(peak)
+            else:
+                # Ortak WHERE filtresi: tarih aralığı + ilçe doğrulaması + opsiyonel
+                # mevsim ay filtresi (DJF/MAM/JJA/SON)
+                base_filters = [
+                    HourlyWeatherData.timestamp >= tw.start,
+                    HourlyWeatherData.timestamp <= tw.end,
+                    HourlyWeatherData.district_name.isnot(None),
+                ]
+                if tw.months:
+                    base_filters.append(
+                        extract("month", HourlyWeatherData.timestamp).in_(tw.months)
+                    )
 
-            # Wind + Temp: saatlik ortalama
-            rows = (
-                db.query(
-                    HourlyWeatherData.city_name,
-                    HourlyWeatherData.district_name,
-                    func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
-                    # avg_radiation bu modda ignore edilir — solar lookup'tan gelir
-                    func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
-                    func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
-                )
-                .filter(*base_filters)
-                .group_by(
-                    HourlyWeatherData.city_name,
-                    HourlyWeatherData.district_name,
+                # Wind + Temp: saatlik ortalama
+                rows = (
+                    db.query(
+                        HourlyWeatherData.city_name,
+                        HourlyWeatherData.district_name,
+                        func.avg(HourlyWeatherData.wind_speed_100m).label("avg_wind"),
+                        # avg_radiation bu modda ignore edilir — solar lookup'tan gelir
+                        func.avg(HourlyWeatherData.shortwave_radiation).label("avg_radiation"),
+                        func.avg(HourlyWeatherData.temperature_2m).label("avg_temp"),
+                    )
+                    .filter(*base_filters)
+                    .group_by(
+                        HourlyWeatherData.city_name,
+                        HourlyWeatherData.district_name,
+                    )
+                    .all()
                 )
-                .all()
-            )
 
-            # Solar: günlük peak → bu peak'lerin ortalaması.
-            # 1) Subquery: city/district/date için MAX(radiation)
-            # 2) Outer: AVG(daily_peak)
-            daily_peak_sq = (
-                db.query(
-                    HourlyWeatherData.city_name.label("c"),
-                    HourlyWeatherData.district_name.label("d"),
-                    func.date(HourlyWeatherData.timestamp).label("day"),
-                    func.max(HourlyWeatherData.shortwave_radiation).label("peak"),
-                )
-                .filter(
-                    *base_filters,
-                    HourlyWeatherData.shortwave_radiation.isnot(None),
-                    HourlyWeatherData.shortwave_radiation > 0,
-                )
-                .group_by(
-                    HourlyWeatherData.city_name,
-                    HourlyWeatherData.district_name,
-                    func.date(HourlyWeatherData.timestamp),
+                # Solar: günlük peak → bu peak'lerin ortalaması.
+                # 1) Subquery: city/district/date için MAX(radiation)
+                # 2) Outer: AVG(daily_peak)
+                daily_peak_sq = (
+                    db.query(
+                        HourlyWeatherData.city_name.label("c"),
+                        HourlyWeatherData.district_name.label("d"),
+                        func.date(HourlyWeatherData.timestamp).label("day"),
+                        func.max(HourlyWeatherData.shortwave_radiation).label("peak"),
+                    )
+                    .filter(
+                        *base_filters,
+                        HourlyWeatherData.shortwave_radiation.isnot(None),
+                        HourlyWeatherData.shortwave_radiation > 0,
+                    )
+                    .group_by(
+                        HourlyWeatherData.city_name,
+                        HourlyWeatherData.district_name,
+                        func.date(HourlyWeatherData.timestamp),
+                    )
+                    .subquery()
                 )
-                .subquery()
-            )
-            solar_rows = (
-                db.query(
-                    daily_peak_sq.c.c,
-                    daily_peak_sq.c.d,
-                    func.avg(daily_peak_sq.c.peak).label("avg_peak"),
+                solar_rows = (
+                    db.query(
+                        daily_peak_sq.c.c,
+                        daily_peak_sq.c.d,
+                        func.avg(daily_peak_sq.c.peak).label("avg_peak"),
+                    )
+                    .group_by(daily_peak_sq.c.c, daily_peak_sq.c.d)
+                    .all()
                 )
-                .group_by(daily_peak_sq.c.c, daily_peak_sq.c.d)
-                .all()
-            )
-            _solar_lookup: dict[str, float] = {}
-            for sr in solar_rows:
-                if sr.c and sr.d and sr.avg_peak and sr.avg_peak > 0:
-                    _solar_lookup[f"{sr.c}|{sr.d}"] = float(sr.avg_peak)
+                _solar_lookup: dict[str, float] = {}
+                for sr in solar_rows:
+                    if sr.c and sr.d and sr.avg_peak and sr.avg_peak > 0:
+                        _solar_lookup[f"{sr.c}|{sr.d}"] = float(sr.avg_peak)
 
             # Meta için solar timestamp yok → null kalır
             global_max_ts = tw.end
@@ -1894,7 +2141,6 @@ def get_district_choropleth(
             meta["data_to"] = datetime.now().isoformat()
 
         result["_meta"] = meta
-        cache_set(cache_key, result, ttl_seconds=900)
         return result
     finally:
         db.close()
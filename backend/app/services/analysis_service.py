@@ -171,15 +171,38 @@ def _weighted(values_counts: List[tuple[float, int]]) -> Optional[float]:
     return (num / den) if den > 0 else None
 
 
-def _aggregate_window(db: Session, cutoff: datetime) -> Dict[str, ProvinceWindowAgg]:
-    """
-    HourlyWeatherData'yı city_name bazında aggregate eder (SQL),
-    sonra TURKEY_CITIES mapping'i ile province bazına katlar (Python).
+def _aggregate_window_rollup(db: Session, cutoff: datetime, end: datetime) -> List[Dict]:
+    """`hourly_weather_rollup`'tan city_name bazında pencere ortalamaları.
 
-    Precipitation: hour başına mm → günlük ortalamaya (mm/gün) dönüştürür.
+    Rollup henüz kurulmadıysa boş liste → çağıran ham tabloya düşer.
     """
-    pm = _build_province_map()
+    from .weather_rollup_service import window_aggregates
 
+    agg = window_aggregates(
+        db, cutoff, end, scope="province",
+        metrics=("wind", "solar", "temp", "precip"),
+    )
+    records: List[Dict] = []
+    for (city, _), mvals in agg.items():
+        def _avg(metric: str) -> Optional[float]:
+            return (mvals.get(metric) or {}).get("avg")
+        records.append({
+            "city": city,
+            "avg_wind": _avg("wind"),
+            "avg_solar": _avg("solar"),
+            "avg_temp": _avg("temp"),
+            "avg_precip_hourly_mm": _avg("precip"),
+            "sample_n": max((v["n"] for v in mvals.values()), default=0),
+        })
+    return records
+
+
+def _aggregate_window_raw(db: Session, cutoff: datetime, end: datetime) -> List:
+    """Ham `hourly_weather_data` üzerinde city_name GROUP BY (rollup fallback).
+
+    ``end``'de kesilir — tabloda duran tahmin (forecast) saatleri rollup'a
+    girmediği gibi buraya da girmez; iki yol aynı pencereyi okur.
+    """
     # NOT: SQLAlchemy 2.0.19+ Row objesinde tek-harf label'lar (`.t`, `.w` gibi) Row
     # dahili method'larıyla çakışabiliyor (SADeprecationWarning + yanlış tip dönüşü).
     # `._mapping[...]` ile erişim bu çakışmadan bağımsız ve sürüm-güvenli.
@@ -192,17 +215,35 @@ def _aggregate_window(db: Session, cutoff: datetime) -> Dict[str, ProvinceWindow
             func.avg(HourlyWeatherData.precipitation).label("avg_precip_hourly_mm"),
             func.count(HourlyWeatherData.id).label("sample_n"),
         )
-        .filter(HourlyWeatherData.timestamp >= cutoff)
+        .filter(HourlyWeatherData.timestamp >= cutoff,
+                HourlyWeatherData.timestamp <= end)
         .group_by(HourlyWeatherData.city_name)
         .all()
     )
+    return [r._mapping for r in rows]
+
+
+def _aggregate_window(db: Session, cutoff: datetime) -> Dict[str, ProvinceWindowAgg]:
+    """
+    Saatlik veriyi city_name bazında aggregate eder (rollup veya ham SQL),
+    sonra TURKEY_CITIES mapping'i ile province bazına katlar (Python).
+
+    Precipitation: hour başına mm → günlük ortalamaya (mm/gün) dönüştürür.
+    """
+    pm = _build_province_map()
+
+    # Önce günlük/aylık rollup (birkaç bin satır); kurulmamışsa ham tablo.
+    # Pencere sonu ikisi için de "şimdi" (forecast saatleri hariç).
+    end = datetime.utcnow()
+    records = _aggregate_window_rollup(db, cutoff, end)
+    if not records:
+        records = _aggregate_window_raw(db, cutoff, end)
 
     # province bazında buckets
     buckets: Dict[str, Dict[str, List[tuple]]] = defaultdict(
         lambda: {"w": [], "s": [], "t": [], "p": [], "n": 0}
     )
-    for r in rows:
-        m = r._mapping  # sürüm-güvenli label erişimi
+    for m in records:
         prov = pm.city_to_province.get(m["city"])
         if prov is None:
             continue
@@ -0,0 +1,203 @@
+"""
+SRRP — Redis Cache Değer Kodlayıcı (serileştirme + sıkıştırma)
+==============================================================
+
+``cache_set`` / ``cache_get`` her çağrıda stdlib ``json.dumps`` / ``json.loads``
+yapıyordu; animasyon frame'leri ve ilçe choropleth'i gibi çok MB'lık
+yanıtlarda bu, Redis gidiş-dönüşünden pahalıydı.
+
+Tel formatı (Redis değeri):
+
+.. code-block:: text
+
+    fmt:u8 | [fresh_until:f64 LE — FLAG_META varsa] | payload
+
+    fmt bit7   = 1 (çerçeveli kayıt; eski kayıtlar düz JSON → ilk bayt < 0x80)
+        bit4-6 = serileştirici   (0 = JSON/UTF-8, 1 = msgpack)
+        bit3   = FLAG_META       (get_or_compute tazelik zamanı başlıkta)
+        bit0-2 = sıkıştırma      (0 = yok, 1 = zlib, 2 = zstd, 3 = lz4)
+
+* JSON ``orjson`` ile (kuruluysa; yoksa stdlib) — düz JSON kalır, böylece
+  ``decode_json_bytes`` değeri hiç çözmeden (yalnızca açarak) HTTP yanıtına
+  verebilir (``get_or_compute(..., raw=True)``).
+* ``SRRP_CACHE_SERIALIZER=msgpack`` (``msgpack`` kuruluysa) daha küçük ve
+  hızlı; ham JSON geçişinde bir kez JSON'a çevrilir.
+* ``SRRP_CACHE_COMPRESS_MIN`` baytın (varsayılan 16 KB) üstündeki gövdeler
+  sıkıştırılır: ``SRRP_CACHE_COMPRESSION=auto`` → zstd > lz4 > zlib(1).
+* Eski düz JSON kayıtlar okunmaya devam eder (başlık baytıyla ayırt edilir).
+"""
+from __future__ import annotations
+
+import json
+import os
+import struct
+import zlib
+from typing import Any, Optional, Tuple
+
+try:
+    import orjson as _orjson  # type: ignore
+    _ORJSON_OK = True
+except ImportError:  # pragma: no cover
+    _orjson = None
+    _ORJSON_OK = False
+
+try:
+    import msgpack as _msgpack  # type: ignore
+    _MSGPACK_OK = True
+except ImportError:
+    _msgpack = None
+    _MSGPACK_OK = False
+
+try:
+    import zstandard as _zstd  # type: ignore
+    _ZSTD_OK = True
+except ImportError:
+    _zstd = None
+    _ZSTD_OK = False
+
+try:
+    import lz4.frame as _lz4  # type: ignore
+    _LZ4_OK = True
+except ImportError:
+    _lz4 = None
+    _LZ4_OK = False
+
+FRAMED = 0x80
+FLAG_META = 0x08
+SER_JSON, SER_MSGPACK = 0, 1
+COMP_NONE, COMP_ZLIB, COMP_ZSTD, COMP_LZ4 = 0, 1, 2, 3
+_COMP_NAMES = {"none": COMP_NONE, "zlib": COMP_ZLIB, "zstd": COMP_ZSTD, "lz4": COMP_LZ4}
+
+_F64 = struct.Struct("<d")
+
+COMPRESS_MIN = int(os.environ.get("SRRP_CACHE_COMPRESS_MIN", 16 * 1024))
+_SERIALIZER = (SER_MSGPACK if os.environ.get("SRRP_CACHE_SERIALIZER", "json") == "msgpack"
+               and _MSGPACK_OK else SER_JSON)
+
+
+def _pick_compression(name: str) -> int:
+    if name == "auto":
+        return COMP_ZSTD if _ZSTD_OK else COMP_LZ4 if _LZ4_OK else COMP_ZLIB
+    comp = _COMP_NAMES.get(name, COMP_ZLIB)
+    if (comp == COMP_ZSTD and not _ZSTD_OK) or (comp == COMP_LZ4 and not _LZ4_OK):
+        return COMP_ZLIB
+    return comp
+
+
+_COMPRESSION = _pick_compression(os.environ.get("SRRP_CACHE_COMPRESSION", "auto"))
+
+
+# ─── JSON ───────────────────────────────────────────────────────────────────
+
+def dumps_json(value: Any) -> bytes:
+    """Değer → UTF-8 JSON. Bilinmeyen tipler ``str`` (eski ``default=str``).
+
+    orjson datetime'ı kendisi ISO ("T" ayraçlı) yazar; ``OPT_PASSTHROUGH_DATETIME``
+    ile ``default=str``'e bırakılır — metin stdlib yoluyla aynı kalır.
+    """
+    if _ORJSON_OK:
+        try:
+            return _orjson.dumps(
+                value, default=str,
+                option=(_orjson.OPT_NON_STR_KEYS | _orjson.OPT_SERIALIZE_NUMPY
+                        | _orjson.OPT_PASSTHROUGH_DATETIME),
+            )
+        except TypeError:
+            pass   # ör. 64 bit'i aşan int — stdlib dener
+    return json.dumps(value, default=str, ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def loads_json(data: bytes) -> Any:
+    return _orjson.loads(data) if _ORJSON_OK else json.loads(data)
+
+
+# ─── Sıkıştırma ─────────────────────────────────────────────────────────────
+
+def _compress(body: bytes, comp: int) -> bytes:
+    if comp == COMP_ZSTD:
+        return _zstd.ZstdCompressor(level=3).compress(body)
+    if comp == COMP_LZ4:
+        return _lz4.compress(body)
+    if comp == COMP_ZLIB:
+        return zlib.compress(body, 1)
+    return body
+
+
+def _decompress(body: bytes, comp: int) -> bytes:
+    if comp == COMP_NONE:
+        return body
+    if comp == COMP_ZLIB:
+        return zlib.decompress(body)
+    if comp == COMP_ZSTD:
+        if not _ZSTD_OK:
+            raise ValueError("zstd ile sıkıştırılmış cache kaydı — zstandard kurulu değil")
+        return _zstd.ZstdDecompressor().decompress(body)
+    if comp == COMP_LZ4:
+        if not _LZ4_OK:
+            raise ValueError("lz4 ile sıkıştırılmış cache kaydı — lz4 kurulu değil")
+        return _lz4.decompress(body)
+    raise ValueError(f"Bilinmeyen sıkıştırma kodu: {comp}")
+
+
+# ─── Çerçeve ────────────────────────────────────────────────────────────────
+
+def _frame(payload: bytes, serializer: int, fresh_until: Optional[float]) -> bytes:
+    comp = _COMPRESSION if len(payload) >= COMPRESS_MIN else COMP_NONE
+    fmt = FRAMED | (serializer << 4) | comp
+    meta = b""
+    if fresh_until is not None:
+        fmt |= FLAG_META
+        meta = _F64.pack(fresh_until)
+    return b"".join([bytes([fmt]), meta, _compress(payload, comp)])
+
+
+def encode(value: Any, fresh_until: Optional[float] = None) -> bytes:
+    """Değer → Redis'e yazılacak çerçeveli bayt dizisi."""
+    if _SERIALIZER == SER_MSGPACK:
+        payload = _msgpack.packb(value, default=str, use_bin_type=True)
+        return _frame(payload, SER_MSGPACK, fresh_until)
+    return _frame(dumps_json(value), SER_JSON, fresh_until)
+
+
+def encode_json_bytes(payload: bytes, fresh_until: Optional[float] = None) -> bytes:
+    """Hazır JSON gövdesini (yeniden serileştirmeden) çerçevele."""
+    return _frame(payload, SER_JSON, fresh_until)
+
+
+def _unframe(blob: bytes) -> Tuple[int, bytes, Optional[float]]:
+    fmt = blob[0]
+    pos = 1
+    fresh_until = None
+    if fmt & FLAG_META:
+        (fresh_until,) = _F64.unpack_from(blob, pos)
+        pos += _F64.size
+    return (fmt >> 4) & 0x07, _decompress(blob[pos:], fmt & 0x07), fresh_until
+
+
+def is_framed(blob: bytes) -> bool:
+    return bool(blob) and blob[0] & FRAMED == FRAMED
+
+
+def decode(blob: bytes) -> Tuple[Any, Optional[float]]:
+    """Redis değeri → (değer, fresh_until | None). Eski düz JSON da okunur."""
+    if not is_framed(blob):
+        return loads_json(blob), None
+    serializer, payload, fresh_until = _unframe(blob)
+    if serializer == SER_MSGPACK:
+        if not _MSGPACK_OK:
+            raise ValueError("msgpack ile kodlanmış cache kaydı — msgpack kurulu değil")
+        return _msgpack.unpackb(payload, raw=False, strict_map_key=False), fresh_until
+    return loads_json(payload), fresh_until
+
+
+def decode_json_bytes(blob: bytes) -> Tuple[bytes, Optional[float]]:
+    """Redis değeri → (JSON bayt, fresh_until | None) — JSON kayıtlarda
+    değer hiç çözülmez, HTTP yanıtına doğrudan verilebilir."""
+    if not is_framed(blob):
+        return blob, None
+    serializer, payload, fresh_until = _unframe(blob)
+    if serializer == SER_JSON:
+        return payload, fresh_until
+    value, _ = decode(blob)
+    return dumps_json(value), fresh_until
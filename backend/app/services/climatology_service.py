@@ -595,6 +595,8 @@ def compute_for_all_provinces(
     # il=100, en kötü=0 (adil sıralama).
     if save:
         normalize_scores_within_resource()
+        from . import data_versions
+        data_versions.bump(data_versions.CLIMATOLOGY)
 
     return results
 
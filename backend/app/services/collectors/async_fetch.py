@@ -0,0 +1,230 @@
+"""
+Open-Meteo async çekim hattı (aiohttp + uyarlamalı token bucket)
+===============================================================
+
+Saatlik toplayıcı 50'lik grupları senkron ``openmeteo_requests`` istemcisiyle
+sırayla çekiyor, her grup arasında sabit 3 sn uyuyor, DB yazımını da ağ
+isteğiyle aynı thread'de bekliyordu — ~1.000 lokasyonluk tam yenileme
+dakikalarca çoğunlukla boşta geçiyordu.
+
+``fetch_pipeline``:
+
+  * **Bağlantı havuzu** — tek ``aiohttp.ClientSession`` (keep-alive), en çok
+    ``concurrency`` eşzamanlı istek.
+  * **Uyarlamalı token bucket** — istekler ``rate`` (istek/sn) hızında,
+    ``burst`` kadar ani yükle çıkar. Her başarı hızı ``increase`` kadar
+    artırır (``max_rate``'e kadar); Open-Meteo rate limit hatası
+    (``is_rate_limit``) hızı yarıya indirir ve kova ``cooldown`` sn durur
+    (dakikalık kota dolunca beklemek gerekir). AIMD — kota sınırına
+    kendiliğinden oturur.
+  * **Hat (pipeline)** — çekilen yanıtlar sınırlı bir kuyruğa girer; tek
+    yazıcı thread'i (DB oturumu thread-safe değil) sırayla ``write`` çağırır.
+    Ağ ve DB işi örtüşür; kuyruk dolunca çekim yavaşlar (bellek sınırlı).
+
+Ayarlar: ``SRRP_OPENMETEO_RATE`` (başlangıç, varsayılan 1/3 istek/sn — eski
+3 sn aralıkla aynı), ``SRRP_OPENMETEO_MAX_RATE`` (1), ``SRRP_OPENMETEO_CONCURRENCY`` (4).
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence
+
+import aiohttp
+from openmeteo_requests import OpenMeteoRequestsError
+from openmeteo_sdk.WeatherApiResponse import WeatherApiResponse
+
+from .base import is_rate_limit
+
+logger = logging.getLogger(__name__)
+
+RATE = float(os.environ.get("SRRP_OPENMETEO_RATE", 1 / 3))
+MAX_RATE = float(os.environ.get("SRRP_OPENMETEO_MAX_RATE", 1.0))
+CONCURRENCY = int(os.environ.get("SRRP_OPENMETEO_CONCURRENCY", 4))
+
+RATE_LIMIT_COOLDOWN = 65.0    # sn — dakikalık kota sıfırlanana kadar
+ERROR_BACKOFF = 5.0           # sn — rate limit dışı hata sonrası
+MAX_RETRIES = 3
+REQUEST_TIMEOUT = 120.0       # sn — 92 günlük geçmiş çok lokasyonda uzun sürer
+
+
+class TokenBucket:
+    """Uyarlamalı (AIMD) token bucket — tek event loop içinde kilitsiz.
+
+    Sanal zamanlama (GCRA) ile uygulanır: ``_tat`` bir sonraki jetonun
+    teorik çıkış anıdır; ``burst`` jeton birikebilir.
+    """
+
+    def __init__(self, rate: float = RATE, burst: int = 1,
+                 max_rate: float = MAX_RATE, min_rate: float = 1 / 60,
+                 increase: float = 0.02, cooldown: float = RATE_LIMIT_COOLDOWN,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_rate = max(max_rate, rate)
+        self.min_rate = min_rate
+        self.increase = increase
+        self.cooldown = cooldown
+        self._clock = clock
+        self._tat = 0.0
+        self.paused_until = 0.0
+        self.rate_limited = 0
+
+    def reserve(self) -> float:
+        """Bir jeton ayır; kullanılabilmesi için beklenecek süreyi (sn) döndür."""
+        now = self._clock()
+        interval = 1.0 / self.rate
+        start = max(now, self.paused_until, self._tat - (self.burst - 1) * interval)
+        self._tat = max(self._tat, start) + interval
+        return start - now
+
+    async def acquire(self) -> None:
+        while True:
+            delay = self.reserve()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            # Bekleme sırasında rate limit geldiyse jeton geçersiz — yeniden sıraya gir
+            if self._clock() >= self.paused_until:
+                return
+
+    def on_success(self) -> None:
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_rate_limit(self) -> None:
+        now = self._clock()
+        self.rate_limited += 1
+        if now < self.paused_until:
+            return   # aynı kota aşımını gören eşzamanlı istekler hızı tekrar düşürmez
+        self.rate = max(self.min_rate, self.rate / 2)
+        self.paused_until = now + self.cooldown
+        self._tat = self.paused_until
+
+
+@dataclass
+class FetchJob:
+    """Tek API isteği; ``payload`` (ör. şehir listesi) yazıcıya aynen verilir."""
+    url: str
+    params: Mapping[str, Any]
+    payload: Any
+    label: str = ""
+
+
+def encode_params(params: Mapping[str, Any]) -> Dict[str, str]:
+    """Open-Meteo sorgu parametreleri — listeler virgülle birleştirilir."""
+    out = {}
+    for key, value in params.items():
+        if isinstance(value, (list, tuple)):
+            out[key] = ",".join(str(v) for v in value)
+        else:
+            out[key] = str(value)
+    out["format"] = "flatbuffers"
+    return out
+
+
+def decode_responses(data: bytes) -> List[WeatherApiResponse]:
+    """Uzunluk önekli FlatBuffers akışı → lokasyon başına yanıt
+    (``openmeteo_requests`` ile aynı çözüm; kopyasız)."""
+    messages = []
+    total = len(data)
+    pos = 0
+    while pos < total:
+        length = int.from_bytes(data[pos:pos + 4], byteorder="little")
+        if length == 0x78656E55:    # akış içi hata "Unexpected..." ile başlar
+            raise OpenMeteoRequestsError(data[pos:].decode("utf-8", "replace"))
+        messages.append(WeatherApiResponse.GetRootAs(data, pos + 4))
+        pos += length + 4
+    return messages
+
+
+async def _fetch_one(session: aiohttp.ClientSession, job: FetchJob) -> List[WeatherApiResponse]:
+    async with session.get(job.url, params=encode_params(job.params)) as resp:
+        body = await resp.read()
+        if resp.status in (400, 429):
+            raise OpenMeteoRequestsError(body.decode("utf-8", "replace"))
+        resp.raise_for_status()
+    return decode_responses(body)
+
+
+async def _fetch_with_retry(session: aiohttp.ClientSession, bucket: TokenBucket,
+                            job: FetchJob) -> Optional[List[WeatherApiResponse]]:
+    """Rate limit'te kova yavaşlar ve istek yeniden sıraya girer; diğer
+    hatalarda kısa bekleme. ``MAX_RETRIES`` sonunda None (iş atlanır)."""
+    for attempt in range(MAX_RETRIES):
+        await bucket.acquire()
+        try:
+            responses = await _fetch_one(session, job)
+        except Exception as exc:  # noqa: BLE001
+            if is_rate_limit(exc):
+                bucket.on_rate_limit()
+                logger.warning(
+                    "Rate limit — hız %.2f istek/sn, %.0f sn duraklama "
+                    "(deneme %d/%d) [%s]",
+                    bucket.rate, bucket.cooldown, attempt + 1, MAX_RETRIES, job.label,
+                )
+            else:
+                logger.error("Çekim hatası (deneme %d): %s [%s]", attempt + 1, exc, job.label)
+                if attempt < MAX_RETRIES - 1:
+                    await asyncio.sleep(ERROR_BACKOFF)
+            continue
+        bucket.on_success()
+        return responses
+    logger.error("İş atlandı: %s", job.label)
+    return None
+
+
+async def _run(jobs: Sequence[FetchJob], write: Callable[[list, Any], int],
+               bucket: TokenBucket, concurrency: int) -> int:
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+    slots = asyncio.Semaphore(concurrency)
+    loop = asyncio.get_running_loop()
+
+    async def produce(job: FetchJob) -> None:
+        async with slots:
+            responses = await _fetch_with_retry(session, bucket, job)
+            if responses is not None:
+                await queue.put((job, responses))
+
+    async def consume(executor: ThreadPoolExecutor) -> int:
+        total = 0
+        while True:
+            item = await queue.get()
+            if item is None:
+                return total
+            job, responses = item
+            try:
+                saved = await loop.run_in_executor(executor, write, responses, job.payload)
+            except Exception:  # noqa: BLE001
+                logger.exception("Yazım hatası, iş atlandı [%s]", job.label)
+                continue
+            total += saved
+            logger.info("  ✓ %s: %d saat kaydedildi", job.label, saved)
+
+    timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="openmeteo-writer") as executor:
+        async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+            writer = asyncio.create_task(consume(executor))
+            try:
+                await asyncio.gather(*(produce(job) for job in jobs))
+            finally:
+                await queue.put(None)
+            return await writer
+
+
+def fetch_pipeline(jobs: Sequence[FetchJob], write: Callable[[list, Any], int],
+                   bucket: Optional[TokenBucket] = None,
+                   concurrency: int = CONCURRENCY) -> int:
+    """İşleri eşzamanlı çek, yanıtları sırayla ``write(responses, payload)``
+    ile yaz. Döner: ``write`` dönüşlerinin toplamı.
+
+    Senkron çağrılır (scheduler / executor thread'i) — kendi event loop'unu
+    açar. Aynı ``bucket`` ardışık çağrılarda paylaşılırsa öğrenilen hız
+    korunur.
+    """
+    if not jobs:
+        return 0
+    return asyncio.run(_run(jobs, write, bucket or TokenBucket(), concurrency))
@@ -11,6 +11,12 @@ HISTORICAL_FORECAST_API_URL = "https://historical-forecast-api.open-meteo.com/v1
 # Logging Setup
 logger = logging.getLogger(__name__)
 
+def is_rate_limit(e: Exception) -> bool:
+    """Open-Meteo dakikalık/saatlik kota aşımı hatası mı?"""
+    s = str(e).lower()
+    return "rate" in s or "minutely" in s or "limit exceeded" in s
+
+
 def setup_client(cache_name='.cache', expire_after=600, retries=5, backoff_factor=0.2):
     """
     Sets up the Open-Meteo client with caching and retry logic.
@@ -1,6 +1,5 @@
 import pandas as pd
 from sqlalchemy import select, func
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 from datetime import date, datetime, timedelta
 from typing import List, Tuple
@@ -12,6 +11,7 @@ from app.db.database import SystemSessionLocal, SystemEngine, SystemBase
 from app.db.models import WeatherData
 
 from .base import setup_client, ARCHIVE_API_URL, FORECAST_API_URL, HISTORICAL_FORECAST_API_URL, logger
+from .pg_copy import DATE, FLOAT8, copy_upsert, encode_rows
 
 # Constants
 LAT_MIN, LAT_MAX = 36.0, 42.0
@@ -37,62 +37,45 @@ def generate_grid_points() -> List[Tuple[float, float]]:
             points.append((round(float(lat), 2), round(float(lon), 2)))
     return points
 
-def save_response_to_db(db: Session, response, lat, lon):
-    """Parses Open-Meteo Binary response and saves to DB."""
+_DAILY_COLS = [
+    "latitude", "longitude", "date", "temperature_mean", "wind_speed_max",
+    "wind_speed_mean", "wind_direction_dominant", "shortwave_radiation_sum",
+]
+
+
+def encode_daily_response(response, lat, lon) -> Tuple[int, bytes]:
+    """Open-Meteo günlük yanıtı → (gün sayısı, ikili COPY satırları).
+
+    Ortalama sıcaklığı olmayan günler atlanır; diğer eksik değerler 0.0
+    yazılır (eski satır satır davranışla aynı). Tarih, yanıt zamanının UTC
+    günüdür.
+    """
     daily = response.Daily()
+    days = np.arange(daily.Time(), daily.TimeEnd(), daily.Interval(), dtype=np.int64) // 86400
+    values = [daily.Variables(i).ValuesAsNumpy().astype(np.float64)[:len(days)]
+              for i in range(5)]
+
+    keep = ~np.isnan(values[0])
+    n = int(keep.sum())
+    fields = [(FLOAT8, lat), (FLOAT8, lon), (DATE, days[keep]), (FLOAT8, values[0][keep])]
+    fields += [(FLOAT8, np.nan_to_num(v[keep], nan=0.0)) for v in values[1:]]
+    return n, encode_rows(n, fields)
 
-    daily_temp_mean = daily.Variables(0).ValuesAsNumpy()
-    daily_wind_max = daily.Variables(1).ValuesAsNumpy()
-    daily_wind_mean = daily.Variables(2).ValuesAsNumpy()
-    daily_wind_dir = daily.Variables(3).ValuesAsNumpy()
-    daily_rad_sum = daily.Variables(4).ValuesAsNumpy()
-
-    dates = pd.date_range(
-        start=pd.to_datetime(daily.Time(), unit="s", utc=True),
-        end=pd.to_datetime(daily.TimeEnd(), unit="s", utc=True),
-        freq=pd.Timedelta(seconds=daily.Interval()),
-        inclusive="left"
-    )
-
-    record_dicts = []
-    for i in range(len(dates)):
-        temp = float(daily_temp_mean[i]) if not pd.isna(daily_temp_mean[i]) else None
-        if temp is None:
-            continue
-        record_dicts.append({
-            'latitude': lat,
-            'longitude': lon,
-            'date': dates[i].date(),
-            'temperature_mean': temp,
-            'wind_speed_max': float(daily_wind_max[i]) if not pd.isna(daily_wind_max[i]) else 0.0,
-            'wind_speed_mean': float(daily_wind_mean[i]) if not pd.isna(daily_wind_mean[i]) else 0.0,
-            'wind_direction_dominant': float(daily_wind_dir[i]) if not pd.isna(daily_wind_dir[i]) else 0.0,
-            'shortwave_radiation_sum': float(daily_rad_sum[i]) if not pd.isna(daily_rad_sum[i]) else 0.0,
-            'province_name': None,
-            'district_name': None,
-        })
-
-    return record_dicts
 
 def save_batch_responses_to_db(db: Session, responses, batch_points):
     """Saves a batch of API responses to DB using ON CONFLICT DO NOTHING.
 
     This prevents UniqueViolation when grid points overlap with existing
-    bulk-imported province/district coordinates.
+    bulk-imported province/district coordinates. Tüm batch tek ikili COPY
+    ile staging'e, oradan tek INSERT ile weather_data'ya yazılır.
     """
-    all_dicts = []
+    chunks = []
     for idx, response in enumerate(responses):
         lat, lon = batch_points[idx]
-        all_dicts.extend(save_response_to_db(db, response, lat, lon))
-
-    if not all_dicts:
-        return
+        chunks.append(encode_daily_response(response, lat, lon)[1])
 
-    stmt = pg_insert(WeatherData).values(all_dicts)
-    stmt = stmt.on_conflict_do_nothing(
-        index_elements=['latitude', 'longitude', 'date']
-    )
-    db.execute(stmt)
+    copy_upsert(db, WeatherData.__tablename__, _DAILY_COLS, chunks,
+                conflict=["latitude", "longitude", "date"])
     db.commit()
 
 # --- BULK HISTORICAL FETCH (from data_collector.py) ---
@@ -223,6 +206,7 @@ def fetch_missing_days(start_date: date, end_date: date,
     db = SystemSessionLocal()
 
     days_fetched = 0
+    saved_any = False
 
     try:
         update_batch_size = 50
@@ -246,6 +230,7 @@ def fetch_missing_days(start_date: date, end_date: date,
             try:
                 responses = openmeteo.weather_api(api_url, params=params)
                 save_batch_responses_to_db(db, responses, batch_points)
+                saved_any = True
 
                 if batch_idx == 0:
                     days_fetched = (end_date - start_date).days + 1
@@ -265,6 +250,10 @@ def fetch_missing_days(start_date: date, end_date: date,
     finally:
         db.close()
 
+    if saved_any:
+        from ..data_versions import DAILY, bump
+        bump(DAILY)
+
     return days_fetched
 
 def _check_gap_completeness(db: Session, start: date, end: date) -> float:
@@ -1,19 +1,20 @@
-import pandas as pd
+import numpy as np
 from sqlalchemy import func
-from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta, timezone, date
+from datetime import datetime, timedelta, date
 from collections import defaultdict
-from typing import List
-import time
+from typing import List, Tuple
 import asyncio
 import logging
 
 from app.db.database import SystemSessionLocal, SystemEngine, SystemBase
 from app.db.models import HourlyWeatherData
 from app.core.constants import TURKEY_CITIES
+from app.services.province_aliases import to_canonical
 
-from .base import setup_client, FORECAST_API_URL, HISTORICAL_FORECAST_API_URL, logger
+from .base import FORECAST_API_URL, HISTORICAL_FORECAST_API_URL, logger
+from .async_fetch import FetchJob, TokenBucket, fetch_pipeline
+from .pg_copy import FLOAT8, TEXT, TIMESTAMP, copy_upsert, encode_rows
 
 # Configuration
 HOURLY_PARAMS = [
@@ -31,8 +32,7 @@ HOURLY_PARAMS = [
     "diffuse_radiation"
 ]
 
-BATCH_SIZE = 50
-DELAY_BETWEEN_BATCHES = 3.0   # saniye — rate limit aşmamak için
+BATCH_SIZE = 50               # istek başına lokasyon (hız: async_fetch.TokenBucket)
 FORECAST_MAX_PAST_DAYS = 92   # Open-Meteo Forecast API geçmiş veri limiti (gün)
 
 
@@ -41,136 +41,82 @@ def create_hourly_tables():
     SystemBase.metadata.create_all(bind=SystemEngine)
 
 
-def process_response(response, city: dict) -> List[HourlyWeatherData]:
-    """Processes API response into DB objects."""
-    hourly = response.Hourly()
+def _location_fields(city: dict) -> list:
+    """Yanıt boyunca sabit lokasyon alanları (COPY sırası: ``_LOCATION_COLS``)."""
+    # İlçe kayıtları için city_name = province adı kullan
+    # → district-summary sorgusu city_name == province ile çalışır
+    # district=None → "Merkez" olarak kaydet: choropleth endpoint
+    # district_name IS NOT NULL filtresi kullanıyor + _MERKEZ_SPLIT dağıtımı
+    # için "Merkez" kaydı gerekli.
+    # 2026-05-24: city_name Türkçe canonical (Balikesir → Balıkesir).
+    # Mevcut tablo karışık format AMA province_aliases bidirectional
+    # match ediyor. Yeni satırlar canonical olsun ki tutarsızlık birikmesin.
+    return [
+        (TEXT, to_canonical(city.get("province", city["name"]))),
+        (TEXT, city.get("district") or "Merkez"),
+        (TEXT, city.get("code")),
+        (FLOAT8, city["lat"]),
+        (FLOAT8, city["lon"]),
+    ]
 
-    times = pd.date_range(
-        start=pd.to_datetime(hourly.Time(), unit="s", utc=True),
-        end=pd.to_datetime(hourly.TimeEnd(), unit="s", utc=True),
-        freq=pd.Timedelta(seconds=hourly.Interval()),
-        inclusive="left"
-    )
 
-    data = {"timestamp": times}
-    for idx, param in enumerate(HOURLY_PARAMS):
-        data[param] = hourly.Variables(idx).ValuesAsNumpy()
-
-    df = pd.DataFrame(data)
-
-    records = []
-    for _, row in df.iterrows():
-        # Naive UTC — DB'deki TIMESTAMP WITHOUT TIME ZONE ile tutarlı
-        ts = row["timestamp"].to_pydatetime()
-        if ts.tzinfo is not None:
-            ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
-
-        # İlçe kayıtları için city_name = province adı kullan
-        # → district-summary sorgusu city_name == province ile çalışır
-        # district=None → "Merkez" olarak kaydet: choropleth endpoint
-        # district_name IS NOT NULL filtresi kullanıyor + _MERKEZ_SPLIT dağıtımı
-        # için "Merkez" kaydı gerekli.
-        _district = city.get("district") or "Merkez"
-        _city_name = city.get("province", city["name"])
-        # 2026-05-24: city_name Türkçe canonical (Balikesir → Balıkesir).
-        # Mevcut tablo karışık format AMA province_aliases bidirectional
-        # match ediyor. Yeni satırlar canonical olsun ki tutarsızlık birikmesin.
-        from app.services.province_aliases import to_canonical
-        _city_name = to_canonical(_city_name)
-        record = HourlyWeatherData(
-            city_name=_city_name,
-            district_name=_district,
-            location_code=city.get("code"),
-            latitude=city["lat"],
-            longitude=city["lon"],
-            timestamp=ts,
-            temperature_2m=float(row["temperature_2m"]) if pd.notna(row["temperature_2m"]) else None,
-            apparent_temperature=float(row["apparent_temperature"]) if pd.notna(row["apparent_temperature"]) else None,
-            relative_humidity_2m=float(row["relative_humidity_2m"]) if pd.notna(row["relative_humidity_2m"]) else None,
-            precipitation=float(row["precipitation"]) if pd.notna(row["precipitation"]) else None,
-            cloud_cover=float(row["cloud_cover"]) if pd.notna(row["cloud_cover"]) else None,
-            wind_speed_10m=float(row["wind_speed_10m"]) if pd.notna(row["wind_speed_10m"]) else None,
-            wind_speed_100m=float(row["wind_speed_100m"]) if pd.notna(row["wind_speed_100m"]) else None,
-            wind_direction_10m=float(row["wind_direction_10m"]) if pd.notna(row["wind_direction_10m"]) else None,
-            wind_gusts_10m=float(row["wind_gusts_10m"]) if pd.notna(row["wind_gusts_10m"]) else None,
-            shortwave_radiation=float(row["shortwave_radiation"]) if pd.notna(row["shortwave_radiation"]) else None,
-            direct_radiation=float(row["direct_radiation"]) if pd.notna(row["direct_radiation"]) else None,
-            diffuse_radiation=float(row["diffuse_radiation"]) if pd.notna(row["diffuse_radiation"]) else None,
-        )
-        records.append(record)
+_LOCATION_COLS = ["city_name", "district_name", "location_code", "latitude", "longitude"]
+_COPY_COLS = _LOCATION_COLS + ["timestamp"] + HOURLY_PARAMS
 
-    return records
 
+def process_response(response, city: dict) -> Tuple[int, bytes]:
+    """API yanıtı → (saat sayısı, ikili COPY satırları).
 
-def _is_rate_limit(e: Exception) -> bool:
-    s = str(e).lower()
-    return "rate" in s or "minutely" in s or "limit exceeded" in s
+    Zaman ekseni yanıttaki Unix saniyesinden (naive UTC — DB'deki TIMESTAMP
+    WITHOUT TIME ZONE ile tutarlı) doğrudan üretilir; değişken dizileri
+    float64'e çevrilip olduğu gibi kodlanır (NaN → merge'de NULL).
+    """
+    hourly = response.Hourly()
+    times = np.arange(hourly.Time(), hourly.TimeEnd(), hourly.Interval(), dtype=np.int64)
+    fields = _location_fields(city) + [(TIMESTAMP, times)]
+    for idx in range(len(HOURLY_PARAMS)):
+        values = hourly.Variables(idx).ValuesAsNumpy().astype(np.float64)
+        fields.append((FLOAT8, values[:len(times)]))
+    return len(times), encode_rows(len(times), fields)
 
 
 def _save_responses(db, responses, batch):
-    """Batch API yanıtlarını DB'ye kaydeder (ON CONFLICT DO UPDATE — güncel veriyi üstüne yazar)."""
+    """Batch API yanıtlarını tek COPY + merge ile kaydeder (ON CONFLICT DO
+    UPDATE — güncel veriyi üstüne yazar). Döner: yanıtlardaki saat sayısı."""
     total = 0
-    cols = [c.name for c in HourlyWeatherData.__table__.columns if c.name != 'id']
-    # Conflict'te güncellenecek alanlar (timestamp/lat/lon hariç)
-    update_cols = [c for c in cols if c not in ('latitude', 'longitude', 'timestamp')]
+    chunks = []
     for response, city in zip(responses, batch):
-        records = process_response(response, city)
-        if not records:
-            continue
-        record_dicts = [{col: getattr(r, col) for col in cols} for r in records]
-        stmt = pg_insert(HourlyWeatherData).values(record_dicts)
-        stmt = stmt.on_conflict_do_update(
-            index_elements=['latitude', 'longitude', 'timestamp'],
-            set_={c: stmt.excluded[c] for c in update_cols},
-        )
-        db.execute(stmt)
-        db.commit()
-        total += len(records)
+        n, rows = process_response(response, city)
+        total += n
+        chunks.append(rows)
+    # Conflict'te güncellenecek alanlar (timestamp/lat/lon hariç)
+    copy_upsert(
+        db, HourlyWeatherData.__tablename__, _COPY_COLS, chunks,
+        conflict=["latitude", "longitude", "timestamp"],
+        update=[c for c in _COPY_COLS if c not in ("latitude", "longitude", "timestamp")],
+        nan_to_null=HOURLY_PARAMS,
+    )
+    db.commit()
     return total
 
 
-def _fetch_batch_with_retry(client, db, batch: list, api_url: str, params_extra: dict,
-                             batch_label: str = "") -> int:
-    """
-    Tek batch için API isteği yapar, rate limit'te 65s bekleyip yeniden dener.
-    Başarıda kaydedilen kayıt sayısını döndürür.
-    """
-    lats = [c["lat"] for c in batch]
-    lons = [c["lon"] for c in batch]
-    params = {
-        "latitude": lats,
-        "longitude": lons,
-        "hourly": HOURLY_PARAMS,
-        "timezone": "Europe/Istanbul",
-        "wind_speed_unit": "ms",          # Varsayılan km/h → m/s olarak al
-        **params_extra,
-    }
-
-    max_retries = 3
-    for attempt in range(max_retries):
-        try:
-            responses = client.weather_api(api_url, params=params)
-            saved = _save_responses(db, responses, batch)
-            logger.info(f"  ✓ {batch_label}: {saved} saat kaydedildi")
-            return saved
-        except Exception as e:
-            if _is_rate_limit(e):
-                wait = 65 + attempt * 15
-                logger.warning(
-                    f"  Rate limit — {wait}s bekleniyor "
-                    f"(deneme {attempt + 1}/{max_retries}) [{batch_label}]"
-                )
-                db.rollback()
-                time.sleep(wait)
-            else:
-                logger.error(f"  Batch hatası (deneme {attempt + 1}): {e} [{batch_label}]")
-                db.rollback()
-                if attempt < max_retries - 1:
-                    time.sleep(5)
-                else:
-                    logger.error(f"  Batch atlandı: {batch_label}")
-                    return 0
-    return 0
+def _batch_jobs(cities: list, api_url: str, params_extra: dict, label: str) -> List[FetchJob]:
+    """Şehir listesini ``BATCH_SIZE``'lık çok-lokasyonlu API isteklerine böler."""
+    total_batches = (len(cities) + BATCH_SIZE - 1) // BATCH_SIZE
+    jobs = []
+    for i in range(0, len(cities), BATCH_SIZE):
+        batch = cities[i:i + BATCH_SIZE]
+        params = {
+            "latitude": [c["lat"] for c in batch],
+            "longitude": [c["lon"] for c in batch],
+            "hourly": HOURLY_PARAMS,
+            "timezone": "Europe/Istanbul",
+            "wind_speed_unit": "ms",          # Varsayılan km/h → m/s olarak al
+            **params_extra,
+        }
+        jobs.append(FetchJob(api_url, params, batch,
+                             f"{label} batch {i // BATCH_SIZE + 1}/{total_batches}"))
+    return jobs
 
 
 def collect_hourly_data(force_refresh: bool = False):
@@ -182,10 +128,23 @@ def collect_hourly_data(force_refresh: bool = False):
     - Boşluk > 92 gün → Historical Forecast API (start_date/end_date)
     - Boşluk ≤ 92 gün → Forecast API (past_days)
     - Boşluk yok → atla
+
+    Döner: bu koşuda API'den istenen en erken gün (naive UTC datetime) —
+    türev depoların (paketli saatlik tablo) yalnızca bu noktadan sonrasını
+    yenilemesi için. Güncelleme yoksa None.
     """
     create_hourly_tables()
     db = SystemSessionLocal()
-    client = setup_client(cache_name='.cache_hourly')
+    # Pass 1 → Pass 2 boyunca öğrenilen istek hızı korunur
+    bucket = TokenBucket()
+
+    def write(responses, batch) -> int:
+        # Hat yazıcısı — tek thread, sırayla çağrılır
+        try:
+            return _save_responses(db, responses, batch)
+        except Exception:
+            db.rollback()
+            raise
 
     try:
         if force_refresh:
@@ -232,7 +191,7 @@ def collect_hourly_data(force_refresh: bool = False):
         total_cities = len(deep_gap_cities) + len(recent_gap_cities)
         if total_cities == 0:
             logger.info("✅ Tüm şehirler güncel. API çağrısı gerekmiyor.")
-            return
+            return None
 
         logger.info(
             f"Güncelleme gerekiyor: {total_cities} şehir "
@@ -240,6 +199,7 @@ def collect_hourly_data(force_refresh: bool = False):
         )
 
         total_saved = 0
+        refresh_from: date | None = None
 
         # ── Pass 1: Derin boşluk → Historical Forecast API ───────────────────
         if deep_gap_cities:
@@ -247,25 +207,18 @@ def collect_hourly_data(force_refresh: bool = False):
             hist_end = yesterday  # Historical Forecast API = dünü destekliyor
 
             if min_start <= hist_end:
+                refresh_from = min_start
                 cities_deep = [c for c, _ in deep_gap_cities]
-                total_batches = (len(cities_deep) + BATCH_SIZE - 1) // BATCH_SIZE
+                jobs = _batch_jobs(
+                    cities_deep, HISTORICAL_FORECAST_API_URL,
+                    {"start_date": min_start.isoformat(), "end_date": hist_end.isoformat()},
+                    "Pass1",
+                )
                 logger.info(
                     f"[Pass 1] Derin backfill: {min_start} → {hist_end} "
-                    f"({len(cities_deep)} şehir, {total_batches} batch)"
+                    f"({len(cities_deep)} şehir, {len(jobs)} batch)"
                 )
-                for i in range(0, len(cities_deep), BATCH_SIZE):
-                    batch = cities_deep[i:i + BATCH_SIZE]
-                    batch_num = i // BATCH_SIZE + 1
-                    label = f"Pass1 batch {batch_num}/{total_batches}"
-                    saved = _fetch_batch_with_retry(
-                        client, db, batch,
-                        HISTORICAL_FORECAST_API_URL,
-                        {"start_date": min_start.isoformat(), "end_date": hist_end.isoformat()},
-                        label
-                    )
-                    total_saved += saved
-                    if i + BATCH_SIZE < len(cities_deep):
-                        time.sleep(DELAY_BETWEEN_BATCHES)
+                total_saved += fetch_pipeline(jobs, write, bucket)
 
             # Derin boşluk şehirlerini yakın geçmiş için de listeye ekle
             for city, _ in deep_gap_cities:
@@ -288,37 +241,43 @@ def collect_hourly_data(force_refresh: bool = False):
                 else:
                     bucket_map[FORECAST_MAX_PAST_DAYS].append(city)
 
+            pass2_start = today - timedelta(days=max(bucket_map))
+            if refresh_from is None or pass2_start < refresh_from:
+                refresh_from = pass2_start
+
+            # Bucket'lar tek hatta — farklı lokasyonlar, yazım sırası önemsiz
+            jobs = []
             for past_days_bucket, bucket_cities in sorted(bucket_map.items()):
-                total_batches = (len(bucket_cities) + BATCH_SIZE - 1) // BATCH_SIZE
+                bucket_jobs = _batch_jobs(
+                    bucket_cities, FORECAST_API_URL,
+                    {"past_days": past_days_bucket, "forecast_days": 1},
+                    f"Pass2 pd={past_days_bucket}",
+                )
                 logger.info(
                     f"[Pass 2] past_days={past_days_bucket}: "
-                    f"{len(bucket_cities)} şehir, {total_batches} batch"
+                    f"{len(bucket_cities)} şehir, {len(bucket_jobs)} batch"
                 )
-                for i in range(0, len(bucket_cities), BATCH_SIZE):
-                    batch = bucket_cities[i:i + BATCH_SIZE]
-                    batch_num = i // BATCH_SIZE + 1
-                    label = f"Pass2 pd={past_days_bucket} batch {batch_num}/{total_batches}"
-                    saved = _fetch_batch_with_retry(
-                        client, db, batch,
-                        FORECAST_API_URL,
-                        {"past_days": past_days_bucket, "forecast_days": 1},
-                        label
-                    )
-                    total_saved += saved
-                    if i + BATCH_SIZE < len(bucket_cities):
-                        time.sleep(DELAY_BETWEEN_BATCHES)
+                jobs.extend(bucket_jobs)
+            total_saved += fetch_pipeline(jobs, write, bucket)
 
         logger.info(f"✅ Saatlik güncelleme tamamlandı. Toplam {total_saved} kayıt eklendi.")
+        if refresh_from is None:
+            return None
+        return datetime.combine(refresh_from, datetime.min.time())
 
     finally:
         db.close()
 
 
 def update_hourly_data():
-    """Son saate kadar olan tüm boşlukları doldurur."""
+    """Son saate kadar olan tüm boşlukları doldurur.
+
+    Döner: `collect_hourly_data` ile aynı — yenilenen en erken an (veya None).
+    """
     logger.info("🔄 Saatlik veriler güncelleniyor...")
-    collect_hourly_data(force_refresh=False)
+    refresh_from = collect_hourly_data(force_refresh=False)
     logger.info("✅ Saatlik güncelleme tamamlandı")
+    return refresh_from
 
 
 async def async_update_hourly_data():
@@ -0,0 +1,122 @@
+"""
+PostgreSQL ikili COPY + staging merge (toplayıcılar için toplu upsert)
+=====================================================================
+
+Toplayıcılar API yanıtını satır satır ORM nesnesine (``iterrows`` + alan
+başına ``pd.notna``) sonra tekrar dict'e çeviriyor, çok satırlı
+``INSERT ... VALUES`` ile yazıyordu — bir lokasyonun bir yıllık saatleri
+(8.760 satır) saniyeler sürüyordu.
+
+Burada NumPy dizileri doğrudan PostgreSQL ikili COPY formatına kodlanır:
+
+  * Bir yanıtın satırları sabit genişlikli: lokasyon alanları (metin,
+    lat/lon) yanıt içinde sabit, sayısal kolonlar ``>f8``. Satırlar tek bir
+    yapılandırılmış NumPy dizisine yazılır — Python döngüsü yok.
+  * NaN değerler NaN olarak gider; merge sırasında ``NULLIF(col, 'NaN')``
+    ile NULL'a çevrilir (satır genişliği sabit kalır).
+  * ``copy_upsert``: geçici staging tablosu (``ON COMMIT DROP``) → ikili
+    ``COPY FROM STDIN`` → tek ``INSERT ... SELECT ... ON CONFLICT`` merge.
+"""
+from __future__ import annotations
+
+import io
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+_HEADER = b"PGCOPY\n\xff\r\n\x00" + (0).to_bytes(4, "big") + (0).to_bytes(4, "big")
+_TRAILER = (-1).to_bytes(2, "big", signed=True)
+
+_PG_EPOCH_S = 946684800          # 2000-01-01T00:00:00Z, Unix saniyesi
+_PG_EPOCH_DAYS = 10957           # 2000-01-01, Unix günü
+
+# Alan türleri: (türü, değer). Dizi değerler satır sayısı uzunluğunda;
+# skaler değerler tüm satırlara yayılır, None → NULL.
+FLOAT8 = "float8"          # float dizisi / skaler (NaN → merge'de NULL)
+TIMESTAMP = "timestamp"    # Unix saniyesi (int dizisi) — naive UTC
+DATE = "date"              # Unix günü (int dizisi)
+TEXT = "text"              # skaler str / None
+
+_WIDTH = {FLOAT8: ("f8", 8), TIMESTAMP: ("i8", 8), DATE: ("i4", 4)}
+
+
+def encode_rows(n_rows: int, fields: Sequence[Tuple[str, Any]]) -> bytes:
+    """``n_rows`` satırı ikili COPY satırlarına kodla (başlık/son ek hariç)."""
+    if n_rows == 0:
+        return b""
+    dtype: List[Tuple[str, str]] = [("n", ">i2")]
+    values = {}
+    for i, (kind, value) in enumerate(fields):
+        dtype.append((f"l{i}", ">i4"))
+        if value is None:
+            values[f"l{i}"] = -1
+            continue
+        if kind == TEXT:
+            raw = str(value).encode("utf-8")
+            values[f"l{i}"] = len(raw)
+            if raw:
+                dtype.append((f"v{i}", f"S{len(raw)}"))
+                values[f"v{i}"] = raw
+            continue
+        code, width = _WIDTH[kind]
+        values[f"l{i}"] = width
+        dtype.append((f"v{i}", ">" + code))
+        if kind == TIMESTAMP:
+            value = (np.asarray(value, dtype=np.int64) - _PG_EPOCH_S) * 1_000_000
+        elif kind == DATE:
+            value = np.asarray(value, dtype=np.int64) - _PG_EPOCH_DAYS
+        values[f"v{i}"] = value
+
+    rows = np.empty(n_rows, dtype=np.dtype(dtype))
+    rows["n"] = len(fields)
+    for name, value in values.items():
+        rows[name] = value
+    return rows.tobytes()
+
+
+def copy_upsert(db: Session, table: str, columns: Sequence[str],
+                chunks: Iterable[bytes], conflict: Sequence[str],
+                update: Optional[Sequence[str]] = None,
+                nan_to_null: Sequence[str] = ()) -> int:
+    """Kodlanmış satırları staging'e COPY'le, hedef tabloya tek sorguda merge et.
+
+    ``update`` None → ``ON CONFLICT DO NOTHING``; aksi halde bu kolonlar
+    güncellenir. Aynı çakışma anahtarı staging'de birden çok kez varsa tek
+    satır alınır (``DISTINCT ON``). Commit çağırana aittir; staging tablosu
+    commit'te düşer. Döner: hedefe yazılan (eklenen + güncellenen) satır.
+    """
+    body = b"".join(chunks)
+    if not body:
+        return 0
+    stage = f"_stage_{table}"
+    cols = ", ".join(columns)
+    keys = ", ".join(conflict)
+    select = ", ".join(
+        f"NULLIF({c}, 'NaN'::float8)" if c in nan_to_null else c for c in columns
+    )
+    if update is None:
+        action = "DO NOTHING"
+    else:
+        action = "DO UPDATE SET " + ", ".join(f"{c} = EXCLUDED.{c}" for c in update)
+
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.execute(f"DROP TABLE IF EXISTS {stage}")
+        cursor.execute(
+            f"CREATE TEMP TABLE {stage} ON COMMIT DROP AS "
+            f"SELECT {cols} FROM {table} WITH NO DATA"
+        )
+        cursor.copy_expert(
+            f"COPY {stage} ({cols}) FROM STDIN WITH (FORMAT binary)",
+            io.BytesIO(_HEADER + body + _TRAILER),
+        )
+        cursor.execute(
+            f"INSERT INTO {table} ({cols}) "
+            f"SELECT DISTINCT ON ({keys}) {select} FROM {stage} "
+            f"ORDER BY {keys} "
+            f"ON CONFLICT ({keys}) {action}"
+        )
+        return cursor.rowcount
+    finally:
+        cursor.close()
@@ -0,0 +1,126 @@
+"""
+SRRP — Veri Sürümü Kaydı (olay güdümlü cache geçersizleştirme)
+==============================================================
+
+Cache geçersizleştirme yalnızca TTL'e bağlıydı: saatlik çekim yeni satır
+yazdıktan sonra ``district-choropleth`` "current" modu TTL boyunca eski
+kalıyordu; tersine, verisi aylarca değişmeyen tematik/ML anahtarları
+zamanlayıcıyla düşürülüp yeniden hesaplanıyordu.
+
+Burada her veri seti için ``data_versions`` tablosunda bir sayaç tutulur:
+
+  * Veriyi yazan iş ``bump(...)`` çağırır — saatlik çekim (``HOURLY``),
+    günlük grid güncellemesi (``DAILY``), ``build_thematic_aggregates`` /
+    ``build_thematic_timeseries`` (``THEMATIC``), ``build_ml_forecasts``
+    (``ML_FORECAST``), climatology refresh (``CLIMATOLOGY``), vektör
+    yükleyiciler (``VECTOR`` — tohumlanmış MVT deposu ve tile anahtarları).
+  * Router'lar anahtarı ``versioned_key(key, HOURLY, ...)`` ile üretir —
+    veri değişince anahtar değişir, eski kayıt bir daha okunmaz. Kayıtlar
+    ``VERSIONED_TTL`` (varsayılan 7 gün) yaşar; bu süre yalnızca artık
+    kullanılmayan eski sürümlerin Redis'ten temizlenmesi içindir.
+
+Sürümler süreç içinde ``SRRP_DATA_VERSION_TTL`` saniye (varsayılan 5)
+tutulur — istek başına DB'ye gidilmez; başka süreçteki (script / worker)
+artış en geç bu kadar gecikmeyle görülür. Tablo yoksa / DB erişilemezse
+sürümler 0 kabul edilir (anahtarlar sabit kalır, davranış TTL'e düşer).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import time
+from threading import Lock
+from typing import Dict
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.db.database import SystemSessionLocal
+from app.db.models import DataVersion
+
+logger = logging.getLogger(__name__)
+
+HOURLY = "hourly_weather"
+DAILY = "daily_weather"
+THEMATIC = "thematic"
+ML_FORECAST = "ml_forecast"
+CLIMATOLOGY = "climatology"
+VECTOR = "vector"
+
+VERSIONED_TTL = int(os.environ.get("SRRP_VERSIONED_CACHE_TTL", 7 * 24 * 3600))
+_REFRESH_SECONDS = float(os.environ.get("SRRP_DATA_VERSION_TTL", 5))
+
+_lock = Lock()
+_snapshot: Dict[str, int] = {}
+_loaded_until = 0.0
+
+
+def _load() -> Dict[str, int]:
+    db = SystemSessionLocal()
+    try:
+        rows = db.query(DataVersion.dataset, DataVersion.version).all()
+        return {dataset: int(version) for dataset, version in rows}
+    finally:
+        db.close()
+
+
+def versions() -> Dict[str, int]:
+    """Tüm veri seti sürümleri (süreç içi kısa cache'li)."""
+    global _snapshot, _loaded_until
+    if time.monotonic() < _loaded_until:
+        return _snapshot
+    with _lock:
+        now = time.monotonic()
+        if now < _loaded_until:
+            return _snapshot
+        try:
+            _snapshot = _load()
+        except Exception as exc:  # noqa: BLE001
+            # Eski anlık görüntü korunur; DB dönene kadar tekrar tekrar denenmez
+            logger.warning("data_versions okunamadı: %s", exc)
+        _loaded_until = now + _REFRESH_SECONDS
+        return _snapshot
+
+
+def get_version(dataset: str) -> int:
+    return versions().get(dataset, 0)
+
+
+def versioned_key(key: str, *datasets: str) -> str:
+    """Cache anahtarına veri seti sürümlerini ekle: ``key:dv12.3``."""
+    return f"{key}:dv" + ".".join(str(get_version(d)) for d in datasets)
+
+
+def invalidate() -> None:
+    """Süreç içi sürüm cache'ini düşür — sonraki okuma DB'den."""
+    global _loaded_until
+    with _lock:
+        _loaded_until = 0.0
+
+
+def bump(*datasets: str) -> None:
+    """Veri setlerinin sürümünü bir artır (yoksa 1 ile oluştur).
+
+    Veriyi yazan iş commit'ten SONRA çağırır. Hata yazma işini düşürmez —
+    loglanır; ilgili anahtarlar ``VERSIONED_TTL`` dolana kadar eski kalır.
+    """
+    if not datasets:
+        return
+    table = DataVersion.__table__
+    db = SystemSessionLocal()
+    try:
+        for dataset in datasets:
+            stmt = pg_insert(table).values(dataset=dataset, version=1)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.dataset],
+                set_={"version": table.c.version + 1, "updated_at": func.now()},
+            )
+            db.execute(stmt)
+        db.commit()
+        logger.info("data_versions artırıldı: %s", ", ".join(datasets))
+    except Exception:
+        db.rollback()
+        logger.exception("data_versions artırılamadı: %s", ", ".join(datasets))
+    finally:
+        db.close()
+    invalidate()
@@ -0,0 +1,291 @@
+"""
+SRRP — Animasyon Frame Izgarası ve İkili (Binary) Kodlayıcı
+===========================================================
+
+`/weather/animation` (format=districts) her frame için `{"İl|İlçe": val}`
+sözlüğü döner: saatlik modda 720 frame × ~975 tekrar eden string anahtar.
+Bu modül iki parça sağlar:
+
+1. ``FrameGrid`` — frame'leri sözlük yerine (zaman × ilçe) matrisinde biriktirir.
+   JSON yanıtı gerekirse sözlükler en sonda bir kez üretilir; ikili yanıt
+   için hiç sözlük kurulmaz.
+
+2. ``encode_frames`` / ``decode_frames`` — Accept başlığıyla seçilen kompakt
+   tel formatı (``application/vnd.srrp.frames``):
+
+   .. code-block:: text
+
+       "SRF1" | flags:u8 | 3× reserved | header_len:u32 | header (UTF-8 JSON)
+              | body_len:u32 | body
+
+   * header: meta + ``keys`` (ilçe anahtarları, bir kez) + ``ts`` listesi +
+     kuantalama parametreleri ``{"offset", "scale", "missing": 65535}``
+   * body: uint16 matris [frame × anahtar], satır-öncelikli, little-endian.
+     ``value = offset + q * scale``; ``q == 65535`` → veri yok.
+   * flags bit0 = delta (zaman ekseninde mod-2¹⁶ fark; çözümde kümülatif
+     toplam), bit1 = zlib, bit2 = zstd (``zstandard`` kuruluysa).
+
+   Kuantalama hatası ≤ scale/2 (rüzgar 0-20 m/s → ~1.5e-4) — JSON'daki 3
+   ondalık yuvarlamanın altında.
+
+Accept örnekleri::
+
+    Accept: application/vnd.srrp.frames
+    Accept: application/vnd.srrp.frames; delta=0; compress=zstd
+"""
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import zstandard as _zstd  # type: ignore
+    _ZSTD_OK = True
+except Exception:  # pragma: no cover
+    _zstd = None
+    _ZSTD_OK = False
+
+MEDIA_TYPE = "application/vnd.srrp.frames"
+MAGIC = b"SRF1"
+MISSING = 0xFFFF
+_QMAX = MISSING - 1
+
+FLAG_DELTA = 0x01
+FLAG_ZLIB = 0x02
+FLAG_ZSTD = 0x04
+
+_U32 = struct.Struct("<I")
+
+
+# ─── Frame ızgarası ─────────────────────────────────────────────────────────
+
+class FrameGrid:
+    """(ts × anahtar) değer ızgarası — sözlük-sözlük yerine indeks + matris.
+
+    Kullanım: ``set`` çağrıları biriktirilir, ``finalize`` matrisi kurar
+    (aynı hücreye birden çok yazım → son yazılan kazanır, dict semantiği).
+    Sonrasında ``fill_missing`` ile boş hücreler doldurulabilir.
+    """
+
+    def __init__(self) -> None:
+        self.ts: List[str] = []
+        self.keys: List[str] = []
+        self._ts_idx: Dict[str, int] = {}
+        self._key_idx: Dict[str, int] = {}
+        self._r: List[int] = []
+        self._c: List[int] = []
+        self._v: List[float] = []
+        self.values: Optional[np.ndarray] = None
+
+    def row(self, ts: str) -> int:
+        i = self._ts_idx.get(ts)
+        if i is None:
+            i = self._ts_idx[ts] = len(self.ts)
+            self.ts.append(ts)
+        return i
+
+    def col(self, key: str) -> int:
+        j = self._key_idx.get(key)
+        if j is None:
+            j = self._key_idx[key] = len(self.keys)
+            self.keys.append(key)
+        return j
+
+    def set(self, ts: str, key: str, value: float) -> None:
+        self._r.append(self.row(ts))
+        self._c.append(self.col(key))
+        self._v.append(value)
+
+    def finalize(self) -> "FrameGrid":
+        """Biriken yazımları float64 matrise döker; satırları ts'ye göre sıralar."""
+        mat = np.full((len(self.ts), len(self.keys)), np.nan, dtype=np.float64)
+        if self._v:
+            r = np.asarray(self._r, dtype=np.intp)
+            c = np.asarray(self._c, dtype=np.intp)
+            v = np.asarray(self._v, dtype=np.float64)
+            # Tekrarlı hücrede son yazım kazansın: ters sırada ilk görüleni al
+            flat = r * len(self.keys) + c
+            _, first_rev = np.unique(flat[::-1], return_index=True)
+            last = len(flat) - 1 - first_rev
+            mat[r[last], c[last]] = v[last]
+        order = sorted(range(len(self.ts)), key=self.ts.__getitem__)
+        self.ts = [self.ts[i] for i in order]
+        self._ts_idx = {t: i for i, t in enumerate(self.ts)}
+        self.values = mat[order]
+        self._r, self._c, self._v = [], [], []
+        return self
+
+    def fill_missing(self, ts: str, keys: List[str], value: float) -> int:
+        """``ts`` satırında ``keys`` içinden boş (NaN) olanları ``value`` ile
+        doldurur (gerekirse yeni anahtar sütunu açar). Döner: doldurulan hücre."""
+        assert self.values is not None, "fill_missing finalize sonrası çağrılır"
+        cols = [self.col(k) for k in keys]
+        if len(self.keys) > self.values.shape[1]:
+            pad = np.full((self.values.shape[0], len(self.keys) - self.values.shape[1]), np.nan)
+            self.values = np.hstack([self.values, pad])
+        i = self._ts_idx[ts]
+        row = self.values[i]
+        cols_arr = np.asarray(cols, dtype=np.intp)
+        empty = cols_arr[np.isnan(row[cols_arr])]
+        row[empty] = value
+        return int(len(empty))
+
+    def to_json_frames(self) -> List[Dict[str, Any]]:
+        """JSON yanıt şekli: ``[{"ts": ..., "vals": {"İl|İlçe": val}}]``."""
+        assert self.values is not None
+        keys = self.keys
+        frames = []
+        for i, ts in enumerate(self.ts):
+            row = self.values[i]
+            nz = np.flatnonzero(~np.isnan(row))
+            frames.append({
+                "ts": ts,
+                "vals": {keys[j]: round(float(row[j]), 3) for j in nz},
+            })
+        return frames
+
+    # Cache (JSON-uyumlu kompakt şekil) ↔ ızgara
+    def to_cacheable(self) -> Dict[str, Any]:
+        assert self.values is not None
+        rows = [
+            [None if np.isnan(v) else round(float(v), 3) for v in row]
+            for row in self.values
+        ]
+        return {"ts": self.ts, "keys": self.keys, "rows": rows}
+
+    @classmethod
+    def from_cacheable(cls, data: Dict[str, Any]) -> "FrameGrid":
+        g = cls()
+        g.ts = list(data["ts"])
+        g.keys = list(data["keys"])
+        g._ts_idx = {t: i for i, t in enumerate(g.ts)}
+        g._key_idx = {k: j for j, k in enumerate(g.keys)}
+        g.values = np.array(
+            [[np.nan if v is None else v for v in row] for row in data["rows"]],
+            dtype=np.float64,
+        ).reshape(len(g.ts), len(g.keys))
+        return g
+
+
+# ─── Accept müzakeresi ──────────────────────────────────────────────────────
+
+def negotiate(accept: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Accept başlığında ``application/vnd.srrp.frames`` varsa kodlama
+    seçeneklerini döner, yoksa None (JSON fallback).
+
+    Parametreler: ``delta=0|1`` (varsayılan 1), ``compress=zlib|zstd|none``
+    (varsayılan zlib; zstd kurulu değilse zlib'e düşer).
+    """
+    if not accept:
+        return None
+    for part in accept.split(","):
+        fields = [f.strip() for f in part.split(";")]
+        if fields[0].lower() != MEDIA_TYPE:
+            continue
+        params = {}
+        for f in fields[1:]:
+            if "=" in f:
+                k, v = f.split("=", 1)
+                params[k.strip().lower()] = v.strip().strip('"').lower()
+        if params.get("q") in ("0", "0.0"):
+            return None
+        compress = params.get("compress", "zlib")
+        if compress == "zstd" and not _ZSTD_OK:
+            compress = "zlib"
+        if compress not in ("zlib", "zstd", "none"):
+            compress = "zlib"
+        return {"delta": params.get("delta", "1") != "0", "compress": compress}
+    return None
+
+
+# ─── Kodlama / çözme ────────────────────────────────────────────────────────
+
+def quantize(values: np.ndarray, vmin: float, vmax: float) -> Tuple[np.ndarray, float]:
+    """float → uint16 (NaN → MISSING). Döner: (q, scale)."""
+    span = float(vmax) - float(vmin)
+    scale = span / _QMAX if span > 0 else 1.0
+    q = np.full(values.shape, MISSING, dtype=np.uint16)
+    ok = ~np.isnan(values)
+    q[ok] = np.clip(np.rint((values[ok] - vmin) / scale), 0, _QMAX).astype(np.uint16)
+    return q, scale
+
+
+def encode_frames(
+    grid: FrameGrid,
+    meta: Dict[str, Any],
+    delta: bool = True,
+    compress: str = "zlib",
+) -> bytes:
+    """FrameGrid → ``application/vnd.srrp.frames`` ikili gövdesi."""
+    assert grid.values is not None
+    values = grid.values
+    finite = values[~np.isnan(values)]
+    vmin = float(finite.min()) if finite.size else 0.0
+    vmax = float(finite.max()) if finite.size else 1.0
+    q, scale = quantize(values, vmin, vmax)
+
+    flags = 0
+    if delta and q.shape[0] > 1:
+        q = q.copy()
+        q[1:] = q[1:] - q[:-1]   # uint16 sarmal fark (mod 2¹⁶), tam tersinir
+        flags |= FLAG_DELTA
+
+    body = np.ascontiguousarray(q, dtype="<u2").tobytes()
+    if compress == "zstd" and _ZSTD_OK:
+        body = _zstd.ZstdCompressor(level=6).compress(body)
+        flags |= FLAG_ZSTD
+    elif compress != "none":
+        body = zlib.compress(body, 6)
+        flags |= FLAG_ZLIB
+
+    header = dict(meta)
+    header.update({
+        "keys": grid.keys,
+        "ts": grid.ts,
+        "shape": [int(q.shape[0]), int(q.shape[1])],
+        "dtype": "uint16",
+        "quant": {"offset": vmin, "scale": scale, "missing": MISSING},
+    })
+    hbytes = json.dumps(header, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return b"".join([
+        MAGIC, bytes([flags, 0, 0, 0]),
+        _U32.pack(len(hbytes)), hbytes,
+        _U32.pack(len(body)), body,
+    ])
+
+
+def decode_frames(blob: bytes) -> Tuple[Dict[str, Any], np.ndarray]:
+    """``encode_frames`` tersi → (header, float64 [frame × anahtar], NaN=yok).
+
+    İstemci tarafı (Flutter) için referans uygulama ve testler.
+    """
+    if blob[:4] != MAGIC:
+        raise ValueError("Geçersiz frame blob (magic)")
+    flags = blob[4]
+    pos = 8
+    (hlen,) = _U32.unpack_from(blob, pos)
+    pos += 4
+    header = json.loads(blob[pos:pos + hlen].decode("utf-8"))
+    pos += hlen
+    (blen,) = _U32.unpack_from(blob, pos)
+    pos += 4
+    body = blob[pos:pos + blen]
+    if flags & FLAG_ZSTD:
+        if not _ZSTD_OK:
+            raise ValueError("zstd ile kodlanmış blob — zstandard kurulu değil")
+        body = _zstd.ZstdDecompressor().decompress(body)
+    elif flags & FLAG_ZLIB:
+        body = zlib.decompress(body)
+
+    rows, cols = header["shape"]
+    q = np.frombuffer(body, dtype="<u2").reshape(rows, cols).copy()
+    if flags & FLAG_DELTA:
+        q = np.cumsum(q, axis=0, dtype=np.uint16)
+    quant = header["quant"]
+    values = quant["offset"] + q.astype(np.float64) * quant["scale"]
+    values[q == quant["missing"]] = np.nan
+    return header, values
@@ -14,9 +14,10 @@ Aktif kontroller (DB tabloları mevcut):
 - ✅ ``hydro_features`` (25K göl/nehir polygon) → solar/wind yasaklı, hydro fırsat
 - ✅ ``restricted_zones`` (boş — B-4'te OSM Overpass ile doldurulacak) → solar/wind yasaklı
 - ✅ ``energy_corridors`` (190K iletim hattı) → mesafe bilgisi note olarak
+- ✅ Yükseklik/eğim → `terrain_provider` (yerel DEM, yoksa Open-Meteo)
 
 İl/ilçe reverse geocoding (province/district):
-- GADM/OSM GeoJSON dosyasından **lazy yüklenir, RAM'de cache** (tek dosya ~10 MB)
+- Ortak `reverse_geocoder` servisi (GADM/OSM GeoJSON, STRtree, lazy + LRU)
 - Borders router'ın okuduğu dosya — tutarlılık garanti
 
 Eksik kontroller (DB'de tablo yok, ileride OSM import ile gelecek):
@@ -24,7 +25,6 @@ Eksik kontroller (DB'de tablo yok, ileride OSM import ile gelecek):
 - ⏳ Yol/demiryolu mesafesi
 - ⏳ Landuse (residential/commercial/industrial/cemetery)
 - ⏳ Doğal yapılar (wetland/cliff/glacier)
-- ⏳ DEM elevation/slope (rio-tiler ayrı sprint)
 
 Eksik kontroller için "veri yok, atlandı" notu döner — analiz patlamaz.
 """
@@ -32,45 +32,17 @@ from __future__ import annotations
 
 import json
 import logging
-from functools import lru_cache
-from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Sequence, Tuple
 
 from sqlalchemy import text
 
 from app.db.database import _engine
+from app.services import reverse_geocoder
+from app.services.terrain_provider import get_terrain_provider
 
 logger = logging.getLogger(__name__)
 
 
-# ───────────────────────────────────────────────────────────────────────────
-# GADM lazy cache (reverse geocoding için)
-# ───────────────────────────────────────────────────────────────────────────
-_GADM_DISTRICTS_PATH = (
-    Path(__file__).resolve().parent.parent.parent
-    / "data" / "vector" / "turkey_districts_osm.geojson"
-)
-
-
-@lru_cache(maxsize=1)
-def _gadm_districts_gdf():
-    """GADM ilçe polygonlarını GeoPandas DataFrame olarak lazy yükler.
-
-    Boyut ~10 MB, ilk çağrıda ~1 sn. Sonraki çağrılar bellek hit (`lru_cache`).
-    """
-    try:
-        import geopandas as gpd
-        if not _GADM_DISTRICTS_PATH.exists():
-            logger.warning("[geo_service] GADM dosyası bulunamadı: %s", _GADM_DISTRICTS_PATH)
-            return None
-        gdf = gpd.read_file(_GADM_DISTRICTS_PATH)
-        logger.info("[geo_service] GADM yüklendi: %d ilçe polygon", len(gdf))
-        return gdf
-    except Exception as e:
-        logger.exception("[geo_service] GADM okunamadı: %s", e)
-        return None
-
-
 # ───────────────────────────────────────────────────────────────────────────
 # Ana servis
 # ───────────────────────────────────────────────────────────────────────────
@@ -105,15 +77,59 @@ class GeoService:
                 loc_info, 0, 0, lat, lon,
             )
 
-        # 2026-06-04 (PERF): elevation/slope Open-Meteo'ya ağ çağrısı (cache miss'te
-        # yavaş, hele backfill IP'yi zorlarken). Kısa timeout + graceful (0,0)
-        # fallback _get_terrain_data içinde; başarısız olursa eğim kontrolü atlanır.
+        # 2026-06-04 (PERF): yerel DEM yoksa elevation/slope Open-Meteo'ya ağ
+        # çağrısı (cache miss'te yavaş). Kısa timeout + graceful (0,0) fallback
+        # _get_terrain_data içinde; başarısız olursa eğim kontrolü atlanır.
         elevation, slope = self._get_terrain_data(lat, lon)
 
-        # 2. Üç enerji türü için ayrı analiz
-        solar = self._analyze_solar(lat, lon, slope)
-        wind = self._analyze_wind(lat, lon, slope)
-        hydro = self._analyze_hydro(lat, lon, elevation)
+        # 2. PostGIS kontrolleri (su, yasaklı bölge, yerleşim, hat, akarsu)
+        facts = self._point_facts(lat, lon)
+        return self._analyze_with_facts(lat, lon, loc_info, elevation, slope, facts)
+
+    def analyze_locations(self, points: Sequence[Tuple[float, float]]) -> List[dict]:
+        """Çoklu koordinat için `analyze_location` — giriş sırasıyla aynı şema.
+
+        Nokta başına ~10 ayrı sorgu yerine her tablo için tek `unnest` +
+        `LATERAL` sorgusu (`_batch_point_facts`), il/ilçe tek toplu geocoder
+        çağrısı, yükseklik/eğim `terrain_provider`'dan tek toplu çağrı.
+        """
+        if not points:
+            return []
+        lats = [float(p[0]) for p in points]
+        lons = [float(p[1]) for p in points]
+        locs = reverse_geocoder.locate_many(lats, lons)
+
+        results: List[Optional[dict]] = [None] * len(points)
+        inside: List[int] = []
+        for i, loc in enumerate(locs):
+            if loc.get("province"):
+                inside.append(i)
+            else:
+                error = "Arazi sınırları dışında (Türkiye dışı veya su)."
+                results[i] = self._final_response(
+                    False, False, False,
+                    [error], [error], [error],
+                    [], [], [],
+                    loc, 0, 0, lats[i], lons[i],
+                )
+        if inside:
+            in_lats = [lats[i] for i in inside]
+            in_lons = [lons[i] for i in inside]
+            terrain = self._get_terrain_batch(in_lats, in_lons)
+            facts = self._batch_point_facts(in_lats, in_lons)
+            for k, i in enumerate(inside):
+                elevation, slope = terrain[k]
+                results[i] = self._analyze_with_facts(
+                    lats[i], lons[i], locs[i], elevation, slope, facts[k],
+                )
+        return results  # type: ignore[return-value]
+
+    def _analyze_with_facts(self, lat: float, lon: float, loc_info: dict,
+                            elevation: float, slope: float, facts: dict) -> dict:
+        """Üç enerji türü için ayrı analiz — tekil ve toplu yol ortak."""
+        solar = self._analyze_solar(lat, lon, slope, facts)
+        wind = self._analyze_wind(lat, lon, slope, facts)
+        hydro = self._analyze_hydro(lat, lon, elevation, facts)
 
         return self._final_response(
             solar["suitable"], wind["suitable"], hydro["suitable"],
@@ -122,11 +138,144 @@ class GeoService:
             loc_info, elevation, slope, lat, lon,
         )
 
+    # ── Nokta olguları (PostGIS) ───────────────────────────────────────────
+    # facts: water_type, zone, populated_type, building_count, corridor_m,
+    # river_m — analizler yalnızca bu sözlüğü okur.
+
+    _WATER_BODY_TYPES = ("water", "reservoir", "wetland", "glacier", "dock")
+    _BUILDING_RADIUS_M = 100
+
+    def _point_facts(self, lat: float, lon: float) -> dict:
+        """Tek nokta için olgular (nokta başına ayrı sorgular)."""
+        water_type = self._water_type_at(lat, lon)
+        populated_type = self._populated_type_at(lat, lon)
+        return {
+            "water_type": water_type,
+            "zone": self._zone_at_point(lat, lon, "restricted_zones"),
+            "populated_type": populated_type,
+            # Polygon ile zaten bloklandıysa bina sayımı gereksiz
+            "building_count": None if populated_type else self._building_count_within(
+                lat, lon, radius_m=self._BUILDING_RADIUS_M,
+            ),
+            "corridor_m": self._nearest_distance_m(lat, lon, "energy_corridors"),
+            # Su kütlesi / nehir kıyısı içindeyse akarsu mesafesi kullanılmaz
+            "river_m": None if water_type in self._WATER_BODY_TYPES + ("riverbank",)
+            else self._nearest_distance_m_filtered(lat, lon, "hydro_features", "riverbank"),
+        }
+
+    _BATCH_POINTS_CTE = """
+        WITH pts AS (
+            SELECT u.i, ST_SetSRID(ST_MakePoint(u.lon, u.lat), 4326) AS g
+            FROM unnest(CAST(:lons AS float8[]), CAST(:lats AS float8[]))
+                 WITH ORDINALITY AS u(lon, lat, i)
+        )
+    """
+
+    def _batch_point_facts(self, lats: List[float], lons: List[float]) -> List[dict]:
+        """`_point_facts`'in toplu karşılığı — tablo başına tek sorgu.
+
+        Her sorgu noktaları `unnest(...) WITH ORDINALITY` ile satıra açar ve
+        `LEFT JOIN LATERAL` ile tekil sorgunun aynısını nokta başına çalıştırır
+        (GIST index'leri aynen kullanılır). Tablo yoksa / sorgu hatası → o
+        olgu tüm noktalar için None (tekil yoldaki graceful skip).
+        """
+        bd = 30.0 / 111.0  # _nearest_distance_m search_km=30 bbox'ı
+        hydro = self._batch_lateral(lats, lons, """
+            SELECT p.i, w.feature_type, r.d
+            FROM pts p
+            LEFT JOIN LATERAL (
+                SELECT feature_type FROM hydro_features
+                WHERE ST_Contains(geom, p.g)
+                LIMIT 1
+            ) w ON true
+            LEFT JOIN LATERAL (
+                SELECT MIN(ST_Distance(geom::geography, p.g::geography)) AS d
+                FROM hydro_features
+                WHERE feature_type = 'riverbank'
+                  AND geom && ST_Expand(p.g, :bd)
+            ) r ON true
+        """, "hydro_features", {"bd": bd})
+        zones = self._batch_lateral(lats, lons, """
+            SELECT p.i, z.label
+            FROM pts p
+            LEFT JOIN LATERAL (
+                SELECT COALESCE(name, feature_type, 'unknown') AS label
+                FROM restricted_zones
+                WHERE ST_Contains(geom, p.g)
+                LIMIT 1
+            ) z ON true
+        """, "restricted_zones")
+        corridors = self._batch_lateral(lats, lons, """
+            SELECT p.i, c.d
+            FROM pts p
+            LEFT JOIN LATERAL (
+                SELECT MIN(ST_Distance(geom::geography, p.g::geography)) AS d
+                FROM energy_corridors
+                WHERE geom && ST_Expand(p.g, :bd)
+            ) c ON true
+        """, "energy_corridors", {"bd": bd})
+        populated = self._batch_lateral(lats, lons, """
+            SELECT p.i, a.feature_type
+            FROM pts p
+            LEFT JOIN LATERAL (
+                SELECT feature_type FROM populated_areas
+                WHERE ST_Contains(geom, p.g)
+                LIMIT 1
+            ) a ON true
+        """, "populated_areas", quiet=True)
+        buildings = self._batch_lateral(lats, lons, """
+            SELECT p.i, b.n
+            FROM pts p
+            LEFT JOIN LATERAL (
+                SELECT COUNT(*) AS n FROM buildings_footprint
+                WHERE ST_DWithin(geom::geography, p.g::geography, :r)
+            ) b ON true
+        """, "buildings_footprint", {"r": self._BUILDING_RADIUS_M}, quiet=True)
+
+        out = []
+        for k in range(len(lats)):
+            water_type = hydro[k][0] if hydro[k] else None
+            populated_type = populated[k][0] if populated[k] else None
+            building_n = buildings[k][0] if buildings[k] is not None else None
+            river_m = hydro[k][1] if hydro[k] else None
+            out.append({
+                "water_type": water_type or None,
+                "zone": (zones[k][0] or None) if zones[k] else None,
+                "populated_type": str(populated_type) if populated_type else None,
+                "building_count": None if populated_type or building_n is None else int(building_n),
+                "corridor_m": float(corridors[k][0]) if corridors[k] and corridors[k][0] is not None else None,
+                "river_m": None if water_type in self._WATER_BODY_TYPES + ("riverbank",)
+                or river_m is None else float(river_m),
+            })
+        return out
+
+    def _batch_lateral(self, lats: List[float], lons: List[float], select_sql: str,
+                       label: str, params: Optional[dict] = None,
+                       quiet: bool = False) -> List[Optional[tuple]]:
+        """`_BATCH_POINTS_CTE` + verilen SELECT → nokta sırasıyla satır değerleri
+        (ilk kolon = 1 tabanlı nokta indeksi). Hata → tüm noktalar None."""
+        out: List[Optional[tuple]] = [None] * len(lats)
+        try:
+            with _engine.connect() as c:
+                rows = c.execute(
+                    text(self._BATCH_POINTS_CTE + select_sql),
+                    {"lats": list(lats), "lons": list(lons), **(params or {})},
+                ).fetchall()
+        except Exception as e:
+            # Tablo yoksa relation not found — tekil yoldaki gibi sessiz geç
+            (logger.debug if quiet else logger.warning)(
+                "[geo_service] batch %s hatası: %s", label, e,
+            )
+            return out
+        for row in rows:
+            out[int(row[0]) - 1] = tuple(row[1:])
+        return out
+
     # ── Reverse geocoding ──────────────────────────────────────────────────
 
     def _get_location_info(self, point=None, lat: Optional[float] = None,
                             lon: Optional[float] = None) -> dict:
-        """Koordinattan il/ilçe — GADM polygon contains.
+        """Koordinattan il/ilçe — ortak `reverse_geocoder` (STRtree + LRU).
 
         Args:
             point: Eski API geri uyumluluk (shapely.Point); kullanılmaz.
@@ -136,109 +285,31 @@ class GeoService:
         """
         if lat is None or lon is None:
             return {"province": "", "district": ""}
-        gdf = _gadm_districts_gdf()
-        if gdf is None:
-            return {"province": "", "district": ""}
-        try:
-            from shapely.geometry import Point
-            pt = Point(lon, lat)
-            # Spatial index ile hızlı bbox filtresi
-            candidates = gdf.cx[lon:lon, lat:lat]
-            if candidates.empty:
-                return {"province": "", "district": ""}
-            hit = candidates[candidates.geometry.contains(pt)]
-            if hit.empty:
-                return {"province": "", "district": ""}
-            row = hit.iloc[0]
-            return {
-                "province": str(row.get("NAME_1", "") or ""),
-                "district": str(row.get("NAME_2", "") or ""),
-            }
-        except Exception as e:
-            logger.warning("[geo_service] location_info hatası: %s", e)
-            return {"province": "", "district": ""}
-
-    # ── Terrain (elevation/slope) — Open-Meteo Elevation API ──────────────
-    # 2026-05-17 Sprint S2 — DEM .tif'ten kurtulduk. Open-Meteo Elevation
-    # ücretsiz API (10K istek/gün). Tek istekte 5 nokta batch:
-    # ana nokta + 4 komşu (kuzey/güney/doğu/batı) → slope hesabı.
-    # Redis cache TTL 7 gün (terrain neredeyse hiç değişmez).
+        return reverse_geocoder.locate(lat, lon)
 
-    _ELEVATION_API_URL = "https://api.open-meteo.com/v1/elevation"
-    _ELEVATION_CACHE_TTL = 7 * 24 * 3600  # 7 gün
-    _SLOPE_OFFSET_DEG = 0.001  # ≈111m kuzey-güney; doğu-batı enlem-bağımlı
+    # ── Terrain (elevation/slope) ─────────────────────────────────────────
+    # `terrain_provider`: yerel DEM (rasterio windowed read, Horn eğimi) varsa
+    # o, yoksa Open-Meteo Elevation API (ana + 4 komşu, Redis 7 gün).
 
     def _get_terrain_data(self, lat: float, lon: float) -> tuple[float, float]:
-        """Open-Meteo Elevation API'den yükseklik + 4 komşu noktadan slope.
+        """Yükseklik + eğim.
 
         Returns:
-            (elevation_m, slope_degrees) — API hata ise (0.0, 0.0) fallback.
+            (elevation_m, slope_degrees) — veri yoksa (0.0, 0.0) fallback.
         """
-        from app.services.redis_cache import cache_get, cache_set
-        import math
-        import requests
-
-        # 100m precision round (0.001° ≈ 111m). Aynı bölgeye birden fazla pin
-        # için tek API çağrısı yeter.
-        lat_r = round(lat, 3)
-        lon_r = round(lon, 3)
-        cache_key = f"elevation:{lat_r}:{lon_r}"
-
-        cached = cache_get(cache_key)
-        if cached and isinstance(cached, dict):
-            return (
-                float(cached.get("elevation", 0.0)),
-                float(cached.get("slope", 0.0)),
-            )
+        return self._get_terrain_batch([lat], [lon])[0]
 
+    def _get_terrain_batch(self, lats: List[float], lons: List[float]) -> List[tuple[float, float]]:
+        """`_get_terrain_data`'nın çoklu nokta hali (nokta sırasıyla)."""
         try:
-            # 5 nokta batch: [ana, N, S, E, W]
-            # E/W offset enlem-bağımlı: lon_offset = lat_offset / cos(lat)
-            lat_offset = self._SLOPE_OFFSET_DEG
-            lon_offset = lat_offset / max(math.cos(math.radians(lat_r)), 0.1)
-
-            lats = f"{lat_r},{lat_r + lat_offset},{lat_r - lat_offset},{lat_r},{lat_r}"
-            lons = f"{lon_r},{lon_r},{lon_r},{lon_r + lon_offset},{lon_r - lon_offset}"
-
-            # 2026-06-04 (PERF): timeout 5→2.5sn. Open-Meteo yavaş/throttled ise
-            # hızlı vazgeç → suitability eğimsiz (slope=0) döner; konum analizi
-            # kullanıcıyı bekletmez. Eğim yalnız aşırı-dik araziyi eler (nadir).
-            resp = requests.get(
-                self._ELEVATION_API_URL,
-                params={"latitude": lats, "longitude": lons},
-                timeout=2.5,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            elevations = data.get("elevation", [])
-            if not elevations or len(elevations) < 1:
-                return 0.0, 0.0
-
-            ana = float(elevations[0])
-            slope_deg = 0.0
-            if len(elevations) >= 5:
-                # Slope: ana noktada max gradient (kuzey-güney / doğu-batı)
-                # |∂h/∂x| ≈ (N-S) / 2*dist, dist ≈ 111m (0.001°)
-                dist_ns = 111.0 * lat_offset * 1000  # m
-                dist_ew = 111.0 * lon_offset * 1000 * math.cos(math.radians(lat_r))
-                grad_ns = (float(elevations[1]) - float(elevations[2])) / max(dist_ns, 1)
-                grad_ew = (float(elevations[3]) - float(elevations[4])) / max(dist_ew, 1)
-                slope_rad = math.atan(math.sqrt(grad_ns**2 + grad_ew**2))
-                slope_deg = math.degrees(slope_rad)
-
-            cache_set(
-                cache_key,
-                {"elevation": ana, "slope": round(slope_deg, 2)},
-                ttl_seconds=self._ELEVATION_CACHE_TTL,
-            )
-            return ana, round(slope_deg, 2)
+            return get_terrain_provider().terrain(lats, lons)
         except Exception as e:
-            logger.warning("[geo] Elevation API hatası (%.4f, %.4f): %s", lat, lon, e)
-            return 0.0, 0.0
+            logger.warning("[geo] terrain hatası (%d nokta): %s", len(lats), e)
+            return [(0.0, 0.0)] * len(lats)
 
     # ── Solar analizi (GES) ────────────────────────────────────────────────
 
-    def _analyze_solar(self, lat: float, lon: float, slope: float) -> dict:
+    def _analyze_solar(self, lat: float, lon: float, slope: float, facts: dict) -> dict:
         """GES — neredeyse her açık alanda uygun. Sadece 3 kesin yasak:
         (a) su üstü, (b) askeri/milli park, (c) çok dik yamaç (DEM hazır olunca).
 
@@ -250,19 +321,19 @@ class GeoService:
         suitable = True
 
         # 1. Su üstüne kurulamaz (water/reservoir/wetland/glacier/dock)
-        water_type = self._water_type_at(lat, lon)
+        water_type = facts["water_type"]
         if water_type:
             suitable = False
             reasons.append(self._water_yasak_label(water_type, "GES"))
 
         # 2. Askeri/milli park/koruma alanı içinde — yasaklı
-        zone = self._zone_at_point(lat, lon, "restricted_zones")
+        zone = facts["zone"]
         if zone:
             suitable = False
             reasons.append(f"Yasaklı bölge: {zone}")
 
         # 3. İletim hattı yakınlığı (note — fırsat)
-        corridor_m = self._nearest_distance_m(lat, lon, "energy_corridors")
+        corridor_m = facts["corridor_m"]
         if corridor_m is not None:
             if corridor_m < 500:
                 notes.append(f"⚡ İletim hattı çok yakın ({corridor_m:.0f}m) — düşük bağlantı maliyeti")
@@ -271,7 +342,7 @@ class GeoService:
             else:
                 notes.append(f"⚠️ İletim hattı {corridor_m/1000:.1f}km uzakta — ek hat maliyeti")
 
-        # 4. Eğim — Sprint S2: Open-Meteo Elevation gerçek değer
+        # 4. Eğim — terrain_provider (yerel DEM / Open-Meteo) gerçek değer
         if slope > 35:
             suitable = False
             reasons.append(f"Çok dik yamaç (Eğim: {slope:.1f}°)")
@@ -287,7 +358,7 @@ class GeoService:
 
     # ── Wind analizi (RES) ─────────────────────────────────────────────────
 
-    def _analyze_wind(self, lat: float, lon: float, slope: float) -> dict:
+    def _analyze_wind(self, lat: float, lon: float, slope: float, facts: dict) -> dict:
         """RES — şartlı: yerleşim/orman/su/askeri uzak, dik olmayan yer.
 
         Mevcut DB tabloları: water (yasak), restricted (yasak), corridor (mesafe),
@@ -298,13 +369,13 @@ class GeoService:
         suitable = True
 
         # 1. Su üstüne kurulamaz
-        water_type = self._water_type_at(lat, lon)
+        water_type = facts["water_type"]
         if water_type:
             suitable = False
             reasons.append(self._water_yasak_label(water_type, "RES"))
 
         # 2. Yasaklı bölge (askeri / milli park / koruma alanı)
-        zone = self._zone_at_point(lat, lon, "restricted_zones")
+        zone = facts["zone"]
         if zone:
             suitable = False
             reasons.append(f"Yasaklı bölge: {zone}")
@@ -312,7 +383,7 @@ class GeoService:
         # 2b. 2026-05-27 (N3) — Yaşam alanı (OSM residential/commercial/retail/
         # school polygon). Türbin gürültüsü + gölge flicker + güvenlik mesafesi
         # → şehir/kasaba/köy yerleşim alanına RES kurulmaz.
-        pop_type = self._populated_type_at(lat, lon)
+        pop_type = facts["populated_type"]
         if pop_type:
             suitable = False
             label = {
@@ -337,7 +408,7 @@ class GeoService:
         #   Kayseri 4 → bloklamaz (OSM Türkiye coverage gap)
         #   Tuz Gölü/Toroslar 0 → kırsal ✓
         if not pop_type:  # Zaten polygon ile bloklandıysa tekrar etme
-            building_n = self._building_count_within(lat, lon, radius_m=100)
+            building_n = facts["building_count"]
             if building_n is not None and building_n >= 5:
                 suitable = False
                 reasons.append(
@@ -353,7 +424,7 @@ class GeoService:
             notes.append("⛰️ Eğimli arazi — rüzgar potansiyeli yüksek olabilir")
 
         # 4. İletim hattı (RES için kritik — uzun hat maliyeti büyük)
-        corridor_m = self._nearest_distance_m(lat, lon, "energy_corridors")
+        corridor_m = facts["corridor_m"]
         if corridor_m is not None:
             if corridor_m < 1000:
                 notes.append(f"⚡ İletim hattı yakın ({corridor_m:.0f}m) — bağlantı kolay")
@@ -422,7 +493,7 @@ class GeoService:
 
     # ── Hydro analizi (HES) ────────────────────────────────────────────────
 
-    def _analyze_hydro(self, lat: float, lon: float, elevation: float) -> dict:
+    def _analyze_hydro(self, lat: float, lon: float, elevation: float, facts: dict) -> dict:
         """HES — sadece **akarsu** kıyısında (riverbank ≤500m, river ≤1km).
 
         Karada (akarsu uzaksa) HES kurulamaz. Göl/baraj/wetland içinde değil
@@ -432,8 +503,8 @@ class GeoService:
         notes = []
 
         # Önce: koordinatın hangi su tipinde olduğunu bul
-        water_type = self._water_type_at(lat, lon)
-        if water_type in ("water", "reservoir", "wetland", "glacier", "dock"):
+        water_type = facts["water_type"]
+        if water_type in self._WATER_BODY_TYPES:
             # Mevcut göl/baraj/sulak/buzul içinde — HES kurulmaz
             return {
                 "suitable": False,
@@ -447,14 +518,12 @@ class GeoService:
                 "reasons": [],
                 "notes": [
                     "💧 Nehir kıyısı: HES kurulumu için ideal (akış halinde su mevcut)",
-                    f"⛰️ Yükseklik: {elevation:.0f} m" if elevation else "⛰️ Yükseklik bilgisi alınamadı (Open-Meteo API)",
+                    f"⛰️ Yükseklik: {elevation:.0f} m" if elevation else "⛰️ Yükseklik bilgisi alınamadı",
                 ],
             }
 
         # Karada — en yakın AKARSU (riverbank) mesafesi
-        river_m = self._nearest_distance_m_filtered(
-            lat, lon, "hydro_features", "riverbank",
-        )
+        river_m = facts["river_m"]
 
         if river_m is None or river_m > 5000:
             # 5 km içinde nehir yok — HES kurulamaz
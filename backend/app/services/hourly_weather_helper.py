@@ -7,12 +7,29 @@ gerçek saatlik veri çeker.
 
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import and_
 
 from app.db.models import HourlyWeatherData
 
 
+def _nearest_hourly_location(
+    system_db: Session,
+    latitude: float,
+    longitude: float,
+    cutoff: datetime,
+):
+    """`cutoff` sonrası kaydı olan en yakın hourly lokasyonu (yoksa None).
+
+    Ham tablo üzerinde `ORDER BY` taraması yerine süreç içi KD-tree
+    (`station_index`, karesel mesafe — aynı ölçüt).
+    """
+    from app.services import station_index
+
+    return station_index.get_index(system_db, "raw").nearest(latitude, longitude, cutoff)
+
+
 def get_hourly_weather_for_pin(
     system_db: Session,
     latitude: float,
@@ -48,25 +65,7 @@ def get_hourly_weather_for_pin(
     cutoff = datetime.utcnow() - timedelta(days=days)
 
     # ── 1. En yakın noktayı bul ──────────────────────────────────────
-    # Son kaydı referans alarak en yakın lat/lon eşleşmesini bul.
-    # Karesel mesafe yeterli (Türkiye ölçeğinde cos düzeltmesine gerek yok).
-    nearest = (
-        system_db.query(
-            HourlyWeatherData.city_name,
-            HourlyWeatherData.district_name,
-            HourlyWeatherData.latitude,
-            HourlyWeatherData.longitude,
-        )
-        .filter(HourlyWeatherData.timestamp >= cutoff)
-        .order_by(
-            (
-                func.pow(HourlyWeatherData.latitude - latitude, 2)
-                + func.pow(HourlyWeatherData.longitude - longitude, 2)
-            )
-        )
-        .limit(1)
-        .first()
-    )
+    nearest = _nearest_hourly_location(system_db, latitude, longitude, cutoff)
 
     if nearest is None:
         return {"hours": [], "count": 0, "error": "Yakın veri noktası bulunamadı"}
@@ -121,6 +120,140 @@ def get_hourly_weather_for_pin(
     }
 
 
+# Dizi anahtarı → HourlyWeatherData kolonu (saat sözlüğü anahtarlarıyla aynı)
+HOURLY_ARRAY_COLUMNS: Dict[str, str] = {
+    "ghi_wm2": "shortwave_radiation",
+    "wind10_ms": "wind_speed_10m",
+    "wind100_ms": "wind_speed_100m",
+    "temp_c": "temperature_2m",
+    "precip_mm": "precipitation",
+    "cloud_pct": "cloud_cover",
+}
+
+
+def get_hourly_arrays_for_pin(
+    system_db: Session,
+    latitude: float,
+    longitude: float,
+    days: int = 365,
+) -> Dict[str, Any]:
+    """
+    `get_hourly_weather_for_pin`'in NumPy karşılığı — saat başına dict yerine
+    kolon başına dizi döner (vektörel verim hesapları için).
+
+    Önce kolonsal `hourly_weather_packed` deposundan okur (lokasyon-ay başına
+    tek satır); paket yoksa ham tabloya düşer. Eksik değerler 0.0 (dict
+    okuyucuyla aynı semantik).
+
+    Returns:
+        {
+            "city_name": str,
+            "district_name": str | None,
+            "ts": np.ndarray[datetime64[h]],
+            "ghi_wm2": np.ndarray[float32], "wind10_ms": ..., "wind100_ms": ...,
+            "temp_c": ..., "precip_mm": ..., "cloud_pct": ...,
+            "count": int,
+            "date_range": (min_ts, max_ts),
+            "source": "packed" | "raw",
+        }
+    """
+    from app.services import hourly_weather_store as store
+    from app.services import station_index
+
+    cutoff = datetime.utcnow() - timedelta(days=days)
+
+    nearest = station_index.get_index(system_db, "packed").nearest(
+        latitude, longitude, store.month_start_of(cutoff),
+    )
+    if nearest is not None:
+        result = load_hourly_arrays_at(system_db, nearest, cutoff, source="packed")
+        if result is not None:
+            return result
+
+    nearest = _nearest_hourly_location(system_db, latitude, longitude, cutoff)
+    if nearest is None:
+        return {"count": 0, "error": "Yakın veri noktası bulunamadı"}
+    return load_hourly_arrays_at(system_db, nearest, cutoff, source="raw")
+
+
+def load_hourly_arrays_at(
+    system_db: Session,
+    location: Any,
+    cutoff: datetime,
+    source: str = "packed",
+) -> Optional[Dict[str, Any]]:
+    """Bilinen bir lokasyonun (`city_name, district_name, latitude, longitude`
+    alanlı satır) `cutoff` sonrası dizilerini okur — `get_hourly_arrays_for_pin`
+    ile aynı dönüş şekli.
+
+    source="packed" → paket deposu; paket yoksa None (çağıran ham tabloya
+    düşebilir). source="raw" → ham tablo (her zaman sözlük döner).
+    """
+    from app.services import hourly_weather_store as store
+
+    arrays = None
+    if source == "packed":
+        packed = store.load_location_arrays(
+            system_db, location.latitude, location.longitude, cutoff,
+            columns=HOURLY_ARRAY_COLUMNS.values(),
+        )
+        if packed is None:
+            return None
+        arrays = {"ts": packed["ts"]}
+        for key, col in HOURLY_ARRAY_COLUMNS.items():
+            arrays[key] = np.nan_to_num(packed[col], nan=0.0)
+    else:
+        cols = [getattr(HourlyWeatherData, c) for c in HOURLY_ARRAY_COLUMNS.values()]
+        rows = (
+            system_db.query(HourlyWeatherData.timestamp, *cols)
+            .filter(
+                and_(
+                    HourlyWeatherData.latitude == location.latitude,
+                    HourlyWeatherData.longitude == location.longitude,
+                    HourlyWeatherData.timestamp >= cutoff,
+                )
+            )
+            .order_by(HourlyWeatherData.timestamp)
+            .all()
+        )
+        ts = np.array([r[0] for r in rows], dtype="datetime64[h]")
+        vals = np.array([r[1:] for r in rows], dtype=np.float32).reshape(len(rows), len(cols))
+        arrays = {"ts": ts}
+        for i, key in enumerate(HOURLY_ARRAY_COLUMNS):
+            arrays[key] = np.nan_to_num(vals[:, i], nan=0.0)
+
+    ts = arrays["ts"]
+    date_range = (ts[0].astype(datetime), ts[-1].astype(datetime)) if len(ts) else (None, None)
+    return {
+        "city_name": location.city_name,
+        "district_name": location.district_name,
+        **arrays,
+        "count": int(len(ts)),
+        "date_range": date_range,
+        "source": source,
+    }
+
+
+def hourly_station_index(
+    system_db: Session,
+    cutoff: datetime,
+) -> Tuple[Any, datetime, str]:
+    """Toplu işler için lokasyon indeksi: (indeks, since, kaynak).
+
+    Önce paket indeksi (`since` = cutoff'un ay başı); `cutoff` sonrası paketi
+    olan lokasyon yoksa ham tablo indeksi. Pinlerin en yakın lokasyonu tek tek
+    SQL yerine `index.nearest_many(lats, lons, since)` ile seçilir.
+    """
+    from app.services import hourly_weather_store as store
+    from app.services import station_index
+
+    index = station_index.get_index(system_db, "packed")
+    since = store.month_start_of(cutoff)
+    if index.active(since):
+        return index, since, "packed"
+    return station_index.get_index(system_db, "raw"), cutoff, "raw"
+
+
 def aggregate_hourly_to_monthly(
     hours: List[Dict[str, Any]],
 ) -> Dict[int, Dict[str, Any]]:
@@ -0,0 +1,293 @@
+"""
+SRRP — Kolonsal Saatlik Hava Deposu
+====================================
+
+`hourly_weather_data` her (lokasyon, saat) için geniş bir float8 satırı tutar;
+ağır endpoint'ler milyonlarca satır tarar. Bu modül aynı veriyi
+`hourly_weather_packed` tablosunda **lokasyon × ay** başına tek satırda,
+sıkıştırılmış float32 matris olarak tutar:
+
+    data = zlib(byte_shuffle(float32[len(PACKED_COLUMNS), n_hours]))
+
+  * Saat indeksi ay başından itibaren (timestamp saklanmaz, implicit).
+  * Kayıt olmayan saat → NaN (tüm kolonlar NaN = saat yok).
+  * Byte-shuffle: float32'nin 4 baytı ayrı düzlemlere ayrılır → üs baytları
+    art arda gelir, zlib oranı belirgin artar (blosc/parquet BYTE_STREAM_SPLIT).
+
+Ham tablo tek doğruluk kaynağı olmaya devam eder; paket her zaman oradan
+yeniden üretilebilir (`repack_range`). Scheduler saatlik çekimden sonra
+`patch_since` ile yalnızca yeni saatleri mevcut bloba yamar.
+
+Okuma: `load_location_arrays` → NumPy dizileri (kolon adı → float32[n]).
+`hourly_weather_helper.get_hourly_arrays_for_pin` bunun üstüne kurulur.
+"""
+from __future__ import annotations
+
+import logging
+import zlib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.db.models import HourlyWeatherPacked
+
+logger = logging.getLogger(__name__)
+
+# Matris satır sırası — değiştirilirse CODEC de değişmeli (eski bloblar okunamaz).
+PACKED_COLUMNS: Tuple[str, ...] = (
+    "temperature_2m",
+    "apparent_temperature",
+    "relative_humidity_2m",
+    "precipitation",
+    "cloud_cover",
+    "wind_speed_10m",
+    "wind_speed_100m",
+    "wind_direction_10m",
+    "wind_gusts_10m",
+    "shortwave_radiation",
+    "direct_radiation",
+    "diffuse_radiation",
+)
+CODEC = "f32-shuf-zlib"
+_ZLIB_LEVEL = 6
+_COL_INDEX = {c: i for i, c in enumerate(PACKED_COLUMNS)}
+
+
+# ─── Zaman yardımcıları ─────────────────────────────────────────────────────
+
+def month_start_of(ts: datetime) -> datetime:
+    """Timestamp'in ayının ilk saati (naive)."""
+    return ts.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def next_month(ms: datetime) -> datetime:
+    return ms.replace(year=ms.year + 1, month=1) if ms.month == 12 else ms.replace(month=ms.month + 1)
+
+
+def hours_in_month(ms: datetime) -> int:
+    return int((next_month(ms) - ms).total_seconds() // 3600)
+
+
+def _iter_months(start: datetime, end: datetime) -> Iterable[datetime]:
+    ms = month_start_of(start)
+    while ms < end:
+        yield ms
+        ms = next_month(ms)
+
+
+# ─── Codec ──────────────────────────────────────────────────────────────────
+
+def encode_matrix(mat: np.ndarray) -> bytes:
+    """float32 [kolon × saat] → byte-shuffle + zlib."""
+    arr = np.ascontiguousarray(mat, dtype="<f4")
+    shuffled = arr.view(np.uint8).reshape(-1, 4).T.copy()
+    return zlib.compress(shuffled.tobytes(), _ZLIB_LEVEL)
+
+
+def decode_matrix(blob: bytes, n_hours: int) -> np.ndarray:
+    """`encode_matrix` tersi → float32 [len(PACKED_COLUMNS) × n_hours]."""
+    raw = np.frombuffer(zlib.decompress(blob), dtype=np.uint8)
+    unshuffled = raw.reshape(4, -1).T.copy()
+    return unshuffled.view("<f4").reshape(len(PACKED_COLUMNS), n_hours)
+
+
+def _empty_matrix(n_hours: int) -> np.ndarray:
+    return np.full((len(PACKED_COLUMNS), n_hours), np.nan, dtype=np.float32)
+
+
+# ─── Yazma ──────────────────────────────────────────────────────────────────
+
+_RAW_SELECT = text(
+    "SELECT latitude, longitude, city_name, district_name, location_code, "
+    "timestamp, " + ", ".join(PACKED_COLUMNS) + " "
+    "FROM hourly_weather_data "
+    "WHERE timestamp >= :start AND timestamp < :end "
+    "AND latitude IS NOT NULL AND longitude IS NOT NULL"
+)
+
+# (lat, lon, month_start) → {"meta": (city, district, code), "idx": [...], "vals": [...]}
+_Groups = Dict[Tuple[float, float, datetime], Dict[str, Any]]
+
+
+def _group_raw_rows(rows) -> _Groups:
+    groups: _Groups = defaultdict(lambda: {"meta": None, "idx": [], "vals": []})
+    for r in rows:
+        ts = r[5]
+        ms = month_start_of(ts)
+        g = groups[(r[0], r[1], ms)]
+        if g["meta"] is None:
+            g["meta"] = (r[2], r[3], r[4])
+        g["idx"].append(int((ts - ms).total_seconds() // 3600))
+        g["vals"].append(r[6:])
+    return groups
+
+
+def _load_existing(db: Session, keys: List[Tuple[float, float, datetime]]) -> Dict[tuple, np.ndarray]:
+    """Yamanacak ayların mevcut matrislerini tek sorguda okur."""
+    months = sorted({k[2] for k in keys})
+    if not months:
+        return {}
+    wanted = set(keys)
+    out: Dict[tuple, np.ndarray] = {}
+    rows = (
+        db.query(
+            HourlyWeatherPacked.latitude,
+            HourlyWeatherPacked.longitude,
+            HourlyWeatherPacked.month_start,
+            HourlyWeatherPacked.n_hours,
+            HourlyWeatherPacked.codec,
+            HourlyWeatherPacked.data,
+        )
+        .filter(HourlyWeatherPacked.month_start.in_(months))
+        .all()
+    )
+    for lat, lon, ms, n_hours, codec, blob in rows:
+        key = (lat, lon, ms)
+        if key not in wanted or codec != CODEC:
+            continue
+        out[key] = decode_matrix(blob, n_hours).copy()
+    return out
+
+
+def _write_groups(db: Session, groups: _Groups, merge_existing: bool) -> int:
+    if not groups:
+        return 0
+    existing = _load_existing(db, list(groups)) if merge_existing else {}
+    payload = []
+    for (lat, lon, ms), g in groups.items():
+        n_hours = hours_in_month(ms)
+        mat = existing.get((lat, lon, ms))
+        if mat is None:
+            mat = _empty_matrix(n_hours)
+        vals = np.array(g["vals"], dtype=np.float32)  # None → NaN
+        mat[:, np.asarray(g["idx"], dtype=np.intp)] = vals.T
+        present = int((~np.isnan(mat).all(axis=0)).sum())
+        city, district, code = g["meta"]
+        payload.append({
+            "latitude": lat,
+            "longitude": lon,
+            "city_name": city,
+            "district_name": district,
+            "location_code": code,
+            "month_start": ms,
+            "n_hours": n_hours,
+            "n_present": present,
+            "codec": CODEC,
+            "data": encode_matrix(mat),
+        })
+
+    CHUNK = 200
+    for i in range(0, len(payload), CHUNK):
+        stmt = pg_insert(HourlyWeatherPacked.__table__).values(payload[i:i + CHUNK])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_hourly_packed_loc_month",
+            set_={
+                "city_name": stmt.excluded.city_name,
+                "district_name": stmt.excluded.district_name,
+                "location_code": stmt.excluded.location_code,
+                "n_hours": stmt.excluded.n_hours,
+                "n_present": stmt.excluded.n_present,
+                "codec": stmt.excluded.codec,
+                "data": stmt.excluded.data,
+                "updated_at": datetime.utcnow(),
+            },
+        )
+        db.execute(stmt)
+    db.commit()
+    return len(payload)
+
+
+def repack_range(db: Session, start: datetime, end: datetime) -> int:
+    """[start, end) aralığındaki ayları ham tablodan sıfırdan paketler.
+
+    Ay ay ilerler (bellek = tek ayın ham satırları). İlk doldurma ve
+    tutarlılık onarımı için; `scripts/build_hourly_packed.py` çağırır.
+    Döner: yazılan (lokasyon, ay) satır sayısı.
+    """
+    written = 0
+    for ms in _iter_months(start, end):
+        rows = db.execute(_RAW_SELECT, {"start": ms, "end": next_month(ms)}).fetchall()
+        n = _write_groups(db, _group_raw_rows(rows), merge_existing=False)
+        logger.info("[packed] %s: %d ham saat → %d lokasyon-ay",
+                    ms.strftime("%Y-%m"), len(rows), n)
+        written += n
+    return written
+
+
+def patch_since(db: Session, since: datetime) -> int:
+    """`since` sonrasında upsert edilen ham saatleri mevcut paketlere yamar.
+
+    Scheduler saatlik çekimden sonra çağırır — yalnızca yeni/revize saatler
+    okunur, ilgili ay blobu açılıp bu indeksler üzerine yazılır. Ay ay
+    ilerler (`repack_range` gibi) — geriye dönük geniş bir yamada bile
+    bellekte tek ayın ham satırları durur.
+    """
+    end = datetime.utcnow() + timedelta(days=16)
+    written = n_rows = 0
+    for ms in _iter_months(since, end):
+        rows = db.execute(
+            _RAW_SELECT, {"start": max(since, ms), "end": min(next_month(ms), end)}
+        ).fetchall()
+        written += _write_groups(db, _group_raw_rows(rows), merge_existing=True)
+        n_rows += len(rows)
+    logger.info("[packed] patch: %d ham saat → %d lokasyon-ay güncellendi", n_rows, written)
+    return written
+
+
+# ─── Okuma ──────────────────────────────────────────────────────────────────
+
+def load_location_arrays(
+    db: Session,
+    latitude: float,
+    longitude: float,
+    start: datetime,
+    end: Optional[datetime] = None,
+    columns: Iterable[str] = PACKED_COLUMNS,
+) -> Optional[Dict[str, np.ndarray]]:
+    """Tek lokasyonun [start, end] saatlerini NumPy dizileri olarak döner.
+
+    Returns:
+        {"ts": datetime64[h][n], "<kolon>": float32[n], ...} — yalnızca
+        kaydı olan saatler (tamamı NaN sütunlar atılır), zaman sıralı.
+        Paket yoksa None (çağıran ham tabloya düşer).
+    """
+    end = end or datetime.utcnow() + timedelta(days=16)
+    rows = (
+        db.query(
+            HourlyWeatherPacked.month_start,
+            HourlyWeatherPacked.n_hours,
+            HourlyWeatherPacked.codec,
+            HourlyWeatherPacked.data,
+        )
+        .filter(
+            HourlyWeatherPacked.latitude == latitude,
+            HourlyWeatherPacked.longitude == longitude,
+            HourlyWeatherPacked.month_start >= month_start_of(start),
+            HourlyWeatherPacked.month_start <= end,
+        )
+        .order_by(HourlyWeatherPacked.month_start)
+        .all()
+    )
+    rows = [r for r in rows if r.codec == CODEC]
+    if not rows:
+        return None
+
+    mats = [decode_matrix(r.data, r.n_hours) for r in rows]
+    ts = np.concatenate([
+        np.datetime64(r.month_start, "h") + np.arange(r.n_hours).astype("timedelta64[h]")
+        for r in rows
+    ])
+    mat = np.concatenate(mats, axis=1)
+
+    keep = ~np.isnan(mat).all(axis=0)
+    keep &= (ts >= np.datetime64(start, "h")) & (ts <= np.datetime64(end, "h"))
+
+    out: Dict[str, np.ndarray] = {"ts": ts[keep]}
+    for col in columns:
+        out[col] = mat[_COL_INDEX[col], keep]
+    return out
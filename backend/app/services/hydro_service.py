@@ -416,39 +416,31 @@ PENSTOCK_COST_PER_METER: Dict[str, float] = {
 
 def get_elevation(latitude: float, longitude: float) -> Optional[float]:
     """
-    Open-Meteo ücretsiz Elevation API ile rakım bilgisi çeker.
-    Sonuç metre (m) cinsinden.
+    Rakım bilgisi (m) — `terrain_provider` (yerel DEM, yoksa Open-Meteo
+    Elevation API). Alınamazsa None.
     """
-    url = "https://api.open-meteo.com/v1/elevation"
-    params = {"latitude": latitude, "longitude": longitude}
-    try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        elevations = data.get("elevation", [])
-        if elevations:
-            return float(elevations[0])
-        return None
-    except requests.RequestException:
-        return None
+    elevations = get_elevations_batch([{"lat": latitude, "lon": longitude}])
+    return elevations[0] if elevations else None
 
 
 def get_elevations_batch(points: list) -> list:
     """
-    Birden fazla nokta için tek API çağrısıyla rakım bilgisi çeker.
+    Birden fazla nokta için tek toplu çağrıyla rakım bilgisi çeker.
     points: [{"lat": ..., "lon": ...}, ...]
+    Herhangi bir nokta alınamazsa boş liste.
     """
-    lats = ",".join(str(p["lat"]) for p in points)
-    lons = ",".join(str(p["lon"]) for p in points)
-    url = "https://api.open-meteo.com/v1/elevation"
-    params = {"latitude": lats, "longitude": lons}
+    from app.services.terrain_provider import get_terrain_provider
+
+    if not points:
+        return []
     try:
-        resp = requests.get(url, params=params, timeout=10)
-        resp.raise_for_status()
-        data = resp.json()
-        return [float(e) for e in data.get("elevation", [])]
-    except requests.RequestException:
+        elevations = get_terrain_provider().elevations(
+            [float(p["lat"]) for p in points],
+            [float(p["lon"]) for p in points],
+        )
+    except Exception:
         return []
+    return elevations or []
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
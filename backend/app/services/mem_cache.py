@@ -0,0 +1,217 @@
+"""
+SRRP — Bayt Bütçeli LRU Bellek Cache
+====================================
+
+Redis yokken (veya tile'lar için ek hız katmanı olarak) kullanılan süreç içi
+cache. Eski sözlükler sınırsız büyüyordu: süresi dolan kayıtlar yalnızca
+okunduklarında siliniyordu, tile cache'i de yakın kullanıma göre değil ekleme
+sırasına göre atıyordu. Redis kapalıyken animasyon JSON'u, choropleth ve
+sınır yanıtları belleği doldurabiliyordu.
+
+``SizedLRU``:
+
+  * **Bayt bütçesi** — her kaydın boyutu (``sizeof``) tutulur; toplam
+    ``max_bytes``'ı aşınca en uzun süredir kullanılmayan kayıtlar atılır.
+    Bütçeden büyük tek kayıt hiç saklanmaz.
+  * **Gerçek LRU** — ``get`` kaydı sona taşır (``OrderedDict.move_to_end``).
+  * **Periyodik TTL süpürme** — ``sweep_interval`` saniyede bir, yazma
+    sırasında süresi dolan kayıtlar toplu silinir (okunmayan bayat kayıt
+    birikmez; arka plan thread'i yok).
+  * **Sayaçlar** — hit / miss / eviction / expiration / rejected + anlık
+    kayıt sayısı ve bayt (``stats()``, ``GET /system/cache``).
+
+Thread-safe (tek ``Lock``); FastAPI threadpool'undaki sync endpoint'lerden
+ve async handler'lardan güvenle çağrılabilir.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+_MB = 1024 * 1024
+
+
+# approx_size: kap başına ölçülen en fazla öğe (fazlası ortalamadan tahmin)
+# ve iniş derinliği (altı sys.getsizeof ile sığ sayılır)
+_SIZE_SAMPLE = 16
+_SIZE_DEPTH = 4
+
+
+def approx_size(value: Any, _depth: int = 0) -> int:
+    """Kaydın yaklaşık bellek maliyeti (bayt) — ``set`` başına ucuz.
+
+    bytes için uzunluk; str için UTF-8 bayt sayısı — ASCII'de uzunluk,
+    değilse kopyasız üst sınır ``4 * len`` (Türkçe karakterler 2 bayttır,
+    karakter saymak bütçeyi aşar). NumPy dizileri için ``nbytes``; kaplar için
+    ``sys.getsizeof`` + ilk ``_SIZE_SAMPLE`` öğenin ortalamasıyla
+    tahmin edilen öğe toplamı. Değer serileştirilmez (eskiden her yazımda
+    ``json.dumps`` — Redis yazımının serileştirmesini ikiler). Kesin boyutu
+    bilen çağıran ``SizedLRU.set(..., size=)`` geçer.
+    """
+    if isinstance(value, str):
+        return len(value) if value.isascii() else 4 * len(value)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    nbytes = getattr(value, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+    size = sys.getsizeof(value)
+    if _depth >= _SIZE_DEPTH or not isinstance(value, (dict, list, tuple, set, frozenset)):
+        return size
+    n = len(value)
+    if not n:
+        return size
+    items = value.items() if isinstance(value, dict) else value
+    sampled = total = 0
+    for item in items:
+        if isinstance(value, dict):
+            total += approx_size(item[0], _depth + 1) + approx_size(item[1], _depth + 1)
+        else:
+            total += approx_size(item, _depth + 1)
+        sampled += 1
+        if sampled == _SIZE_SAMPLE:
+            break
+    return size + total * n // sampled
+
+
+class SizedLRU:
+    """Bayt bütçeli, TTL'li, thread-safe LRU."""
+
+    def __init__(self, max_bytes: int, default_ttl: float = 3600.0,
+                 sizeof: Callable[[Any], int] = approx_size,
+                 sweep_interval: float = 60.0, name: str = "cache") -> None:
+        self.name = name
+        self.max_bytes = int(max_bytes)
+        self.default_ttl = default_ttl
+        self.sizeof = sizeof
+        self.sweep_interval = sweep_interval
+        # key → (value, expire_at_monotonic, size)
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._bytes = 0
+        self._lock = Lock()
+        self._next_sweep = time.monotonic() + sweep_interval
+        self.hits = self.misses = self.evictions = self.expirations = self.rejected = 0
+
+    # ── Okuma ───────────────────────────────────────────────────────────────
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            if time.monotonic() >= entry[1]:
+                self._drop(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def ttl(self, key: str) -> Optional[float]:
+        """Kalan ömür (sn); kayıt yoksa / süresi dolmuşsa None. Sayaçlara dokunmaz."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            remaining = entry[1] - time.monotonic()
+            return remaining if remaining > 0 else None
+
+    def __contains__(self, key: str) -> bool:
+        return self.ttl(key) is not None
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    # ── Yazma ───────────────────────────────────────────────────────────────
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None,
+            size: Optional[int] = None) -> bool:
+        """Kaydı yaz; bütçeden büyükse saklamaz (False)."""
+        size = self.sizeof(value) if size is None else size
+        now = time.monotonic()
+        expire_at = now + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+            if size > self.max_bytes:
+                self.rejected += 1
+                return False
+            if now >= self._next_sweep:
+                self._sweep(now)
+            self._data[key] = (value, expire_at, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key = next(iter(self._data))
+                self._drop(old_key)
+                self.evictions += 1
+            return True
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key in self._data:
+                self._drop(key)
+                return True
+            return False
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(prefix)]
+            for k in keys:
+                self._drop(k)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def sweep(self) -> int:
+        """Süresi dolan kayıtları hemen sil. Döner: silinen sayısı."""
+        with self._lock:
+            return self._sweep(time.monotonic())
+
+    # ── İstatistik ──────────────────────────────────────────────────────────
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "rejected": self.rejected,
+            }
+
+    # ── İç ──────────────────────────────────────────────────────────────────
+
+    def _drop(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def _sweep(self, now: float) -> int:
+        expired = [k for k, (_, exp, _) in self._data.items() if now >= exp]
+        for k in expired:
+            self._drop(k)
+        self.expirations += len(expired)
+        self._next_sweep = now + self.sweep_interval
+        return len(expired)
+
+
+def budget_from_env(var: str, default_mb: int) -> int:
+    """``SRRP_*_MB`` env değişkeninden bayt bütçesi (geçersizse varsayılan)."""
+    try:
+        return int(float(os.environ.get(var, default_mb)) * _MB)
+    except ValueError:
+        return default_mb * _MB
@@ -8,6 +8,10 @@ script (`build_ml_forecasts.py`) bunu kullanarak `ml_forecast` tablosunu dolduru
   2. Holt-Winters (statsmodels ExponentialSmoothing, additive seasonal)
   3. Linear + seasonal (numpy polyfit trend + aylık ortalama)
 
+Batch için 2 ve 3'ün toplu (vektörel) sürümü: `select_best_fast_batch` —
+tüm seriler tek matriste; script bunu SARIMAX'tan önce hızlı katman olarak
+kullanır.
+
 Climatology serisi çoğunlukla 12-ay ortalaması (×tekrar) olduğundan modeller
 benzer çıkar; framework gerçek çok-yıllık veri geldiğinde anlamlı ayrışır.
 """
@@ -15,6 +19,7 @@ from __future__ import annotations
 
 import logging
 import math
+from dataclasses import dataclass, field
 from datetime import date
 from typing import List, Optional, Tuple
 
@@ -69,19 +74,6 @@ def get_monthly_series(
     if field is None:
         return None
 
-    def _extract(monthly) -> Optional[List[float]]:
-        if not monthly or len(monthly) != 12:
-            return None
-        out: List[float] = []
-        for m in monthly:
-            if isinstance(m, dict):
-                out.append(float(m.get("mean", 0.0)))
-            elif isinstance(m, (int, float)):
-                out.append(float(m))
-            else:
-                return None
-        return out
-
     with SystemSessionLocal() as db:
         variants = province_aliases(province)
         # 1) İlçe spesifik
@@ -96,7 +88,7 @@ def get_monthly_series(
                 .first()
             )
             if row:
-                s = _extract(getattr(row, field, None))
+                s = _extract_climatology(getattr(row, field, None))
                 if s:
                     return s
         # 2) İl bazlı (district_name NULL)
@@ -110,7 +102,7 @@ def get_monthly_series(
             .first()
         )
         if row:
-            return _extract(getattr(row, field, None))
+            return _extract_climatology(getattr(row, field, None))
     return None
 
 
@@ -128,27 +120,24 @@ _DAILY_METRIC_COLS = {
 }
 
 
-def get_monthly_series_from_daily(
+def monthly_daily_series_sql(
     province: str,
     district: Optional[str],
     metric: str,
-) -> tuple[List[float], Optional["date"]]:  # type: ignore[name-defined]
-    """`weather_data` günlük tablosundan ilçe (veya il) için aylık seri.
+    last_months: Optional[int] = None,
+):
+    """`weather_data` günlüğünü aylıklaştıran sorgu: (metin, parametreler) —
+    satırlar (ay başı, ortalama), ay sırasıyla. Metrik bilinmiyorsa None.
 
-    İlçe climatology'si yok; bu fonksiyon raw 10 yıllık daily veriyi
-    `date_trunc('month')` ile aylıklaştırır (gerçek aylık varyasyon + uzun
-    vade trend → ML için zengin sinyal).
-
-    Returns: (values, start_date). start_date None = veri yok.
+    ``last_months`` verilirse yalnız son N ay (SQL'de kırpılır — akış
+    modunda satırlar doğrudan cursor'dan gönderilebilir).
     """
-    from datetime import date as _d
-    from app.db.database import SystemSessionLocal
     from sqlalchemy import text
     from app.services.province_aliases import province_aliases
 
     col = _DAILY_METRIC_COLS.get(metric)
     if not col:
-        return [], None
+        return None
 
     variants = province_aliases(province)
     where = ["province_name = ANY(:provs)", f"{col} IS NOT NULL"]
@@ -161,14 +150,42 @@ def get_monthly_series_from_daily(
     # IS NULL filtre koymak boş döndürürdü.
     where_sql = " AND ".join(where)
 
-    sql = text(f"""
+    monthly = f"""
         SELECT date_trunc('month', date)::date AS m, AVG({col}) AS v
         FROM weather_data
         WHERE {where_sql}
         GROUP BY 1
         HAVING COUNT(*) >= 10
-        ORDER BY 1
-    """)
+    """
+    if last_months is None:
+        return text(monthly + " ORDER BY 1"), params
+    params["last_months"] = int(last_months)
+    return text(f"""
+        SELECT m, v FROM ({monthly} ORDER BY 1 DESC LIMIT :last_months) t
+        ORDER BY m
+    """), params
+
+
+def get_monthly_series_from_daily(
+    province: str,
+    district: Optional[str],
+    metric: str,
+) -> tuple[List[float], Optional["date"]]:  # type: ignore[name-defined]
+    """`weather_data` günlük tablosundan ilçe (veya il) için aylık seri.
+
+    İlçe climatology'si yok; bu fonksiyon raw 10 yıllık daily veriyi
+    `date_trunc('month')` ile aylıklaştırır (gerçek aylık varyasyon + uzun
+    vade trend → ML için zengin sinyal).
+
+    Returns: (values, start_date). start_date None = veri yok.
+    """
+    from datetime import date as _d
+    from app.db.database import SystemSessionLocal
+
+    query = monthly_daily_series_sql(province, district, metric)
+    if query is None:
+        return [], None
+    sql, params = query
     with SystemSessionLocal() as db:
         rows = db.execute(sql, params).fetchall()
     if not rows:
@@ -246,6 +263,247 @@ def get_monthly_series_best(
     return get_monthly_series_from_daily(province, district, metric)
 
 
+# ─── Toplu seri yükleyici (batch için) ───────────────────────────────────────
+#
+# Yukarıdaki fonksiyonlar (lokasyon × metrik) başına ayrı sorgu atıyor; batch
+# binlerce küçük aggregate sorgusu demek. `load_monthly_series_bank` tüm
+# kaynakları tek geçişte okur:
+#   • weather_data: (il, ilçe, ay) başına metrik kolonlarının SUM + COUNT'u —
+#     tek GROUP BY, sunucu tarafı cursor. İl-seviyesi seri ilçe toplamlarından
+#     (ΣSUM / ΣCOUNT) türetilir → SQL'deki il AVG'si ile aynı.
+#   • monthly_climate: tek SELECT, il × ay.
+#   • climatology (opsiyonel): tek SELECT.
+# Sonuç yoğun NumPy dizileri (lokasyon × ay); `best()` / `climatology()`
+# tekil fonksiyonlarla aynı seriyi döndürür (il adı varyasyonları dahil).
+
+_BANK_BATCH = 20_000     # sunucu tarafı cursor parti boyutu
+_DAILY_MIN_DAYS = 10     # get_monthly_series_from_daily: HAVING COUNT(*) >= 10
+
+
+def _abs_month(d: date) -> int:
+    return d.year * 12 + d.month - 1
+
+
+def _from_abs_month(m: int) -> date:
+    return date(m // 12, m % 12 + 1, 1)
+
+
+class MonthlySeriesBank:
+    """Batch için bellek-içi aylık seri deposu (bkz. `load_monthly_series_bank`)."""
+
+    def __init__(self) -> None:
+        # weather_data: satır = (ham il adı, ilçe); sütun = month0'dan itibaren ay
+        self.daily_index: dict = {}                 # (il, ilçe) → satır
+        self.daily_rows_by_prov: dict = {}          # il → [satır]
+        self.daily_month0 = 0
+        self.daily_sum: dict = {}                   # kolon → (L × M) float
+        self.daily_count: dict = {}                 # kolon → (L × M) int
+        # monthly_climate: satır = ham il adı
+        self.mc_index: dict = {}
+        self.mc_month0 = 0
+        self.mc_values: dict = {}                   # kolon → (P × M) float (NaN = yok)
+        self.climatology_rows: dict = {}            # (il, ilçe, kaynak) → {alan: liste}
+
+    # ── Sorgular ───────────────────────────────────────────────────────────
+
+    def daily(self, province: str, district: Optional[str], metric: str,
+              ) -> tuple[List[float], Optional[date]]:
+        """`get_monthly_series_from_daily` eşdeğeri (sorgusuz)."""
+        import numpy as np  # type: ignore
+        col = _DAILY_METRIC_COLS.get(metric)
+        if not col or col not in self.daily_sum:
+            return [], None
+        rows: List[int] = []
+        for name in _aliases(province):
+            if district:
+                idx = self.daily_index.get((name, district))
+                if idx is not None:
+                    rows.append(idx)
+            else:
+                rows.extend(self.daily_rows_by_prov.get(name, ()))
+        if not rows:
+            return [], None
+        total = self.daily_sum[col][rows].sum(axis=0)
+        count = self.daily_count[col][rows].sum(axis=0)
+        months = np.flatnonzero(count >= _DAILY_MIN_DAYS)
+        if not len(months):
+            return [], None
+        values = total[months] / count[months]
+        return values.tolist(), _from_abs_month(self.daily_month0 + int(months[0]))
+
+    def monthly_climate(self, province: str, metric: str,
+                        ) -> tuple[List[float], Optional[date]]:
+        """`get_monthly_series_from_monthly_climate` eşdeğeri (sorgusuz)."""
+        import numpy as np  # type: ignore
+        col = _MONTHLY_CLIMATE_COLS.get(metric)
+        if not col or col not in self.mc_values:
+            return [], None
+        months, values = [], []
+        for name in _aliases(province):
+            idx = self.mc_index.get(name)
+            if idx is None:
+                continue
+            row = self.mc_values[col][idx]
+            present = np.flatnonzero(~np.isnan(row))
+            months.append(present)
+            values.append(row[present])
+        if not months:
+            return [], None
+        months_arr = np.concatenate(months)
+        if len(months_arr) < 24:
+            return [], None
+        order = np.argsort(months_arr, kind="stable")     # ORDER BY year, month
+        return (np.concatenate(values)[order].tolist(),
+                _from_abs_month(self.mc_month0 + int(months_arr[order[0]])))
+
+    def best(self, province: str, district: Optional[str], metric: str,
+             ) -> tuple[List[float], Optional[date]]:
+        """`get_monthly_series_best` eşdeğeri (sorgusuz)."""
+        if district is None:
+            mc_vals, mc_start = self.monthly_climate(province, metric)
+            if mc_vals and len(mc_vals) >= 24:
+                return mc_vals, mc_start
+        return self.daily(province, district, metric)
+
+    def climatology(self, province: str, district: Optional[str], resource: str,
+                    metric: str) -> Optional[List[float]]:
+        """`get_monthly_series` eşdeğeri (sorgusuz)."""
+        field_name = _FIELD_MAP.get(metric)
+        if field_name is None:
+            return None
+        names = _aliases(province)
+        for dist in ((district, None) if district else (None,)):
+            for name in names:
+                row = self.climatology_rows.get((name, dist, resource))
+                if row is None:
+                    continue
+                series = _extract_climatology(row.get(field_name))
+                if series or dist is None:
+                    return series
+                break
+        return None
+
+
+_ALIAS_CACHE: dict = {}
+
+
+def _aliases(province: str) -> List[str]:
+    from app.services.province_aliases import province_aliases
+    if province not in _ALIAS_CACHE:
+        _ALIAS_CACHE[province] = list(province_aliases(province))
+    return _ALIAS_CACHE[province]
+
+
+def _extract_climatology(monthly) -> Optional[List[float]]:
+    if not monthly or len(monthly) != 12:
+        return None
+    out: List[float] = []
+    for m in monthly:
+        if isinstance(m, dict):
+            out.append(float(m.get("mean", 0.0)))
+        elif isinstance(m, (int, float)):
+            out.append(float(m))
+        else:
+            return None
+    return out
+
+
+def load_monthly_series_bank(
+    metrics,
+    province_filter: Optional[str] = None,
+    daily: bool = True,
+    climatology: bool = False,
+) -> MonthlySeriesBank:
+    """Batch'in ihtiyaç duyduğu tüm aylık serileri tek geçişte yükle.
+
+    ``metrics``: hesaplanacak metrikler (kolonlar tekilleştirilir).
+    ``province_filter``: tek il (varyasyonlarıyla); None = tüm Türkiye.
+    ``daily``: weather_data + monthly_climate; ``climatology``: climatology JSON.
+    """
+    import numpy as np  # type: ignore
+    from app.db.database import SystemSessionLocal
+    from sqlalchemy import text
+
+    bank = MonthlySeriesBank()
+    provs = _aliases(province_filter) if province_filter else None
+    prov_where = "AND province_name = ANY(:provs)" if provs else ""
+    params = {"provs": provs} if provs else {}
+
+    with SystemSessionLocal() as db:
+        daily_cols = sorted({_DAILY_METRIC_COLS[m] for m in metrics if m in _DAILY_METRIC_COLS})
+        if daily and daily_cols:
+            aggs = ", ".join(f"COUNT({c}), SUM({c})" for c in daily_cols)
+            sql = text(f"""
+                SELECT province_name, district_name,
+                       (EXTRACT(YEAR FROM date) * 12 + EXTRACT(MONTH FROM date) - 1)::int AS m,
+                       {aggs}
+                FROM weather_data
+                WHERE province_name IS NOT NULL {prov_where}
+                GROUP BY 1, 2, 3
+            """).execution_options(yield_per=_BANK_BATCH)
+            keys, months, stats = [], [], []
+            for chunk in db.execute(sql, params).partitions():
+                for r in chunk:
+                    keys.append((r[0], r[1]))
+                    months.append(r[2])
+                    stats.append(tuple(float(v or 0) for v in r[3:]))
+            if keys:
+                for key in keys:
+                    if key not in bank.daily_index:
+                        bank.daily_index[key] = len(bank.daily_index)
+                        bank.daily_rows_by_prov.setdefault(key[0], []).append(
+                            bank.daily_index[key])
+                loc = np.array([bank.daily_index[k] for k in keys])
+                mon = np.array(months)
+                bank.daily_month0 = int(mon.min())
+                mon -= bank.daily_month0
+                shape = (len(bank.daily_index), int(mon.max()) + 1)
+                stat_arr = np.array(stats)
+                for i, col in enumerate(daily_cols):
+                    count = np.zeros(shape, dtype=np.int64)
+                    total = np.zeros(shape)
+                    count[loc, mon] = stat_arr[:, 2 * i]
+                    total[loc, mon] = stat_arr[:, 2 * i + 1]
+                    bank.daily_count[col] = count
+                    bank.daily_sum[col] = total
+
+        mc_cols = sorted({_MONTHLY_CLIMATE_COLS[m] for m in metrics
+                          if m in _MONTHLY_CLIMATE_COLS})
+        if daily and mc_cols:
+            sql = text(f"""
+                SELECT province_name, year * 12 + month - 1 AS m, {", ".join(mc_cols)}
+                FROM monthly_climate
+                WHERE province_name IS NOT NULL {prov_where}
+            """)
+            rows = db.execute(sql, params).fetchall()
+            if rows:
+                for r in rows:
+                    bank.mc_index.setdefault(r[0], len(bank.mc_index))
+                loc = np.array([bank.mc_index[r[0]] for r in rows])
+                mon = np.array([int(r[1]) for r in rows])
+                bank.mc_month0 = int(mon.min())
+                mon -= bank.mc_month0
+                shape = (len(bank.mc_index), int(mon.max()) + 1)
+                for i, col in enumerate(mc_cols):
+                    arr = np.full(shape, np.nan)
+                    vals = np.array([np.nan if r[2 + i] is None else float(r[2 + i])
+                                     for r in rows])
+                    arr[loc, mon] = vals
+                    bank.mc_values[col] = arr
+
+        if climatology:
+            from app.db.models import Climatology
+            q = db.query(Climatology)
+            if provs:
+                q = q.filter(Climatology.province_name.in_(provs))
+            fields = sorted(set(_FIELD_MAP.values()))
+            for row in q.order_by(Climatology.id):
+                key = (row.province_name, row.district_name, row.resource_type)
+                bank.climatology_rows.setdefault(
+                    key, {f: getattr(row, f, None) for f in fields})
+    return bank
+
+
 # ─── Model aileleri ───────────────────────────────────────────────────────────
 
 
@@ -258,6 +516,15 @@ def _mape(actual: List[float], pred: List[float]) -> Optional[float]:
     return sum(errs) / len(errs) if errs else None
 
 
+def _pct_band(values):
+    """CI'sı olmayan modeller için ±%10 kaba bant: (lower, upper) dizileri.
+    Negatif değerlerde (ör. kış sıcaklığı) de lower ≤ upper kalır."""
+    import numpy as np  # type: ignore
+    v = np.asarray(values, dtype=float)
+    half = 0.1 * np.abs(v)
+    return v - half, v + half
+
+
 def _forecast_holt_winters(
     series: List[float], horizon: int
 ) -> Optional[List[float]]:
@@ -312,6 +579,201 @@ def _forecast_linear_seasonal(
         return None
 
 
+# ─── Toplu (vektörel) hızlı katman ────────────────────────────────────────────
+#
+# `_forecast_holt_winters` / `_forecast_linear_seasonal` seri başına ayrı çağrı
+# yapıyor (HW'de statsmodels optimizasyonu). Batch binlerce seride aynı iki
+# modeli tek NumPy işlemiyle çalıştırır: seriler sola hizalı bir matrise
+# (n_seri × n_ay, sağ taraf NaN) dizilir, her satır kendi uzunluğuna kadar
+# kullanılır.
+#   • Linear + seasonal: maskeli en küçük kareler (satır başına kapalı form
+#     eğim/kesişim) + faz (ay indeksi % 12) başına ortalama artık —
+#     `_forecast_linear_seasonal` ile birebir aynı sonuç.
+#   • Holt-Winters (additive trend + season): (α, β, γ) ızgarası tüm
+#     satırlarda aynı anda koşturulur; satır başına en düşük tek-adım SSE'li
+#     kombinasyon seçilir (statsmodels'in sürekli optimizasyonunun yaklaşığı);
+#     bu yüzden ayrı etiketle ("holt_winters_grid") saklanır.
+# Aralıklar: `select_best_monthly_forecast`'ın HW / linear yoluyla aynı ±%10
+# bant — bir serinin bandı hangi katmandan geçtiğine göre değişmez.
+
+_HW_ALPHAS = (0.1, 0.3, 0.5, 0.7, 0.9)
+_HW_BETAS = (0.0, 0.05, 0.15)
+_HW_GAMMAS = (0.05, 0.2, 0.4)
+
+
+@dataclass
+class BatchForecast:
+    """Toplu forecast — satır i = girdi serisi i. Geçersiz satırlar NaN."""
+    values: "np.ndarray"         # (n, horizon)
+    lower: "np.ndarray"          # (n, horizon)
+    upper: "np.ndarray"          # (n, horizon)
+    holdout_mape: "np.ndarray"   # (n,) — son 12 ay holdout; NaN = yok
+    methods: List[Optional[str]] = field(default_factory=list)
+
+
+def pack_series(series_list: List[List[float]]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Serileri sola hizalı (n × max_len) matrise diz. Döner: (matrix, lengths)."""
+    import numpy as np  # type: ignore
+    lengths = np.array([len(s) for s in series_list], dtype=np.int64)
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.full((len(series_list), width), np.nan)
+    for i, s in enumerate(series_list):
+        matrix[i, :len(s)] = s
+    return matrix, lengths
+
+
+def _batch_linear_seasonal(matrix, lengths, horizon: int):
+    """Maskeli toplu lineer+mevsim. Döner: values (n×h); n<12 → NaN."""
+    import numpy as np  # type: ignore
+    n_rows, width = matrix.shape
+    cols = np.arange(width)
+    w = (cols[None, :] < lengths[:, None]).astype(float)
+    y = np.where(w > 0, matrix, 0.0)
+    # Satır başına OLS: slope = (S0·Sxy − Sx·Sy) / (S0·Sxx − Sx²)
+    s0 = w.sum(axis=1)
+    sx = w @ cols
+    sxx = w @ (cols * cols)
+    sy = y.sum(axis=1)
+    sxy = y @ cols
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (s0 * sxy - sx * sy) / (s0 * sxx - sx * sx)
+        intercept = (sy - slope * sx) / s0
+        resid = (y - (slope[:, None] * cols + intercept[:, None])) * w
+        # Faz (index % 12) başına ortalama artık
+        phase = np.eye(12)[cols % 12]                      # (width, 12)
+        seasonal = (resid @ phase) / (w @ phase)
+    future = lengths[:, None] + np.arange(horizon)[None, :]
+    values = (slope[:, None] * future + intercept[:, None]
+              + np.take_along_axis(seasonal, future % 12, axis=1))
+    invalid = lengths < 12
+    values[invalid] = np.nan
+    return values
+
+
+def _batch_holt_winters(matrix, lengths, horizon: int):
+    """Izgara aramalı toplu additive Holt-Winters. Döner: values (n×h); n<24 → NaN."""
+    import numpy as np  # type: ignore
+    n_rows = matrix.shape[0]
+    grid = np.array([(a, b, g) for a in _HW_ALPHAS for b in _HW_BETAS for g in _HW_GAMMAS])
+    alpha, beta, gamma = (grid[:, k][None, :] for k in range(3))   # (1, K)
+    valid = lengths >= 24
+    values = np.full((n_rows, horizon), np.nan)
+    if not valid.any():
+        return values
+    y = matrix[valid]
+    lens = lengths[valid]
+    rows = len(lens)
+    k = len(grid)
+
+    # Başlangıç durumu: ilk iki yıl ortalaması (seviye / eğim), ilk yıl sapması (mevsim)
+    first = y[:, :12].mean(axis=1)
+    second = y[:, 12:24].mean(axis=1)
+    level = np.repeat(first[:, None], k, axis=1)
+    trend = np.repeat(((second - first) / 12.0)[:, None], k, axis=1)
+    season = np.repeat((y[:, :12] - first[:, None])[:, None, :], k, axis=1)  # (R, K, 12)
+    sse = np.zeros((rows, k))
+
+    for t in range(12, int(lens.max())):
+        active = (t < lens)[:, None]
+        obs = y[:, t][:, None]
+        p = t % 12
+        s_prev = season[:, :, p]
+        err = obs - (level + trend + s_prev)
+        new_level = alpha * (obs - s_prev) + (1 - alpha) * (level + trend)
+        new_trend = beta * (new_level - level) + (1 - beta) * trend
+        new_season = gamma * (obs - level - trend) + (1 - gamma) * s_prev
+        sse = np.where(active, sse + err * err, sse)
+        level = np.where(active, new_level, level)
+        trend = np.where(active, new_trend, trend)
+        season[:, :, p] = np.where(active, new_season, s_prev)
+
+    best = sse.argmin(axis=1)
+    r = np.arange(rows)
+    h = np.arange(1, horizon + 1)
+    slot = (lens[:, None] - 1 + h[None, :]) % 12
+    fc = (level[r, best][:, None] + h[None, :] * trend[r, best][:, None]
+          + np.take_along_axis(season[r, best], slot, axis=1))
+    values[valid] = fc
+    return values
+
+
+_BATCH_MODELS = {
+    "holt_winters": _batch_holt_winters,
+    "linear_seasonal": _batch_linear_seasonal,
+}
+
+# ml_forecasts.method'a yazılan etiket: ızgara HW statsmodels fit'i değildir;
+# toplu linear+seasonal seri başına modelle birebir aynıdır
+FAST_METHOD_LABELS = {
+    "holt_winters": "holt_winters_grid",
+    "linear_seasonal": "linear_seasonal",
+}
+
+
+def _batch_holdout_mape(matrix, lengths, model) -> "np.ndarray":
+    """Son 12 ay holdout MAPE (satır başına; |gerçek| < 1e-6 atlanır — `_mape`)."""
+    import numpy as np  # type: ignore
+    mape = np.full(len(lengths), np.nan)
+    has_holdout = lengths >= 24
+    if not has_holdout.any():
+        return mape
+    train_len = np.where(has_holdout, lengths - 12, lengths)
+    pred = model(matrix, train_len, 12)
+    idx = train_len[:, None] + np.arange(12)[None, :]
+    actual = np.take_along_axis(matrix, np.minimum(idx, matrix.shape[1] - 1), axis=1)
+    ok = np.abs(actual) >= 1e-6
+    with np.errstate(divide="ignore", invalid="ignore"):
+        err = np.where(ok, np.abs(actual - pred) / np.abs(actual), 0.0)
+        mape = err.sum(axis=1) / ok.sum(axis=1)
+    mape[~has_holdout | np.isnan(pred).any(axis=1)] = np.nan
+    return mape
+
+
+def forecast_batch(series_list: List[List[float]], horizon: int,
+                   method: str = "linear_seasonal") -> BatchForecast:
+    """Tek model ailesiyle tüm serileri birlikte tahminle (holdout MAPE dahil)."""
+    import numpy as np  # type: ignore
+    model = _BATCH_MODELS[method]
+    matrix, lengths = pack_series(series_list)
+    values = model(matrix, lengths, horizon)
+    lower, upper = _pct_band(values)
+    return BatchForecast(
+        values=values,
+        lower=lower,
+        upper=upper,
+        holdout_mape=_batch_holdout_mape(matrix, lengths, model),
+        methods=[None if np.isnan(v[0]) else method for v in values],
+    )
+
+
+def select_best_fast_batch(series_list: List[List[float]], horizon: int) -> BatchForecast:
+    """Hızlı katman: HW ve linear+seasonal'ı toplu koştur, satır başına holdout
+    MAPE'si düşük olanı seç. Holdout'u olmayan satırlar method=None (→ SARIMAX)."""
+    import numpy as np  # type: ignore
+    if not series_list:
+        empty = np.empty((0, horizon))
+        return BatchForecast(empty, empty, empty, np.empty(0), [])
+    results = {m: forecast_batch(series_list, horizon, m) for m in _BATCH_MODELS}
+    names = list(results)
+    mapes = np.stack([results[m].holdout_mape for m in names])        # (M, n)
+    filled = np.where(np.isnan(mapes), np.inf, mapes)
+    pick = filled.argmin(axis=0)
+    rows = np.arange(len(series_list))
+
+    def _take(attr):
+        return np.stack([getattr(results[m], attr) for m in names])[pick, rows]
+
+    best_mape = filled[pick, rows]
+    return BatchForecast(
+        values=_take("values"),
+        lower=_take("lower"),
+        upper=_take("upper"),
+        holdout_mape=np.where(np.isinf(best_mape), np.nan, best_mape),
+        methods=[names[j] if np.isfinite(best_mape[i]) else None
+                 for i, j in enumerate(pick)],
+    )
+
+
 def select_best_monthly_forecast(
     series: List[float],
     start_date: date,
@@ -380,6 +842,8 @@ def select_best_monthly_forecast(
     uppers: List[Optional[float]] = []
 
     if best_method == "sarimax":
+        # Aynı etiket → holdout fit'inin parametreleri sıcak başlangıç olur
+        # (SARIMAXForecaster parametre cache'i); optimizasyon kısa sürer.
         try:
             f = _fc().forecast(
                 series=series, start_date=start_date,
@@ -409,7 +873,7 @@ def select_best_monthly_forecast(
             method_detail = "fallback_naive"
         values = pred
         # CI yok → ±%10 kaba bant
-        lowers = [v * 0.9 for v in values]
-        uppers = [v * 1.1 for v in values]
+        lower, upper = _pct_band(values)
+        lowers, uppers = lower.tolist(), upper.tolist()
 
     return values, lowers, uppers, method_detail, best_mape
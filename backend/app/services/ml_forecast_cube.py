@@ -0,0 +1,306 @@
+"""
+ML forecast küpü — /ml/choropleth için önceden dilimlenmiş değerler
+===================================================================
+
+`/ml/choropleth` her (metric, resource, scenario, level, year, month) için
+`ml_forecast` üzerinde dörde kadar gruplu ``AVG`` sorgusu çalıştırıyordu
+(ikisi yalnız baseline 5-95 persentilleri için), ardından il adı
+varyasyonlarını Python'da genişletiyordu. Yıl slider'ının her adımı yeni bir
+sorgu turuydu.
+
+ML batch sonunda ``rebuild_all`` (metric, resource, scenario, level) başına
+bir küp yazar (`ml_forecast_cube` tablosu):
+
+  * ``values`` — float64 [lokasyon × yıl × 13]; 0-11 aylar, 12 yıllık
+    ortalama (eski ``AVG`` ile aynı). Veri yok → NaN.
+  * ``norm`` — [yıl × 13 × 2] baseline 5-95 persentil aralığı (senaryo
+    bağımsız renk ölçeği; ilçe baseline'ı yoksa il baseline'ı).
+  * ``keys`` / ``aliases`` — yanıt anahtarları (il / "İl|İlçe") ve GADM
+    eşleşmesi için önceden genişletilmiş [anahtar, lokasyon] çiftleri.
+
+Endpoint ``get_cube`` ile küpü süreç belleğinden alır (ML forecast veri
+sürümü değişince DB'den bir kez yeniden okunur) ve ``slice`` ile keser —
+yıl/ay değiştirmek DB işi gerektirmez. Küp yoksa (batch henüz koşmadı)
+endpoint eski sorgu yoluna düşer.
+"""
+from __future__ import annotations
+
+import logging
+import zlib
+from dataclasses import dataclass
+from itertools import groupby
+from threading import Lock
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+CODEC = "f64-zlib"
+SLOTS = 13            # 12 ay + yıllık ortalama
+ANNUAL = 12
+LEVELS = ("province", "district")
+_STREAM_BATCH = 20_000
+_DISTRICT_NOTE = "İlçe verisi yok; il değerleri kullanılıyor"
+
+
+@dataclass
+class ForecastCube:
+    metric: str
+    resource: str
+    scenario: str
+    level: str
+    year0: int
+    values: np.ndarray                 # (L, Y, 13)
+    norm: np.ndarray                   # (Y, 13, 2)
+    keys: List[str]
+    aliases: List[Tuple[str, int]]
+
+    def slice(self, year: int, month: Optional[int] = None) -> dict:
+        """`/ml/choropleth` yanıtı — sorgu yolunun ürettiğiyle aynı biçim."""
+        slot = ANNUAL if month is None else month - 1
+        yi = year - self.year0
+        scores: Dict[str, float] = {}
+        norm_min = norm_max = None
+        if 0 <= yi < self.values.shape[1]:
+            for key, v in zip(self.keys, self.values[:, yi, slot].tolist()):
+                if v == v:                       # NaN değil
+                    scores[key] = round(v, 2)
+            lo, hi = self.norm[yi, slot].tolist()
+            if lo == lo:
+                norm_min, norm_max = lo, hi
+        vals = list(scores.values())
+        expanded = dict(scores)
+        for alias, idx in self.aliases:
+            value = scores.get(self.keys[idx])
+            if value is not None:
+                expanded.setdefault(alias, value)
+        return {
+            "metric": self.metric,
+            "resource": self.resource,
+            "scenario": self.scenario,
+            "level": self.level,
+            "year": year,
+            "count": len(expanded),
+            "min": min(vals) if vals else None,
+            "max": max(vals) if vals else None,
+            "norm_min": norm_min,
+            "norm_max": norm_max,
+            "scores": expanded,
+            "note": _DISTRICT_NOTE if self.level == "district" else None,
+        }
+
+
+# ─── Kurulum ────────────────────────────────────────────────────────────────
+
+def _norm_range(values: np.ndarray) -> Tuple[float, float]:
+    """Baseline 5-95 persentili (frontend ile aynı indeksleme); boşsa NaN."""
+    bs = sorted(v for v in values.tolist() if v == v)
+    if not bs:
+        return float("nan"), float("nan")
+
+    def _pct(p):
+        return bs[min(len(bs) - 1, max(0, round((len(bs) - 1) * p)))]
+
+    lo, hi = round(_pct(0.05), 2), round(_pct(0.95), 2)
+    if hi - lo < 1e-9:
+        lo, hi = round(bs[0], 2), round(bs[-1], 2)
+    return lo, hi
+
+
+def _norm_grid(baseline: Optional[np.ndarray], n_years: int) -> np.ndarray:
+    out = np.full((n_years, SLOTS, 2), np.nan)
+    if baseline is None or not len(baseline):
+        return out
+    for yi in range(n_years):
+        for slot in range(SLOTS):
+            out[yi, slot] = _norm_range(baseline[:, yi, slot])
+    return out
+
+
+def _with_annual(monthly: np.ndarray) -> np.ndarray:
+    """(L, Y, 12) → (L, Y, 13); 12. dilim = mevcut ayların ortalaması."""
+    present = ~np.isnan(monthly)
+    count = present.sum(axis=2)
+    total = np.where(present, monthly, 0.0).sum(axis=2)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        annual = np.where(count > 0, total / count, np.nan)
+    return np.concatenate([monthly, annual[:, :, None]], axis=2)
+
+
+def _alias_pairs(keys: List[str]) -> List[Tuple[str, int]]:
+    """Endpoint'teki eski genişletme: canonical + varyasyonlar (anahtar başına)."""
+    from app.services.province_aliases import province_aliases, to_canonical
+    pairs = []
+    for i, key in enumerate(keys):
+        names = {to_canonical(key)}
+        names.update(province_aliases(key))
+        names.update(province_aliases(to_canonical(key)))
+        names.discard(key)
+        pairs.extend((name, i) for name in sorted(names))
+    return pairs
+
+
+def _group_cubes(metric: str, resource: str, items: list) -> List[ForecastCube]:
+    """Tek (metric, resource) grubunun satırları → senaryo × seviye küpleri."""
+    year0 = min(r[3] for r in items)
+    n_years = max(r[3] for r in items) - year0 + 1
+    keys = {s: sorted({r[1] for r in items if r[0] == s}) for s in LEVELS}
+    index = {s: {k: i for i, k in enumerate(keys[s])} for s in LEVELS}
+    scenarios = sorted({r[2] for r in items})
+    arrays = {(s, sc): np.full((len(keys[s]), n_years, 12), np.nan)
+              for s in LEVELS for sc in scenarios}
+    for scope, key, scenario, year, month, value in items:
+        arrays[(scope, scenario)][index[scope][key], year - year0, month - 1] = value
+    arrays = {k: _with_annual(v) for k, v in arrays.items()}
+
+    base_prov = arrays.get(("province", "baseline"))
+    base_dist = arrays.get(("district", "baseline"))
+    norm_prov = _norm_grid(base_prov, n_years)
+    # İlçe baseline'ı boş olan (yıl, dilim) hücrelerinde il aralığı
+    norm_dist = _norm_grid(base_dist, n_years)
+    norm_dist = np.where(np.isnan(norm_dist), norm_prov, norm_dist)
+
+    prov_aliases = _alias_pairs(keys["province"])
+    dist_keys = keys["district"] + keys["province"]
+    dist_aliases = _alias_pairs(keys["district"]) + [
+        (a, i + len(keys["district"])) for a, i in prov_aliases]
+    cubes: List[ForecastCube] = []
+    for scenario in scenarios:
+        prov_vals = arrays[("province", scenario)]
+        cubes.append(ForecastCube(metric, resource, scenario, "province", year0,
+                                  prov_vals, norm_prov, keys["province"], prov_aliases))
+        cubes.append(ForecastCube(
+            metric, resource, scenario, "district", year0,
+            np.concatenate([arrays[("district", scenario)], prov_vals]),
+            norm_dist, dist_keys, dist_aliases,
+        ))
+    return cubes
+
+
+def iter_cubes(rows: Iterable[tuple]) -> Iterator[ForecastCube]:
+    """(metric, resource) sıralı ml_forecast satırları (scope, il, ilçe,
+    kaynak, metrik, senaryo, yıl, ay, değer) → küpler, grup grup.
+
+    Bellekte aynı anda yalnız bir (metric, resource) grubunun satırları
+    durur; sırasız girdi (aynı grup iki kez) ValueError.
+    """
+    seen = set()
+    for (resource, metric), group in groupby(rows, key=lambda r: (r[3], r[4])):
+        if (metric, resource) in seen:
+            raise ValueError(f"ml_forecast satırları (metric, resource) sıralı değil: "
+                             f"{metric}/{resource}")
+        seen.add((metric, resource))
+        items = [
+            (scope, prov if scope == "province" else f"{prov}|{dist}",
+             scenario, year, month, value)
+            for scope, prov, dist, _, _, scenario, year, month, value in group
+            if value is not None and not (scope == "district" and dist is None)
+        ]
+        if items:
+            yield from _group_cubes(metric, resource, items)
+
+
+def build_cubes(rows: Iterable[tuple]) -> List[ForecastCube]:
+    """Tüm küpler (liste) — satırlar herhangi sırada olabilir."""
+    return list(iter_cubes(sorted(rows, key=lambda r: (r[4], r[3]))))
+
+
+# ─── Kalıcılık ──────────────────────────────────────────────────────────────
+
+def _encode(arr: np.ndarray) -> bytes:
+    return zlib.compress(np.ascontiguousarray(arr, dtype="<f8").tobytes(), 6)
+
+
+def _decode(blob: bytes, shape: Tuple[int, ...]) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(blob), dtype="<f8").reshape(shape)
+
+
+def rebuild_all(db: Session) -> int:
+    """ml_forecast'tan tüm küpleri yeniden üret, tabloyu değiştir (tek
+    transaction). Satırlar (metric, resource) sıralı akar; her grubun küpleri
+    yazılıp bırakılır. Döner: yazılan küp sayısı."""
+    from app.db.models import MlForecastCube
+
+    MlForecastCube.__table__.create(bind=db.get_bind(), checkfirst=True)
+    db.query(MlForecastCube).delete(synchronize_session=False)
+    result = db.execute(text(
+        "SELECT scope, province_name, district_name, resource, metric, scenario, "
+        "year, month, value FROM ml_forecast ORDER BY metric, resource"
+    ).execution_options(yield_per=_STREAM_BATCH))
+    n = 0
+    for cube in iter_cubes(row for chunk in result.partitions() for row in chunk):
+        db.add(MlForecastCube(
+            metric=cube.metric, resource=cube.resource, scenario=cube.scenario,
+            level=cube.level, year0=cube.year0, n_years=cube.values.shape[1],
+            keys=cube.keys, aliases=[list(p) for p in cube.aliases], codec=CODEC,
+            data=_encode(cube.values), norm=_encode(cube.norm),
+        ))
+        db.flush()
+        n += 1
+    db.commit()
+    invalidate()
+    logger.info("ML forecast küpü: %d küp yazıldı", n)
+    return n
+
+
+# ─── Okuma (süreç içi, veri sürümüne bağlı) ─────────────────────────────────
+
+_cache: Dict[Tuple[str, str, str, str], Tuple[int, Optional[ForecastCube]]] = {}
+_lock = Lock()
+
+
+def _load(metric: str, resource: str, scenario: str, level: str) -> Optional[ForecastCube]:
+    from app.db.database import SystemSessionLocal
+    from app.db.models import MlForecastCube
+
+    with SystemSessionLocal() as db:
+        row = (
+            db.query(MlForecastCube)
+            .filter(
+                MlForecastCube.metric == metric,
+                MlForecastCube.resource == resource,
+                MlForecastCube.scenario == scenario,
+                MlForecastCube.level == level,
+            )
+            .first()
+        )
+    if row is None or row.codec != CODEC:
+        return None
+    n_loc = len(row.keys)
+    return ForecastCube(
+        metric=metric, resource=resource, scenario=scenario, level=level,
+        year0=row.year0,
+        values=_decode(row.data, (n_loc, row.n_years, SLOTS)),
+        norm=_decode(row.norm, (row.n_years, SLOTS, 2)),
+        keys=list(row.keys),
+        aliases=[(a, int(i)) for a, i in row.aliases],
+    )
+
+
+def get_cube(metric: str, resource: str, scenario: str, level: str) -> Optional[ForecastCube]:
+    """Küp (yoksa None). ML forecast veri sürümü değişmedikçe DB'ye gidilmez."""
+    from app.services import data_versions
+
+    key = (metric, resource, scenario, level)
+    version = data_versions.get_version(data_versions.ML_FORECAST)
+    hit = _cache.get(key)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    with _lock:
+        hit = _cache.get(key)
+        if hit is not None and hit[0] == version:
+            return hit[1]
+        try:
+            cube = _load(*key)
+        except Exception as e:  # noqa: BLE001 — tablo yok (migration öncesi) vb.
+            logger.debug("ML forecast küpü okunamadı %s: %s", key, e)
+            cube = None
+        _cache[key] = (version, cube)
+        return cube
+
+
+def invalidate() -> None:
+    _cache.clear()
@@ -15,10 +15,20 @@ forecast'ı. Prophet'in %85-90 kalitesi, %15 boyutu (~30 MB ek dep vs
 Detay: docs/knowledge/srrp-knowledge/GRANULARITY-FORMULAS.md § 6
 
 **MAPE hedefi:** %20 altında (P1.8 validation kabul kriteri).
+
+**Parametre cache'i:** Fit edilen modelin order'ı + parametre vektörü seri
+içeriği + konfigürasyon hash'iyle saklanır (redis_cache, varsayılan 30 gün —
+``SRRP_SARIMAX_PARAMS_TTL``). Aynı seri farklı horizon / güven düzeyiyle
+istendiğinde optimizasyon yapılmaz: model kayıtlı parametrelerle filtrelenir
+ve ``get_forecast`` çağrılır. Seri değiştiyse (holdout kesiti, yeni aylar)
+aynı etiketin son parametreleri ``fit(start_params=…)`` ile sıcak başlangıç
+olarak kullanılır.
 """
 from __future__ import annotations
 
+import hashlib
 import logging
+import os
 import warnings
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
@@ -43,6 +53,13 @@ except Exception:  # pragma: no cover
     _PMDARIMA_OK = False
 
 
+# Fit parametre cache'i (bkz. modül docstring). _EXOG_VERSION: _build_exog
+# kolonları değişirse artır → eski parametreler kullanılmaz.
+_PARAMS_TTL = int(os.environ.get("SRRP_SARIMAX_PARAMS_TTL", 30 * 24 * 3600))
+_EXOG_VERSION = 1
+_FIT_MAXITER = 200
+
+
 # ─── API Tipi ───────────────────────────────────────────────────────────────
 
 @dataclass
@@ -178,11 +195,23 @@ class SARIMAXForecaster:
         )
         ts = pd.Series(arr, index=idx)
 
-        # Order seçimi
-        order, seasonal_order, method = self._select_order(ts)
+        # Parametre cache'i: aynı seri + konfigürasyon → order + params hazır
+        config = self._fit_config(start_date, with_exog)
+        fit_key = _params_key("fit", arr.tobytes(), config)
+        warm_key = _params_key("warm", target_label.encode("utf-8"), config)
+        cached = _load_params(fit_key)
+
+        # Order seçimi (cache'te varsa auto_arima da atlanır)
+        if cached:
+            order = tuple(cached["order"])
+            seasonal_order = tuple(cached["seasonal_order"])
+            method = cached["method"]
+        else:
+            order, seasonal_order, method = self._select_order(ts)
         logger.info(
-            "SARIMAX %s: order=%s seasonal=%s n=%d horizon=%d exog=%s",
+            "SARIMAX %s: order=%s seasonal=%s n=%d horizon=%d exog=%s cached=%s",
             target_label, order, seasonal_order, n, horizon_months, with_exog,
+            bool(cached),
         )
 
         # M-G.1: Exog matrix (Fourier + year_trend) — fit + forecast'ı zenginleştir
@@ -206,7 +235,26 @@ class SARIMAXForecaster:
                     enforce_stationarity=False,
                     enforce_invertibility=False,
                 )
-                fitted = model.fit(disp=False, maxiter=200)
+                n_params = len(model.param_names)
+                if cached and len(cached["params"]) == n_params:
+                    # Optimizasyon yok — kayıtlı parametrelerle Kalman filtresi
+                    fitted = model.filter(np.asarray(cached["params"]))
+                else:
+                    warm = _load_params(warm_key)
+                    start_params = None
+                    if (warm and tuple(warm["order"]) == order
+                            and tuple(warm["seasonal_order"]) == seasonal_order
+                            and len(warm["params"]) == n_params):
+                        start_params = np.asarray(warm["params"])
+                    fitted = model.fit(
+                        start_params=start_params, disp=False, maxiter=_FIT_MAXITER,
+                    )
+                    _store_params((fit_key, warm_key), {
+                        "order": list(order),
+                        "seasonal_order": list(seasonal_order),
+                        "method": method,
+                        "params": [float(v) for v in np.asarray(fitted.params)],
+                    })
             except Exception as e:
                 logger.warning(
                     "SARIMAX fit hatası (%s), naive seasonal'a düşülüyor: %s",
@@ -273,6 +321,12 @@ class SARIMAXForecaster:
             notes=[],
         )
 
+    def _fit_config(self, start_date: date, with_exog: bool) -> str:
+        """Parametre cache anahtarına giren konfigürasyon (seri içeriği hariç)."""
+        return (f"{start_date.isoformat()}|s{self.seasonal_period}|"
+                f"auto{int(self.use_auto_arima and _PMDARIMA_OK)}|"
+                f"exog{int(with_exog)}.{_EXOG_VERSION}|it{_FIT_MAXITER}")
+
     # ── Order selection ─────────────────────────────────────────────────────
 
     def _select_order(
@@ -384,6 +438,37 @@ class SARIMAXForecaster:
         )
 
 
+# ─── Parametre cache'i ───────────────────────────────────────────────────────
+
+
+def _params_key(kind: str, content: bytes, config: str) -> str:
+    """``fit``: seri içeriği + konfigürasyon (birebir yeniden kullanım);
+    ``warm``: hedef etiketi + konfigürasyon (sıcak başlangıç ipucu)."""
+    digest = hashlib.sha1(content + b"|" + config.encode("utf-8")).hexdigest()
+    return f"ml:sarimax:{kind}:{digest}"
+
+
+def _load_params(key: str) -> Optional[dict]:
+    try:
+        from app.services.redis_cache import cache_get
+        data = cache_get(key)
+    except Exception as e:  # noqa: BLE001
+        logger.debug("SARIMAX params cache okunamadı: %s", e)
+        return None
+    if not isinstance(data, dict) or not data.get("params"):
+        return None
+    return data
+
+
+def _store_params(keys: Tuple[str, ...], payload: dict) -> None:
+    try:
+        from app.services.redis_cache import cache_set
+        for key in keys:
+            cache_set(key, payload, ttl_seconds=_PARAMS_TTL)
+    except Exception as e:  # noqa: BLE001
+        logger.debug("SARIMAX params cache yazılamadı: %s", e)
+
+
 # ─── Pin & Climatology Forecast ──────────────────────────────────────────────
 
 
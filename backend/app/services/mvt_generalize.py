@@ -0,0 +1,163 @@
+"""
+SRRP — MVT Katmanları İçin Genelleştirilmiş Geometri (zoom bantları)
+====================================================================
+
+`/tiles/{z}/{x}/{y}.pbf` her tile'da 190K ``energy_corridors`` ve 25K
+``hydro_features`` satırının ham (sadeleştirilmemiş) geometrisini
+``ST_Transform`` ediyor, katman başına ayrı sorgu atıyor ve sabit ``LIMIT``
+ile rastgele feature'ları düşürüyordu.
+
+Bu modül üç katmanı ``mvt_features`` tablosuna (EPSG:3857) **zoom bandı
+başına bir kez** sadeleştirilmiş olarak yazar:
+
+  * Tolerans = bandın en detaylı zoom'undaki MVT grid çözünürlüğü
+    (4096 extent) → sadeleştirme tile'da görünmez.
+  * Bandın en detaylı zoom'unda bir ekran pikselinden küçük kalan feature'lar
+    o banda hiç yazılmaz (küçük göller z6'da zaten çizilemez).
+  * ``priority`` = projeksiyon alanı (çizgiler için uzunluk × tolerans);
+    tile sorgusu bütçeyi aşarsa en önemsizler elenir (sıra keyfi değil).
+
+Tablo yükleyiciler (``load_vector_data.py``, ``backfill_restricted_zones.py``)
+kaynak tabloyu yazdıktan sonra ``build_generalized`` ile yeniden kurulur;
+elle: ``python scripts/build_mvt_generalized.py``.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+EARTH_CIRCUMFERENCE_M = 40075016.68557849
+MVT_EXTENT = 4096
+TILE_PX = 256
+
+# (ilk zoom, son zoom) — son bant üst sınırsız (overzoom)
+ZOOM_BANDS: Tuple[Tuple[int, int], ...] = ((0, 7), (8, 9), (10, 11), (12, 13), (14, 24))
+
+# Katman tanımları — kaynak tablo, görünür olduğu ilk zoom, tile başına
+# feature bütçesi (öncelik sırasıyla doldurulur) ve MVT öznitelikleri
+LAYERS: Dict[str, dict] = {
+    "hydro": {
+        "table":       "hydro_features",
+        "min_zoom":    6,     # Su kütleleri düşük zoom'da da görünür
+        "budget":      1500,
+        "feature_type": "t.feature_type",
+        "description": "NULL",
+        "capacity":    "t.energy_capacity_mw",
+        "properties":  "feature_type, min_zoom, energy_capacity_mw",
+    },
+    "restricted": {
+        "table":       "restricted_zones",
+        "min_zoom":    7,
+        "budget":      800,
+        "feature_type": "t.feature_type",
+        "description": "t.description",
+        "capacity":    "NULL",
+        "properties":  "feature_type, min_zoom, description",
+    },
+    "energy": {
+        "table":       "energy_corridors",
+        # Tarım/endüstriyel arazi çok büyük — sadece çok yakın zoom'da göster
+        "min_zoom":    11,
+        "budget":      800,
+        "feature_type": "t.feature_type",
+        "description": "NULL",
+        "capacity":    "NULL",
+        "properties":  "feature_type, min_zoom",
+    },
+}
+
+
+def grid_resolution_m(z: int) -> float:
+    """Zoom z'de bir MVT grid biriminin metre karşılığı (ekvatorda)."""
+    return EARTH_CIRCUMFERENCE_M / (MVT_EXTENT * (1 << z))
+
+
+def band_of(z: int) -> Tuple[int, int]:
+    for band in ZOOM_BANDS:
+        if band[0] <= z <= band[1]:
+            return band
+    return ZOOM_BANDS[-1]
+
+
+def band_tolerance(band: Tuple[int, int]) -> float:
+    """Bandın en detaylı zoom'undaki grid çözünürlüğü (overzoom bandında ilk zoom)."""
+    return grid_resolution_m(band[1] if band != ZOOM_BANDS[-1] else band[0])
+
+
+def band_pixel(band: Tuple[int, int]) -> float:
+    """Bandın en detaylı zoom'unda bir ekran pikselinin metre karşılığı."""
+    return band_tolerance(band) * MVT_EXTENT / TILE_PX
+
+
+def band_min_size(band: Tuple[int, int]) -> float:
+    """Bu banda yazılacak en küçük feature boyutu (m²) — bir ekran pikseli."""
+    px = band_pixel(band)
+    return px * px
+
+
+_SOURCE_SQL = """
+    CREATE TEMP TABLE _mvt_src ON COMMIT DROP AS
+    SELECT COALESCE(t.min_zoom, 0) AS min_zoom,
+           {feature_type} AS feature_type,
+           {description} AS description,
+           {capacity} AS energy_capacity_mw,
+           ST_Transform(t.geom, 3857) AS g
+    FROM {table} t
+    WHERE t.geom IS NOT NULL AND NOT ST_IsEmpty(t.geom)
+"""
+
+_INSERT_SQL = """
+    INSERT INTO mvt_features
+        (layer, zoom_band, priority, min_zoom, feature_type, description,
+         energy_capacity_mw, geom)
+    SELECT :layer, :band, s.size, s.min_zoom, s.feature_type, s.description,
+           s.energy_capacity_mw, ST_SimplifyPreserveTopology(s.g, :tol)
+    FROM (
+        SELECT src.*,
+               CASE WHEN GeometryType(src.g) IN ('POINT', 'MULTIPOINT') THEN :min_size
+                    ELSE GREATEST(ST_Area(src.g), ST_Length(src.g) * :px)
+               END AS size
+        FROM _mvt_src src
+        WHERE src.min_zoom <= :band_last
+    ) s
+    WHERE s.size >= :min_size
+"""
+
+
+def build_generalized(engine, layers: Optional[Iterable[str]] = None) -> Dict[str, int]:
+    """``mvt_features``'ı verilen katmanlar için yeniden kurar (varsayılan:
+    hepsi). Katman başına tek transaction — yarım kalan kurulum görünmez.
+    Döner: katman → yazılan satır sayısı."""
+    from app.db.models_geo import MvtFeature
+
+    MvtFeature.__table__.create(bind=engine, checkfirst=True)
+    counts: Dict[str, int] = {}
+    for name in (layers or LAYERS):
+        cfg = LAYERS[name]
+        t0 = time.monotonic()
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM mvt_features WHERE layer = :layer"), {"layer": name})
+            conn.execute(text(_SOURCE_SQL.format(**cfg)))
+            total = 0
+            for band in ZOOM_BANDS:
+                if band[1] < cfg["min_zoom"]:
+                    continue
+                total += conn.execute(text(_INSERT_SQL), {
+                    "layer": name,
+                    "band": band[0],
+                    "band_last": band[1],
+                    "tol": band_tolerance(band),
+                    "px": band_pixel(band),
+                    "min_size": band_min_size(band),
+                }).rowcount
+        counts[name] = total
+        logger.info("[mvt_generalize] %s: %d satır (%.1f sn)",
+                    name, total, time.monotonic() - t0)
+    with engine.begin() as conn:
+        conn.execute(text("ANALYZE mvt_features"))
+    return counts
@@ -0,0 +1,95 @@
+"""
+SRRP — NDJSON Akış (Streaming) Yanıt Yardımcıları
+=================================================
+
+Uzun animasyon / zaman serisi endpoint'leri tüm payload'ı bellekte kurup
+tek seferde serileştiriyordu (30 gün saatlik → 50K+ satır). Akış modunda
+satırlar sunucu tarafı cursor ile (`Query.yield_per`) okunur, frame'ler
+üretildikçe satır-satır JSON (NDJSON, chunked) olarak gönderilir → istemci
+ilk frame'leri geri kalanı hesaplanırken çizebilir, tepe bellek sabit kalır.
+
+Satır protokolü (her satır tek JSON nesnesi, ``type`` alanıyla):
+
+.. code-block:: text
+
+    {"type": "meta",  ...endpoint meta...}
+    {"type": "frame", "ts": "...", "vals": {...}}     (0..N kez)
+    {"type": "end",   "total_frames": N, "metric_min": .., "metric_max": ..}
+
+Akış başladıktan sonra HTTP durumu değiştirilemez; hata olursa son satır
+``{"type": "error", "detail": "..."}`` olur ve akış kapanır.
+
+Akış modu ``?stream=true`` veya ``Accept: application/x-ndjson`` ile seçilir.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from fastapi.responses import StreamingResponse
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Sunucu tarafı cursor parti boyutu (Query.yield_per)
+STREAM_BATCH = 2000
+
+
+def wants_ndjson(accept: Optional[str], stream: bool = False) -> bool:
+    """``?stream=true`` veya Accept'te ``application/x-ndjson`` varsa True."""
+    if stream:
+        return True
+    if not accept:
+        return False
+    return any(
+        part.split(";", 1)[0].strip().lower() == NDJSON_MEDIA_TYPE
+        for part in accept.split(",")
+    )
+
+
+def ndjson_line(obj: Dict[str, Any]) -> bytes:
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=str) + "\n").encode("utf-8")
+
+
+def _guarded(lines: Iterable[Dict[str, Any]]) -> Iterator[bytes]:
+    try:
+        for obj in lines:
+            yield ndjson_line(obj)
+    except Exception as e:
+        logger.exception("NDJSON akışı yarıda kesildi")
+        yield ndjson_line({"type": "error", "detail": str(e)})
+
+
+def ndjson_response(lines: Iterable[Dict[str, Any]]) -> StreamingResponse:
+    """Satır üreticisini chunked NDJSON yanıtına sarar.
+
+    Senkron üretici Starlette tarafından threadpool'da tüketilir; DB oturumu
+    üreticinin içinde açılıp kapanmalıdır (istek bitince değil, akış bitince).
+    """
+    return StreamingResponse(
+        _guarded(lines),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class RunningRange:
+    """Akış boyunca global min/max — tüm değerleri listede tutmadan."""
+
+    __slots__ = ("lo", "hi")
+
+    def __init__(self) -> None:
+        self.lo: Optional[float] = None
+        self.hi: Optional[float] = None
+
+    def add(self, v: float) -> None:
+        if self.lo is None or v < self.lo:
+            self.lo = v
+        if self.hi is None or v > self.hi:
+            self.hi = v
+
+    def extend(self, values: Iterable[float]) -> None:
+        for v in values:
+            self.add(v)
@@ -0,0 +1,166 @@
+"""
+SRRP — Toplu Pin Yeniden Analizi (paralel, sınırlı eşzamanlılık)
+=================================================================
+
+`/pins/batch/reanalyze` 500'e kadar pini tek tek işliyordu: her pin için en
+yakın lokasyon `ORDER BY` + tam yıllık seri okuma + verim hesabı, hepsi tek
+paylaşılan `system_db` oturumu üzerinden. Bu modül aynı işi:
+
+1. **Gruplar** — her pinin en yakın lokasyonu süreç içi KD-tree ile tek
+   vektörel sorguda seçilir (`hourly_station_index`, aynı karesel mesafe
+   ölçütü). Aynı lokasyona düşen pinler tek grupta toplanır.
+2. **Bir kez okur** — her lokasyonun saatlik dizileri grup başına bir kez
+   yüklenir (`load_hourly_arrays_at`), gruptaki tüm pinler paylaşır.
+3. **Sınırlı havuzda hesaplar** — gruplar `MAX_WORKERS` iş parçacıklı
+   havuzda işlenir; her worker kendi `SystemSessionLocal` oturumunu açar
+   (oturumlar thread'ler arasında paylaşılmaz).
+
+`run_batch` sonuçları tamamlandıkça `PinOutcome` olarak yield eder → router
+ilerlemeyi akış (NDJSON) olarak gönderebilir. DB yazımı (pin analizi, pin
+alanları) çağıranın işidir; burada yalnızca okuma + hesap yapılır.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from app.db.database import SystemSessionLocal
+
+logger = logging.getLogger(__name__)
+
+# DB havuzu pool_size=20 — toplu iş havuzun yarısından fazlasını tutmasın
+MAX_WORKERS = 6
+
+
+@dataclass(frozen=True)
+class PinJob:
+    """Pin'in hesap için gereken alanlarının ORM'den bağımsız kopyası
+    (ORM nesneleri worker thread'lerine taşınmaz)."""
+    pin_id: int
+    latitude: float
+    longitude: float
+    pin_type: str
+    panel_area: Optional[float] = None
+    capacity_mw: Optional[float] = None
+    efficiency: float = 0.20
+
+
+@dataclass
+class PinOutcome:
+    pin_id: int
+    status: str                             # "ok" | "skipped" | "error"
+    result_data: Optional[dict] = None
+    pin_updates: Dict[str, Any] = field(default_factory=dict)
+    msg: Optional[str] = None
+
+
+# compute(job, hourly_data | None, weather_stats_fn) → (result_data | None, pin_updates)
+ComputeFn = Callable[[PinJob, Optional[dict], Callable[[], dict]], Tuple[Optional[dict], Dict[str, Any]]]
+
+
+def group_jobs_by_location(
+    jobs: List[PinJob],
+    index: Any,
+    since: Optional[datetime] = None,
+) -> List[Tuple[Optional[Any], List[PinJob]]]:
+    """Pinleri `StationIndex` üzerinde en yakın lokasyona göre grupla.
+    Lokasyonu bulunamayan pinler lokasyonu None olan grupta toplanır."""
+    if not jobs:
+        return []
+    idx = index.nearest_many(
+        np.array([j.latitude for j in jobs], dtype=np.float64),
+        np.array([j.longitude for j in jobs], dtype=np.float64),
+        since,
+    )
+    groups: Dict[int, List[PinJob]] = {}
+    for job, i in zip(jobs, idx.tolist()):
+        groups.setdefault(i, []).append(job)
+    return [(index.stations[i] if i >= 0 else None, grp) for i, grp in groups.items()]
+
+
+def run_batch(
+    jobs: List[PinJob],
+    compute: ComputeFn,
+    max_workers: int = MAX_WORKERS,
+    days: int = 365,
+) -> Iterator[PinOutcome]:
+    """Pinleri lokasyon gruplarına ayırıp sınırlı havuzda hesaplar; her pin
+    sonucunu tamamlandıkça yield eder (sıra = tamamlanma sırası)."""
+    from app.crud import crud
+    from app.services.hourly_weather_helper import (
+        hourly_station_index,
+        load_hourly_arrays_at,
+    )
+
+    if not jobs:
+        return
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    with SystemSessionLocal() as db:
+        index, since, source = hourly_station_index(db, cutoff)
+    groups = group_jobs_by_location(jobs, index, since)
+    logger.info("[pin_batch] %d pin → %d lokasyon grubu (%s), %d worker",
+                len(jobs), len(groups), source, min(max_workers, len(groups)))
+
+    # Worker başına bir oturum (thread-local); havuz kapanınca hepsi kapatılır
+    local = threading.local()
+    sessions: list = []
+    sessions_lock = threading.Lock()
+
+    def _session():
+        db = getattr(local, "db", None)
+        if db is None:
+            db = local.db = SystemSessionLocal()
+            with sessions_lock:
+                sessions.append(db)
+        return db
+
+    def _process(location, group: List[PinJob]) -> List[PinOutcome]:
+        db = _session()
+        hourly = None
+        try:
+            if location is not None:
+                hourly = load_hourly_arrays_at(db, location, cutoff, source=source)
+                if hourly is None and source == "packed":
+                    hourly = load_hourly_arrays_at(db, location, cutoff, source="raw")
+        except Exception as e:
+            db.rollback()
+            logger.warning("[pin_batch] lokasyon okuma hatası %s: %s", location, e)
+        hourly_data = hourly if hourly and hourly.get("count") else None
+
+        out: List[PinOutcome] = []
+        for job in group:
+            try:
+                result_data, updates = compute(
+                    job, hourly_data,
+                    lambda j=job: crud.get_weather_stats(db, j.latitude, j.longitude) or {},
+                )
+                if result_data:
+                    out.append(PinOutcome(job.pin_id, "ok", result_data, updates))
+                else:
+                    out.append(PinOutcome(job.pin_id, "skipped"))
+            except Exception as e:
+                db.rollback()
+                out.append(PinOutcome(job.pin_id, "error", msg=str(e)))
+        return out
+
+    workers = max(1, min(max_workers, len(groups)))
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pin-batch")
+    try:
+        futures = {pool.submit(_process, loc, grp): grp for loc, grp in groups}
+        for fut in as_completed(futures):
+            try:
+                outcomes = fut.result()
+            except Exception as e:
+                outcomes = [PinOutcome(j.pin_id, "error", msg=str(e)) for j in futures[fut]]
+            yield from outcomes
+    finally:
+        # Akış erken kapanırsa (istemci koptu) bekleyen gruplar iptal edilir
+        pool.shutdown(wait=True, cancel_futures=True)
+        for db in sessions:
+            db.close()
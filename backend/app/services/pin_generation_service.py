@@ -39,15 +39,14 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta, date
 from typing import Literal, Optional
 
+import numpy as np
+from numpy.typing import ArrayLike
 from sqlalchemy import and_, or_, func
 
 from app.db.database import SystemSessionLocal, UserSessionLocal
 from app.db.models import Climatology, HourlyWeatherData, Pin
-from app.services.climatology_service import (
-    _tr_ascii_fold,
-    _wind_power_curve,
-    GHI_STC_WM2,
-)
+from app.services import yield_engine
+from app.services.climatology_service import _tr_ascii_fold
 
 logger = logging.getLogger(__name__)
 
@@ -103,34 +102,39 @@ def _resolve_period(
 
 
 def _compute_wind_hourly_kwh(
-    wind_speed_mps: float,
+    wind_speed_mps: ArrayLike,
     capacity_mw: float,
-) -> float:
-    """Saatlik rüzgar üretimi (kWh).
+) -> np.ndarray:
+    """Saatlik rüzgar üretimi (kWh) — skaler veya dizi (vektörel).
 
     power_curve [0..1] × capacity_mw × 1 saat × 1000 (MW→kW)
     """
-    cf = _wind_power_curve(wind_speed_mps)
+    cf = yield_engine.wind_cf(wind_speed_mps)
     return cf * capacity_mw * 1000.0  # 1 saat
 
 
 def _compute_solar_hourly_kwh(
-    ghi_wm2: float,
+    ghi_wm2: ArrayLike,
     capacity_mw: float,
     panel_area_m2: Optional[float] = None,
-) -> float:
-    """Saatlik güneş üretimi (kWh).
+) -> np.ndarray:
+    """Saatlik güneş üretimi (kWh) — skaler veya dizi (vektörel).
 
     capacity_mw direkt verilmişse: cf × capacity × 1h
     panel_area verilmişse: GHI × area × verim × 1h (gerçekçi)
 
     Pilot fazda capacity-based — basit.
     """
-    pr = 0.80  # performance ratio
-    cf = min(ghi_wm2, GHI_STC_WM2) / GHI_STC_WM2 * pr
+    cf = yield_engine.solar_cf(ghi_wm2, pr=0.80)  # performance ratio
     return cf * capacity_mw * 1000.0
 
 
+def _compute_hourly_kwh(resource: str, values: np.ndarray, capacity_mw: float) -> np.ndarray:
+    if resource == "wind":
+        return _compute_wind_hourly_kwh(values, capacity_mw)
+    return _compute_solar_hourly_kwh(values, capacity_mw)
+
+
 def _get_climatology_for_pin(pin: Pin) -> Optional[Climatology]:
     """Pin'in tipine + konumuna en uygun climatology row'u bul.
 
@@ -248,24 +252,11 @@ def _generation_from_hourly_actual(
         if not rows:
             return 0.0, [], 0
 
-        daily_kwh: dict[date, float] = {}
-        total = 0.0
-        for ts, val in rows:
-            if val is None:
-                continue
-            if resource == "wind":
-                kwh = _compute_wind_hourly_kwh(float(val), capacity)
-            else:
-                kwh = _compute_solar_hourly_kwh(float(val), capacity)
-            total += kwh
-            d = ts.date() if hasattr(ts, "date") else ts
-            daily_kwh[d] = daily_kwh.get(d, 0.0) + kwh
-
-        breakdown = [
-            {"date": d.isoformat(), "kwh": round(v, 2)}
-            for d, v in sorted(daily_kwh.items())
-        ]
-        return round(total, 2), breakdown, len(rows)
+        ts = np.array([r[0] for r in rows if r[1] is not None], dtype="datetime64[h]")
+        vals = np.array([r[1] for r in rows if r[1] is not None], dtype=np.float64)
+        kwh = _compute_hourly_kwh(resource, vals, capacity)
+        breakdown = yield_engine.daily_sums(ts, kwh)
+        return round(float(kwh.sum()), 2), breakdown, len(rows)
 
 
 def _generation_hydro_physical(
@@ -370,30 +361,22 @@ def _generation_from_climatology(
         return 0.0, [], 0
 
     profile = climatology.hourly_typical_profile  # {"1": {"0": v, ...}}
-    daily_kwh: dict[date, float] = {}
-    total = 0.0
-    cur = start
-    sample = 0
-    while cur < end:
-        month_key = str(cur.month)
-        hour_key = str(cur.hour)
-        val = (profile.get(month_key) or {}).get(hour_key)
-        if val is not None:
-            if resource == "wind":
-                kwh = _compute_wind_hourly_kwh(float(val), capacity)
-            else:
-                kwh = _compute_solar_hourly_kwh(float(val), capacity)
-            total += kwh
-            d = cur.date()
-            daily_kwh[d] = daily_kwh.get(d, 0.0) + kwh
-            sample += 1
-        cur += timedelta(hours=1)
-
-    breakdown = [
-        {"date": d.isoformat(), "kwh": round(v, 2)}
-        for d, v in sorted(daily_kwh.items())
-    ]
-    return round(total, 2), breakdown, sample
+    # (ay × saat) profil matrisi; eksik hücre NaN → o saat örneklenmez
+    prof = np.full((12, 24), np.nan)
+    for month_key, hours in profile.items():
+        for hour_key, val in (hours or {}).items():
+            if val is not None:
+                prof[int(month_key) - 1, int(hour_key)] = float(val)
+
+    # [start, end) saat ekseni; başlangıcın dakika/saniye ofseti korunur
+    n_hours = max(int(np.ceil((end - start).total_seconds() / 3600)), 0)
+    ts = np.datetime64(start, "s") + np.arange(n_hours) * np.timedelta64(3600, "s")
+    hour_idx = ts.astype("datetime64[h]").astype(np.int64) % 24
+    vals = prof[yield_engine.month_index(ts), hour_idx]
+    ok = ~np.isnan(vals)
+    kwh = _compute_hourly_kwh(resource, vals[ok], capacity)
+    breakdown = yield_engine.daily_sums(ts[ok], kwh)
+    return round(float(kwh.sum()), 2), breakdown, int(ok.sum())
 
 
 def compute_pin_generation(
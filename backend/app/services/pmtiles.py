@@ -0,0 +1,338 @@
+"""
+SRRP — PMTiles v3 Okuyucu / Yazıcı (bağımlılıksız)
+==================================================
+
+Contour tile'ları MBTiles (SQLite) dosyasından thread-local bağlantılarla,
+senkron threadpool'da tile başına bir SELECT ile okunuyordu. PMTiles tek
+dosyalık, dizin (directory) indeksli bir tile arşividir:
+
+  * 127 baytlık başlık + kök dizin dosyanın ilk 16 KB'ında
+  * Tile'lar Hilbert eğrisi sırasındaki ``tile_id`` ile adreslenir; dizin
+    girdileri (tile_id, offset, uzunluk, run_length) varint + delta kodlu
+  * Aynı içerikli tile'lar (ör. deniz/boş) tek kopya + run_length ile saklanır
+
+``PMTilesReader`` dosyayı ``mmap`` ile açar; kök dizin açılışta, yaprak
+dizinler ilk erişimde çözülüp bellekte tutulur → tile okuma saf bellek
+işlemi (syscall / lock / thread yok), async handler'dan doğrudan çağrılır.
+Tile baytları arşivdeki sıkıştırmayla (çoğunlukla gzip) olduğu gibi döner.
+
+``write_pmtiles`` (z, x, y, bayt) akışından arşiv üretir —
+``scripts/build_contour_mvt.py --pmtiles`` MBTiles çıktısını bununla çevirir.
+
+Biçim: https://github.com/protomaps/PMTiles/blob/main/spec/v3/spec.md
+"""
+from __future__ import annotations
+
+import bisect
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+HEADER_LEN = 127
+ROOT_MAX_BYTES = 16384 - HEADER_LEN
+
+# Sıkıştırma / tile tipi enum'ları (spec)
+COMPRESSION_NONE = 1
+COMPRESSION_GZIP = 2
+TILE_TYPE_MVT = 1
+
+_HEADER = struct.Struct("<7sB11QBBBBBBiiiiBii")
+
+
+class Entry(NamedTuple):
+    tile_id: int
+    offset: int
+    length: int
+    run_length: int      # 0 → yaprak dizin işaretçisi
+
+
+class Header(NamedTuple):
+    root_offset: int
+    root_length: int
+    metadata_offset: int
+    metadata_length: int
+    leaf_offset: int
+    leaf_length: int
+    data_offset: int
+    data_length: int
+    addressed_tiles: int
+    tile_entries: int
+    tile_contents: int
+    clustered: int
+    internal_compression: int
+    tile_compression: int
+    tile_type: int
+    min_zoom: int
+    max_zoom: int
+    min_lon_e7: int
+    min_lat_e7: int
+    max_lon_e7: int
+    max_lat_e7: int
+    center_zoom: int
+    center_lon_e7: int
+    center_lat_e7: int
+
+
+# ─── Tile ID (Hilbert) ──────────────────────────────────────────────────────
+
+def zxy_to_tileid(z: int, x: int, y: int) -> int:
+    """(z, x, y) → PMTiles tile_id: önceki zoom'ların tile sayısı + Hilbert d."""
+    if z > 31 or x >= (1 << z) or y >= (1 << z) or x < 0 or y < 0:
+        raise ValueError(f"geçersiz tile z{z}/{x}/{y}")
+    acc = ((1 << (2 * z)) - 1) // 3
+    for a in range(z - 1, -1, -1):
+        s = 1 << a
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        acc += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x = s - 1 - (x & (s - 1))
+                y = s - 1 - (y & (s - 1))
+            x, y = y, x
+        x &= s - 1
+        y &= s - 1
+    return acc
+
+
+# ─── Varint / dizin kodlama ─────────────────────────────────────────────────
+
+def _read_varint(buf: bytes, pos: int) -> Tuple[int, int]:
+    result = shift = 0
+    while True:
+        b = buf[pos]
+        pos += 1
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result, pos
+        shift += 7
+
+
+def _write_varint(out: bytearray, v: int) -> None:
+    while v >= 0x80:
+        out.append((v & 0x7F) | 0x80)
+        v >>= 7
+    out.append(v)
+
+
+def deserialize_directory(buf: bytes) -> List[Entry]:
+    n, pos = _read_varint(buf, 0)
+    ids, runs, lens, offs = [0] * n, [0] * n, [0] * n, [0] * n
+    last = 0
+    for i in range(n):
+        d, pos = _read_varint(buf, pos)
+        last += d
+        ids[i] = last
+    for i in range(n):
+        runs[i], pos = _read_varint(buf, pos)
+    for i in range(n):
+        lens[i], pos = _read_varint(buf, pos)
+    for i in range(n):
+        v, pos = _read_varint(buf, pos)
+        # 0 → önceki girdinin hemen arkası (ardışık yazılmış tile'lar)
+        offs[i] = offs[i - 1] + lens[i - 1] if v == 0 and i > 0 else v - 1
+    return [Entry(*e) for e in zip(ids, offs, lens, runs)]
+
+
+def serialize_directory(entries: List[Entry]) -> bytes:
+    out = bytearray()
+    _write_varint(out, len(entries))
+    last = 0
+    for e in entries:
+        _write_varint(out, e.tile_id - last)
+        last = e.tile_id
+    for e in entries:
+        _write_varint(out, e.run_length)
+    for e in entries:
+        _write_varint(out, e.length)
+    for i, e in enumerate(entries):
+        if i > 0 and e.offset == entries[i - 1].offset + entries[i - 1].length:
+            _write_varint(out, 0)
+        else:
+            _write_varint(out, e.offset + 1)
+    return bytes(out)
+
+
+def find_entry(entries: List[Entry], tile_id: int) -> Optional[Entry]:
+    """``tile_id``'yi kapsayan girdi (tile ya da yaprak dizin) veya None."""
+    i = bisect.bisect_right(entries, (tile_id, float("inf"))) - 1
+    if i < 0:
+        return None
+    e = entries[i]
+    if e.run_length == 0 or tile_id < e.tile_id + e.run_length:
+        return e
+    return None
+
+
+def _decompress(data: bytes, compression: int) -> bytes:
+    if compression in (0, COMPRESSION_NONE):
+        return bytes(data)
+    if compression == COMPRESSION_GZIP:
+        return gzip.decompress(data)
+    raise ValueError(f"desteklenmeyen PMTiles iç sıkıştırması: {compression}")
+
+
+# ─── Okuyucu ────────────────────────────────────────────────────────────────
+
+class PMTilesReader:
+    """mmap tabanlı, thread-safe PMTiles okuyucu (dizinler bellekte)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        raw = _HEADER.unpack_from(self._mm, 0)
+        if raw[0] != b"PMTiles" or raw[1] != 3:
+            self._mm.close()
+            raise ValueError(f"PMTiles v3 değil: {path}")
+        self.header = Header(*raw[2:])
+        st = os.stat(path)
+        # Güçlü ETag kökü: dosya kimliği (boyut + mtime) — içerik değişirse değişir
+        self.etag_base = hashlib.blake2s(
+            f"{st.st_size}:{st.st_mtime_ns}".encode(), digest_size=6,
+        ).hexdigest()
+        h = self.header
+        self._root = deserialize_directory(self._dir_bytes(h.root_offset, h.root_length))
+        self._leaves: Dict[int, List[Entry]] = {}
+        self._lock = threading.Lock()
+
+    def _dir_bytes(self, offset: int, length: int) -> bytes:
+        return _decompress(self._mm[offset:offset + length], self.header.internal_compression)
+
+    def _leaf(self, offset: int, length: int) -> List[Entry]:
+        entries = self._leaves.get(offset)
+        if entries is None:
+            entries = deserialize_directory(
+                self._dir_bytes(self.header.leaf_offset + offset, length))
+            with self._lock:
+                self._leaves[offset] = entries
+        return entries
+
+    def locate(self, z: int, x: int, y: int) -> Optional[Tuple[int, int]]:
+        """Tile'ın arşivdeki (mutlak offset, uzunluk) değeri; yoksa None."""
+        h = self.header
+        if not h.min_zoom <= z <= h.max_zoom:
+            return None
+        tile_id = zxy_to_tileid(z, x, y)
+        entries = self._root
+        for _ in range(4):       # spec: en fazla 3 yaprak seviyesi
+            e = find_entry(entries, tile_id)
+            if e is None:
+                return None
+            if e.run_length > 0:
+                return h.data_offset + e.offset, e.length
+            entries = self._leaf(e.offset, e.length)
+        return None
+
+    def read(self, offset: int, length: int) -> bytes:
+        """``locate`` sonucundaki ham (arşivdeki sıkıştırmayla) tile baytları."""
+        return self._mm[offset:offset + length]
+
+    def get_tile(self, z: int, x: int, y: int) -> Optional[bytes]:
+        loc = self.locate(z, x, y)
+        return self.read(*loc) if loc is not None else None
+
+    def etag(self, offset: int, length: int) -> str:
+        """Tile için güçlü ETag — tekilleştirilmiş aynı içerik aynı etiketi alır."""
+        return f'"{self.etag_base}-{offset:x}-{length:x}"'
+
+    def metadata(self) -> dict:
+        h = self.header
+        if not h.metadata_length:
+            return {}
+        return json.loads(self._dir_bytes(h.metadata_offset, h.metadata_length))
+
+    def close(self) -> None:
+        self._mm.close()
+
+
+# ─── Yazıcı ─────────────────────────────────────────────────────────────────
+
+def _build_directories(entries: List[Entry], compress) -> Tuple[bytes, bytes]:
+    """Kök (+ gerekirse yaprak) dizinler. Kök 16 KB'a sığana dek yaprak
+    boyutu büyütülür."""
+    root = compress(serialize_directory(entries))
+    if len(root) <= ROOT_MAX_BYTES:
+        return root, b""
+    leaf_size = 4096
+    while True:
+        leaves = bytearray()
+        root_entries = []
+        for i in range(0, len(entries), leaf_size):
+            chunk = entries[i:i + leaf_size]
+            blob = compress(serialize_directory(chunk))
+            root_entries.append(Entry(chunk[0].tile_id, len(leaves), len(blob), 0))
+            leaves += blob
+        root = compress(serialize_directory(root_entries))
+        if len(root) <= ROOT_MAX_BYTES:
+            return root, bytes(leaves)
+        leaf_size *= 2
+
+
+def write_pmtiles(
+    path: str,
+    tiles: Iterable[Tuple[int, int, int, bytes]],
+    tile_compression: int = COMPRESSION_GZIP,
+    metadata: Optional[dict] = None,
+    bounds: Tuple[float, float, float, float] = (-180.0, -85.0, 180.0, 85.0),
+) -> int:
+    """(z, x, y, bayt) akışından PMTiles v3 arşivi yazar; aynı içerikli tile'lar
+    tek kopya saklanır. Geçici dosyaya yazıp atomik olarak yerine koyar.
+    Döner: adreslenen tile sayısı."""
+    def compress(b: bytes) -> bytes:
+        return gzip.compress(b, mtime=0)
+
+    by_id = sorted(
+        ((zxy_to_tileid(z, x, y), z, data) for z, x, y, data in tiles if data),
+        key=lambda t: t[0],
+    )
+    data = bytearray()
+    seen: Dict[bytes, Tuple[int, int]] = {}
+    entries: List[Entry] = []
+    zooms = []
+    for tile_id, z, blob in by_id:
+        zooms.append(z)
+        digest = hashlib.blake2b(blob, digest_size=16).digest()
+        if digest in seen:
+            off, length = seen[digest]
+        else:
+            off, length = len(data), len(blob)
+            seen[digest] = (off, length)
+            data += blob
+        last = entries[-1] if entries else None
+        if (last is not None and last.offset == off and last.length == length
+                and last.tile_id + last.run_length == tile_id):
+            entries[-1] = last._replace(run_length=last.run_length + 1)
+        else:
+            entries.append(Entry(tile_id, off, length, 1))
+
+    root, leaves = _build_directories(entries, compress)
+    meta = compress(json.dumps(metadata or {}).encode("utf-8"))
+    root_off = HEADER_LEN
+    meta_off = root_off + len(root)
+    leaf_off = meta_off + len(meta)
+    data_off = leaf_off + len(leaves)
+    minz, maxz = (min(zooms), max(zooms)) if zooms else (0, 0)
+    w, s, e, n = bounds
+    header = _HEADER.pack(
+        b"PMTiles", 3,
+        root_off, len(root), meta_off, len(meta), leaf_off, len(leaves),
+        data_off, len(data), len(by_id), len(entries), len(seen),
+        1, COMPRESSION_GZIP, tile_compression, TILE_TYPE_MVT, minz, maxz,
+        int(w * 1e7), int(s * 1e7), int(e * 1e7), int(n * 1e7),
+        minz, int((w + e) / 2 * 1e7), int((s + n) / 2 * 1e7),
+    )
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(header)
+        f.write(root)
+        f.write(meta)
+        f.write(leaves)
+        f.write(data)
+    os.replace(tmp, path)
+    return len(by_id)
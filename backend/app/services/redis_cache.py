@@ -8,59 +8,58 @@ Katmanlı strateji:
 
 Her iki katman da aynı API ile kullanılır; uygulama kodu
 Redis varlığından haberdar olmak zorunda değildir.
+
+Ağır hesaplamalar için ``get_or_compute`` (stampede koruması): aynı anahtar
+için süreç içinde tek hesap (per-key lock), süreçler arası Redis ``SET NX``
+kirası, TTL dolunca bir işçi yenilerken diğerlerine bayat değer
+(stale-while-revalidate).
 """
-import json
 import os
 import time
+import uuid
 import logging
+from contextlib import contextmanager
 from threading import Lock
-from typing import Optional, Any, Tuple
+from typing import Optional, Any, Tuple, Callable, Union
 from functools import wraps
 
+from app.services import cache_codec
+from app.services.mem_cache import SizedLRU, budget_from_env
+
 logger = logging.getLogger(__name__)
 
 # ─── In-Memory TTL Cache ────────────────────────────────────────────────────
-# Yapı: { key: (value, expire_at_float) }
-# Thread-safe: Lock ile korunur.
-_mem_store: dict = {}
-_mem_lock = Lock()
+# Bayt bütçeli LRU (mem_cache.SizedLRU): Redis kapalıyken büyük yanıtlar
+# (animasyon, choropleth) belleği sınırsız doldurmasın. Bütçe:
+# SRRP_MEM_CACHE_MB (varsayılan 256 MB). Thread-safe.
+_mem_store = SizedLRU(budget_from_env("SRRP_MEM_CACHE_MB", 256), name="mem")
 
 
 def _mem_get(key: str) -> Optional[Any]:
-    with _mem_lock:
-        entry = _mem_store.get(key)
-        if entry is None:
-            return None
-        value, expire_at = entry
-        if time.monotonic() > expire_at:
-            del _mem_store[key]
-            return None
-        return value
+    return _mem_store.get(key)
 
 
 def _mem_set(key: str, value: Any, ttl_seconds: int) -> None:
-    with _mem_lock:
-        _mem_store[key] = (value, time.monotonic() + ttl_seconds)
+    _mem_store.set(key, value, ttl_seconds)
 
 
 def _mem_delete(key: str) -> None:
-    with _mem_lock:
-        _mem_store.pop(key, None)
+    _mem_store.delete(key)
 
 
 def _mem_flush() -> None:
-    with _mem_lock:
-        _mem_store.clear()
+    _mem_store.clear()
 
 
 def _mem_delete_pattern(pattern: str) -> int:
     """Basit glob-style wildcard: 'prefix:*' şeklindeki pattern'leri destekler."""
-    prefix = pattern.rstrip("*")
-    with _mem_lock:
-        keys_to_del = [k for k in _mem_store if k.startswith(prefix)]
-        for k in keys_to_del:
-            del _mem_store[k]
-    return len(keys_to_del)
+    return _mem_store.delete_prefix(pattern.rstrip("*"))
+
+
+def mem_cache_stats() -> dict:
+    """Süreç içi cache sayaçları (hit/miss/eviction, bayt)."""
+    return _mem_store.stats()
+
 
 # --- Redis Bağlantısı ---
 REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379/0")
@@ -70,10 +69,13 @@ try:
     redis_client = redis.from_url(REDIS_URL, decode_responses=True)
     # Bağlantıyı test et
     redis_client.ping()
+    # Değerler cache_codec çerçevesiyle (ikili) yazılır → ayrı, decode'suz istemci
+    redis_binary_client = redis.from_url(REDIS_URL, decode_responses=False)
     REDIS_AVAILABLE = True
     logger.info("✅ Redis bağlantısı başarılı")
 except Exception as e:
     redis_client = None
+    redis_binary_client = None
     REDIS_AVAILABLE = False
     logger.warning(f"⚠️ Redis bağlantısı kurulamadı: {e}. Cache devre dışı.")
 
@@ -85,20 +87,37 @@ def cache_get(key: str) -> Optional[Any]:
     """Cache'den veri oku. Redis → in-memory fallback zinciri."""
     if REDIS_AVAILABLE:
         try:
-            data = redis_client.get(key)
+            data = redis_binary_client.get(key)
             if data:
-                return json.loads(data)
+                return cache_codec.decode(data)[0]
         except Exception as e:
             logger.error(f"Redis okuma hatası: {e}")
     # In-memory fallback
     return _mem_get(key)
 
 
+def cache_get_raw(key: str) -> Optional[bytes]:
+    """Cache'deki değeri JSON bayt olarak oku — JSON kayıtlar çözülmeden
+    döner; ``Response(content=..., media_type="application/json")`` ile
+    doğrudan gönderilebilir (decode/encode turu yok)."""
+    if REDIS_AVAILABLE:
+        try:
+            data = redis_binary_client.get(key)
+            if data:
+                if cache_codec.is_framed(data):
+                    return cache_codec.decode_json_bytes(data)[0]
+                return data
+        except Exception as e:
+            logger.error(f"Redis okuma hatası: {e}")
+    value = _mem_get(key)
+    return None if value is None else cache_codec.dumps_json(value)
+
+
 def cache_set(key: str, value: Any, ttl_seconds: int = 3600) -> bool:
     """Cache'e veri yaz. Varsayılan TTL: 1 saat. Her iki katmana da yazar."""
     if REDIS_AVAILABLE:
         try:
-            redis_client.setex(key, ttl_seconds, json.dumps(value, default=str))
+            redis_binary_client.setex(key, ttl_seconds, cache_codec.encode(value))
             return True
         except Exception as e:
             logger.error(f"Redis yazma hatası: {e}")
@@ -145,6 +164,197 @@ def cache_flush() -> bool:
     return True
 
 
+# --- Stampede koruması ---
+# Tazelik zamanı Redis'te cache_codec başlığında (FLAG_META), bellekte
+# {"__swr__": taze_bitiş_epoch, "v": değer} zarfında tutulur. Fiziksel TTL =
+# ttl + bayat penceresi; taze süre dolunca değer bayat penceresi boyunca
+# sunulmaya devam eder, o sırada tek bir işçi yeniler. Bellekteki zarf
+# get_or_compute ile okunmalıdır (cache_get zarfı açmaz).
+
+_SWR_MARK = "__swr__"
+_LEASE_PREFIX = "lease:"
+_LEASE_RELEASE_LUA = (
+    "if redis.call('get', KEYS[1]) == ARGV[1] then "
+    "return redis.call('del', KEYS[1]) else return 0 end"
+)
+
+# key → [Lock, kullanıcı sayısı]; kullanıcı kalmayınca silinir (sınırsız büyümez)
+_inflight: dict = {}
+_inflight_guard = Lock()
+
+
+@contextmanager
+def _key_lock(key: str, blocking: bool = True):
+    with _inflight_guard:
+        slot = _inflight.setdefault(key, [Lock(), 0])
+        slot[1] += 1
+    acquired = slot[0].acquire(blocking)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            slot[0].release()
+        with _inflight_guard:
+            slot[1] -= 1
+            if slot[1] == 0:
+                _inflight.pop(key, None)
+
+
+def _acquire_lease(key: str, lease_seconds: int) -> Optional[str]:
+    """Süreçler arası yenileme kirası. Redis yoksa süreç içi kilit yeterli →
+    her zaman verilir. Döner: kira jetonu veya None (başkası hesaplıyor)."""
+    token = uuid.uuid4().hex
+    if not REDIS_AVAILABLE:
+        return token
+    try:
+        if redis_client.set(_LEASE_PREFIX + key, token, nx=True, ex=lease_seconds):
+            return token
+        return None
+    except Exception as e:
+        logger.error(f"Redis kira hatası: {e}")
+        return token
+
+
+def _release_lease(key: str, token: str) -> None:
+    if not REDIS_AVAILABLE:
+        return
+    try:
+        redis_client.eval(_LEASE_RELEASE_LUA, 1, _LEASE_PREFIX + key, token)
+    except Exception as e:
+        logger.error(f"Redis kira bırakma hatası: {e}")
+
+
+def _lease_held(key: str) -> bool:
+    if not REDIS_AVAILABLE:
+        return False
+    try:
+        return bool(redis_client.exists(_LEASE_PREFIX + key))
+    except Exception:
+        return False
+
+
+def _read_entry(key: str, raw: bool = False) -> Optional[Tuple[Any, float]]:
+    """(değer, taze_bitiş_epoch) — tazelik bilgisi olmayan kayıtlar taze
+    sayılır. ``raw`` → değer JSON bayt olarak (mümkünse çözülmeden)."""
+    if REDIS_AVAILABLE:
+        try:
+            data = redis_binary_client.get(key)
+            if data:
+                if raw and cache_codec.is_framed(data):
+                    value, fresh_until = cache_codec.decode_json_bytes(data)
+                    return value, float("inf") if fresh_until is None else fresh_until
+                value, fresh_until = cache_codec.decode(data)
+                if fresh_until is None:
+                    return _unwrap(value, raw)
+                return value, fresh_until
+        except Exception as e:
+            logger.error(f"Redis okuma hatası: {e}")
+    value = _mem_get(key)
+    return None if value is None else _unwrap(value, raw)
+
+
+def _unwrap(data: Any, raw: bool) -> Tuple[Any, float]:
+    fresh_until = float("inf")
+    if isinstance(data, dict) and _SWR_MARK in data:
+        data, fresh_until = data.get("v"), float(data[_SWR_MARK])
+    return (cache_codec.dumps_json(data) if raw else data), fresh_until
+
+
+def _compute_and_store(key: str, fn: Callable[[], Any],
+                       ttl_seconds: Union[int, Callable[[Any], int]],
+                       stale_seconds: Optional[int], raw: bool = False) -> Any:
+    value = fn()
+    if value is None:
+        return None
+    ttl = ttl_seconds(value) if callable(ttl_seconds) else ttl_seconds
+    stale = ttl if stale_seconds is None else stale_seconds
+    fresh_until = time.time() + ttl
+    payload = cache_codec.dumps_json(value) if raw else None
+    if REDIS_AVAILABLE:
+        try:
+            blob = (cache_codec.encode_json_bytes(payload, fresh_until) if raw
+                    else cache_codec.encode(value, fresh_until))
+            redis_binary_client.setex(key, ttl + stale, blob)
+            return payload if raw else value
+        except Exception as e:
+            logger.error(f"Redis yazma hatası: {e}")
+    _mem_set(key, {_SWR_MARK: fresh_until, "v": value}, ttl + stale)
+    return payload if raw else value
+
+
+def get_or_compute(
+    key: str,
+    fn: Callable[[], Any],
+    ttl_seconds: Union[int, Callable[[Any], int]] = 3600,
+    stale_seconds: Optional[int] = None,
+    lease_seconds: int = 60,
+    raw: bool = False,
+) -> Any:
+    """
+    Cache'den oku; yoksa ``fn()`` ile hesapla — aynı anahtar için tek hesap.
+
+      * Taze kayıt → doğrudan döner.
+      * Bayat kayıt (taze süre dolmuş, ``stale_seconds`` içinde) → kirayı alan
+        tek istek yeniler, diğerleri beklemeden bayat değeri alır. Yenileme
+        hata verirse bayat değer döner.
+      * Kayıt yok → süreç içinde aynı anahtarı bekleyenler tek kilitte
+        sıralanır; Redis kirası başka süreçteyse sonuç yazılana kadar (en
+        çok ``lease_seconds``) beklenir, kira düşerse burada hesaplanır.
+
+    ``ttl_seconds`` değerden TTL üreten bir fonksiyon da olabilir (ör. boş
+    sonuç kısa cache'lensin). ``stale_seconds`` varsayılanı ``ttl``'dir.
+    ``None`` sonuçlar cache'lenmez. ``fn``'in istisnaları (kayıt yoksa)
+    çağırana aynen iletilir.
+
+    ``raw=True`` → sonuç JSON bayt olarak döner (cache'ten geliyorsa hiç
+    çözülmeden) — büyük yanıtlar ``Response(content=...)`` ile gönderilir.
+    """
+    entry = _read_entry(key, raw)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() < fresh_until:
+            return value
+        with _key_lock(key, blocking=False) as acquired:
+            if not acquired:
+                return value
+            token = _acquire_lease(key, lease_seconds)
+            if token is None:
+                return value
+            try:
+                refreshed = _compute_and_store(key, fn, ttl_seconds, stale_seconds, raw)
+                return value if refreshed is None else refreshed
+            except Exception as e:
+                logger.warning(f"Cache yenileme hatası ({key}), bayat değer sunuluyor: {e}")
+                return value
+            finally:
+                _release_lease(key, token)
+
+    with _key_lock(key):
+        entry = _read_entry(key, raw)     # kilidi bekleyen diğer iş parçacığı yazmış olabilir
+        if entry is not None:
+            return entry[0]
+        token = _acquire_lease(key, lease_seconds)
+        if token is None:
+            deadline = time.monotonic() + lease_seconds
+            delay = 0.05
+            while time.monotonic() < deadline:
+                time.sleep(delay)
+                delay = min(delay * 2, 0.5)
+                entry = _read_entry(key, raw)
+                if entry is not None:
+                    logger.debug(f"Cache COALESCED: {key}")
+                    return entry[0]
+                if not _lease_held(key):
+                    token = _acquire_lease(key, lease_seconds)
+                    if token is not None:
+                        break
+        try:
+            return _compute_and_store(key, fn, ttl_seconds, stale_seconds, raw)
+        finally:
+            if token is not None:
+                _release_lease(key, token)
+
+
 # --- Dekoratör ---
 
 def cached(key_prefix: str, ttl_seconds: int = 3600):
@@ -0,0 +1,208 @@
+"""
+SRRP — Ortak Ters Coğrafi Kodlama (koordinat → il/ilçe)
+========================================================
+
+Koordinattan il/ilçe bulma farklı yerlerde ayrı ayrı yapılıyordu:
+
+  * `GeoService._get_location_info` — GeoPandas `.cx` bbox dilimi + her
+    tıkta `contains` (DataFrame kopyası, nokta başına ms mertebesi)
+  * `reports._find_nearest_location` — her GridAnalysis satırı için tüm
+    `TURKEY_CITIES` listesinde Python haversine döngüsü
+
+Bu modül ikisini tek yerde toplar:
+
+1. **Poligon araması** (`ReverseGeocoder`) — GADM/OSM ilçe poligonları
+   (borders router'ın okuduğu dosya) üzerinde shapely ``STRtree``; poligonlar
+   ``shapely.prepare`` ile hazırlanır. ``locate_many(lats, lons)`` tüm
+   noktaları tek bbox sorgusu + vektörel ``contains_xy`` ile çözer
+   (~1.000 ilçe poligonunda >100K nokta/sn).
+   Tekil ``locate`` koordinatı ``QUANT_DECIMALS`` basamağa yuvarlayıp LRU
+   önbellekten döner (aynı bölgeye tekrarlı tık / pin).
+2. **En yakın adlandırılmış lokasyon** (`NamedLocationIndex`) — `TURKEY_CITIES`
+   üzerinde birim küre (x, y, z) KD-tree; kiriş mesafesi büyük çember
+   mesafesiyle monoton → haversine döngüsüyle aynı sonuç.
+
+Eski davranış korunur: sınırdaki nokta poligonun içinde sayılmaz
+(``contains``), birden çok eşleşmede dosya sırasındaki ilk poligon kazanır,
+bulunamazsa ``{"province": "", "district": ""}``.
+"""
+from __future__ import annotations
+
+import json
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_GADM_DISTRICTS_PATH = (
+    Path(__file__).resolve().parent.parent.parent
+    / "data" / "vector" / "turkey_districts_osm.geojson"
+)
+
+# LRU anahtarı için yuvarlama: 4 basamak ≈ 11 m
+QUANT_DECIMALS = 4
+LOCATE_CACHE_SIZE = 65536
+
+_EMPTY = {"province": "", "district": ""}
+
+
+class ReverseGeocoder:
+    """İlçe poligonları üzerinde nokta-içinde-poligon araması."""
+
+    def __init__(self, geometries: Sequence[Any], provinces: Sequence[str],
+                 districts: Sequence[str]) -> None:
+        import shapely
+        from shapely import STRtree
+
+        self._geoms = np.asarray(geometries, dtype=object)
+        shapely.prepare(self._geoms)
+        self._tree = STRtree(self._geoms)
+        self.provinces: List[str] = [str(p or "") for p in provinces]
+        self.districts: List[str] = [str(d or "") for d in districts]
+        self._locate_cached = lru_cache(maxsize=LOCATE_CACHE_SIZE)(self._locate_quantized)
+
+    def __len__(self) -> int:
+        return len(self._geoms)
+
+    def locate_indices(self, lats: Sequence[float], lons: Sequence[float]) -> np.ndarray:
+        """Her nokta için poligon indeksi (bulunamazsa -1)."""
+        import shapely
+
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        out = np.full(len(lats), -1, dtype=np.int64)
+        if len(lats) == 0 or len(self._geoms) == 0:
+            return out
+        # Önce STRtree bbox adayları, sonra hazırlanmış poligonlarda
+        # `contains_xy` (GEOS prepared) — predicate'li query'den ~10× hızlı
+        pt_idx, poly_idx = self._tree.query(shapely.points(lons, lats))
+        hit = shapely.contains_xy(self._geoms[poly_idx], lons[pt_idx], lats[pt_idx])
+        pt_idx, poly_idx = pt_idx[hit], poly_idx[hit]
+        if len(pt_idx):
+            # Aynı noktaya birden çok poligon → en küçük (dosya sırasında ilk) indeks
+            order = np.lexsort((poly_idx, pt_idx))
+            pt_sorted, poly_sorted = pt_idx[order], poly_idx[order]
+            first = np.flatnonzero(np.r_[True, pt_sorted[1:] != pt_sorted[:-1]])
+            out[pt_sorted[first]] = poly_sorted[first]
+        return out
+
+    def locate_many(self, lats: Sequence[float], lons: Sequence[float]) -> List[Dict[str, str]]:
+        """Toplu arama → ``[{"province", "district"}, ...]`` (giriş sırasıyla)."""
+        return [
+            {"province": self.provinces[i], "district": self.districts[i]} if i >= 0 else dict(_EMPTY)
+            for i in self.locate_indices(lats, lons).tolist()
+        ]
+
+    def _locate_quantized(self, q_lat: float, q_lon: float) -> Tuple[str, str]:
+        i = int(self.locate_indices([q_lat], [q_lon])[0])
+        return (self.provinces[i], self.districts[i]) if i >= 0 else ("", "")
+
+    def locate(self, lat: float, lon: float) -> Dict[str, str]:
+        """Tekil arama — yuvarlanmış koordinat üzerinden LRU önbellekli."""
+        province, district = self._locate_cached(
+            round(float(lat), QUANT_DECIMALS), round(float(lon), QUANT_DECIMALS),
+        )
+        return {"province": province, "district": district}
+
+    def cache_info(self):
+        return self._locate_cached.cache_info()
+
+
+def load_geocoder(path: Path = _GADM_DISTRICTS_PATH) -> Optional[ReverseGeocoder]:
+    """GADM/OSM GeoJSON'dan geocoder kurar (dosya yoksa / okunamazsa None)."""
+    if not path.exists():
+        logger.warning("[reverse_geocoder] GADM dosyası bulunamadı: %s", path)
+        return None
+    try:
+        from shapely.geometry import shape
+
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        geoms, provinces, districts = [], [], []
+        for feat in data.get("features", []):
+            if not feat.get("geometry"):
+                continue
+            p = feat.get("properties", {}) or {}
+            geoms.append(shape(feat["geometry"]))
+            provinces.append(p.get("NAME_1", ""))
+            districts.append(p.get("NAME_2", ""))
+        geocoder = ReverseGeocoder(geoms, provinces, districts)
+        logger.info("[reverse_geocoder] GADM yüklendi: %d ilçe polygon", len(geocoder))
+        return geocoder
+    except Exception as e:
+        logger.exception("[reverse_geocoder] GADM okunamadı: %s", e)
+        return None
+
+
+@lru_cache(maxsize=1)
+def get_geocoder() -> Optional[ReverseGeocoder]:
+    """Süreç başına tek geocoder (ilk çağrıda ~1 sn yükleme)."""
+    return load_geocoder()
+
+
+def locate(lat: float, lon: float) -> Dict[str, str]:
+    """Koordinat → ``{"province", "district"}``; veri yoksa boş değerler."""
+    geocoder = get_geocoder()
+    if geocoder is None:
+        return dict(_EMPTY)
+    try:
+        return geocoder.locate(lat, lon)
+    except Exception as e:
+        logger.warning("[reverse_geocoder] locate hatası (%s, %s): %s", lat, lon, e)
+        return dict(_EMPTY)
+
+
+def locate_many(lats: Sequence[float], lons: Sequence[float]) -> List[Dict[str, str]]:
+    """Toplu ``locate``; veri yoksa her nokta için boş değerler."""
+    geocoder = get_geocoder()
+    if geocoder is None:
+        return [dict(_EMPTY) for _ in range(len(lats))]
+    return geocoder.locate_many(lats, lons)
+
+
+# ─── En yakın adlandırılmış lokasyon (TURKEY_CITIES) ───────────────────────
+
+def _unit_xyz(lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    lat_r, lon_r = np.radians(lats), np.radians(lons)
+    return np.column_stack([
+        np.cos(lat_r) * np.cos(lon_r),
+        np.cos(lat_r) * np.sin(lon_r),
+        np.sin(lat_r),
+    ])
+
+
+class NamedLocationIndex:
+    """Adlandırılmış lokasyon listesi (``{"name", "lat", "lon", ...}``) üzerinde
+    büyük çember mesafesine göre en yakın komşu."""
+
+    def __init__(self, locations: Sequence[Dict[str, Any]]) -> None:
+        from scipy.spatial import cKDTree
+
+        self.locations = list(locations)
+        xyz = _unit_xyz(
+            np.array([loc["lat"] for loc in self.locations], dtype=np.float64),
+            np.array([loc["lon"] for loc in self.locations], dtype=np.float64),
+        )
+        self._tree = cKDTree(xyz) if len(self.locations) else None
+
+    def nearest_many(self, lats: Sequence[float], lons: Sequence[float]) -> List[Optional[Dict[str, Any]]]:
+        if self._tree is None:
+            return [None] * len(lats)
+        _, idx = self._tree.query(_unit_xyz(np.asarray(lats, np.float64), np.asarray(lons, np.float64)))
+        return [self.locations[i] for i in np.atleast_1d(idx).tolist()]
+
+
+@lru_cache(maxsize=1)
+def _named_locations() -> NamedLocationIndex:
+    from app.core.constants import TURKEY_CITIES
+
+    return NamedLocationIndex(TURKEY_CITIES)
+
+
+def nearest_named_locations(lats: Sequence[float], lons: Sequence[float]) -> List[Optional[Dict[str, Any]]]:
+    """Her koordinat için en yakın `TURKEY_CITIES` kaydı (haversine ile aynı)."""
+    return _named_locations().nearest_many(lats, lons)
@@ -192,7 +192,11 @@ def _run_tracked(job_name: str, fn: Callable[[], None]) -> None:
 def _hourly_fetch_and_recompute() -> None:
     """
     1) Open-Meteo hourly fetch (81 il)
-    2) province_analysis recompute (tek kaynak tablosu)
+    2) Kolonsal paket deposuna yeni saatleri yama (hourly_weather_packed)
+    3) Günlük/aylık rollup'ları yeni saatler için güncelle (hourly_weather_rollup)
+    4) En yakın lokasyon indeksini tazele (yeni lokasyonlar, son kayıt zamanı)
+    5) Saatlik veri sürümünü artır (data_versions — saatlik cache anahtarları)
+    6) province_analysis recompute (tek kaynak tablosu)
 
     Her iki adımın başlangıç/bitiş zamanı log'a yazılır — geç tetikleme veya
     yavaş çalışma durumunda timestamp'lerden teşhis kolaylaştırılır.
@@ -203,9 +207,16 @@ def _hourly_fetch_and_recompute() -> None:
 
     logger.info("[scheduler] hourly fetch BAŞLADI")
     t0 = time.monotonic()
-    update_hourly_data()
+    refresh_from = update_hourly_data()
     logger.info("[scheduler] hourly fetch bitti (%.1fs)", time.monotonic() - t0)
 
+    if refresh_from is not None:
+        publish_hourly_update(refresh_from)
+    else:
+        # Yeni saat yoksa da — ayrı süreçte çalışan script'lerin eklediği
+        # lokasyonlar istek yolunda kurulum olmadan görünsün
+        _refresh_station_index()
+
     logger.info("[scheduler] province_analysis recompute BAŞLADI")
     t1 = time.monotonic()
     analysis_service.recompute_all_provinces()
@@ -215,6 +226,87 @@ def _hourly_fetch_and_recompute() -> None:
     )
 
 
+def publish_hourly_update(refresh_from: datetime) -> None:
+    """Yeni upsert edilen saatleri türev depolara işler, sonra saatlik veri
+    sürümünü artırır.
+
+    Saatlik çekimi tetikleyen her yol (scheduler, ``POST /weather/refresh``)
+    bunu çağırır — paket deposu, rollup ve lokasyon indeksi güncellenmeden
+    sürüm artarsa yeni sürümün cache anahtarları eski rollup'tan hesaplanıp
+    kalıcılaşır.
+    """
+    from . import data_versions
+
+    _patch_packed_store(refresh_from)
+    _refresh_rollups(refresh_from)
+    _refresh_station_index()
+    data_versions.bump(data_versions.HOURLY)
+
+
+def _patch_packed_store(refresh_from: datetime) -> None:
+    """Yeni upsert edilen saatleri kolonsal depoya yamar.
+
+    Hata hourly job'u düşürmez — paket ham tablodan her zaman yeniden
+    üretilebilir (`scripts/build_hourly_packed.py`), okuyucu ham tabloya düşer.
+    """
+    from .hourly_weather_store import patch_since
+
+    t0 = time.monotonic()
+    db = SystemSessionLocal()
+    try:
+        n = patch_since(db, refresh_from)
+        logger.info(
+            "[scheduler] packed store yamandı: %d lokasyon-ay (%.1fs)",
+            n, time.monotonic() - t0,
+        )
+    except Exception:
+        db.rollback()
+        logger.exception("[scheduler] packed store yaması başarısız")
+    finally:
+        db.close()
+
+
+def _refresh_rollups(refresh_from: datetime) -> None:
+    """Yeni upsert edilen saatlerin günlük + aylık rollup'larını yeniler.
+
+    Başarısızlık hourly job'u düşürmez — choropleth rollup boşsa ham
+    tabloya düşer; `scripts/build_weather_rollups.py` tam yeniden kurar.
+    """
+    from .weather_rollup_service import refresh_since
+
+    t0 = time.monotonic()
+    db = SystemSessionLocal()
+    try:
+        out = refresh_since(db, refresh_from)
+        logger.info(
+            "[scheduler] rollup güncellendi: %d günlük, %d aylık (%.1fs)",
+            out["daily"], out["monthly"], time.monotonic() - t0,
+        )
+    except Exception:
+        db.rollback()
+        logger.exception("[scheduler] rollup güncellemesi başarısız")
+    finally:
+        db.close()
+
+
+def _refresh_station_index() -> None:
+    """Süreç içi en yakın lokasyon indeksini (KD-tree) yeniden kurar.
+
+    Başarısızlık hourly job'u düşürmez — eski indeks hizmette kalır, bir
+    sonraki tur yeniden dener (istek yolu indeksi yeniden kurmaz).
+    """
+    from . import station_index
+
+    db = SystemSessionLocal()
+    try:
+        station_index.refresh(db)
+    except Exception:
+        db.rollback()
+        logger.exception("[scheduler] lokasyon indeksi tazelenemedi")
+    finally:
+        db.close()
+
+
 # ───────────────────────── Public API ─────────────────────────
 
 def start_scheduler(run_on_startup: bool = True) -> BackgroundScheduler:
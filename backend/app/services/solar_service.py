@@ -10,10 +10,15 @@ GHI her saat için Wh/m² olarak değerlendirilir (1 saat × W/m² = Wh/m²).
 Yıllık toplam tüm saatlerin basit toplamıdır — ortalama ya da tahmin yok.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any
 from datetime import datetime, timedelta
+
+import numpy as np
 import requests
 
+from app.services import yield_engine
+from app.services.yield_engine import HourlyInput
+
 
 # ── Türkçe ay isimleri ────────────────────────────────────────────────────────
 MONTH_NAMES_TR = [
@@ -30,16 +35,14 @@ def _temperature_correction(temp_c: float, noct: float = 45.0) -> float:
     NOCT (Nominal Operating Cell Temperature): Tipik değer 45°C.
     Hücre sıcaklığı = ortam + (NOCT - 20) × (G / 800)
     Basitleştirme: referans ışınım 800 W/m² varsayılır → t_cell ≈ temp_c + (NOCT - 20)
+
+    Dizi sürümü: `yield_engine.temperature_factor`.
     """
-    t_cell = temp_c + (noct - 20)  # NOCT=45 → temp_c + 25
-    loss_per_degree = 0.004  # %0.4/°C
-    delta = t_cell - 25.0
-    factor = 1.0 - (delta * loss_per_degree)
-    return max(factor, 0.5)  # Minimum %50 verim
+    return float(yield_engine.temperature_factor(temp_c, noct))
 
 
 def calculate_solar_from_hourly(
-    hourly_data: List[Dict[str, Any]],
+    hourly_data: HourlyInput,
     panel_area: float = 10.0,
     panel_efficiency: float = 0.20,
     performance_ratio: float = 0.80,
@@ -48,8 +51,13 @@ def calculate_solar_from_hourly(
     """
     Gerçek saatlik GHI verilerinden yıllık güneş enerjisi üretim hesabı.
 
+    Hesap vektöreldir (`yield_engine`): saat döngüsü yok, aylık kırılım
+    `np.bincount`.
+
     Args:
-        hourly_data: hourly_weather_helper'dan gelen saatlik veri listesi
+        hourly_data: `get_hourly_arrays_for_pin` dizi çıktısı
+            {"ts": datetime64[h][], "ghi_wm2": [], "temp_c": [], ...}
+            veya (geri uyum) `get_hourly_weather_for_pin` saat listesi
             [{"ts": datetime, "ghi_wm2": float, "temp_c": float, ...}, ...]
         panel_area: Panel alanı (m²)
         panel_efficiency: Panel verimi (0-1)
@@ -67,7 +75,8 @@ def calculate_solar_from_hourly(
             "method": "hourly_real_data"
         }
     """
-    if not hourly_data:
+    n_hours = yield_engine.hour_count(hourly_data)
+    if not n_hours:
         return {
             "predicted_annual_production_kwh": 0,
             "daily_avg_potential_kwh_m2": 0,
@@ -77,43 +86,31 @@ def calculate_solar_from_hourly(
             "error": "Saatlik veri bulunamadı",
         }
 
-    # ── Saatlik üretim hesabı ────────────────────────────────────────
-    monthly_kwh: Dict[int, float] = {}
-    monthly_ghi_wh: Dict[int, float] = {}
-    monthly_hours: Dict[int, int] = {}
-    total_production_kwh = 0.0
-    total_ghi_wh = 0.0
-
-    for h in hourly_data:
-        ghi = h.get("ghi_wm2", 0.0) or 0.0
-        if ghi <= 0:
-            continue
-
-        temp = h.get("temp_c", 25.0) or 25.0
-        ts: datetime = h["ts"]
-        month = ts.month
+    # ── Saatlik üretim hesabı (vektörel) ─────────────────────────────
+    arrays = yield_engine.as_arrays(hourly_data, ("ghi_wm2", "temp_c"))
+    ts, ghi = arrays["ts"], arrays["ghi_wm2"]
+    day = ghi > 0  # gece saatleri üretime ve aylık saat sayısına girmez
 
-        # Sıcaklık düzeltmesi
-        temp_factor = _temperature_correction(temp) if apply_temp_correction else 1.0
-
-        # Saatlik üretim: GHI(W/m²) × 1h = Wh/m²
-        # E_hour = (GHI_Wh/m² × A × η × PR × temp_factor) / 1000 → kWh
-        hour_kwh = (ghi * panel_area * panel_efficiency * performance_ratio * temp_factor) / 1000.0
-
-        total_production_kwh += hour_kwh
-        total_ghi_wh += ghi
-
-        monthly_kwh[month] = monthly_kwh.get(month, 0.0) + hour_kwh
-        monthly_ghi_wh[month] = monthly_ghi_wh.get(month, 0.0) + ghi
-        monthly_hours[month] = monthly_hours.get(month, 0) + 1
+    # Sıcaklık düzeltmesi — eksik/0 sıcaklık 25 °C sayılır (`temp or 25.0`)
+    if apply_temp_correction:
+        temp = np.where(arrays["temp_c"] == 0, 25.0, arrays["temp_c"])
+        temp_factor = yield_engine.temperature_factor(temp)
+    else:
+        temp_factor = 1.0
+
+    # Saatlik üretim: GHI(W/m²) × 1h = Wh/m²
+    # E_hour = (GHI_Wh/m² × A × η × PR × temp_factor) / 1000 → kWh
+    hour_kwh = np.where(
+        day,
+        ghi * panel_area * panel_efficiency * performance_ratio * temp_factor / 1000.0,
+        0.0,
+    )
+    total_production_kwh = float(hour_kwh.sum())
+    total_ghi_wh = float(ghi[day].sum())
+    monthly_kwh, monthly_hours = yield_engine.monthly_sums(ts, hour_kwh, mask=day)
 
     # ── Veri dönemi ve yıllık ölçekleme ──────────────────────────────
-    if hourly_data:
-        ts_min = hourly_data[0]["ts"]
-        ts_max = hourly_data[-1]["ts"]
-        data_days = max((ts_max - ts_min).days, 1)
-    else:
-        data_days = 1
+    data_days = yield_engine.data_period_days(ts)
 
     # Eğer veri 365 günden azsa, yıllık değere oranla
     scale_factor = 365.0 / data_days if data_days < 365 else 1.0
@@ -124,29 +121,18 @@ def calculate_solar_from_hourly(
     daily_avg_ghi = total_ghi_kwh_m2 / data_days
 
     # ── Aylık kırılım ────────────────────────────────────────────────
-    month_by_month: Dict[str, float] = {}
-    for i in range(12):
-        m = i + 1
-        if m in monthly_kwh:
-            # Eğer o ay kısmen veriliyse (örneğin Mart ayından sadece 15 gün),
-            # aylık değeri ölçekle
-            expected_hours = [744, 672, 744, 720, 744, 720,
-                              744, 744, 720, 744, 720, 744][i]
-            actual_hours = monthly_hours.get(m, expected_hours)
-            ratio = expected_hours / actual_hours if actual_hours > 0 else 1.0
-            # Çok büyük ölçeklemeyi engelle (en fazla ×2)
-            ratio = min(ratio, 2.0)
-            month_by_month[MONTH_NAMES_TR[i]] = round(monthly_kwh[m] * ratio, 2)
-        else:
-            # Veri olmayan aylar için yıllık ortalamanın 1/12'si
-            month_by_month[MONTH_NAMES_TR[i]] = round(annual_production / 12, 2)
+    # Kısmi aylar (örn. Mart'tan sadece 15 gün) beklenen saate ölçeklenir
+    # (en fazla ×2); veri olmayan aylar yıllık ortalamanın 1/12'si.
+    month_by_month = yield_engine.month_by_month(
+        monthly_kwh, monthly_hours, annual_production, MONTH_NAMES_TR,
+    )
 
     return {
         "predicted_annual_production_kwh": round(annual_production, 2),
         "daily_avg_potential_kwh_m2": round(daily_avg_ghi, 2),
         "month_by_month_prediction": month_by_month,
         "total_ghi_kwh_m2": round(total_ghi_kwh_m2, 2),
-        "hours_used": len(hourly_data),
+        "hours_used": n_hours,
         "data_period_days": data_days,
         "method": "hourly_real_data",
     }
@@ -161,7 +147,7 @@ def calculate_solar_power_production(
     panel_area: float,
     panel_efficiency: float = 0.20,
     weather_stats: Dict[str, Any] = None,  # type: ignore
-    hourly_data: List[Dict[str, Any]] = None,  # type: ignore
+    hourly_data: HourlyInput = None,
 ) -> Dict[str, Any]:
     """
     Backward-compatible wrapper.
@@ -169,7 +155,7 @@ def calculate_solar_power_production(
     yoksa eski weather_stats fallback'ine düşer.
     """
     # Yeni yol: gerçek saatlik veri
-    if hourly_data and len(hourly_data) > 100:
+    if yield_engine.hour_count(hourly_data) > 100:
         return calculate_solar_from_hourly(
             hourly_data=hourly_data,
             panel_area=panel_area,
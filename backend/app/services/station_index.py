@@ -0,0 +1,215 @@
+"""
+SRRP — En Yakın Hava Lokasyonu İndeksi (bellek içi KD-tree)
+============================================================
+
+Pin / senaryo / üretim hesapları en yakın saatlik hava lokasyonunu her istekte
+``ORDER BY pow(lat-x,2)+pow(lon-y,2) LIMIT 1`` ile buluyordu — son bir yılın
+tüm saatlik satırları (en büyük tablo) her pin için taranıyordu. Oysa farklı
+lokasyon sayısı ~1.000'dir.
+
+Bu modül lokasyonları (il, ilçe, lat, lon, location_code, son kayıt) bir kez
+okuyup ``scipy.spatial.cKDTree`` kurar; sorgu mikro saniye mertebesindedir.
+Ölçüt SQL'dekiyle aynıdır: derece uzayında öklid (karesel) mesafe —
+Türkiye ölçeğinde cos düzeltmesine gerek yok.
+
+İki kaynak için ayrı indeks tutulur:
+
+  * ``"packed"`` — `hourly_weather_packed` (lokasyon × ay, küçük tablo);
+    ``last_seen`` = son paket ayının başı
+  * ``"raw"``    — `hourly_weather_data`'nın tüm lokasyonları; ``last_seen``
+    = lokasyonun son saati (kesin — tek pin SQL'iyle aynı sonuç, her
+    ``since`` için). Tablo GROUP BY ile taranmaz: `ix_hourly_lat_lon_ts`
+    üzerinde özyinelemeli atlamalı tarama (lokasyon başına iki index
+    araması).
+
+Tazeleme yalnız arka planda: scheduler her saatlik işte ``refresh`` çağırır.
+``get_index`` istek yolunda yeniden kurmaz — eldeki (bayat olabilir) indeksi
+döner; yalnız süreçte hiç indeks yokken bir kez kurar.
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+from scipy.spatial import cKDTree
+from sqlalchemy import func, text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# `since` filtresinde önce bu kadar en yakın aday denenir, sonra kaba kuvvet
+_KNN_PROBE = 8
+
+
+class Station(NamedTuple):
+    """Tek hava lokasyonu — `load_hourly_arrays_at`'in beklediği alanlar."""
+    city_name: Optional[str]
+    district_name: Optional[str]
+    latitude: float
+    longitude: float
+    location_code: Optional[str]
+    last_seen: datetime
+
+
+class StationIndex:
+    """Lokasyon listesi üzerinde en yakın komşu sorguları."""
+
+    def __init__(self, stations: Sequence[Station], source: str) -> None:
+        self.stations: List[Station] = list(stations)
+        self.source = source
+        self.built_at = time.monotonic()
+        n = len(self.stations)
+        self._coords = np.array(
+            [(s.latitude, s.longitude) for s in self.stations], dtype=np.float64,
+        ).reshape(n, 2)
+        self._last_seen = np.array(
+            [s.last_seen for s in self.stations], dtype="datetime64[s]",
+        )
+        self._tree = cKDTree(self._coords) if n else None
+
+    def __len__(self) -> int:
+        return len(self.stations)
+
+    def _active(self, since: Optional[datetime]) -> np.ndarray:
+        if since is None:
+            return np.ones(len(self.stations), dtype=bool)
+        return self._last_seen >= np.datetime64(since, "s")
+
+    def nearest_many(
+        self,
+        lats: np.ndarray,
+        lons: np.ndarray,
+        since: Optional[datetime] = None,
+    ) -> np.ndarray:
+        """Her (lat, lon) için en yakın lokasyon indeksi; ``since`` sonrası
+        kaydı olan lokasyon yoksa -1."""
+        pts = np.column_stack([np.asarray(lats, np.float64), np.asarray(lons, np.float64)])
+        out = np.full(len(pts), -1, dtype=np.int64)
+        if self._tree is None or len(pts) == 0:
+            return out
+        active = self._active(since)
+        if not active.any():
+            return out
+
+        k = min(_KNN_PROBE, len(self.stations))
+        _, idx = self._tree.query(pts, k=k)
+        idx = idx.reshape(len(pts), k)
+        ok = active[idx]
+        hit = ok.any(axis=1)
+        out[hit] = idx[hit, ok[hit].argmax(axis=1)]
+
+        # Nadir: en yakın k aday da pasif → aktifler üzerinde kaba kuvvet
+        miss = np.flatnonzero(~hit)
+        if len(miss):
+            act = np.flatnonzero(active)
+            d2 = ((pts[miss, None, :] - self._coords[None, act, :]) ** 2).sum(axis=2)
+            out[miss] = act[np.argmin(d2, axis=1)]
+        return out
+
+    def nearest(
+        self,
+        latitude: float,
+        longitude: float,
+        since: Optional[datetime] = None,
+    ) -> Optional[Station]:
+        """Koordinata en yakın (``since`` sonrası kaydı olan) lokasyon veya None."""
+        i = int(self.nearest_many(np.array([latitude]), np.array([longitude]), since)[0])
+        return self.stations[i] if i >= 0 else None
+
+    def active(self, since: Optional[datetime] = None) -> List[Station]:
+        """``since`` sonrası kaydı olan lokasyonlar."""
+        return [self.stations[i] for i in np.flatnonzero(self._active(since))]
+
+
+# ─── Kurulum ────────────────────────────────────────────────────────────────
+
+# Farklı (lat, lon) çiftleri ix_hourly_lat_lon_ts üzerinde birer birer
+# atlanarak bulunur (loose index scan); her çiftin son satırı aynı index'te
+# geriye doğru tek arama
+_RAW_STATIONS_SQL = text("""
+    WITH RECURSIVE loc AS (
+        (SELECT latitude, longitude FROM hourly_weather_data
+         WHERE latitude IS NOT NULL AND longitude IS NOT NULL
+         ORDER BY latitude, longitude LIMIT 1)
+        UNION ALL
+        SELECT n.latitude, n.longitude
+        FROM loc, LATERAL (
+            SELECT h.latitude, h.longitude FROM hourly_weather_data h
+            WHERE (h.latitude, h.longitude) > (loc.latitude, loc.longitude)
+              AND h.longitude IS NOT NULL
+            ORDER BY h.latitude, h.longitude LIMIT 1
+        ) n
+    )
+    SELECT last.city_name, last.district_name, loc.latitude, loc.longitude,
+           last.location_code, last.timestamp
+    FROM loc, LATERAL (
+        SELECT h.city_name, h.district_name, h.location_code, h.timestamp
+        FROM hourly_weather_data h
+        WHERE h.latitude = loc.latitude AND h.longitude = loc.longitude
+        ORDER BY h.timestamp DESC LIMIT 1
+    ) last
+""")
+
+
+def _load_stations(db: Session, source: str) -> List[Station]:
+    from app.db.models import HourlyWeatherPacked as P
+
+    if source == "packed":
+        rows = db.query(
+            P.city_name, P.district_name, P.latitude, P.longitude,
+            func.max(P.location_code), func.max(P.month_start),
+        ).group_by(P.city_name, P.district_name, P.latitude, P.longitude).all()
+    else:
+        rows = db.execute(_RAW_STATIONS_SQL).fetchall()
+    return [
+        Station(r[0], r[1], float(r[2]), float(r[3]), r[4], r[5])
+        for r in rows
+        if r[2] is not None and r[3] is not None
+    ]
+
+
+def build_index(db: Session, source: str = "packed") -> StationIndex:
+    """DB'den lokasyonları okuyup yeni bir indeks kurar (önbelleğe koymaz)."""
+    t0 = time.monotonic()
+    index = StationIndex(_load_stations(db, source), source)
+    logger.info("[station_index] %s: %d lokasyon (%.0f ms)",
+                source, len(index), (time.monotonic() - t0) * 1000)
+    return index
+
+
+# ─── Süreç içi önbellek ─────────────────────────────────────────────────────
+
+_INDEXES: Dict[str, StationIndex] = {}
+_LOCK = threading.Lock()
+
+
+def get_index(db: Session, source: str = "packed") -> StationIndex:
+    """Önbellekteki indeks — bayat olsa da döner, istek yolunda yeniden
+    kurmaz. Süreçte hiç indeks yoksa (soğuk başlangıç) bir kez kurar."""
+    index = _INDEXES.get(source)
+    if index is not None:
+        return index
+    with _LOCK:
+        index = _INDEXES.get(source)
+        if index is None:
+            index = _INDEXES[source] = build_index(db, source)
+    return index
+
+
+def refresh(db: Session, sources: Sequence[str] = ("packed", "raw")) -> None:
+    """İndeksleri yeniden kurar (scheduler) — kurulum kilit dışında, eski
+    indeks yenisi hazır olana dek sorgulara hizmet eder."""
+    for source in sources:
+        index = build_index(db, source)
+        with _LOCK:
+            _INDEXES[source] = index
+
+
+def invalidate() -> None:
+    """Önbelleği boşaltır; sonraki sorgu indeksi yeniden kurar."""
+    with _LOCK:
+        _INDEXES.clear()
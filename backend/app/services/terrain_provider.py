@@ -0,0 +1,386 @@
+"""
+SRRP — Arazi (Yükseklik / Eğim / Bakı) Sağlayıcısı
+===================================================
+
+Yükseklik ve eğim her tıkta Open-Meteo Elevation API'ye gidiyordu
+(`GeoService._get_terrain_data`, `hydro_service.get_elevation(s_batch)`);
+sonuç yalnızca Redis'te tutuluyor, önbellek ıskasında ağ gecikmesi ödeniyor,
+çevrimdışı çalışmıyordu.
+
+Bu modül takılabilir bir sağlayıcı arayüzü sunar:
+
+  * ``DemTerrainProvider`` — yerel GeoTIFF/COG (veya VRT) DEM karoları.
+    Noktalar karo başına gruplanır; her nokta için 3×3 pencere ``rasterio``
+    windowed read ile okunur (tüm noktalar küçük bir alana düşüyorsa tek
+    pencere). Eğim/bakı Horn yöntemiyle vektörel NumPy ile hesaplanır.
+    Kapsam dışı / nodata noktalar ``fallback`` sağlayıcıya gider.
+  * ``OpenMeteoTerrainProvider`` — eski davranış (HTTP, Redis önbellekli,
+    ana + 4 komşu noktadan eğim). DEM yoksa varsayılan.
+
+Yapılandırma: ``SRRP_DEM_PATH`` — tek raster dosyası veya ``*.tif`` /
+``*.vrt`` içeren dizin (varsayılan ``data/dem``). Dosya yoksa ya da rasterio
+kurulu değilse Open-Meteo kullanılır. Tekil sorgu ~0.5 ms (GDAL blok
+önbelleği ısındıktan sonra); dağınık büyük partilerde soğuk blok açma
+baskındır → sıkıştırmasız ya da hafif sıkıştırılmış, 256-512 px tiled COG
+önerilir.
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+try:
+    import rasterio
+    from rasterio.windows import Window
+    _RASTERIO_AVAILABLE = True
+except ImportError:  # pragma: no cover - rasterio requirements.txt'te
+    _RASTERIO_AVAILABLE = False
+
+_DEFAULT_DEM_PATH = Path(__file__).resolve().parent.parent.parent / "data" / "dem"
+
+# Derece → metre (WGS84 ortalama; coğrafi CRS'li DEM'lerde piksel boyu için)
+_M_PER_DEG_LAT = 110_540.0
+_M_PER_DEG_LON = 111_320.0
+
+# Tek pencereyle okunacak en büyük alan (piksel) — üstünde nokta başına 3×3
+_MAX_SHARED_WINDOW_PX = 1024 * 1024
+
+
+class TerrainSample(NamedTuple):
+    """Nokta sırasıyla diziler; veri yoksa NaN."""
+    elevation: np.ndarray   # m
+    slope: np.ndarray       # derece
+    aspect: np.ndarray      # derece, kuzeyden saat yönü (yamacın baktığı yön); düz → -1
+
+
+def horn_slope_aspect(
+    windows: np.ndarray,
+    dx_m: np.ndarray,
+    dy_m: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """(N, 3, 3) yükseklik pencerelerinden Horn eğimi ve bakısı (derece).
+
+    Satırlar kuzeyden güneye, kolonlar batıdan doğuya. ``dx_m`` / ``dy_m``
+    nokta başına piksel boyu (m). Penceresinde NaN olan nokta → NaN.
+    """
+    w = np.asarray(windows, dtype=np.float64)
+    a, b, c = w[:, 0, 0], w[:, 0, 1], w[:, 0, 2]
+    d, f = w[:, 1, 0], w[:, 1, 2]
+    g, h, i = w[:, 2, 0], w[:, 2, 1], w[:, 2, 2]
+    dz_east = ((c + 2 * f + i) - (a + 2 * d + g)) / (8.0 * dx_m)
+    dz_south = ((g + 2 * h + i) - (a + 2 * b + c)) / (8.0 * dy_m)
+    slope = np.degrees(np.arctan(np.hypot(dz_east, dz_south)))
+    # Aşağı eğim yönü = -gradyan → (doğu, kuzey) = (-dz_east, dz_south)
+    aspect = np.degrees(np.arctan2(-dz_east, dz_south)) % 360.0
+    flat = (dz_east == 0) & (dz_south == 0)
+    aspect = np.where(flat, -1.0, aspect)
+    return slope, aspect
+
+
+class TerrainProvider:
+    """Sağlayıcı arayüzü."""
+
+    name = "base"
+
+    def sample(self, lats: Sequence[float], lons: Sequence[float]) -> TerrainSample:
+        raise NotImplementedError
+
+    def elevations(self, lats: Sequence[float], lons: Sequence[float]) -> Optional[List[float]]:
+        """Nokta sırasıyla yükseklikler; herhangi biri alınamazsa None."""
+        elev = self.sample(lats, lons).elevation
+        if len(elev) == 0 or np.isnan(elev).any():
+            return None
+        return [float(v) for v in elev]
+
+    def terrain(self, lats: Sequence[float], lons: Sequence[float]) -> List[Tuple[float, float]]:
+        """(elevation_m, slope_deg) listesi — veri yoksa (0.0, 0.0) (suitability
+        analizinin eğimsiz fallback'i)."""
+        s = self.sample(lats, lons)
+        return [
+            (0.0, 0.0) if math.isnan(e) else (float(e), 0.0 if math.isnan(sl) else round(float(sl), 2))
+            for e, sl in zip(s.elevation.tolist(), s.slope.tolist())
+        ]
+
+
+# ─── Yerel DEM ──────────────────────────────────────────────────────────────
+
+class _DemTile:
+    """Tek raster — açık dataset + thread kilidi (GDAL handle'ları thread-safe değil)."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.ds = rasterio.open(path)
+        self.lock = threading.Lock()
+        self.geographic = bool(self.ds.crs is None or self.ds.crs.is_geographic)
+        self.res_x, self.res_y = abs(self.ds.transform.a), abs(self.ds.transform.e)
+        b = self.ds.bounds
+        self.bounds = (b.left, b.bottom, b.right, b.top)
+
+    def to_crs(self, lons: np.ndarray, lats: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        if self.ds.crs is None or self.ds.crs.to_epsg() == 4326:
+            return lons, lats
+        from rasterio.warp import transform
+        xs, ys = transform("EPSG:4326", self.ds.crs, lons.tolist(), lats.tolist())
+        return np.asarray(xs), np.asarray(ys)
+
+    def windows(self, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Her (row, col) merkezli 3×3 pencere → (N, 3, 3) float64; nodata/kapsam dışı NaN."""
+        r0, c0 = int(rows.min()) - 1, int(cols.min()) - 1
+        h, w = int(rows.max()) - r0 + 2, int(cols.max()) - c0 + 2
+        with self.lock:
+            if h * w <= _MAX_SHARED_WINDOW_PX:
+                block = self._read(Window(c0, r0, w, h))
+                rr = (rows - r0)[:, None, None] + np.arange(-1, 2)[None, :, None]
+                cc = (cols - c0)[:, None, None] + np.arange(-1, 2)[None, None, :]
+                return block[rr, cc]
+            return np.stack([
+                self._read(Window(int(c) - 1, int(r) - 1, 3, 3))
+                for r, c in zip(rows.tolist(), cols.tolist())
+            ])
+
+    def _read(self, window: "Window") -> np.ndarray:
+        """Pencereyi raster sınırına kırpıp okur, dışını NaN ile doldurur
+        (``boundless=True`` her okumada VRT kurar — ~100× yavaş)."""
+        c0, r0 = int(window.col_off), int(window.row_off)
+        w, h = int(window.width), int(window.height)
+        out = np.full((h, w), np.nan)
+        rc0, cc0 = max(r0, 0), max(c0, 0)
+        rc1, cc1 = min(r0 + h, self.ds.height), min(c0 + w, self.ds.width)
+        if rc1 <= rc0 or cc1 <= cc0:
+            return out
+        arr = self.ds.read(1, window=Window(cc0, rc0, cc1 - cc0, rc1 - rc0), masked=True)
+        out[rc0 - r0:rc1 - r0, cc0 - c0:cc1 - c0] = np.ma.filled(arr.astype(np.float64), np.nan)
+        return out
+
+
+class DemTerrainProvider(TerrainProvider):
+    """Yerel DEM karolarından yükseklik/eğim/bakı."""
+
+    name = "dem"
+
+    def __init__(self, paths: Sequence[Path], fallback: Optional[TerrainProvider] = None) -> None:
+        self.tiles = [_DemTile(Path(p)) for p in paths]
+        self.fallback = fallback
+
+    def _sample_local(self, lats: np.ndarray, lons: np.ndarray) -> TerrainSample:
+        n = len(lats)
+        elev = np.full(n, np.nan)
+        slope = np.full(n, np.nan)
+        aspect = np.full(n, np.nan)
+        todo = np.ones(n, dtype=bool)
+        for tile in self.tiles:
+            if not todo.any():
+                break
+            idx = np.flatnonzero(todo)
+            xs, ys = tile.to_crs(lons[idx], lats[idx])
+            left, bottom, right, top = tile.bounds
+            inside = (xs >= left) & (xs < right) & (ys > bottom) & (ys <= top)
+            if not inside.any():
+                continue
+            idx, xs, ys = idx[inside], xs[inside], ys[inside]
+            rows, cols = rasterio.transform.rowcol(tile.ds.transform, xs, ys)
+            win = tile.windows(np.asarray(rows), np.asarray(cols))
+            if tile.geographic:
+                dx = tile.res_x * _M_PER_DEG_LON * np.cos(np.radians(lats[idx]))
+                dy = np.full(len(idx), tile.res_y * _M_PER_DEG_LAT)
+            else:
+                dx = np.full(len(idx), tile.res_x)
+                dy = np.full(len(idx), tile.res_y)
+            sl, asp = horn_slope_aspect(win, dx, dy)
+            centre = win[:, 1, 1]
+            ok = ~np.isnan(centre)
+            elev[idx[ok]] = centre[ok]
+            slope[idx[ok]] = sl[ok]
+            aspect[idx[ok]] = asp[ok]
+            todo[idx[ok]] = False
+        return TerrainSample(elev, slope, aspect)
+
+    def elevations(self, lats: Sequence[float], lons: Sequence[float]) -> Optional[List[float]]:
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        elev = self._sample_local(lats, lons).elevation
+        missing = np.flatnonzero(np.isnan(elev))
+        if len(missing) and self.fallback is not None:
+            fb = self.fallback.elevations(lats[missing], lons[missing])
+            if fb is None:
+                return None
+            elev[missing] = fb
+        if len(elev) == 0 or np.isnan(elev).any():
+            return None
+        return [float(v) for v in elev]
+
+    def sample(self, lats: Sequence[float], lons: Sequence[float]) -> TerrainSample:
+        lats = np.asarray(lats, dtype=np.float64)
+        lons = np.asarray(lons, dtype=np.float64)
+        out = self._sample_local(lats, lons)
+        missing = np.flatnonzero(np.isnan(out.elevation))
+        if len(missing) and self.fallback is not None:
+            fb = self.fallback.sample(lats[missing], lons[missing])
+            out.elevation[missing] = fb.elevation
+            out.slope[missing] = fb.slope
+            out.aspect[missing] = fb.aspect
+        return out
+
+
+# ─── Open-Meteo (HTTP) ──────────────────────────────────────────────────────
+
+class OpenMeteoTerrainProvider(TerrainProvider):
+    """Open-Meteo Elevation API — ana nokta + 4 komşudan (K/G/D/B) eğim.
+
+    Redis önbellekli (7 gün, 0.001° ≈ 111 m yuvarlama). Tek istekte en fazla
+    100 koordinat → 20 nokta × 5. Bakı hesaplanmaz (NaN).
+
+    ``elevations`` ayrı yoldur (hidro düşü = iki kesin yükseklik farkı):
+    yalnız istenen noktalar, yuvarlama ve önbellek yok, eski 10 sn timeout.
+    """
+
+    name = "open-meteo"
+
+    API_URL = "https://api.open-meteo.com/v1/elevation"
+    CACHE_TTL = 7 * 24 * 3600  # 7 gün
+    SLOPE_OFFSET_DEG = 0.001   # ≈111m kuzey-güney; doğu-batı enlem-bağımlı
+    POINTS_PER_REQUEST = 20
+    TIMEOUT_S = 2.5
+    ELEVATION_POINTS_PER_REQUEST = 100
+    ELEVATION_TIMEOUT_S = 10
+
+    def _offsets(self, lat_r: float) -> Tuple[float, float]:
+        # E/W offset enlem-bağımlı: lon_offset = lat_offset / cos(lat)
+        lat_offset = self.SLOPE_OFFSET_DEG
+        return lat_offset, lat_offset / max(math.cos(math.radians(lat_r)), 0.1)
+
+    def _slope_from_neighbours(self, elevations: list, lat_r: float) -> float:
+        """[ana, N, S, E, W] yüksekliklerinden ana noktadaki max gradient (°)."""
+        lat_offset, lon_offset = self._offsets(lat_r)
+        # |∂h/∂x| ≈ (N-S) / 2*dist, dist ≈ 111m (0.001°)
+        dist_ns = 111.0 * lat_offset * 1000  # m
+        dist_ew = 111.0 * lon_offset * 1000 * math.cos(math.radians(lat_r))
+        grad_ns = (float(elevations[1]) - float(elevations[2])) / max(dist_ns, 1)
+        grad_ew = (float(elevations[3]) - float(elevations[4])) / max(dist_ew, 1)
+        return math.degrees(math.atan(math.sqrt(grad_ns**2 + grad_ew**2)))
+
+    def elevations(self, lats: Sequence[float], lons: Sequence[float]) -> Optional[List[float]]:
+        import requests
+
+        out: List[float] = []
+        step = self.ELEVATION_POINTS_PER_REQUEST
+        for start in range(0, len(lats), step):
+            q_lats = [float(v) for v in lats[start:start + step]]
+            q_lons = [float(v) for v in lons[start:start + step]]
+            try:
+                resp = requests.get(
+                    self.API_URL,
+                    params={"latitude": ",".join(map(str, q_lats)),
+                            "longitude": ",".join(map(str, q_lons))},
+                    timeout=self.ELEVATION_TIMEOUT_S,
+                )
+                resp.raise_for_status()
+                elevations = resp.json().get("elevation", [])
+            except Exception as e:
+                logger.warning("[terrain] Elevation API hatası (%d nokta): %s", len(q_lats), e)
+                return None
+            if len(elevations) != len(q_lats) or any(v is None for v in elevations):
+                return None
+            out.extend(float(v) for v in elevations)
+        return out or None
+
+    def sample(self, lats: Sequence[float], lons: Sequence[float]) -> TerrainSample:
+        from app.services.redis_cache import cache_get, cache_set
+        import requests
+
+        n = len(lats)
+        elev = np.full(n, np.nan)
+        slope = np.full(n, np.nan)
+        aspect = np.full(n, np.nan)
+
+        # 100m precision round (0.001° ≈ 111m). Aynı bölgeye birden fazla pin
+        # için tek API çağrısı yeter.
+        pending: dict = {}
+        for i, (lat, lon) in enumerate(zip(lats, lons)):
+            key = (round(float(lat), 3), round(float(lon), 3))
+            cached = cache_get(f"elevation:{key[0]}:{key[1]}")
+            if cached and isinstance(cached, dict):
+                elev[i] = float(cached.get("elevation", 0.0))
+                slope[i] = float(cached.get("slope", 0.0))
+            else:
+                pending.setdefault(key, []).append(i)
+
+        keys = list(pending)
+        step = self.POINTS_PER_REQUEST
+        for start in range(0, len(keys), step):
+            chunk = keys[start:start + step]
+            q_lats: List[str] = []
+            q_lons: List[str] = []
+            for lat_r, lon_r in chunk:
+                # 5 nokta: [ana, N, S, E, W]
+                lat_offset, lon_offset = self._offsets(lat_r)
+                q_lats += [f"{v}" for v in (lat_r, lat_r + lat_offset, lat_r - lat_offset, lat_r, lat_r)]
+                q_lons += [f"{v}" for v in (lon_r, lon_r, lon_r, lon_r + lon_offset, lon_r - lon_offset)]
+            try:
+                # 2026-06-04 (PERF): timeout 5→2.5sn. Open-Meteo yavaş/throttled ise
+                # hızlı vazgeç → suitability eğimsiz (slope=0) döner.
+                resp = requests.get(
+                    self.API_URL,
+                    params={"latitude": ",".join(q_lats), "longitude": ",".join(q_lons)},
+                    timeout=self.TIMEOUT_S,
+                )
+                resp.raise_for_status()
+                elevations = resp.json().get("elevation", [])
+            except Exception as e:
+                logger.warning("[terrain] Elevation API hatası (%d nokta, ilk %s): %s",
+                               len(chunk), chunk[0], e)
+                continue
+
+            for k, (lat_r, lon_r) in enumerate(chunk):
+                five = elevations[k * 5:(k + 1) * 5]
+                if not five:
+                    continue
+                ana = float(five[0])
+                slope_deg = round(self._slope_from_neighbours(five, lat_r), 2) if len(five) >= 5 else 0.0
+                cache_set(
+                    f"elevation:{lat_r}:{lon_r}",
+                    {"elevation": ana, "slope": slope_deg},
+                    ttl_seconds=self.CACHE_TTL,
+                )
+                for i in pending[(lat_r, lon_r)]:
+                    elev[i] = ana
+                    slope[i] = slope_deg
+        return TerrainSample(elev, slope, aspect)
+
+
+# ─── Seçim ──────────────────────────────────────────────────────────────────
+
+def _dem_paths(root: Path) -> List[Path]:
+    if root.is_file():
+        return [root]
+    if root.is_dir():
+        return sorted(p for p in root.iterdir() if p.suffix.lower() in (".tif", ".tiff", ".vrt"))
+    return []
+
+
+@lru_cache(maxsize=1)
+def get_terrain_provider() -> TerrainProvider:
+    """Yerel DEM varsa onu (Open-Meteo fallback'li), yoksa Open-Meteo döner."""
+    remote = OpenMeteoTerrainProvider()
+    paths = _dem_paths(Path(os.environ.get("SRRP_DEM_PATH", str(_DEFAULT_DEM_PATH))))
+    if not paths:
+        return remote
+    if not _RASTERIO_AVAILABLE:
+        logger.warning("[terrain] DEM bulundu ama rasterio yok — Open-Meteo kullanılıyor")
+        return remote
+    try:
+        provider = DemTerrainProvider(paths, fallback=remote)
+        logger.info("[terrain] Yerel DEM aktif: %d karo", len(provider.tiles))
+        return provider
+    except Exception as e:
+        logger.exception("[terrain] DEM açılamadı, Open-Meteo kullanılıyor: %s", e)
+        return remote
@@ -0,0 +1,248 @@
+"""
+SRRP — Önceden Üretilmiş, Versiyonlu MVT Tile Deposu (MBTiles)
+===============================================================
+
+`/tiles/{z}/{x}/{y}.pbf` her önbellek ıskasında katman başına bir
+``ST_AsMVT`` sorgusu çalıştırıyordu; önbellek 500 girdilik / 5 dk'lık süreç
+içi sözlük + Redis'ten ibaretti. Vektör veri (hydro / restricted / energy)
+yalnızca yükleyici script'ler çalışınca değişir — tile'lar o ana kadar
+sabittir.
+
+Bu modül tile piramidini diskte bir MBTiles (SQLite) dosyasında tutar:
+
+  * **Veri versiyonu** — ``data_versions`` kaydındaki ``VECTOR`` sayacı.
+    Vektör yükleyiciler (``load_vector_data.py``, ``backfill_restricted_zones.py``,
+    ``build_mvt_generalized.py``) yazımdan sonra
+    ``data_versions.bump(data_versions.VECTOR)`` çağırır.
+  * **Depo** — ``data/tiles/vector.mbtiles``; ``metadata`` tablosunda
+    ``data_version``, ``minzoom``, ``maxzoom`` ve ``bounds`` tutulur.
+    Depo versiyonu güncel versiyonla eşleşmiyorsa hiç kullanılmaz (bayat
+    tile sunulmaz → canlı PostGIS'e düşülür).
+  * **Boş tile** — seeder boş tile'ları yazmaz; tohumlanmış zoom/bbox
+    aralığında satır yoksa tile "bilinen boş"tur, DB'ye gidilmez.
+
+Okuma ``contour_tiles`` ile aynı desen: thread-local salt-okunur bağlantı
+(``mode=ro&immutable=1``). Dosya seeder tarafından geçici dosyaya yazılıp
+``os.replace`` ile atomik değiştirilir; değişiklik dosya mtime'ından
+algılanır ve bağlantılar yeniden açılır. Okumalar (SQLite + sürüm kaydı)
+senkrondur — async handler'lar thread pool'dan çağırır.
+
+Üretim: ``python scripts/seed_tiles.py`` (z6–z12, Türkiye bbox, süreç havuzu).
+"""
+from __future__ import annotations
+
+import logging
+import math
+import os
+import sqlite3
+import threading
+from typing import Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from app.services import data_versions
+
+logger = logging.getLogger(__name__)
+
+_TILES_DIR = os.environ.get(
+    "SRRP_TILES_DIR",
+    os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "data", "tiles")
+    ),
+)
+MBTILES_PATH = os.path.join(_TILES_DIR, "vector.mbtiles")
+
+# Türkiye bounding box (W, S, E, N) — build_contour_mvt ile aynı
+TR_BBOX = (25.5, 35.8, 44.8, 42.1)
+SEED_MINZOOM = 6
+SEED_MAXZOOM = 12
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS metadata (name TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS tiles (
+    zoom_level INTEGER, tile_column INTEGER, tile_row INTEGER, tile_data BLOB,
+    PRIMARY KEY (zoom_level, tile_column, tile_row)
+);
+"""
+
+
+# ─── Tile matematiği (XYZ / Web Mercator) ───────────────────────────────────
+
+def lonlat_to_tile(lon: float, lat: float, z: int) -> Tuple[int, int]:
+    """WGS84 → XYZ tile (x, y); kenar değerleri [0, 2^z-1] aralığına kırpılır."""
+    n = 1 << z
+    lat = max(min(lat, 85.0511), -85.0511)
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_r = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_r)) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def tile_range(bbox: Tuple[float, float, float, float], z: int) -> Tuple[int, int, int, int]:
+    """bbox (W, S, E, N) → (x0, y0, x1, y1) kapsayan tile aralığı (dahil)."""
+    w, s, e, n = bbox
+    x0, y0 = lonlat_to_tile(w, n, z)
+    x1, y1 = lonlat_to_tile(e, s, z)
+    return x0, y0, x1, y1
+
+
+def iter_tiles(bbox: Tuple[float, float, float, float], minzoom: int,
+               maxzoom: int) -> Iterator[Tuple[int, int, int]]:
+    for z in range(minzoom, maxzoom + 1):
+        x0, y0, x1, y1 = tile_range(bbox, z)
+        for x in range(x0, x1 + 1):
+            for y in range(y0, y1 + 1):
+                yield z, x, y
+
+
+# ─── Veri versiyonu ─────────────────────────────────────────────────────────
+
+def current_version() -> int:
+    """Vektör verinin güncel versiyonu (kayıt yoksa 0)."""
+    return data_versions.get_version(data_versions.VECTOR)
+
+
+# ─── Okuma ──────────────────────────────────────────────────────────────────
+
+class StoreInfo(NamedTuple):
+    version: int
+    minzoom: int
+    maxzoom: int
+    bounds: Tuple[float, float, float, float]
+
+
+_local = threading.local()
+_state_lock = threading.Lock()
+# (mbtiles mtime_ns, StoreInfo | None) — tek atomik tuple; versiyon
+# karşılaştırması her çağrıda (kayıt süreç içinde kısa süre önbellekli)
+_state: Tuple[Optional[int], Optional[StoreInfo]] = (None, None)
+
+
+def _stat_key() -> Optional[int]:
+    try:
+        return os.stat(MBTILES_PATH).st_mtime_ns
+    except OSError:
+        return None
+
+
+def _open_ro() -> sqlite3.Connection:
+    # immutable=1 → salt-okunur, lock yok; dosya yalnızca atomik replace ile değişir
+    uri = f"file:{MBTILES_PATH}?mode=ro&immutable=1"
+    return sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+
+def _read_info(conn: sqlite3.Connection) -> Optional[StoreInfo]:
+    meta = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+    try:
+        bounds = tuple(float(v) for v in meta["bounds"].split(","))
+        return StoreInfo(int(meta["data_version"]), int(meta["minzoom"]),
+                         int(meta["maxzoom"]), bounds)  # type: ignore[arg-type]
+    except (KeyError, ValueError):
+        return None
+
+
+def _current_state() -> Tuple[Optional[int], Optional[StoreInfo]]:
+    global _state
+    key = _stat_key()
+    if key is None:
+        return None, None
+    if _state[0] != key:
+        with _state_lock:
+            if _state[0] != key:
+                info = None
+                try:
+                    conn = _open_ro()
+                    try:
+                        info = _read_info(conn)
+                    finally:
+                        conn.close()
+                except sqlite3.Error as e:
+                    logger.warning("[tile_store] mbtiles okunamadı: %s", e)
+                _state = (key, info)
+    key, info = _state
+    if info is not None and info.version != current_version():
+        return key, None          # bayat depo → canlı PostGIS
+    return key, info
+
+
+def store_info() -> Optional[StoreInfo]:
+    """Kullanılabilir (güncel versiyonlu) depo bilgisi; yoksa / bayatsa None."""
+    return _current_state()[1]
+
+
+def _conn(key: int) -> sqlite3.Connection:
+    conn = getattr(_local, "conn", None)
+    if conn is None or getattr(_local, "key", None) != key:
+        if conn is not None:
+            conn.close()
+        conn = _local.conn = _open_ro()
+        _local.key = key
+    return conn
+
+
+def covers(info: StoreInfo, z: int, x: int, y: int) -> bool:
+    """Tile deponun tohumlandığı zoom + bbox aralığında mı?"""
+    if not info.minzoom <= z <= info.maxzoom:
+        return False
+    x0, y0, x1, y1 = tile_range(info.bounds, z)
+    return x0 <= x <= x1 and y0 <= y <= y1
+
+
+def get_tile(z: int, x: int, y: int) -> Optional[bytes]:
+    """Tohumlanmış tile baytları; kapsanan ama boş tile için ``b""``.
+    Depo yok / bayat / tile kapsam dışı → None (çağıran canlı üretir)."""
+    key, info = _current_state()
+    if info is None or not covers(info, z, x, y):
+        return None
+    try:
+        row = _conn(key).execute(
+            "SELECT tile_data FROM tiles "
+            "WHERE zoom_level=? AND tile_column=? AND tile_row=?",
+            (z, x, (1 << z) - 1 - y),
+        ).fetchone()
+    except sqlite3.Error as e:
+        logger.warning("[tile_store] tile okuma hatası z%s/%s/%s: %s", z, x, y, e)
+        return None
+    return bytes(row[0]) if row and row[0] else b""
+
+
+# ─── Yazma (seeder) ─────────────────────────────────────────────────────────
+
+class TileWriter:
+    """Geçici dosyaya MBTiles yazar; ``commit`` ile atomik olarak yerine koyar."""
+
+    def __init__(self, version: int, minzoom: int, maxzoom: int,
+                 bounds: Tuple[float, float, float, float],
+                 path: Optional[str] = None) -> None:
+        path = path or MBTILES_PATH
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.tmp_path = path + ".tmp"
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        self._db = sqlite3.connect(self.tmp_path)
+        self._db.executescript(_SCHEMA)
+        self._db.executemany("INSERT INTO metadata VALUES (?, ?)", [
+            ("name", "srrp-vector"),
+            ("format", "pbf"),
+            ("scheme", "tms"),
+            ("data_version", str(version)),
+            ("minzoom", str(minzoom)),
+            ("maxzoom", str(maxzoom)),
+            ("bounds", ",".join(str(v) for v in bounds)),
+        ])
+        self.written = 0
+
+    def write(self, tiles: Iterable[Tuple[int, int, int, bytes]]) -> None:
+        rows = [(z, x, (1 << z) - 1 - y, sqlite3.Binary(data))
+                for z, x, y, data in tiles if data]
+        self._db.executemany("INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)", rows)
+        self.written += len(rows)
+
+    def commit(self) -> None:
+        self._db.commit()
+        self._db.close()
+        os.replace(self.tmp_path, self.path)
+
+    def abort(self) -> None:
+        self._db.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
@@ -0,0 +1,269 @@
+"""
+SRRP — Paylaşılan Yaylı (shared-arc) Topoloji + TopoJSON Kodlayıcı
+==================================================================
+
+İl / ilçe sınırları GeoJSON olarak gönderilirken komşu iki poligonun ortak
+sınırı iki kez yazılıyor, her poligon ayrı sadeleştirildiği için de ortak
+sınırlarda boşluk / çakışma (sliver) oluşabiliyordu.
+
+``build_topology`` poligonları bir kez topolojiye çevirir:
+
+  1. Koordinatlar 1e-7° ızgaraya tamsayılanır (aynı sınır → aynı nokta)
+  2. **Kavşaklar** bulunur: aynı noktadan geçen halkalarda komşuları farklı
+     olan noktalar (üç poligonun buluştuğu yer, kıyı ↔ kara sınırı geçişi)
+  3. Halkalar kavşaklarda kesilir → **yaylar**; ters yönde tekrar eden yay
+     aynı yaya ``~i`` referansıyla bağlanır (her ortak sınır tek kopya)
+
+Sadeleştirme yay başına yapılır (uç noktalar sabit) → komşu poligonlar aynı
+sadeleştirilmiş sınırı paylaşır; GeoJSON ve TopoJSON çıktıları aynı yaylardan
+üretildiği için birbiriyle tutarlıdır. ``subset`` bir feature alt kümesinin
+kullandığı yaylarla küçük bir topoloji döndürür (ör. tek ilin ilçeleri).
+
+TopoJSON biçimi: https://github.com/topojson/topojson-specification
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+_GRID = 1e7          # giriş ızgarası: 1e-7° ≈ 1 cm
+QUANTIZATION = 1_000_000   # TopoJSON çıktı ızgarası (bbox başına adım sayısı)
+GEOJSON_DECIMALS = 6
+
+
+def _rings_of(geom) -> List[List[np.ndarray]]:
+    """Polygon / MultiPolygon → [[dış halka, delik...], ...] (kapanış noktasız)."""
+    polys = getattr(geom, "geoms", [geom])
+    out = []
+    for poly in polys:
+        if poly.is_empty or poly.geom_type != "Polygon":
+            continue
+        rings = [poly.exterior] + list(poly.interiors)
+        out.append([
+            np.round(np.asarray(r.coords, dtype=np.float64)[:-1, :2] * _GRID).astype(np.int64)
+            for r in rings
+        ])
+    return out
+
+
+class Topology:
+    """Yaylar + feature başına halka → yay referansları."""
+
+    def __init__(self, arcs: List[np.ndarray], features: List[List[List[List[int]]]],
+                 properties: List[Dict[str, Any]]) -> None:
+        self.arcs = arcs                  # float (n, 2) dizileri, derece
+        self.features = features          # feature → poligon → halka → yay ref
+        self.properties = properties
+
+    def __len__(self) -> int:
+        return len(self.features)
+
+    # ── Alt küme ────────────────────────────────────────────────────────────
+
+    def subset(self, indices: Sequence[int]) -> "Topology":
+        """Seçili feature'lar ve yalnızca onların kullandığı yaylar."""
+        remap: Dict[int, int] = {}
+        arcs: List[np.ndarray] = []
+
+        def ref(r: int) -> int:
+            i = r if r >= 0 else ~r
+            if i not in remap:
+                remap[i] = len(arcs)
+                arcs.append(self.arcs[i])
+            j = remap[i]
+            return j if r >= 0 else ~j
+
+        feats = [
+            [[[ref(r) for r in ring] for ring in poly] for poly in self.features[k]]
+            for k in indices
+        ]
+        return Topology(arcs, feats, [self.properties[k] for k in indices])
+
+    # ── Sadeleştirme ────────────────────────────────────────────────────────
+
+    def simplified_arcs(self, tolerance: float) -> List[np.ndarray]:
+        """Yay başına Douglas-Peucker (uç noktalar korunur). Kapalı tek yaylı
+        halkalar topoloji korumalı sadeleştirilir (çökmesinler diye)."""
+        if tolerance <= 0 or not self.arcs:
+            return list(self.arcs)
+        import shapely
+
+        lines = shapely.linestrings(
+            np.concatenate(self.arcs),
+            indices=np.repeat(np.arange(len(self.arcs)), [len(a) for a in self.arcs]),
+        )
+        closed = np.array([len(a) > 3 and (a[0] == a[-1]).all() for a in self.arcs])
+        out = np.empty(len(lines), dtype=object)
+        if (~closed).any():
+            out[~closed] = shapely.simplify(lines[~closed], tolerance, preserve_topology=False)
+        if closed.any():
+            out[closed] = shapely.simplify(lines[closed], tolerance, preserve_topology=True)
+        return [shapely.get_coordinates(g) for g in out]
+
+    @staticmethod
+    def _ring_coords(ring: List[int], arcs: List[np.ndarray]) -> np.ndarray:
+        parts = []
+        for k, r in enumerate(ring):
+            a = arcs[r] if r >= 0 else arcs[~r][::-1]
+            parts.append(a if k == 0 else a[1:])
+        return np.concatenate(parts) if parts else np.empty((0, 2))
+
+    def _valid_polygons(self, feat, arcs) -> List[List[List[int]]]:
+        """Sadeleştirme sonrası 4 noktadan kısa kalan halkaları at (dış halka
+        çökerse poligon, tüm poligonlar çökerse feature düşer)."""
+        polys = []
+        for poly in feat:
+            rings = [ring for ring in poly if len(self._ring_coords(ring, arcs)) >= 4]
+            if rings and rings[0] is poly[0]:
+                polys.append(rings)
+        return polys
+
+    # ── Çıktılar ────────────────────────────────────────────────────────────
+
+    def to_geojson(self, tolerance: float = 0.0) -> Dict[str, Any]:
+        arcs = self.simplified_arcs(tolerance)
+        features = []
+        for feat, props in zip(self.features, self.properties):
+            polys = self._valid_polygons(feat, arcs)
+            if not polys:
+                continue
+            coords = [
+                [np.round(self._ring_coords(ring, arcs), GEOJSON_DECIMALS).tolist() for ring in poly]
+                for poly in polys
+            ]
+            geometry = ({"type": "Polygon", "coordinates": coords[0]} if len(coords) == 1
+                        else {"type": "MultiPolygon", "coordinates": coords})
+            features.append({"type": "Feature", "properties": props, "geometry": geometry})
+        return {"type": "FeatureCollection", "features": features}
+
+    def to_topojson(self, object_name: str, tolerance: float = 0.0,
+                    quantization: int = QUANTIZATION) -> Dict[str, Any]:
+        arcs = self.simplified_arcs(tolerance)
+        kept = []
+        used: Dict[int, int] = {}
+        for feat, props in zip(self.features, self.properties):
+            polys = self._valid_polygons(feat, arcs)
+            if polys:
+                kept.append((polys, props))
+                for poly in polys:
+                    for ring in poly:
+                        for r in ring:
+                            used.setdefault(r if r >= 0 else ~r, len(used))
+        order = sorted(used, key=used.get)
+        if order:
+            allpts = np.concatenate([arcs[i] for i in order])
+            x0, y0 = allpts.min(axis=0)
+            x1, y1 = allpts.max(axis=0)
+        else:
+            x0 = y0 = x1 = y1 = 0.0
+        kx = (x1 - x0) / (quantization - 1) or 1.0
+        ky = (y1 - y0) / (quantization - 1) or 1.0
+
+        out_arcs = []
+        for i in order:
+            q = np.round((arcs[i] - (x0, y0)) / (kx, ky)).astype(np.int64)
+            keep = np.ones(len(q), dtype=bool)
+            keep[1:] = (q[1:] != q[:-1]).any(axis=1)
+            q = q[keep]
+            if len(q) < 2:
+                q = np.vstack([q, q])
+            delta = np.vstack([q[:1], np.diff(q, axis=0)])
+            out_arcs.append(delta.tolist())
+
+        def ref(r: int) -> int:
+            j = used[r if r >= 0 else ~r]
+            return j if r >= 0 else ~j
+
+        geometries = []
+        for polys, props in kept:
+            a = [[[ref(r) for r in ring] for ring in poly] for poly in polys]
+            geometries.append(
+                {"type": "Polygon", "arcs": a[0], "properties": props} if len(a) == 1
+                else {"type": "MultiPolygon", "arcs": a, "properties": props}
+            )
+        return {
+            "type": "Topology",
+            "bbox": [float(x0), float(y0), float(x1), float(y1)],
+            "transform": {"scale": [float(kx), float(ky)], "translate": [float(x0), float(y0)]},
+            "objects": {object_name: {"type": "GeometryCollection", "geometries": geometries}},
+            "arcs": out_arcs,
+        }
+
+
+def build_topology(geometries: Sequence[Any],
+                   properties: Optional[Sequence[Dict[str, Any]]] = None) -> Topology:
+    """shapely Polygon/MultiPolygon listesi → paylaşılan yaylı ``Topology``."""
+    properties = list(properties) if properties is not None else [{} for _ in geometries]
+    feats_rings = [_rings_of(g) for g in geometries]
+
+    # 1. Kavşaklar: aynı nokta farklı (önceki, sonraki) komşu çiftiyle görülürse
+    neighbours: Dict[tuple, tuple] = {}
+    junctions: set = set()
+    for polys in feats_rings:
+        for rings in polys:
+            for ring in rings:
+                n = len(ring)
+                pts = list(map(tuple, ring.tolist()))
+                for i in range(n):
+                    p, a, b = pts[i], pts[i - 1], pts[(i + 1) % n]
+                    pair = (a, b) if a <= b else (b, a)
+                    seen = neighbours.setdefault(p, pair)
+                    if seen != pair:
+                        junctions.add(p)
+
+    # 2. Halkaları kavşaklarda kes, yayları tekilleştir (ters yön → ~i)
+    arcs: List[np.ndarray] = []
+    index: Dict[bytes, int] = {}
+
+    def add_arc(a: np.ndarray) -> int:
+        key = a.tobytes()
+        if key in index:
+            return index[key]
+        rkey = a[::-1].copy().tobytes()
+        if rkey in index:
+            return ~index[rkey]
+        index[key] = len(arcs)
+        arcs.append(a)
+        return len(arcs) - 1
+
+    def canonical_closed(ring: np.ndarray) -> int:
+        # Kavşaksız halka: en küçük noktadan başlat → iki poligondaki aynı
+        # halka (ör. anklav ve deliği) aynı yaya eşlenir
+        def rotated(r):
+            k = int(np.lexsort((r[:, 1], r[:, 0]))[0])
+            r = np.roll(r, -k, axis=0)
+            return np.vstack([r, r[:1]])
+        fwd = rotated(ring)
+        key = fwd.tobytes()
+        if key in index:
+            return index[key]
+        rev = rotated(ring[::-1].copy())
+        if rev.tobytes() in index:
+            return ~index[rev.tobytes()]
+        index[key] = len(arcs)
+        arcs.append(fwd)
+        return len(arcs) - 1
+
+    features: List[List[List[List[int]]]] = []
+    for polys in feats_rings:
+        fpolys = []
+        for rings in polys:
+            fr = []
+            for ring in rings:
+                if len(ring) < 3:
+                    continue
+                pts = list(map(tuple, ring.tolist()))
+                cut = [i for i, p in enumerate(pts) if p in junctions]
+                if not cut:
+                    fr.append([canonical_closed(ring)])
+                    continue
+                r = np.roll(ring, -cut[0], axis=0)
+                r = np.vstack([r, r[:1]])
+                bounds = [c - cut[0] for c in cut] + [len(ring)]
+                fr.append([add_arc(r[s:e + 1].copy()) for s, e in zip(bounds[:-1], bounds[1:])])
+            if fr:
+                fpolys.append(fr)
+        features.append(fpolys)
+
+    return Topology([a / _GRID for a in arcs], features, properties)
@@ -0,0 +1,262 @@
+"""
+SRRP — Saatlik Veri Rollup Servisi (günlük / aylık)
+===================================================
+
+Choropleth ve özet endpoint'leri her istekte ham `hourly_weather_data`
+üzerinde `GROUP BY city_name, district_name` yapıyordu (yıllık pencere ≈
+milyonlarca satır). Bu servis aynı agregatları `hourly_weather_rollup`
+tablosunda (il, ilçe, metrik) başına **günlük** ve **aylık** satır olarak
+tutar; pencere sorguları birkaç bin rollup satırı okur.
+
+Satır içeriği (period_type = "day" | "month"):
+    n_hours, sum_value, avg_value, max_value  → pencere ortalaması = Σsum / Σn
+    peak_sum, peak_days                       → günlük pik (solar) ortalaması
+                                                = Σpeak_sum / Σpeak_days
+
+Günlük satırın `max_value`'su = o günün piki; `peak_*` yalnızca pozitif
+pikleri sayar (choropleth'in `radiation > 0` günlük peak alt sorgusu ile aynı).
+Aylık satırlar günlük satırlardan türetilir.
+
+Bakım: scheduler saatlik çekimden sonra `refresh_since(db, since)` çağırır —
+yalnızca yeni upsert edilen saatlerin günleri ve ayları yeniden hesaplanır.
+İlk doldurma: `scripts/build_weather_rollups.py`.
+"""
+from __future__ import annotations
+
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# metric → hourly_weather_data kolonu (choropleth/thematic vokabüleri + hidro için yağış)
+ROLLUP_METRICS: Dict[str, str] = {
+    "wind": "wind_speed_100m",
+    "solar": "shortwave_radiation",
+    "temp": "temperature_2m",
+    "precip": "precipitation",
+}
+
+_METRIC_VALUES_SQL = ", ".join(
+    f"('{m}', h.{col})" for m, col in ROLLUP_METRICS.items()
+)
+_METRIC_COLS_SQL = ", ".join(ROLLUP_METRICS.values())
+
+_UPSERT_SET = """
+    ON CONFLICT ON CONSTRAINT uq_hourly_rollup_key DO UPDATE SET
+        n_hours   = EXCLUDED.n_hours,
+        sum_value = EXCLUDED.sum_value,
+        avg_value = EXCLUDED.avg_value,
+        max_value = EXCLUDED.max_value,
+        peak_sum  = EXCLUDED.peak_sum,
+        peak_days = EXCLUDED.peak_days,
+        computed_at = EXCLUDED.computed_at
+"""
+
+# Ham saatler → günlük rollup (yalnızca [start, upto] aralığındaki saatler okunur)
+_DAILY_SQL = text(f"""
+    INSERT INTO hourly_weather_rollup
+        (period_type, period_start, city_name, district_name, metric,
+         n_hours, sum_value, avg_value, max_value, peak_sum, peak_days, computed_at)
+    SELECT 'day', h.day, h.city_name, h.district_name, m.metric,
+           COUNT(m.v), SUM(m.v), AVG(m.v), MAX(m.v),
+           CASE WHEN MAX(m.v) > 0 THEN MAX(m.v) ELSE 0 END,
+           CASE WHEN MAX(m.v) > 0 THEN 1 ELSE 0 END,
+           now()
+    FROM (
+        SELECT CAST(timestamp AS date) AS day, city_name, district_name,
+               {_METRIC_COLS_SQL}
+        FROM hourly_weather_data
+        WHERE timestamp >= :start AND timestamp <= :upto
+          AND city_name IS NOT NULL AND district_name IS NOT NULL
+    ) h
+    CROSS JOIN LATERAL (VALUES {_METRIC_VALUES_SQL}) AS m(metric, v)
+    WHERE m.v IS NOT NULL
+    GROUP BY h.day, h.city_name, h.district_name, m.metric
+    {_UPSERT_SET}
+""")
+
+# Günlük rollup → aylık rollup (etkilenen aylar)
+_MONTHLY_SQL = text(f"""
+    INSERT INTO hourly_weather_rollup
+        (period_type, period_start, city_name, district_name, metric,
+         n_hours, sum_value, avg_value, max_value, peak_sum, peak_days, computed_at)
+    SELECT 'month', CAST(date_trunc('month', period_start) AS date),
+           city_name, district_name, metric,
+           SUM(n_hours), SUM(sum_value),
+           SUM(sum_value) / NULLIF(SUM(n_hours), 0),
+           MAX(max_value), SUM(peak_sum), SUM(peak_days),
+           now()
+    FROM hourly_weather_rollup
+    WHERE period_type = 'day'
+      AND period_start >= :mstart AND period_start < :mend
+    GROUP BY date_trunc('month', period_start), city_name, district_name, metric
+    {_UPSERT_SET}
+""")
+
+
+def _month_floor(d: date) -> date:
+    return d.replace(day=1)
+
+
+def _next_month(d: date) -> date:
+    return d.replace(year=d.year + 1, month=1) if d.month == 12 else d.replace(month=d.month + 1)
+
+
+# ─── Bakım ──────────────────────────────────────────────────────────────────
+
+def refresh_since(db: Session, since: datetime, upto: Optional[datetime] = None) -> Dict[str, int]:
+    """`since` gününden itibaren günlük rollup'ları, ilgili ayları da aylık
+    rollup'ta yeniden hesaplar.
+
+    `since` gün başına yuvarlanır (günlük satır tam günü kapsamalı). `upto`
+    varsayılan = şimdi (UTC) — tahmin (forecast) saatleri rollup'a girmez;
+    bugünün satırı sonraki saatlik koşuda tamamlanır.
+    """
+    upto = upto or datetime.utcnow()
+    day0 = since.date() if isinstance(since, datetime) else since
+    start = datetime.combine(day0, datetime.min.time())
+
+    daily = db.execute(_DAILY_SQL, {"start": start, "upto": upto}).rowcount
+    monthly = db.execute(_MONTHLY_SQL, {
+        "mstart": _month_floor(day0),
+        "mend": _next_month(_month_floor(upto.date())),
+    }).rowcount
+    db.commit()
+    logger.info("[rollup] %s → %s: %d günlük, %d aylık satır",
+                day0, upto.date(), daily, monthly)
+    return {"daily": daily, "monthly": monthly}
+
+
+def rebuild(db: Session, start: date, end: date) -> Dict[str, int]:
+    """[start, end] aralığını ay ay yeniden kurar (ilk doldurma)."""
+    totals = {"daily": 0, "monthly": 0}
+    m = _month_floor(start)
+    while m <= end:
+        nm = _next_month(m)
+        upto = datetime.combine(min(nm, end + timedelta(days=1)), datetime.min.time()) - timedelta(seconds=1)
+        out = refresh_since(db, datetime.combine(max(m, start), datetime.min.time()), upto)
+        totals["daily"] += out["daily"]
+        totals["monthly"] += out["monthly"]
+        m = nm
+    return totals
+
+
+# ─── Okuma ──────────────────────────────────────────────────────────────────
+
+# Metrik başına en erken günlük satır (ix_hourly_rollup_lookup ile tek index
+# araması); rollup'ta hiç olmayan metrik → NULL
+_COVERAGE_SQL = text("""
+    SELECT m.metric,
+           (SELECT MIN(period_start) FROM hourly_weather_rollup r
+            WHERE r.period_type = 'day' AND r.metric = m.metric) AS first_day
+    FROM unnest(CAST(:metrics AS text[])) AS m(metric)
+""")
+
+_RAW_BEFORE_SQL = text("""
+    SELECT 1 FROM hourly_weather_data
+    WHERE timestamp >= :start AND timestamp < :first_day
+    LIMIT 1
+""")
+
+
+def _window_split(d0: date, d1: date) -> Tuple[date, date]:
+    """[d0, d1] → (ilk tam ay başı, son tam ayın bitişi). Aralık dışı kalan
+    kenar günler günlük satırlardan okunur; tam ay yoksa ikisi de d1+1."""
+    first_full = d0 if d0.day == 1 else _next_month(_month_floor(d0))
+    last_full_end = _month_floor(d1)
+    if first_full >= last_full_end:
+        first_full = last_full_end = d1 + timedelta(days=1)
+    return first_full, last_full_end
+
+
+def _covers(db: Session, start: datetime, metrics: list) -> bool:
+    """Rollup pencerenin başından itibaren dolu mu?
+
+    Kısmi backfill'de (ör. build script yarıda kaldı) en erken günlük satır
+    pencere başından sonradır — rollup pencerenin alt kümesi üzerinden
+    ortalama döndürürdü. Ham tabloda da o tarihten önce saat yoksa (veri
+    zaten orada başlıyor) kapsama tamdır.
+    """
+    firsts = [r[1] for r in db.execute(_COVERAGE_SQL, {"metrics": metrics})]
+    if not firsts or any(f is None for f in firsts):
+        return False
+    first_day = max(firsts)
+    if first_day <= start.date():
+        return True
+    return db.execute(_RAW_BEFORE_SQL, {
+        "start": start,
+        "first_day": datetime.combine(first_day, datetime.min.time()),
+    }).first() is None
+
+
+def window_aggregates(
+    db: Session,
+    start: datetime,
+    end: datetime,
+    months: Optional[Iterable[int]] = None,
+    scope: str = "district",
+    metrics: Iterable[str] = ("wind", "solar", "temp"),
+) -> Dict[Tuple[str, Optional[str]], Dict[str, Dict[str, float]]]:
+    """Pencere agregatlarını rollup'tan okur.
+
+    Pencerenin içindeki tam aylar aylık satırlardan, kenar (kısmi) aylar
+    günlük satırlardan gelir → yıllık pencere ≈ 12 × ilçe aylık + ~30 gün ×
+    ilçe günlük satır. Gün çözünürlüğü: başlangıç günü tam gün sayılır.
+
+    Returns:
+        {(city_name, district_name|None): {metric: {"avg", "peak_avg", "n"}}}
+        scope="province" → district_name None (il toplamı). Rollup boşsa ya
+        da pencere başını kapsamıyorsa (kısmi backfill) {} → çağıran ham
+        tabloya düşer.
+    """
+    metrics = list(metrics)
+    if not _covers(db, start, metrics):
+        logger.info("[rollup] %s penceresini kapsamıyor — ham tabloya düşülüyor",
+                    start.date())
+        return {}
+
+    d0 = start.date()
+    d1 = end.date()
+    first_full, last_full_end = _window_split(d0, d1)
+
+    group = "city_name" if scope == "province" else "city_name, district_name"
+    where_months = ""
+    params = {
+        "d0": d0, "d1": d1, "mf": first_full, "ml": last_full_end,
+        "metrics": metrics,
+    }
+    if months:
+        where_months = "AND EXTRACT(MONTH FROM period_start) = ANY(:months)"
+        params["months"] = list(months)
+
+    sql = text(f"""
+        SELECT {group}, metric,
+               SUM(sum_value) / NULLIF(SUM(n_hours), 0)   AS avg,
+               SUM(peak_sum)  / NULLIF(SUM(peak_days), 0) AS peak_avg,
+               SUM(n_hours)                               AS n
+        FROM hourly_weather_rollup
+        WHERE metric = ANY(:metrics)
+          AND (
+                (period_type = 'month' AND period_start >= :mf AND period_start < :ml)
+             OR (period_type = 'day' AND (
+                    (period_start >= :d0 AND period_start < :mf)
+                 OR (period_start >= :ml AND period_start <= :d1)))
+          )
+          {where_months}
+        GROUP BY {group}, metric
+    """)
+
+    out: Dict[Tuple[str, Optional[str]], Dict[str, Dict[str, float]]] = {}
+    for r in db.execute(sql, params).fetchall():
+        m = r._mapping
+        key = (m["city_name"], None if scope == "province" else m["district_name"])
+        out.setdefault(key, {})[m["metric"]] = {
+            "avg": float(m["avg"]) if m["avg"] is not None else None,
+            "peak_avg": float(m["peak_avg"]) if m["peak_avg"] is not None else None,
+            "n": int(m["n"] or 0),
+        }
+    return out
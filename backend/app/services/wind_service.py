@@ -8,9 +8,10 @@ saatlik güçlerin toplamı yıllık enerji üretimini (kWh) verir.
 Ortalama hız × 8760 saat yöntemi kullanılmaz.
 """
 
-import math
-from typing import Dict, Any, List, Union
-from datetime import datetime
+from typing import Dict, Any, Union
+
+from app.services import yield_engine
+from app.services.yield_engine import HourlyInput
 
 
 # ── Standart Türbin Güç Eğrisi (3.3 MW) ──────────────────────────────────────
@@ -36,32 +37,16 @@ def get_power_from_curve(
     """
     Verilen rüzgar hızında türbinin ne kadar güç (kW) üreteceğini hesaplar.
     Ara değerler için lineer interpolasyon yapar.
+
+    Tek değer için; dizi hesapları `yield_engine.power_from_curve` kullanır.
     """
     if curve is None:
         curve = EXAMPLE_TURBINE_POWER_CURVE
-
-    speeds = sorted(curve.keys())
-
-    if wind_speed < speeds[0] or wind_speed > speeds[-1]:
-        return 0.0
-
-    if wind_speed in curve:
-        return float(curve[wind_speed])
-
-    lower = max([s for s in speeds if s <= wind_speed], default=0)
-    upper = min([s for s in speeds if s >= wind_speed], default=max(speeds))
-
-    if lower == upper:
-        return float(curve[lower])
-
-    p_lower = curve[lower]
-    p_upper = curve[upper]
-    ratio = (wind_speed - lower) / (upper - lower)
-    return float(p_lower + ratio * (p_upper - p_lower))
+    return float(yield_engine.power_from_curve(wind_speed, curve))
 
 
 def calculate_wind_from_hourly(
-    hourly_data: List[Dict[str, Any]],
+    hourly_data: HourlyInput,
     use_100m: bool = True,
     power_curve: Dict[Union[int, float], Union[int, float]] = None,
 ) -> Dict[str, Any]:
@@ -73,8 +58,13 @@ def calculate_wind_from_hourly(
         2. Güç eğrisinden anlık kW değerini hesapla
         3. 1 saat × kW = kWh olarak topla
 
+    Hesap vektöreldir (`yield_engine`): tüm saatler tek `np.interp` çağrısı,
+    aylık kırılım `np.bincount`.
+
     Args:
-        hourly_data: hourly_weather_helper'dan gelen saatlik veri listesi
+        hourly_data: `get_hourly_arrays_for_pin` dizi çıktısı
+            {"ts": datetime64[h][], "wind10_ms": [], "wind100_ms": [], ...}
+            veya (geri uyum) `get_hourly_weather_for_pin` saat listesi
             [{"ts": datetime, "wind10_ms": float, "wind100_ms": float, ...}, ...]
         use_100m: 100m rüzgar hızını kullan (türbin hub yüksekliği)
         power_curve: Özel güç eğrisi (None ise 3.3 MW varsayılan)
@@ -93,7 +83,7 @@ def calculate_wind_from_hourly(
     if power_curve is None:
         power_curve = EXAMPLE_TURBINE_POWER_CURVE
 
-    if not hourly_data:
+    if not yield_engine.hour_count(hourly_data):
         return {
             "predicted_annual_production_kwh": 0,
             "avg_wind_speed_ms": 0,
@@ -104,47 +94,24 @@ def calculate_wind_from_hourly(
             "error": "Saatlik veri bulunamadı",
         }
 
-    # ── Saatlik güç hesabı ───────────────────────────────────────────
-    monthly_kwh: Dict[int, float] = {}
-    monthly_hours: Dict[int, int] = {}
-    monthly_wind_sum: Dict[int, float] = {}
-    total_production_kwh = 0.0
-    total_wind_sum = 0.0
-    valid_hours = 0
-
-    for h in hourly_data:
-        wind = h.get("wind100_ms", 0.0) if use_100m else h.get("wind10_ms", 0.0)
-        wind = wind or 0.0
-        ts: datetime = h["ts"]
-        month = ts.month
-
-        # Güç eğrisinden anlık güç (kW)
-        power_kw = get_power_from_curve(wind, power_curve)
-
-        # 1 saat × kW = kWh
-        hour_kwh = power_kw  # power_kw × 1h = kWh
+    # ── Saatlik güç hesabı (vektörel) ────────────────────────────────
+    key = "wind100_ms" if use_100m else "wind10_ms"
+    arrays = yield_engine.as_arrays(hourly_data, (key,))
+    ts, wind = arrays["ts"], arrays[key]
 
-        total_production_kwh += hour_kwh
-        total_wind_sum += wind
-        valid_hours += 1
-
-        monthly_kwh[month] = monthly_kwh.get(month, 0.0) + hour_kwh
-        monthly_hours[month] = monthly_hours.get(month, 0) + 1
-        monthly_wind_sum[month] = monthly_wind_sum.get(month, 0.0) + wind
+    # Güç eğrisinden anlık güç (kW); 1 saat × kW = kWh
+    hour_kwh = yield_engine.power_from_curve(wind, power_curve)
+    total_production_kwh = float(hour_kwh.sum())
+    valid_hours = int(len(wind))
+    monthly_kwh, monthly_hours = yield_engine.monthly_sums(ts, hour_kwh)
 
     # ── Veri dönemi ve yıllık ölçekleme ──────────────────────────────
-    if hourly_data:
-        ts_min = hourly_data[0]["ts"]
-        ts_max = hourly_data[-1]["ts"]
-        data_days = max((ts_max - ts_min).days, 1)
-    else:
-        data_days = 1
-
+    data_days = yield_engine.data_period_days(ts)
     scale_factor = 365.0 / data_days if data_days < 365 else 1.0
     annual_production = total_production_kwh * scale_factor
 
     # Ortalama rüzgar hızı
-    avg_wind = total_wind_sum / valid_hours if valid_hours > 0 else 0.0
+    avg_wind = float(wind.mean()) if valid_hours > 0 else 0.0
 
     # Kapasite faktörü
     rated_power_kw = max(power_curve.values())
@@ -154,18 +121,9 @@ def calculate_wind_from_hourly(
         capacity_factor = min(capacity_factor, 0.70)  # Fiziksel üst sınır
 
     # ── Aylık kırılım ────────────────────────────────────────────────
-    month_by_month: Dict[str, float] = {}
-    for i in range(12):
-        m = i + 1
-        if m in monthly_kwh:
-            expected_hours = [744, 672, 744, 720, 744, 720,
-                              744, 744, 720, 744, 720, 744][i]
-            actual_hours = monthly_hours.get(m, expected_hours)
-            ratio = expected_hours / actual_hours if actual_hours > 0 else 1.0
-            ratio = min(ratio, 2.0)
-            month_by_month[MONTH_NAMES_TR[i]] = round(monthly_kwh[m] * ratio, 2)
-        else:
-            month_by_month[MONTH_NAMES_TR[i]] = round(annual_production / 12, 2)
+    month_by_month = yield_engine.month_by_month(
+        monthly_kwh, monthly_hours, annual_production, MONTH_NAMES_TR,
+    )
 
     return {
         "predicted_annual_production_kwh": round(annual_production, 0),
@@ -184,7 +142,7 @@ def calculate_wind_power_production(
     latitude: float,
     longitude: float,
     weather_stats: Dict[str, Any] = None,  # type: ignore
-    hourly_data: List[Dict[str, Any]] = None,  # type: ignore
+    hourly_data: HourlyInput = None,
 ) -> Dict[str, Any]:
     """
     Backward-compatible wrapper.
@@ -192,7 +150,7 @@ def calculate_wind_power_production(
     yoksa eski weather_stats fallback'ine düşer.
     """
     # Yeni yol: gerçek saatlik veri
-    if hourly_data and len(hourly_data) > 100:
+    if yield_engine.hour_count(hourly_data) > 100:
         result = calculate_wind_from_hourly(hourly_data=hourly_data)
         return result
 
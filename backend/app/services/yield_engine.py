@@ -0,0 +1,166 @@
+"""
+SRRP — Vektörel Verim (Yield) Motoru
+====================================
+
+Rüzgar / güneş üretim hesapları her saat için Python döngüsü çalıştırıyordu:
+`get_power_from_curve` her saatte eğri sözlüğünü sıralayıp liste
+comprehension ile tarıyor, servisler 8.760 saat sözlüğü üzerinde dönüyordu.
+Bu modül aynı hesapları NumPy dizileri üzerinde yapar:
+
+  * Güç eğrisi: ``np.interp`` (eğri bir kez sıralanıp önbelleğe alınır)
+  * Aylık kırılım: ``datetime64[M]`` ay indeksi + ``np.bincount``
+  * Günlük kırılım: ``datetime64[D]`` + ``np.unique`` / ``np.bincount``
+
+Girdi: `hourly_weather_helper.get_hourly_arrays_for_pin` çıktısı (kolon →
+dizi). Eski saat-sözlüğü listesi de ``arrays_from_hours`` ile çevrilerek
+kabul edilir (geri uyum).
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Tuple, Union
+
+import numpy as np
+
+# Ay başına beklenen saat (kısmi ay ölçeklemesi; Şubat 28 gün)
+EXPECTED_MONTH_HOURS = np.array(
+    [744, 672, 744, 720, 744, 720, 744, 744, 720, 744, 720, 744], dtype=np.float64,
+)
+
+Curve = Mapping[Union[int, float], Union[int, float]]
+HourlyInput = Union[List[Dict[str, Any]], Mapping[str, Any], None]
+
+
+# ─── Girdi normalizasyonu ───────────────────────────────────────────────────
+
+def arrays_from_hours(hours: List[Dict[str, Any]], keys: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Saat sözlüğü listesi → {"ts": datetime64[h], key: float64} (None → 0)."""
+    out: Dict[str, np.ndarray] = {
+        "ts": np.array([h["ts"] for h in hours], dtype="datetime64[h]"),
+    }
+    for k in keys:
+        out[k] = np.array([h.get(k) or 0.0 for h in hours], dtype=np.float64)
+    return out
+
+
+def as_arrays(hourly_data: HourlyInput, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+    """Dizi sözlüğü (okuyucu çıktısı) veya saat listesi → dizi sözlüğü."""
+    keys = tuple(keys)
+    if not hourly_data:
+        return {"ts": np.array([], dtype="datetime64[h]"),
+                **{k: np.zeros(0) for k in keys}}
+    if isinstance(hourly_data, Mapping):
+        out = {"ts": np.asarray(hourly_data["ts"], dtype="datetime64[h]")}
+        for k in keys:
+            out[k] = np.nan_to_num(np.asarray(hourly_data[k], dtype=np.float64), nan=0.0)
+        return out
+    return arrays_from_hours(hourly_data, keys)
+
+
+def hour_count(hourly_data: HourlyInput) -> int:
+    """Saat sayısı — liste için len, dizi sözlüğü için ``ts`` uzunluğu."""
+    if not hourly_data:
+        return 0
+    if isinstance(hourly_data, Mapping):
+        return int(len(hourly_data.get("ts", ())))
+    return len(hourly_data)
+
+
+# ─── Güç eğrisi ─────────────────────────────────────────────────────────────
+
+@lru_cache(maxsize=32)
+def _curve_points(items: Tuple[Tuple[float, float], ...]) -> Tuple[np.ndarray, np.ndarray]:
+    xs = np.array([k for k, _ in items], dtype=np.float64)
+    ys = np.array([v for _, v in items], dtype=np.float64)
+    return xs, ys
+
+
+def curve_points(curve: Curve) -> Tuple[np.ndarray, np.ndarray]:
+    """Eğri sözlüğü → sıralı (hız, güç) dizileri (eğri başına bir kez kurulur)."""
+    return _curve_points(tuple(sorted((float(k), float(v)) for k, v in curve.items())))
+
+
+def power_from_curve(speeds: Union[float, np.ndarray], curve: Curve) -> np.ndarray:
+    """Hız(lar) → güç (kW), ara değerler lineer; eğri aralığı dışı → 0."""
+    xs, ys = curve_points(curve)
+    return np.interp(speeds, xs, ys, left=0.0, right=0.0)
+
+
+def wind_cf(speeds: Union[float, np.ndarray]) -> np.ndarray:
+    """Normalize trapez/küp güç eğrisi (0-1) — `climatology_service._wind_power_curve`
+    ile aynı: cut-in altı / cut-out üstü 0, rated üstü 1, arası küp."""
+    from app.services.climatology_service import (
+        WIND_CUTIN_MS, WIND_CUTOUT_MS, WIND_RATED_MS,
+    )
+    v = np.asarray(speeds, dtype=np.float64)
+    ramp = np.clip((v - WIND_CUTIN_MS) / (WIND_RATED_MS - WIND_CUTIN_MS), 0.0, 1.0) ** 3
+    return np.where((v < WIND_CUTIN_MS) | (v > WIND_CUTOUT_MS), 0.0, ramp)
+
+
+def solar_cf(ghi_wm2: Union[float, np.ndarray], pr: float = 0.80) -> np.ndarray:
+    """GHI (W/m²) → kapasite oranı: min(GHI, STC) / STC × PR."""
+    from app.services.climatology_service import GHI_STC_WM2
+    g = np.asarray(ghi_wm2, dtype=np.float64)
+    return np.minimum(g, GHI_STC_WM2) / GHI_STC_WM2 * pr
+
+
+def temperature_factor(temp_c: np.ndarray, noct: float = 45.0) -> np.ndarray:
+    """PV sıcaklık düzeltmesi (%0.4/°C, t_cell ≈ ortam + NOCT-20, taban %50)."""
+    delta = np.asarray(temp_c, dtype=np.float64) + (noct - 20) - 25.0
+    return np.maximum(1.0 - delta * 0.004, 0.5)
+
+
+# ─── Zaman kırılımları ──────────────────────────────────────────────────────
+
+def month_index(ts: np.ndarray) -> np.ndarray:
+    """datetime64 → ay indeksi 0..11."""
+    return ts.astype("datetime64[M]").astype(np.int64) % 12
+
+
+def monthly_sums(ts: np.ndarray, values: np.ndarray, mask: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """(12 aylık toplam, 12 aylık saat sayısı). ``mask`` → yalnızca seçili saatler."""
+    m = month_index(ts)
+    if mask is not None:
+        m, values = m[mask], values[mask]
+    sums = np.bincount(m, weights=values, minlength=12)
+    counts = np.bincount(m, minlength=12)
+    return sums, counts
+
+
+def daily_sums(ts: np.ndarray, values: np.ndarray) -> List[Dict[str, Any]]:
+    """Saatlik değerler → ``[{"date": "YYYY-MM-DD", "kwh": float}]`` (gün sıralı)."""
+    if len(ts) == 0:
+        return []
+    days, inv = np.unique(ts.astype("datetime64[D]"), return_inverse=True)
+    totals = np.bincount(inv, weights=values, minlength=len(days))
+    return [
+        {"date": str(d), "kwh": round(float(v), 2)}
+        for d, v in zip(days, totals)
+    ]
+
+
+def data_period_days(ts: np.ndarray) -> int:
+    """İlk-son saat arası gün sayısı (en az 1) — liste okuyucudaki ``.days``."""
+    if len(ts) == 0:
+        return 1
+    span_h = int((ts[-1] - ts[0]).astype("timedelta64[h]").astype(np.int64))
+    return max(span_h // 24, 1)
+
+
+def month_by_month(
+    monthly_kwh: np.ndarray,
+    monthly_hours: np.ndarray,
+    annual_kwh: float,
+    month_names: List[str],
+) -> Dict[str, float]:
+    """Aylık kırılım: kısmi ay beklenen saate ölçeklenir (en fazla ×2); verisiz
+    ay yıllık üretimin 1/12'si."""
+    out: Dict[str, float] = {}
+    for i in range(12):
+        if monthly_hours[i] > 0:
+            ratio = min(EXPECTED_MONTH_HOURS[i] / monthly_hours[i], 2.0)
+            out[month_names[i]] = round(float(monthly_kwh[i]) * ratio, 2)
+        else:
+            out[month_names[i]] = round(annual_kwh / 12, 2)
+    return out
+
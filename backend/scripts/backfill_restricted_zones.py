@@ -255,6 +255,13 @@ def main():
     # 2. PostGIS'e yaz
     inserted = insert_into_db(elements)
 
+    # Tile geometrisini yeniden genelleştir; tohumlanmış tile deposu artık
+    # bayat — `/tiles` canlı PostGIS'e döner (yenilemek için: scripts/seed_tiles.py)
+    from app.services.mvt_generalize import build_generalized
+    from app.services import data_versions
+    build_generalized(_engine, ["restricted"])
+    data_versions.bump(data_versions.VECTOR)
+
     # 3. Doğrulama
     with _engine.connect() as c:
         total = c.execute(text("SELECT COUNT(*) FROM restricted_zones")).scalar()
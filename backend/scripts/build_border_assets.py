@@ -0,0 +1,152 @@
+"""
+SRRP — Sınır Varlıkları (GeoJSON + TopoJSON, çok çözünürlüklü, ön-sıkıştırılmış)
+================================================================================
+
+``/geo/borders/*`` endpoint'lerinin sunduğu dosyaları önceden üretir; böylece
+API süreci GeoPandas ile OSM/GADM dosyasını okuyup sadeleştirmek zorunda
+kalmaz (ilk istekte saniyeler) ve her yanıt sıkıştırılmış gider.
+
+Her katman (provinces, districts, regions) için:
+
+  * Paylaşılan yaylı topoloji kurulur (``app/services/topology.py``) —
+    komşu poligonlar ortak sınırı tek kopya paylaşır, sadeleştirme yay
+    başına yapıldığından ortak sınırlarda boşluk / çakışma oluşmaz
+  * Üç detay seviyesi (``low`` / ``medium`` / ``high``) × GeoJSON + TopoJSON
+  * İlçeler için ayrıca il ve bölge alt kümeleri (``?province=`` / ``?region=``)
+  * Her dosyanın ``.gz`` (ve ``brotli`` kuruluysa ``.br``) kopyası
+  * ``manifest.json`` — dosya → içerik özeti (ETag) + mevcut kodlamalar
+
+Çıktı: ``backend/data/vector/borders/``. Çalışan API'nin yeni dosyaları
+okuması için ``POST /geo/borders/cache/clear`` (veya yeniden başlatma).
+
+Kullanım
+--------
+
+.. code-block:: bash
+
+    cd backend
+    python scripts/build_border_assets.py
+"""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import math
+import os
+import sys
+import time
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_BACKEND_ROOT))
+
+from app.routers import borders  # noqa: E402
+from app.services.topology import Topology, build_topology  # noqa: E402
+
+try:
+    import brotli  # type: ignore
+    _BROTLI_AVAILABLE = True
+except ImportError:
+    brotli = None
+    _BROTLI_AVAILABLE = False
+
+logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _clean(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    return value
+
+
+def _topology_of(gdf) -> Topology:
+    cols = [c for c in gdf.columns if c != "geometry"]
+    props = [{c: _clean(row[c]) for c in cols} for _, row in gdf.iterrows()]
+    return build_topology(list(gdf.geometry), props)
+
+
+class AssetWriter:
+    def __init__(self, out_dir: Path) -> None:
+        self.out_dir = out_dir
+        out_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest: dict = {}
+
+    def write(self, filename: str, payload: dict) -> None:
+        raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        encodings = ["gzip"]
+        (self.out_dir / filename).write_bytes(raw)
+        (self.out_dir / f"{filename}.gz").write_bytes(gzip.compress(raw, compresslevel=9, mtime=0))
+        if _BROTLI_AVAILABLE:
+            (self.out_dir / f"{filename}.br").write_bytes(brotli.compress(raw, quality=11))
+            encodings.append("br")
+        self.manifest[filename] = {
+            "sha": hashlib.sha256(raw).hexdigest()[:20],
+            "size": len(raw),
+            "encodings": encodings,
+        }
+
+    def write_layer(self, name: str, object_name: str, topo: Topology,
+                    base_tolerance: float) -> None:
+        for detail, factor in borders.DETAIL_FACTORS.items():
+            tol = base_tolerance * factor
+            self.write(f"{name}.{detail}.geojson", topo.to_geojson(tol))
+            self.write(f"{name}.{detail}.topojson", topo.to_topojson(object_name, tol))
+
+    def finish(self) -> None:
+        path = self.out_dir / "manifest.json"
+        tmp = path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.manifest, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def main() -> None:
+    t0 = time.monotonic()
+    writer = AssetWriter(borders._ASSET_DIR)
+
+    provinces, is_osm = borders._read_level_gdf(1)
+    if provinces is None:
+        logger.error("İl sınır verisi yok — önce scripts/download_osm_borders.py")
+        sys.exit(1)
+    # Toleranslar canlı yolla aynı (OSM verisi zaten optimize → yarısı)
+    osm = 0.5 if is_osm else 1.0
+    topo = _topology_of(provinces)
+    logger.info("provinces: %d feature, %d yay", len(topo), len(topo.arcs))
+    writer.write_layer("provinces", "provinces", topo, 0.002 * osm)
+
+    districts, is_osm = borders._read_level_gdf(2)
+    if districts is not None:
+        osm = 0.5 if is_osm else 1.0
+        topo = _topology_of(districts)
+        logger.info("districts: %d feature, %d yay", len(topo), len(topo.arcs))
+        writer.write_layer("districts", "districts", topo, 0.001 * osm)
+
+        keys = [borders._ascii_key(p.get("NAME_1") or "") for p in topo.properties]
+        for key in sorted(set(keys)):
+            idx = [i for i, k in enumerate(keys) if k == key]
+            writer.write_layer(f"districts.province-{borders._slug(key)}", "districts",
+                               topo.subset(idx), 0.001 * osm)
+        for region, provs in borders.TURKEY_REGIONS.items():
+            wanted = {borders._ascii_key(p) for p in provs}
+            idx = [i for i, k in enumerate(keys) if k in wanted]
+            writer.write_layer(f"districts.region-{borders._slug(region)}", "districts",
+                               topo.subset(idx), 0.001 * osm)
+        writer.write_layer("districts.empty", "districts", topo.subset([]), 0.0)
+
+    regions, is_osm = borders._read_regions_gdf()
+    if regions is not None:
+        topo = _topology_of(regions)
+        writer.write_layer("regions", "regions", topo, 0.0015 if is_osm else 0.003)
+
+    writer.finish()
+    total = sum(e["size"] for e in writer.manifest.values())
+    logger.info("Tamam: %d dosya (+ sıkıştırılmış), %.1f MB ham, %.1f sn → %s",
+                len(writer.manifest), total / 1e6, time.monotonic() - t0, borders._ASSET_DIR)
+    if not _BROTLI_AVAILABLE:
+        logger.info("brotli kurulu değil — yalnızca .gz üretildi (pip install brotli)")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,6 +8,7 @@ Pipeline (5 aşama):
   3. ogr2ogr ile GeoJSON'a çevir (tippecanoe girişi)
   4. tippecanoe ile MVT (.mbtiles) üret
   5. Çıktıyı backend/data/contours/contour.mbtiles'a koy
+  6. (--pmtiles) MBTiles → contour.pmtiles (mmap'le sunulan tek dosya arşiv)
 
 **Bağımlılıklar (sistem araçları — pip değil):**
   - GDAL (gdal_contour, ogr2ogr)  → OSGeo4W (Windows) / apt gdal-bin (Linux)
@@ -29,6 +30,12 @@ indirmeden önce ortamı kontrol eder.
     python scripts/build_contour_mvt.py --dem dem.tif --interval 100 \
         --minzoom 8 --maxzoom 14
 
+    # PMTiles da üret (backend varsa onu tercih eder):
+    python scripts/build_contour_mvt.py --dem dem.tif --pmtiles
+
+    # Mevcut contour.mbtiles'ı yalnızca PMTiles'a çevir (GDAL/tippecanoe gerekmez):
+    python scripts/build_contour_mvt.py --pmtiles
+
 **SRTM DEM nereden:**
   - https://srtm.csi.cgiar.org/  (CGIAR 90m, ücretsiz)
   - https://dwtkns.com/srtm30m/  (NASA 30m, login gerekir)
@@ -53,6 +60,7 @@ TR_BBOX = (25.5, 35.8, 44.8, 42.1)
 _BASE = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 _WORK = os.path.join(_BASE, "data", "contours", "_work")
 _OUT = os.path.join(_BASE, "data", "contours", "contour.mbtiles")
+_OUT_PM = os.path.splitext(_OUT)[0] + ".pmtiles"
 
 
 def _which(tool: str) -> str | None:
@@ -170,6 +178,50 @@ def build(dem: str, interval: int, minzoom: int, maxzoom: int) -> None:
     print("=" * 60)
 
 
+def mbtiles_to_pmtiles(src: str = _OUT, dst: str = _OUT_PM) -> None:
+    """MBTiles (TMS y) → PMTiles v3. Tile baytları (tippecanoe gzip'i) aynen
+    kopyalanır; aynı içerikli tile'lar tekilleştirilir."""
+    import json
+    import sqlite3
+
+    sys.path.insert(0, _BASE)
+    from app.services.pmtiles import (
+        COMPRESSION_GZIP, COMPRESSION_NONE, write_pmtiles,
+    )
+
+    if not os.path.isfile(src):
+        print(f"X MBTiles yok: {src}")
+        sys.exit(1)
+    print(f"\n>> MBTiles → PMTiles ({dst})")
+    conn = sqlite3.connect(f"file:{src}?mode=ro", uri=True)
+    try:
+        meta = dict(conn.execute("SELECT name, value FROM metadata").fetchall())
+        first = conn.execute("SELECT tile_data FROM tiles LIMIT 1").fetchone()
+        gz = bool(first and first[0][:2] == b"\x1f\x8b")
+        tiles = (
+            (z, x, (1 << z) - 1 - row, bytes(data))
+            for z, x, row, data in conn.execute(
+                "SELECT zoom_level, tile_column, tile_row, tile_data FROM tiles")
+        )
+        metadata = {k: v for k, v in meta.items() if k != "json"}
+        if meta.get("json"):
+            try:
+                metadata.update(json.loads(meta["json"]))
+            except ValueError:
+                pass
+        bounds = tuple(float(v) for v in meta.get(
+            "bounds", ",".join(str(v) for v in TR_BBOX)).split(","))
+        n = write_pmtiles(
+            dst, tiles,
+            tile_compression=COMPRESSION_GZIP if gz else COMPRESSION_NONE,
+            metadata=metadata, bounds=bounds,
+        )
+    finally:
+        conn.close()
+    size_mb = os.path.getsize(dst) / (1024 * 1024)
+    print(f"   OK — {n} tile, {size_mb:.1f} MB")
+
+
 def main() -> None:
     p = argparse.ArgumentParser(description="Contour MVT pipeline")
     p.add_argument("--dem", help="SRTM DEM GeoTIFF yolu")
@@ -179,8 +231,14 @@ def main() -> None:
     p.add_argument("--maxzoom", type=int, default=14)
     p.add_argument("--check", action="store_true",
                    help="Sadece ortam kontrolü yap, çık")
+    p.add_argument("--pmtiles", action="store_true",
+                   help="contour.pmtiles da üret (--dem yoksa mevcut mbtiles çevrilir)")
     args = p.parse_args()
 
+    if args.pmtiles and not args.dem and not args.check:
+        mbtiles_to_pmtiles()
+        return
+
     tools = check_env()
     env_ok = print_env(tools)
 
@@ -202,6 +260,8 @@ def main() -> None:
         sys.exit(1)
 
     build(args.dem, args.interval, args.minzoom, args.maxzoom)
+    if args.pmtiles:
+        mbtiles_to_pmtiles()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,84 @@
+r"""Kolonsal saatlik depo — ilk doldurma / yeniden paketleme (hourly_weather_packed).
+
+`hourly_weather_data` ham satırlarını lokasyon × ay başına tek sıkıştırılmış
+float32 matrise paketler. Scheduler sonrasında yalnızca yeni saatleri yamar;
+bu script ilk kurulumda ve codec/kolon değişikliğinde tam yeniden üretim için.
+
+Sonunda iki tablonun disk boyutunu karşılaştırır (pg_total_relation_size).
+
+**Kullanım:**
+
+    cd backend
+    ..\.venv\Scripts\python.exe scripts\build_hourly_packed.py
+    ..\.venv\Scripts\python.exe scripts\build_hourly_packed.py --months 3
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")  # type: ignore[attr-defined]
+except Exception:
+    pass
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def _relation_size(db, table: str) -> int:
+    from sqlalchemy import text
+    return int(db.execute(
+        text("SELECT pg_total_relation_size(CAST(:t AS regclass))"), {"t": table}
+    ).scalar() or 0)
+
+
+def main(months: int | None) -> None:
+    from sqlalchemy import func
+    from app.db.database import SystemSessionLocal, SystemEngine, SystemBase
+    from app.db.models import HourlyWeatherData, HourlyWeatherPacked
+    from app.services.hourly_weather_store import repack_range
+
+    SystemBase.metadata.create_all(bind=SystemEngine, tables=[HourlyWeatherPacked.__table__])
+
+    print("=" * 64)
+    print("  Kolonsal Saatlik Depo — yeniden paketleme")
+    print("=" * 64)
+
+    t0 = time.monotonic()
+    with SystemSessionLocal() as db:
+        first, last = db.query(
+            func.min(HourlyWeatherData.timestamp),
+            func.max(HourlyWeatherData.timestamp),
+        ).one()
+        if first is None:
+            print("hourly_weather_data boş — yapılacak iş yok.")
+            return
+        end = last + timedelta(hours=1)
+        start = first
+        if months:
+            start = max(first, datetime.utcnow() - timedelta(days=31 * months))
+        print(f"Aralık: {start:%Y-%m-%d} → {end:%Y-%m-%d}\n")
+
+        written = repack_range(db, start, end)
+
+        raw_size = _relation_size(db, "hourly_weather_data")
+        packed_size = _relation_size(db, "hourly_weather_packed")
+
+    dur = time.monotonic() - t0
+    ratio = raw_size / packed_size if packed_size else 0.0
+    print("\n" + "=" * 64)
+    print(f"  BİTTİ — {written} lokasyon-ay, {dur:.1f}s")
+    print(f"  Ham: {raw_size / 1e6:,.1f} MB · Paket: {packed_size / 1e6:,.1f} MB "
+          f"(×{ratio:.1f})")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--months", type=int, default=None,
+                   help="Sadece son N ayı paketle (varsayılan: tüm geçmiş)")
+    args = p.parse_args()
+    main(months=args.months)
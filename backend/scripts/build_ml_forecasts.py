@@ -10,6 +10,22 @@ harita + Projeksiyon tab bu tablodan anında okur.
     ..\.venv\Scripts\python.exe scripts\build_ml_forecasts.py
     ..\.venv\Scripts\python.exe scripts\build_ml_forecasts.py --years 10 --only-province
     ..\.venv\Scripts\python.exe scripts\build_ml_forecasts.py --province Konya
+    ..\.venv\Scripts\python.exe scripts\build_ml_forecasts.py --workers 8 --resume
+
+Paralel: lokasyon bazlı görevler süreç havuzunda (`--workers`, varsayılan
+çekirdek sayısı); her işçi kendi satırlarını tek upsert ile yazar. Her seri
+`ml_forecast_checkpoint`'e işlenir — kesilen koşu `--resume` ile sürer.
+İlerleme satırları seri/sn ve kalan süreyi gösterir.
+
+Seriler lokasyon başına sorgulanmaz: `load_monthly_series_bank` tüm
+weather_data / monthly_climate (veya climatology) aggregate'lerini birkaç
+gruplu sorguda NumPy dizilerine yükler, işçilere seriler görevle gider.
+
+Hızlı katman: tüm seriler önce tek matriste toplu Holt-Winters +
+linear+seasonal ile tahminlenir (`select_best_fast_batch`); holdout MAPE'si
+`--fast-mape` eşiğinin altındaki seriler SARIMAX'a hiç gitmez. Izgara
+Holt-Winters sonuçları ``holt_winters_grid`` etiketiyle yazılır; bantlar seri
+başına yolla aynı (±%10).
 
 Aylık çözünürlük. "Günlük hava" DEĞİL — iklim normali + trend + RCP senaryo.
 Plan: PLAN-2026-05-28-ML-CLIMATE-PROJECTION.md
@@ -28,6 +44,11 @@ except Exception:
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+# Paralel işçilerde BLAS tek thread — N süreç × M thread çekirdekleri boğmasın
+# (numpy yüklenmeden önce ayarlanmalı; spawn edilen işçiler de devralır)
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
 # Kaynak → hesaplanacak metrikler (frontend ile uyumlu)
 RESOURCE_METRICS = {
     "solar": ["sunshine", "cloud"],
@@ -37,6 +58,10 @@ RESOURCE_METRICS = {
 
 SCENARIOS = ["baseline", "rcp45", "rcp85"]
 
+# Hızlı katman: toplu HW / linear+seasonal holdout MAPE'si bu eşiğin altındaki
+# seriler SARIMAX'a gitmez (varsayılan %8; --fast-mape 0 → kapalı)
+FAST_TIER_MAX_MAPE = float(os.environ.get("SRRP_ML_FAST_TIER_MAPE", 0.08))
+
 
 def _distinct_locations(db, only_province: bool, province_filter):
     """climatology'den (province, district, resource) kombinasyonları."""
@@ -104,33 +129,271 @@ DAILY_RESOURCE_METRICS = {
 }
 
 
-def main(years: int, only_province: bool, province_filter, dry_run: bool,
-         use_daily: bool = False) -> None:
-    from app.db.database import SystemSessionLocal
-    from app.db.models import MlForecast
-    from app.services.ml_batch_service import (
-        get_monthly_series,
-        get_monthly_series_best,
-        select_best_monthly_forecast,
-    )
+def _series_key(prov, district, resource, metric) -> str:
+    return f"{prov}_{district or '-'}_{resource}_{metric}"
+
+
+def _run_key(years: int, only_province: bool, province_filter, use_daily: bool) -> str:
+    """Aynı parametreli koşular aynı checkpoint kümesini paylaşır."""
+    return (f"y{years}:{'daily' if use_daily else 'climatology'}:"
+            f"{'prov' if only_province else 'all'}:{province_filter or '*'}")
+
+
+def _load_series(bank, prov, district, resource, metric, start_year: int, use_daily: bool):
+    """Tek serinin aylık geçmişi (toplu yüklenmiş `bank`'ten) →
+    (series, fc_abs0) | None (veri yok).
+
+    fc_abs0: forecast'ın ilk ayının mutlak ay indeksi (yıl·12 + ay−1).
+    """
+    if use_daily:
+        # İl-scope'ta monthly_climate (20y, ~257 ay) tercih edilir;
+        # ilçede daily aggregate. (bank.best = get_monthly_series_best)
+        series, series_start = bank.best(
+            prov, district, metric,
+        )
+        if series and series_start:
+            start_date = date(series_start.year, series_start.month, 1)
+        else:
+            start_date = date(start_year, 1, 1)
+    else:
+        series = bank.climatology(prov, district, resource, metric)
+        start_date = date(start_year - 5, 1, 1)
+    if not series:
+        return None
+
+    # 2026-06-02 (MEVSİM FIX): Forecaster seriyi BİTİŞ ayından SONRA
+    # tahminler (future_idx = son ay + 1). Seri Haziran'da biterse
+    # forecast[0] = Temmuz olur; eski kod forecast[0]'ı Ocak sanıp
+    # etiketliyordu → mevsim ~6 ay kayıp TERS dönüyordu (yaz=düşük!).
+    # Çözüm: seriyi en yakın ARALIK'ta bitir → forecast Ocak'ta başlar
+    # → ay etiketleri doğru + tam takvim yılları.
+    _s_abs = start_date.year * 12 + (start_date.month - 1)
+    _last_abs = _s_abs + len(series) - 1
+    _trim = (_last_abs % 12 + 1) % 12   # son ay Aralık değilse kırp
+    if _trim and (len(series) - _trim) >= 24:
+        series = series[:-_trim]
+        _last_abs -= _trim
+    return list(series), _last_abs + 1   # forecast ilk ayı (Ocak), mutlak ay indeksi
+
+
+def _forecast_rows(prov, district, resource, metric, start_year: int, fc_abs0: int,
+                   values, lowers, uppers, method: str, mape) -> list:
+    """Forecast noktaları × senaryolar → ml_forecast satırları."""
     from app.services.climate_scenarios import scenario_factor
     from app.services.province_aliases import to_canonical
+
+    scope = "province" if district is None else "district"
+    # 2026-06-02 (ML-1 fix): Kaynak tablolar il adını farklı kodlamada
+    # tutuyor (climatology=Türkçe, weather_data=ASCII). Seri ÇEKİMİ
+    # orijinal `prov` ile yapılır (kaynak satırı bulunsun), ama DB'ye
+    # YAZILAN ad daima Türkçe-canonical (GADM) olur → frontend choropleth
+    # eşleşir, tekrar kayıt oluşmaz. (Mor ilçe/il sorununun kökü buydu.)
+    prov_canon = to_canonical(prov)
+    rows = []
+    for i, v in enumerate(values):
+        # Doğru ay etiketi: forecast'ın GERÇEK başlangıç ayından say.
+        _midx = fc_abs0 + i
+        d = date(_midx // 12, _midx % 12 + 1, 1)
+        year_offset = d.year - start_year
+        for scenario in SCENARIOS:
+            factor = scenario_factor(scenario, metric, year_offset)
+            rows.append({
+                "scope": scope,
+                "province_name": prov_canon,
+                "district_name": district,
+                "resource": resource,
+                "metric": metric,
+                "scenario": scenario,
+                "year": d.year,
+                "month": d.month,
+                # 2026-06-02: metrikler negatif olamaz → [0,∞) kıstır
+                "value": max(0.0, round(v * factor, 4)),
+                "lower": max(0.0, round((lowers[i] or v) * factor, 4)),
+                "upper": max(0.0, round((uppers[i] or v) * factor, 4)),
+                "method": method,
+                "mape": mape,
+            })
+    return rows
+
+
+def _init_worker() -> None:
+    """Fork edilen işçi ebeveynin bağlantı havuzunu paylaşmasın."""
+    from app.db.database import SystemEngine
+    SystemEngine.dispose(close=False)
+
+
+def _load_location(bank, task: dict) -> dict:
+    """Lokasyonun tüm metrik serilerini `bank`'ten göreve ekle (sorgusuz)."""
+    task = dict(task)
+    entries = []
+    for metric in task["metrics"]:
+        entry = {"metric": metric, "series": None, "fc_abs0": None, "fast": None, "error": None}
+        try:
+            loaded = _load_series(bank, task["prov"], task["district"], task["resource"], metric,
+                                  task["start_year"], task["use_daily"])
+        except Exception as e:  # noqa: BLE001
+            entry["error"] = str(e)
+        else:
+            if loaded is not None:
+                entry["series"], entry["fc_abs0"] = loaded
+        entries.append(entry)
+    task["entries"] = entries
+    return task
+
+
+def _process_location(task: dict) -> dict:
+    """İşçi (2. faz): bir lokasyonun (il/ilçe × kaynak) tüm metrikleri.
+
+    Hızlı katmanın kabul ettiği seriler hazır forecast'la gelir; kalanlar
+    seri başına model seçimiyle (SARIMAX dahil) tahminlenir. Satırlar tek
+    çok-satırlı upsert ile yazılır; seri checkpoint'leri aynı transaction'da
+    — yarıda kesilen lokasyon ne veri ne checkpoint bırakır.
+    """
+    import time
+    from app.db.database import SystemSessionLocal
+    from app.db.models import MlForecast, MlForecastCheckpoint
+    from app.services.ml_batch_service import select_best_monthly_forecast
+    from sqlalchemy import func
     from sqlalchemy.dialects.postgresql import insert as pg_insert
 
+    prov, district, resource = task["prov"], task["district"], task["resource"]
+    out = {"ok": 0, "skipped": 0, "errors": 0, "fast": 0, "rows": 0, "messages": []}
+    rows, checkpoints = [], []
+    for entry in task["entries"]:
+        metric = entry["metric"]
+        key = _series_key(prov, district, resource, metric)
+        t0 = time.monotonic()
+        series_rows, method, status = [], None, "ok"
+        try:
+            if entry["error"]:
+                raise RuntimeError(entry["error"])
+            if entry["series"] is None:
+                status = "skipped"
+            else:
+                fast = entry["fast"]
+                if fast is None:
+                    s_abs = entry["fc_abs0"] - len(entry["series"])
+                    values, lowers, uppers, method, mape = select_best_monthly_forecast(
+                        entry["series"], date(s_abs // 12, s_abs % 12 + 1, 1),
+                        task["horizon"], key,
+                    )
+                else:
+                    out["fast"] += 1
+                    values, lowers, uppers = fast["values"], fast["lower"], fast["upper"]
+                    method, mape = fast["method"], fast["mape"]
+                series_rows = _forecast_rows(
+                    prov, district, resource, metric, task["start_year"],
+                    entry["fc_abs0"], values, lowers, uppers, method, mape,
+                )
+        except Exception as e:  # noqa: BLE001
+            status, series_rows = "error", []
+            out["messages"].append(f"  X {key}: {e}")
+        out[{"ok": "ok", "skipped": "skipped", "error": "errors"}[status]] += 1
+        rows.extend(series_rows)
+        checkpoints.append({"series_key": key, "status": status, "rows": len(series_rows),
+                            "method": method, "seconds": round(time.monotonic() - t0, 3)})
+    out["rows"] = len(rows)
+    if task["dry_run"]:
+        return out
+
+    with SystemSessionLocal() as db:
+        if rows:
+            # Upsert (conflict = unique key → güncelle)
+            stmt = pg_insert(MlForecast.__table__).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                constraint="uq_ml_forecast_key",
+                set_={
+                    "value": stmt.excluded.value,
+                    "lower": stmt.excluded.lower,
+                    "upper": stmt.excluded.upper,
+                    "method": stmt.excluded.method,
+                    "mape": stmt.excluded.mape,
+                    "computed_at": date.today(),
+                },
+            )
+            db.execute(stmt)
+        stmt = pg_insert(MlForecastCheckpoint.__table__).values(
+            [{"run_key": task["run_key"], **c} for c in checkpoints])
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_ml_checkpoint_key",
+            set_={
+                "status": stmt.excluded.status,
+                "rows": stmt.excluded.rows,
+                "method": stmt.excluded.method,
+                "seconds": stmt.excluded.seconds,
+                "finished_at": func.now(),
+            },
+        )
+        db.execute(stmt)
+        db.commit()
+    return out
+
+
+def _apply_fast_tier(tasks: list, horizon: int, max_mape: float) -> int:
+    """Tüm serileri tek matriste HW + linear+seasonal ile tahminle; holdout
+    MAPE'si ``max_mape`` altındaki serileri kabul et (SARIMAX atlanır).
+    Döner: kabul edilen seri sayısı."""
+    import math
+    from app.services.ml_batch_service import FAST_METHOD_LABELS, select_best_fast_batch
+
+    entries = [e for t in tasks for e in t["entries"] if e["series"] is not None]
+    if not entries or max_mape <= 0:
+        return 0
+    batch = select_best_fast_batch([e["series"] for e in entries], horizon)
+    accepted = 0
+    for i, entry in enumerate(entries):
+        mape = float(batch.holdout_mape[i])
+        if batch.methods[i] is None or math.isnan(mape) or mape > max_mape:
+            continue
+        entry["fast"] = {
+            "values": batch.values[i].tolist(),
+            "lower": batch.lower[i].tolist(),
+            "upper": batch.upper[i].tolist(),
+            "method": FAST_METHOD_LABELS[batch.methods[i]],
+            "mape": mape,
+        }
+        accepted += 1
+    return accepted
+
+
+def _prepare_checkpoints(db, run_key: str, resume: bool) -> set:
+    """`--resume` → tamamlanmış (ok/skipped) seri anahtarları; aksi halde
+    bu koşunun eski checkpoint'leri silinir (baştan kurulum)."""
+    from app.db.database import SystemEngine
+    from app.db.models import MlForecastCheckpoint
+
+    MlForecastCheckpoint.__table__.create(bind=SystemEngine, checkfirst=True)
+    q = db.query(MlForecastCheckpoint).filter(MlForecastCheckpoint.run_key == run_key)
+    if not resume:
+        q.delete(synchronize_session=False)
+        db.commit()
+        return set()
+    return {
+        r.series_key for r in q.filter(MlForecastCheckpoint.status.in_(("ok", "skipped")))
+    }
+
+
+def main(years: int, only_province: bool, province_filter, dry_run: bool,
+         use_daily: bool = False, workers: int = 0, resume: bool = False,
+         fast_mape: float = FAST_TIER_MAX_MAPE, rebuild_cube: bool = False) -> None:
+    import time
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from app.db.database import SystemSessionLocal
+    from app.services.ml_batch_service import load_monthly_series_bank
+
+    workers = workers or os.cpu_count() or 1
+    run_key = _run_key(years, only_province, province_filter, use_daily)
     print("=" * 64)
     print("  ML Forecast Batch Precompute (M-A.4)")
     print(f"  horizon={years}y · only_province={only_province} · "
           f"province={province_filter or 'ALL'} · dry_run={dry_run} · "
           f"use_daily={use_daily}")
+    print(f"  workers={workers} · run_key={run_key} · resume={resume} · "
+          f"fast_mape={fast_mape}")
     print("=" * 64)
 
     start_year = date.today().year
     horizon = years * 12
-
-    written = 0
-    skipped = 0
-    loc_count = 0
-
     resource_metrics = DAILY_RESOURCE_METRICS if use_daily else RESOURCE_METRICS
 
     with SystemSessionLocal() as db:
@@ -140,113 +403,100 @@ def main(years: int, only_province: bool, province_filter, dry_run: bool,
         else:
             locations = _distinct_locations(db, only_province, province_filter)
             print(f"Toplam {len(locations)} (il/ilçe × kaynak) kombinasyonu.\n")
-
-        for prov, district, resource in locations:
-            if resource not in resource_metrics:
-                continue
-            scope = "province" if district is None else "district"
-            # 2026-06-02 (ML-1 fix): Kaynak tablolar il adını farklı kodlamada
-            # tutuyor (climatology=Türkçe, weather_data=ASCII). Seri ÇEKİMİ
-            # orijinal `prov` ile yapılır (kaynak satırı bulunsun), ama DB'ye
-            # YAZILAN ad daima Türkçe-canonical (GADM) olur → frontend choropleth
-            # eşleşir, tekrar kayıt oluşmaz. (Mor ilçe/il sorununun kökü buydu.)
-            prov_canon = to_canonical(prov)
-            for metric in resource_metrics[resource]:
-                if use_daily:
-                    # İl-scope'ta monthly_climate (20y, ~257 ay) tercih edilir;
-                    # ilçede daily aggregate. (get_monthly_series_best yönetir.)
-                    series, series_start = get_monthly_series_best(
-                        prov, district, metric,
-                    )
-                    if series and series_start:
-                        start_date = date(series_start.year, series_start.month, 1)
-                    else:
-                        start_date = date(start_year, 1, 1)
-                else:
-                    series = get_monthly_series(prov, district, resource, metric)
-                    start_date = date(start_year - 5, 1, 1)
-                if not series:
-                    skipped += 1
-                    continue
-
-                # 2026-06-02 (MEVSİM FIX): Forecaster seriyi BİTİŞ ayından SONRA
-                # tahminler (future_idx = son ay + 1). Seri Haziran'da biterse
-                # forecast[0] = Temmuz olur; eski kod forecast[0]'ı Ocak sanıp
-                # etiketliyordu → mevsim ~6 ay kayıp TERS dönüyordu (yaz=düşük!).
-                # Çözüm: seriyi en yakın ARALIK'ta bitir → forecast Ocak'ta başlar
-                # → ay etiketleri doğru + tam takvim yılları.
-                _s_abs = start_date.year * 12 + (start_date.month - 1)
-                _last_abs = _s_abs + len(series) - 1
-                _trim = (_last_abs % 12 + 1) % 12   # son ay Aralık değilse kırp
-                if _trim and (len(series) - _trim) >= 24:
-                    series = series[:-_trim]
-                    _last_abs -= _trim
-                _fc_abs0 = _last_abs + 1             # forecast ilk ayı (Ocak), mutlak ay indeksi
-
-                label = f"{prov}_{district or '-'}_{resource}_{metric}"
-                try:
-                    values, lowers, uppers, method, mape = \
-                        select_best_monthly_forecast(
-                            series, start_date, horizon, label,
-                        )
-                except Exception as e:
-                    print(f"  X {label}: {e}")
-                    skipped += 1
-                    continue
-
-                loc_count += 1
-                rows = []
-                for i, v in enumerate(values):
-                    # Doğru ay etiketi: forecast'ın GERÇEK başlangıç ayından say.
-                    _midx = _fc_abs0 + i
-                    d = date(_midx // 12, _midx % 12 + 1, 1)
-                    year_offset = d.year - start_year
-                    for scenario in SCENARIOS:
-                        factor = scenario_factor(scenario, metric, year_offset)
-                        rows.append({
-                            "scope": scope,
-                            "province_name": prov_canon,
-                            "district_name": district,
-                            "resource": resource,
-                            "metric": metric,
-                            "scenario": scenario,
-                            "year": d.year,
-                            "month": d.month,
-                            # 2026-06-02: metrikler negatif olamaz → [0,∞) kıstır
-                            "value": max(0.0, round(v * factor, 4)),
-                            "lower": max(0.0, round((lowers[i] or v) * factor, 4)),
-                            "upper": max(0.0, round((uppers[i] or v) * factor, 4)),
-                            "method": method,
-                            "mape": mape,
-                        })
-
-                if dry_run:
-                    written += len(rows)
-                    continue
-
-                # Upsert (conflict = unique key → güncelle)
-                stmt = pg_insert(MlForecast.__table__).values(rows)
-                stmt = stmt.on_conflict_do_update(
-                    constraint="uq_ml_forecast_key",
-                    set_={
-                        "value": stmt.excluded.value,
-                        "lower": stmt.excluded.lower,
-                        "upper": stmt.excluded.upper,
-                        "method": stmt.excluded.method,
-                        "mape": stmt.excluded.mape,
-                        "computed_at": date.today(),
-                    },
-                )
-                db.execute(stmt)
-                db.commit()
-                written += len(rows)
-
-            if loc_count and loc_count % 25 == 0:
-                print(f"  ... {loc_count} seri işlendi, {written} satır yazıldı")
+        done = set() if dry_run else _prepare_checkpoints(db, run_key, resume)
+
+    # Görevler lokasyon bazlı (il/ilçe × kaynak → metrikleri) — seri sorguları
+    # ve yazım lokasyon başına tek transaction
+    tasks = []
+    already = 0
+    for prov, district, resource in locations:
+        if resource not in resource_metrics:
+            continue
+        metrics = [m for m in resource_metrics[resource]
+                   if _series_key(prov, district, resource, m) not in done]
+        already += len(resource_metrics[resource]) - len(metrics)
+        if metrics:
+            tasks.append({
+                "prov": prov, "district": district, "resource": resource,
+                "metrics": metrics, "start_year": start_year, "horizon": horizon,
+                "use_daily": use_daily, "run_key": run_key, "dry_run": dry_run,
+            })
+    total_series = sum(len(t["metrics"]) for t in tasks)
+    if already:
+        print(f"Checkpoint: {already} seri önceki koşuda tamamlanmış, atlanıyor.")
+    print(f"{total_series} seri, {len(tasks)} görev.\n")
+
+    written = skipped = errors = loc_count = fast_count = 0
+    finished = 0
+    t0 = time.monotonic()
+
+    def _collect(out: dict) -> None:
+        nonlocal written, skipped, errors, loc_count, fast_count, finished
+        for msg in out["messages"]:
+            print(msg)
+        loc_count += out["ok"]
+        skipped += out["skipped"]
+        errors += out["errors"]
+        fast_count += out["fast"]
+        written += out["rows"]
+        prev = finished
+        finished += out["ok"] + out["skipped"] + out["errors"]
+        if finished // 25 > prev // 25 or finished == total_series:
+            elapsed = time.monotonic() - t0
+            rate = finished / elapsed if elapsed else 0.0
+            eta = (total_series - finished) / rate if rate else 0.0
+            print(f"  ... {finished}/{total_series} seri · {rate:.2f} seri/sn · "
+                  f"{written} satır · kalan ~{eta / 60:.1f} dk")
+
+    def _run(fn, items):
+        if workers == 1:
+            yield from map(fn, items)
+            return
+        for fut in as_completed([pool.submit(fn, item) for item in items]):
+            yield fut.result()
+
+    pool = None
+    if workers > 1:
+        # Her işçi tek BLAS thread'iyle (script başında) — çekirdek başına bir seri
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+    try:
+        # Tüm seriler tek geçişte (birkaç gruplu sorgu) → NumPy; işçilere
+        # seriler görevle gider, işçiler kaynak tablolara sorgu atmaz
+        bank = load_monthly_series_bank(
+            {m for t in tasks for m in t["metrics"]}, province_filter,
+            daily=use_daily, climatology=not use_daily,
+        )
+        tasks = [_load_location(bank, task) for task in tasks]
+        del bank
+        t_fast = time.monotonic()
+        accepted = _apply_fast_tier(tasks, horizon, fast_mape)
+        print(f"Seriler yüklendi ({t_fast - t0:.1f} sn). Hızlı katman: {accepted} seri "
+              f"kabul (holdout MAPE ≤ {fast_mape}), {time.monotonic() - t_fast:.2f} sn; "
+              f"kalanlar seri başına model seçimine.\n")
+        for out in _run(_process_location, tasks):
+            _collect(out)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.monotonic() - t0
+    # Hatasız biten her koşuda (0 satır yazan --resume dahil — önceki koşunun
+    # satırları küpe henüz girmemiş olabilir); hatalıysa yalnız yeni satır
+    # yazıldıysa ya da --rebuild-cube ile
+    if not dry_run and (written or not errors or rebuild_cube):
+        from app.services import data_versions
+        from app.services.ml_forecast_cube import rebuild_all
+        # /ml/choropleth küpleri (metrik × kaynak × senaryo × seviye) — tüm tablo
+        with SystemSessionLocal() as db:
+            n_cubes = rebuild_all(db)
+        print(f"Choropleth küpü: {n_cubes} küp yazıldı.")
+        data_versions.bump(data_versions.ML_FORECAST)
 
     print("\n" + "=" * 64)
     print(f"  BİTTİ — {loc_count} seri, {written} satır {'(dry-run)' if dry_run else 'yazıldı'}, "
-          f"{skipped} atlandı (veri yok)")
+          f"{skipped} atlandı (veri yok), {errors} hata, {fast_count} hızlı katman")
+    print(f"  {elapsed:.1f} sn · {finished / elapsed if elapsed else 0:.2f} seri/sn "
+          f"· {workers} işçi")
     print("=" * 64)
 
 
@@ -261,6 +511,16 @@ if __name__ == "__main__":
     p.add_argument("--use-daily", action="store_true",
                    help="weather_data günlük tablosundan ilçe daily aggregate "
                         "kullan (M-F: ilçe ML)")
+    p.add_argument("--workers", type=int, default=0,
+                   help="Paralel işçi süreç sayısı (0 = çekirdek sayısı, 1 = seri)")
+    p.add_argument("--resume", action="store_true",
+                   help="Aynı parametreli yarım koşuyu checkpoint'ten sürdür")
+    p.add_argument("--fast-mape", type=float, default=FAST_TIER_MAX_MAPE,
+                   help="Hızlı katman (toplu HW/linear) kabul eşiği — holdout "
+                        "MAPE; 0 = kapalı, her seri SARIMAX'lı seçimden geçer")
+    p.add_argument("--rebuild-cube", action="store_true",
+                   help="Hatalı seri olsa da choropleth küpünü yeniden kur ve "
+                        "ML forecast sürümünü artır")
     args = p.parse_args()
     main(
         years=max(1, min(10, args.years)),
@@ -268,4 +528,8 @@ if __name__ == "__main__":
         province_filter=args.province,
         dry_run=args.dry_run,
         use_daily=args.use_daily,
+        workers=max(0, args.workers),
+        resume=args.resume,
+        fast_mape=max(0.0, args.fast_mape),
+        rebuild_cube=args.rebuild_cube,
     )
@@ -0,0 +1,47 @@
+"""
+SRRP — mvt_features Kurulumu (zoom bandı başına sadeleştirilmiş geometri)
+=========================================================================
+
+``hydro_features`` / ``restricted_zones`` / ``energy_corridors`` tablolarından
+``mvt_features`` tablosunu yeniden kurar (bkz. ``app/services/mvt_generalize.py``)
+ve vektör veri versiyonunu artırır — tohumlanmış tile deposu bayat sayılır.
+
+Kullanım
+--------
+
+.. code-block:: bash
+
+    cd backend
+    python scripts/build_mvt_generalized.py                 # tüm katmanlar
+    python scripts/build_mvt_generalized.py --layer hydro   # tek katman
+    python scripts/seed_tiles.py                            # ardından depoyu yenile
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_BACKEND_ROOT))
+
+from app.db.database import _engine  # noqa: E402
+from app.services.mvt_generalize import LAYERS, build_generalized  # noqa: E402
+from app.services import data_versions  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="mvt_features kurulumu")
+    parser.add_argument("--layer", action="append", choices=sorted(LAYERS),
+                        help="Yalnızca bu katman(lar)")
+    args = parser.parse_args()
+
+    build_generalized(_engine, args.layer)
+    data_versions.bump(data_versions.VECTOR)
+
+
+if __name__ == "__main__":
+    main()
@@ -269,6 +269,10 @@ def main(only_province: bool, dry_run: bool) -> None:
                   f"ilçe {dist_count} gerçek + {fill_count} fallback "
                   f"({miss_count} eşleşmedi), {len(rows)} satır")
 
+    if not dry_run and written:
+        from app.services import data_versions
+        data_versions.bump(data_versions.THEMATIC)
+
     print("\n" + "=" * 64)
     print(f"  BİTTİ — {written} satır {'(dry-run)' if dry_run else 'yazıldı'}")
     print("=" * 64)
@@ -149,6 +149,10 @@ def main(years: int, dry_run: bool) -> None:
             print(f"  [{scope:8s}] {period_type:5s} → {locs} lokasyon × "
                   f"{periods} dönem = {len(rows)} satır")
 
+    if not dry_run and written:
+        from app.services import data_versions
+        data_versions.bump(data_versions.THEMATIC)
+
     print("\n" + "=" * 64)
     print(f"  BİTTİ — {written} satır {'(dry-run)' if dry_run else 'yazıldı'}")
     print("=" * 64)
@@ -0,0 +1,68 @@
+r"""Saatlik veri rollup'ları — ilk doldurma / tam yeniden kurulum.
+
+`hourly_weather_rollup` tablosunu (il × ilçe × metrik, günlük + aylık)
+`hourly_weather_data`'dan ay ay kurar. Sonrasında scheduler her saatlik
+çekimden sonra yalnızca yeni saatleri günceller.
+
+**Kullanım:**
+
+    cd backend
+    ..\.venv\Scripts\python.exe scripts\build_weather_rollups.py
+    ..\.venv\Scripts\python.exe scripts\build_weather_rollups.py --days 400
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")  # type: ignore[attr-defined]
+except Exception:
+    pass
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+
+def main(days: int | None) -> None:
+    from sqlalchemy import func
+    from app.db.database import SystemSessionLocal, SystemEngine, SystemBase
+    from app.db.models import HourlyWeatherData, HourlyWeatherRollup
+    from app.services.weather_rollup_service import rebuild
+
+    SystemBase.metadata.create_all(bind=SystemEngine, tables=[HourlyWeatherRollup.__table__])
+
+    print("=" * 64)
+    print("  Saatlik Rollup (günlük + aylık) — yeniden kurulum")
+    print("=" * 64)
+
+    t0 = time.monotonic()
+    with SystemSessionLocal() as db:
+        first, last = db.query(
+            func.min(HourlyWeatherData.timestamp),
+            func.max(HourlyWeatherData.timestamp),
+        ).one()
+        if first is None:
+            print("hourly_weather_data boş — yapılacak iş yok.")
+            return
+        start = first.date()
+        end = min(last.date(), date.today())
+        if days:
+            start = max(start, end - timedelta(days=days))
+        print(f"Aralık: {start} → {end}\n")
+        totals = rebuild(db, start, end)
+
+    print("\n" + "=" * 64)
+    print(f"  BİTTİ — {totals['daily']} günlük, {totals['monthly']} aylık satır "
+          f"({time.monotonic() - t0:.1f}s)")
+    print("=" * 64)
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser()
+    p.add_argument("--days", type=int, default=None,
+                   help="Sadece son N günü kur (varsayılan: tüm geçmiş)")
+    args = p.parse_args()
+    main(days=args.days)
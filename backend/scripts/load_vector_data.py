@@ -253,9 +253,19 @@ if __name__ == '__main__':
         load_natural_features()
         load_landuse_features()
 
+        # Tile geometrisini yeniden genelleştir; tohumlanmış tile deposu artık
+        # bayat — `/tiles` canlı PostGIS'e döner
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+        from app.services.mvt_generalize import build_generalized
+        from app.services import data_versions
+        print("\n🧩 mvt_features (zoom bandı geometrisi) kuruluyor...")
+        build_generalized(engine)
+        data_versions.bump(data_versions.VECTOR)
+
         print("\n" + "=" * 60)
         print("✅ Tüm veriler başarıyla yüklendi!")
         print("   Haritada tile katmanları artık veri gösterecek.")
+        print("   Tile deposunu yenilemek için: python scripts/seed_tiles.py")
         print("=" * 60)
 
     except Exception as e:
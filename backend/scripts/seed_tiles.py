@@ -0,0 +1,123 @@
+"""
+SRRP — Vektör MVT Tile Piramidi Seeder
+======================================
+
+`/api/v1/tiles/{z}/{x}/{y}.pbf` için hydro / restricted / energy katmanlarını
+Türkiye bbox'ı üzerinde önceden üretip ``data/tiles/vector.mbtiles``'a yazar
+(bkz. ``app/services/tile_store.py``). Endpoint tohumlanmış aralıktaki
+tile'ları doğrudan dosyadan sunar; aralık dışı zoom'lar canlı PostGIS'ten
+üretilmeye devam eder.
+
+Tile'lar sütun (z, x) başına bir iş olarak süreç havuzunda üretilir; her
+worker kendi DB bağlantı havuzunu açar. Yazım tek süreçte (ana süreç) ve
+geçici dosyada yapılır, bitince atomik olarak yerine konur — yarım kalan
+seed servis edilen depoyu bozmaz.
+
+Depo, yazıldığı andaki veri versiyonuyla etiketlenir. Vektör yükleyiciler
+versiyonu artırınca depo bayat sayılır → seeder yeniden çalıştırılmalı.
+
+Kullanım
+--------
+
+.. code-block:: bash
+
+    cd backend
+    python scripts/seed_tiles.py                    # z6–z12, tüm çekirdekler
+    python scripts/seed_tiles.py --maxzoom 10 --workers 4
+    python scripts/seed_tiles.py --bump             # versiyonu artırıp seed'le
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import List, Tuple
+
+_BACKEND_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(_BACKEND_ROOT))
+
+from app.services import data_versions, tile_store  # noqa: E402
+
+logging.basicConfig(level=logging.INFO, format="[%(asctime)s] %(message)s")
+logger = logging.getLogger(__name__)
+
+
+def _init_worker() -> None:
+    """Fork sonrası ebeveynin bağlantılarını paylaşma — worker'a yeni havuz."""
+    from app.db.database import _engine
+
+    _engine.dispose(close=False)
+
+
+def _render_column(z: int, x: int, y0: int, y1: int) -> List[Tuple[int, int, int, bytes]]:
+    from app.routers.tiles import _fetch_combined_tile
+
+    out = []
+    for y in range(y0, y1 + 1):
+        tile = _fetch_combined_tile(z, x, y, raise_errors=True)
+        if tile:
+            out.append((z, x, y, tile))
+    return out
+
+
+def seed(minzoom: int, maxzoom: int, workers: int,
+         bbox: Tuple[float, float, float, float] = tile_store.TR_BBOX) -> int:
+    version = tile_store.current_version()
+    jobs = []
+    for z in range(minzoom, maxzoom + 1):
+        x0, y0, x1, y1 = tile_store.tile_range(bbox, z)
+        jobs.extend((z, x, y0, y1) for x in range(x0, x1 + 1))
+    total = sum(y1 - y0 + 1 for _, _, y0, y1 in jobs)
+    logger.info("[seed] v%d z%d–z%d: %d tile, %d sütun, %d worker",
+                version, minzoom, maxzoom, total, len(jobs), workers)
+
+    writer = tile_store.TileWriter(version, minzoom, maxzoom, bbox)
+    t0 = time.monotonic()
+    done = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            futures = {pool.submit(_render_column, *job): job for job in jobs}
+            for fut in as_completed(futures):
+                z, x, y0, y1 = futures[fut]
+                writer.write(fut.result())
+                done += y1 - y0 + 1
+                if done % 2000 < (y1 - y0 + 1):
+                    rate = done / max(time.monotonic() - t0, 1e-6)
+                    logger.info("[seed] %d/%d tile (%.0f tile/sn)", done, total, rate)
+    except BaseException:
+        writer.abort()
+        raise
+
+    data_versions.invalidate()     # süreç içi sürüm önbelleğini atla
+    if tile_store.current_version() != version:
+        # Seed sürerken veri yeniden yüklendi → bu depo zaten bayat
+        writer.abort()
+        logger.warning("[seed] veri versiyonu seed sırasında değişti — depo yazılmadı")
+        return 0
+    writer.commit()
+    logger.info("[seed] tamam: %d dolu tile / %d (%.1f sn) → %s",
+                writer.written, total, time.monotonic() - t0, tile_store.MBTILES_PATH)
+    return writer.written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Vektör MVT tile piramidi seeder")
+    parser.add_argument("--minzoom", type=int, default=tile_store.SEED_MINZOOM)
+    parser.add_argument("--maxzoom", type=int, default=tile_store.SEED_MAXZOOM)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4,
+                        help="Süreç sayısı (her süreç 1 PostgreSQL bağlantısı açar)")
+    parser.add_argument("--bump", action="store_true",
+                        help="Seed öncesi veri versiyonunu artır")
+    args = parser.parse_args()
+
+    if args.bump:
+        data_versions.bump(data_versions.VECTOR)
+    seed(args.minzoom, args.maxzoom, max(1, args.workers))
+
+
+if __name__ == "__main__":
+    main()
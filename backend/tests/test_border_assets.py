@@ -0,0 +1,109 @@
+import gzip
+import hashlib
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from shapely.geometry import Polygon, box, shape
+from shapely.ops import unary_union
+
+from app.routers import borders
+from app.services.topology import build_topology
+
+
+def _grid():
+    """3×3 kare il + ortadaki ilin içinde bir anklav (delik + ada)."""
+    cells = []
+    for i in range(3):
+        for j in range(3):
+            cells.append(box(30 + i, 38 + j, 31 + i, 39 + j))
+    enclave = box(31.4, 39.4, 31.6, 39.6)
+    cells[4] = Polygon(cells[4].exterior.coords, [enclave.exterior.coords])
+    return cells + [enclave]
+
+
+def test_shared_arcs_roundtrip_and_subset():
+    geoms = _grid()
+    topo = build_topology(geoms, [{"i": k} for k in range(len(geoms))])
+    # Ortak sınırlar tek kopya: 10 poligonun halkaları ayrı ayrı yazılsaydı 10+ yay
+    ring_refs = sum(len(ring) for f in topo.features for poly in f for ring in poly)
+    assert ring_refs > len(topo.arcs)
+
+    fc = topo.to_geojson()
+    for geom, feat in zip(geoms, fc["features"]):
+        assert shape(feat["geometry"]).symmetric_difference(geom).area < 1e-9
+
+    tj = topo.to_topojson("cells")
+    assert len(tj["objects"]["cells"]["geometries"]) == len(geoms)
+
+    sub = topo.subset([4, 9])
+    assert [p["i"] for p in sub.properties] == [4, 9]
+    assert len(sub.arcs) < len(topo.arcs)
+    union = unary_union([shape(f["geometry"]) for f in sub.to_geojson()["features"]])
+    assert union.symmetric_difference(geoms[4].union(geoms[9])).area < 1e-9
+
+
+def test_simplified_neighbours_share_boundary():
+    # Ortak sınırı zikzaklı iki poligon — ayrı sadeleştirilseler boşluk kalırdı
+    zig = [(31.0, 38.0 + k / 50) for k in range(51)]
+    zig = [(x + (0.003 if k % 2 else 0.0), y) for k, (x, y) in enumerate(zig)]
+    left = Polygon([(30.0, 38.0)] + zig + [(30.0, 39.0)])
+    right = Polygon(zig + [(32.0, 39.0), (32.0, 38.0)])
+    topo = build_topology([left, right], [{}, {}])
+    a, b = (shape(f["geometry"]) for f in topo.to_geojson(0.01)["features"])
+    assert a.intersection(b).area < 1e-9
+    assert abs(a.union(b).area - (a.area + b.area)) < 1e-9
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    topo = build_topology(_grid()[:2], [{"NAME_1": "Ankara"}, {"NAME_1": "İzmir"}])
+    manifest = {}
+    for name, t in (("provinces", topo), ("districts.province-ankara", topo.subset([0])),
+                    ("districts.empty", topo.subset([]))):
+        for fmt, payload in (("geojson", t.to_geojson()), ("topojson", t.to_topojson("x"))):
+            filename = f"{name}.medium.{fmt}"
+            raw = json.dumps(payload).encode()
+            (tmp_path / filename).write_bytes(raw)
+            (tmp_path / f"{filename}.gz").write_bytes(gzip.compress(raw, mtime=0))
+            manifest[filename] = {"sha": hashlib.sha256(raw).hexdigest()[:20],
+                                  "size": len(raw), "encodings": ["gzip"]}
+    (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+    monkeypatch.setattr(borders, "_ASSET_DIR", tmp_path)
+    monkeypatch.setattr(borders, "_cache", {})
+    app = FastAPI()
+    app.include_router(borders.router)
+    return TestClient(app)
+
+
+def test_prebuilt_assets_negotiation_and_etag(client):
+    plain = client.get("/geo/borders/provinces", headers={"Accept-Encoding": "identity"})
+    assert plain.status_code == 200
+    assert "Content-Encoding" not in plain.headers
+    assert len(plain.json()["features"]) == 2
+
+    gz = client.get("/geo/borders/provinces", headers={"Accept-Encoding": "gzip"})
+    assert gz.headers["Content-Encoding"] == "gzip"
+    assert gz.json() == plain.json()
+    assert gz.headers["ETag"] != plain.headers["ETag"]
+
+    cached = client.get("/geo/borders/provinces",
+                        headers={"Accept-Encoding": "gzip", "If-None-Match": gz.headers["ETag"]})
+    assert cached.status_code == 304
+
+    topo = client.get("/geo/borders/provinces?format=topojson")
+    assert topo.headers["content-type"].startswith("application/topo+json")
+    assert topo.json()["type"] == "Topology"
+    via_accept = client.get("/geo/borders/provinces",
+                            headers={"Accept": "application/topo+json"})
+    assert via_accept.json()["type"] == "Topology"
+
+
+def test_district_subsets_from_assets(client):
+    ankara = client.get("/geo/borders/districts?province=ANKARA").json()
+    assert [f["properties"]["NAME_1"] for f in ankara["features"]] == ["Ankara"]
+    unknown = client.get("/geo/borders/districts?province=Yok").json()
+    assert unknown["features"] == []
+    # Bölge varlığı üretilmemiş + TopoJSON canlı yolda yok → 404
+    assert client.get("/geo/borders/regions?format=topojson").status_code == 404
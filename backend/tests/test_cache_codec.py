@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from app.services import cache_codec, redis_cache
+from app.services.mem_cache import SizedLRU
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def eval(self, script, numkeys, key, token):
+        return int(self.data.pop(key, None) is not None)
+
+
+def test_roundtrip_compression_and_meta():
+    small = {"a": 1, "İl|İlçe": [1.5, None]}
+    blob = cache_codec.encode(small)
+    assert blob[0] & cache_codec.FRAMED and blob[0] & 0x07 == cache_codec.COMP_NONE
+    assert cache_codec.decode(blob) == (small, None)
+
+    big = {"frames": [{"ts": f"2024-01-{d:02d}", "vals": {"x": d}} for d in range(1, 29)] * 50}
+    blob = cache_codec.encode(big, fresh_until=1234.5)
+    assert blob[0] & 0x07 != cache_codec.COMP_NONE            # eşik üstü → sıkıştırıldı
+    assert len(blob) < len(json.dumps(big)) / 5
+    assert cache_codec.decode(blob) == (big, 1234.5)
+
+
+def test_legacy_plain_json_entries_still_readable():
+    legacy = json.dumps({"v": [1, 2]}).encode()
+    assert not cache_codec.is_framed(legacy)
+    assert cache_codec.decode(legacy) == ({"v": [1, 2]}, None)
+    assert cache_codec.decode_json_bytes(legacy) == (legacy, None)
+
+
+def test_dumps_json_writes_datetimes_like_stdlib_default_str():
+    from datetime import date, datetime, time
+
+    value = {"ts": datetime(2026, 10, 17, 12, 30), "d": date(2026, 10, 17), "t": time(6, 0)}
+    stdlib = json.dumps(value, default=str, ensure_ascii=False, separators=(",", ":"))
+    assert cache_codec.dumps_json(value) == stdlib.encode("utf-8")
+    assert cache_codec.dumps_json(value).startswith(b'{"ts":"2026-10-17 12:30:00"')
+
+
+def test_raw_json_passthrough_skips_decode(monkeypatch):
+    blob = cache_codec.encode({"x": [1, 2, 3]} | {"pad": "y" * 40000}, fresh_until=9.0)
+    monkeypatch.setattr(cache_codec, "loads_json", lambda data: pytest.fail("çözülmemeli"))
+    raw, fresh = cache_codec.decode_json_bytes(blob)
+    assert fresh == 9.0 and raw.startswith(b'{"x":[1,2,3]')
+
+
+@pytest.fixture
+def redis_fake(monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_cache, "REDIS_AVAILABLE", True)
+    monkeypatch.setattr(redis_cache, "redis_client", fake)
+    monkeypatch.setattr(redis_cache, "redis_binary_client", fake)
+    monkeypatch.setattr(redis_cache, "_mem_store", SizedLRU(1 << 20))
+    return fake
+
+
+def test_cache_set_get_and_get_or_compute_raw(redis_fake):
+    redis_cache.cache_set("k", {"a": [1, 2]}, 60)
+    assert cache_codec.is_framed(redis_fake.data["k"])
+    assert redis_cache.cache_get("k") == {"a": [1, 2]}
+    assert json.loads(redis_cache.cache_get_raw("k")) == {"a": [1, 2]}
+
+    redis_fake.data["old"] = json.dumps({"legacy": True}).encode()   # eski düz JSON kayıt
+    assert redis_cache.cache_get("old") == {"legacy": True}
+
+    raw = redis_cache.get_or_compute("c", lambda: {"İl": 1.5}, ttl_seconds=60, raw=True)
+    assert json.loads(raw) == {"İl": 1.5}
+    # Sonraki istek: Redis'teki JSON çözülmeden aynen döner; normal okuma da çalışır
+    assert redis_cache.get_or_compute("c", lambda: pytest.fail("hesap"), raw=True) == raw
+    assert redis_cache.get_or_compute("c", lambda: pytest.fail("hesap")) == {"İl": 1.5}
+    assert redis_cache.cache_get("c") == {"İl": 1.5}
@@ -0,0 +1,123 @@
+import threading
+import time
+
+import pytest
+
+from app.services import cache_codec, redis_cache
+from app.services.mem_cache import SizedLRU
+
+
+class FakeRedis:
+    """get/setex/set(nx)/exists/eval — kira testleri için yeterli alt küme."""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+            return 1
+        return 0
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(redis_cache, "REDIS_AVAILABLE", False)
+    monkeypatch.setattr(redis_cache, "_mem_store", SizedLRU(1 << 20))
+    return redis_cache
+
+
+def test_concurrent_misses_compute_once(cache):
+    calls = []
+    gate = threading.Event()
+
+    def slow():
+        calls.append(1)
+        gate.wait(1)
+        return {"v": 1}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute("k", slow, 60)))
+               for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    gate.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert results == [{"v": 1}] * 8
+    assert not cache._inflight
+
+
+def test_stale_served_while_one_refreshes(cache, monkeypatch):
+    cache.get_or_compute("k", lambda: 1, ttl_seconds=10)
+    now = time.time()
+    monkeypatch.setattr(redis_cache.time, "time", lambda: now + 15)   # taze süre doldu
+
+    refreshing = threading.Event()
+    release = threading.Event()
+
+    def refresh():
+        refreshing.set()
+        release.wait(1)
+        return 2
+
+    worker = threading.Thread(target=lambda: cache.get_or_compute("k", refresh, ttl_seconds=10))
+    worker.start()
+    refreshing.wait(1)
+    # Yenileme sürerken diğer istekler beklemeden bayat değeri alır
+    assert cache.get_or_compute("k", lambda: pytest.fail("ikinci hesap"), ttl_seconds=10) == 1
+    release.set()
+    worker.join()
+    assert cache.get_or_compute("k", lambda: 3, ttl_seconds=10) == 2
+
+
+def test_failed_refresh_keeps_stale_and_miss_raises(cache, monkeypatch):
+    cache.get_or_compute("k", lambda: "old", ttl_seconds=10)
+    now = time.time()
+    monkeypatch.setattr(redis_cache.time, "time", lambda: now + 15)
+
+    def boom():
+        raise RuntimeError("db down")
+
+    assert cache.get_or_compute("k", boom, ttl_seconds=10) == "old"
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("other", boom, ttl_seconds=10)
+
+
+def test_ttl_from_value_and_legacy_entries(cache):
+    cache.get_or_compute("empty", lambda: {}, ttl_seconds=lambda v: 900 if v else 60)
+    assert cache._mem_store.ttl("empty") <= 120          # 60 sn taze + 60 sn bayat
+    cache.cache_set("legacy", [1, 2], 60)               # zarfsız eski kayıt → taze
+    assert cache.get_or_compute("legacy", lambda: pytest.fail("hesaplanmamalı")) == [1, 2]
+
+
+def test_waits_for_lease_held_by_other_process(cache, monkeypatch):
+    fake = FakeRedis()
+    monkeypatch.setattr(redis_cache, "REDIS_AVAILABLE", True)
+    monkeypatch.setattr(redis_cache, "redis_client", fake)
+    monkeypatch.setattr(redis_cache, "redis_binary_client", fake)
+    fake.set("lease:k", "other-worker", nx=True)
+
+    def other_process_finishes():
+        time.sleep(0.1)
+        fake.setex("k", 120, cache_codec.encode("theirs", fresh_until=time.time() + 60))
+
+    threading.Thread(target=other_process_finishes).start()
+    assert cache.get_or_compute("k", lambda: pytest.fail("kira başkasında"), lease_seconds=5) == "theirs"
@@ -0,0 +1,60 @@
+import pytest
+
+from app.services import data_versions
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    state = {"rows": {}, "loads": 0, "fail": False}
+
+    def fake_load():
+        state["loads"] += 1
+        if state["fail"]:
+            raise RuntimeError("db down")
+        return dict(state["rows"])
+
+    monkeypatch.setattr(data_versions, "_load", fake_load)
+    monkeypatch.setattr(data_versions, "_snapshot", {})
+    data_versions.invalidate()
+    yield state
+    data_versions.invalidate()
+
+
+def test_key_embeds_versions_and_changes_on_bump(registry):
+    registry["rows"] = {data_versions.HOURLY: 4}
+    key = data_versions.versioned_key("weather:x", data_versions.HOURLY, data_versions.DAILY)
+    assert key == "weather:x:dv4.0"
+
+    registry["rows"] = {data_versions.HOURLY: 5}
+    # Kısa süreli süreç içi cache: yeni sürüm hemen görülmez, DB'ye tekrar gidilmez
+    assert data_versions.versioned_key("weather:x", data_versions.HOURLY) == "weather:x:dv4"
+    assert registry["loads"] == 1
+
+    data_versions.invalidate()            # bump() aynı süreçte bunu yapar
+    assert data_versions.versioned_key("weather:x", data_versions.HOURLY) == "weather:x:dv5"
+
+
+def test_unreadable_registry_keeps_last_snapshot(registry, monkeypatch):
+    registry["rows"] = {data_versions.THEMATIC: 2}
+    assert data_versions.get_version(data_versions.THEMATIC) == 2
+    registry["fail"] = True
+    data_versions.invalidate()
+    assert data_versions.get_version(data_versions.THEMATIC) == 2
+    assert data_versions.get_version(data_versions.THEMATIC) == 2
+    assert registry["loads"] == 2         # hata sonrası da TTL boyunca tekrar denenmez
+
+
+def test_publish_hourly_update_bumps_after_derived_stores(monkeypatch):
+    from datetime import datetime
+
+    from app.services import scheduler
+
+    calls = []
+    for name in ("_patch_packed_store", "_refresh_rollups"):
+        monkeypatch.setattr(scheduler, name, lambda since, name=name: calls.append(name))
+    monkeypatch.setattr(scheduler, "_refresh_station_index", lambda: calls.append("index"))
+    monkeypatch.setattr(data_versions, "bump", lambda name: calls.append(("bump", name)))
+
+    scheduler.publish_hourly_update(datetime(2026, 10, 17, 5))
+    assert calls == ["_patch_packed_store", "_refresh_rollups", "index",
+                     ("bump", data_versions.HOURLY)]
@@ -0,0 +1,49 @@
+import numpy as np
+
+from app.services import frame_codec as fc
+
+
+def _grid():
+    g = fc.FrameGrid()
+    g.set("2025-01-02", "Ankara|Çankaya", 5.0)
+    g.set("2025-01-01", "Ankara|Çankaya", 4.0)
+    g.set("2025-01-01", "İzmir|Konak", 7.25)
+    g.set("2025-01-01", "Ankara|Çankaya", 4.5)  # son yazım kazanır
+    return g.finalize()
+
+
+def test_grid_last_write_wins_and_sorted():
+    g = _grid()
+    assert g.ts == ["2025-01-01", "2025-01-02"]
+    frames = g.to_json_frames()
+    assert frames[0]["vals"] == {"Ankara|Çankaya": 4.5, "İzmir|Konak": 7.25}
+    assert frames[1]["vals"] == {"Ankara|Çankaya": 5.0}
+
+    back = fc.FrameGrid.from_cacheable(g.to_cacheable())
+    assert back.to_json_frames() == frames
+
+
+def test_fill_missing_fills_only_empty_cells():
+    g = _grid()
+    filled = g.fill_missing("2025-01-02", ["İzmir|Konak", "İzmir|Bornova", "Ankara|Çankaya"], 6.0)
+    assert filled == 2
+    assert g.to_json_frames()[1]["vals"] == {
+        "Ankara|Çankaya": 5.0, "İzmir|Konak": 6.0, "İzmir|Bornova": 6.0}
+
+
+def test_binary_roundtrip_with_delta_and_missing():
+    g = _grid()
+    for opts in ({"delta": True, "compress": "zlib"}, {"delta": False, "compress": "none"}):
+        header, values = fc.decode_frames(fc.encode_frames(g, {"metric": "wind"}, **opts))
+        assert header["keys"] == g.keys and header["metric"] == "wind"
+        np.testing.assert_array_equal(np.isnan(values), np.isnan(g.values))
+        ok = ~np.isnan(values)
+        assert np.abs(values[ok] - g.values[ok]).max() <= header["quant"]["scale"] / 2 + 1e-12
+
+
+def test_negotiate():
+    assert fc.negotiate(None) is None
+    assert fc.negotiate("application/json") is None
+    assert fc.negotiate("application/vnd.srrp.frames") == {"delta": True, "compress": "zlib"}
+    opts = fc.negotiate("application/json, application/vnd.srrp.frames; delta=0; compress=none")
+    assert opts == {"delta": False, "compress": "none"}
@@ -0,0 +1,66 @@
+"""Toplu suitability: tablo-başı sorgu sonuçları tekil yolla aynı yanıtı vermeli."""
+from app.services import geo_service, reverse_geocoder
+from app.services.geo_service import GeoService
+
+# (lat, lon) → tablo olguları
+POINTS = {
+    (39.0, 32.0): {"water": None, "zone": None, "pop": None, "bld": 2, "cor": 350.0, "river": 800.0},
+    (38.0, 30.0): {"water": "reservoir", "zone": None, "pop": None, "bld": 0, "cor": 12000.0, "river": 10.0},
+    (40.0, 35.0): {"water": None, "zone": "Milli Park", "pop": "residential", "bld": 40, "cor": None, "river": None},
+    (37.5, 41.0): {"water": "riverbank", "zone": None, "pop": None, "bld": 7, "cor": 4000.0, "river": 0.0},
+    (36.9, 33.3): {"water": None, "zone": None, "pop": None, "bld": None, "cor": 900.0, "river": 3000.0},
+}
+OUTSIDE = (50.0, 10.0)
+
+
+def _patch(monkeypatch):
+    def loc(lat, lon):
+        if (lat, lon) == OUTSIDE:
+            return {"province": "", "district": ""}
+        return {"province": "İl", "district": f"{lat}"}
+
+    monkeypatch.setattr(reverse_geocoder, "locate", loc)
+    monkeypatch.setattr(reverse_geocoder, "locate_many", lambda la, lo: [loc(a, b) for a, b in zip(la, lo)])
+    monkeypatch.setattr(GeoService, "_get_terrain_batch",
+                        lambda self, la, lo: [(100.0 + a, 7.5 if a > 38 else 1.0) for a in la])
+
+    f = lambda lat, lon: POINTS[(lat, lon)]  # noqa: E731
+    monkeypatch.setattr(GeoService, "_water_type_at", staticmethod(lambda lat, lon: f(lat, lon)["water"]))
+    monkeypatch.setattr(GeoService, "_zone_at_point", staticmethod(lambda lat, lon, t: f(lat, lon)["zone"]))
+    monkeypatch.setattr(GeoService, "_populated_type_at", staticmethod(lambda lat, lon: f(lat, lon)["pop"]))
+    monkeypatch.setattr(GeoService, "_building_count_within",
+                        staticmethod(lambda lat, lon, radius_m=100: f(lat, lon)["bld"]))
+    monkeypatch.setattr(GeoService, "_nearest_distance_m", staticmethod(lambda lat, lon, t: f(lat, lon)["cor"]))
+    monkeypatch.setattr(GeoService, "_nearest_distance_m_filtered",
+                        staticmethod(lambda lat, lon, t, ft: f(lat, lon)["river"]))
+
+    columns = {
+        "hydro_features": lambda v: (v["water"], v["river"]),
+        "restricted_zones": lambda v: (v["zone"],),
+        "energy_corridors": lambda v: (v["cor"],),
+        "populated_areas": lambda v: (v["pop"],),
+        "buildings_footprint": lambda v: (v["bld"],),
+    }
+
+    def batch_lateral(self, lats, lons, sql, label, params=None, quiet=False):
+        assert "unnest" in self._BATCH_POINTS_CTE and "LATERAL" in sql
+        return [columns[label](f(a, b)) for a, b in zip(lats, lons)]
+
+    monkeypatch.setattr(GeoService, "_batch_lateral", batch_lateral)
+
+
+def test_batch_matches_single_point_analysis(monkeypatch):
+    _patch(monkeypatch)
+    geo = GeoService()
+    pts = list(POINTS) + [OUTSIDE]
+    single = [geo.analyze_location(lat, lon) for lat, lon in pts]
+    assert geo.analyze_locations(pts) == single
+    assert single[-1]["suitable"] is False
+    assert geo.analyze_locations([]) == []
+
+
+def test_failed_table_degrades_to_missing_facts(monkeypatch):
+    monkeypatch.setattr(geo_service, "_engine", None)  # connect() → AttributeError
+    geo = GeoService()
+    out = GeoService._batch_lateral(geo, [39.0, 38.0], [32.0, 30.0], "SELECT 1", "energy_corridors")
+    assert out == [None, None]
@@ -0,0 +1,37 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.services import hourly_weather_store as store
+
+
+def test_hours_in_month():
+    assert store.hours_in_month(datetime(2024, 2, 1)) == 29 * 24  # artık yıl
+    assert store.hours_in_month(datetime(2025, 12, 1)) == 31 * 24
+
+
+def test_matrix_roundtrip_keeps_nan():
+    """Codec kayıpsız olmalı — NaN (kayıt yok) saatler dahil."""
+    n_hours = store.hours_in_month(datetime(2025, 3, 1))
+    mat = np.random.default_rng(0).normal(10, 3, (len(store.PACKED_COLUMNS), n_hours)).astype(np.float32)
+    mat[:, 100:110] = np.nan
+
+    blob = store.encode_matrix(mat)
+    back = store.decode_matrix(blob, n_hours)
+
+    assert back.shape == mat.shape
+    np.testing.assert_array_equal(np.isnan(back), np.isnan(mat))
+    np.testing.assert_array_equal(back[~np.isnan(back)], mat[~np.isnan(mat)])
+
+
+def test_packed_blob_smaller_than_float8_rows():
+    """Düzgün saatlik seri float8 ham boyutun çok altına sıkışmalı."""
+    n_hours = 744
+    t = np.arange(n_hours)
+    mat = np.vstack([
+        np.round(15 + 8 * np.sin(2 * np.pi * t / 24) + i, 1)
+        for i in range(len(store.PACKED_COLUMNS))
+    ]).astype(np.float32)
+
+    blob = store.encode_matrix(mat)
+    assert len(blob) < mat.size * 8 / 4
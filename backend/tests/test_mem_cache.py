@@ -0,0 +1,84 @@
+import threading
+
+from app.services import mem_cache
+from app.services.mem_cache import SizedLRU
+
+
+def test_byte_budget_evicts_least_recently_used():
+    c = SizedLRU(max_bytes=30, sizeof=len)
+    c.set("a", b"x" * 10)
+    c.set("b", b"x" * 10)
+    c.set("c", b"x" * 10)
+    assert c.get("a") == b"x" * 10        # a en son kullanılan olur
+    c.set("d", b"x" * 10)                 # bütçe aşıldı → b atılır (ekleme sırası değil)
+    assert c.get("b") is None
+    assert c.get("a") is not None and c.get("d") is not None
+    s = c.stats()
+    assert s["bytes"] == 30 and s["entries"] == 3 and s["evictions"] == 1
+
+    assert c.set("huge", b"x" * 31) is False          # bütçeden büyük → saklanmaz
+    assert c.stats()["rejected"] == 1 and "huge" not in c
+
+
+def test_overwrite_and_prefix_delete_keep_accounting():
+    c = SizedLRU(max_bytes=1000)
+    c.set("weather:a", {"v": list(range(10))})
+    c.set("weather:a", "short")
+    assert c.stats()["bytes"] == len("short")
+    c.set("weather:b", "x")
+    c.set("ml:a", "y")
+    assert c.delete_prefix("weather:") == 2
+    assert c.stats()["bytes"] == 1 and len(c) == 1
+
+
+def test_periodic_sweep_drops_unread_expired(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(mem_cache.time, "monotonic", lambda: now[0])
+    c = SizedLRU(max_bytes=1000, sweep_interval=60, sizeof=len)
+    for i in range(5):
+        c.set(f"k{i}", "v", ttl=10)
+    now[0] += 61
+    c.set("fresh", "v", ttl=10)           # yazma süpürmeyi tetikler — okunmayanlar da gider
+    assert len(c) == 1
+    s = c.stats()
+    assert s["expirations"] == 5 and s["bytes"] == 1
+    assert c.get("k0") is None and s["hits"] == 0
+
+
+def test_thread_safety_under_load():
+    c = SizedLRU(max_bytes=5000, sizeof=len)
+
+    def worker(n):
+        for i in range(2000):
+            c.set(f"{n}:{i % 300}", b"x" * (i % 50))
+            c.get(f"{n}:{(i * 7) % 300}")
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    s = c.stats()
+    assert s["bytes"] <= 5000
+    assert s["bytes"] == sum(e[2] for e in c._data.values())
+
+
+def test_approx_size_samples_containers_without_serializing(monkeypatch):
+    import json
+    import sys
+
+    import numpy as np
+
+    monkeypatch.setattr(json, "dumps", lambda *a, **k: (_ for _ in ()).throw(AssertionError))
+    rows = ["x" * 40] * 1000
+    assert mem_cache.approx_size(rows) == sys.getsizeof(rows) + 40 * 1000
+    d = {f"k{i:03d}": b"y" * 10 for i in range(500)}
+    assert mem_cache.approx_size(d) == sys.getsizeof(d) + (4 + 10) * 500
+    assert mem_cache.approx_size(np.zeros((3, 100), np.float32)) == 1200
+
+
+def test_approx_size_counts_non_ascii_str_by_utf8_upper_bound():
+    assert mem_cache.approx_size("Ankara") == 6
+    s = "Çankaya ığüşöç" * 10
+    assert mem_cache.approx_size(s) >= len(s.encode("utf-8"))
+    assert mem_cache.approx_size(s) == 4 * len(s)
@@ -0,0 +1,44 @@
+import math
+
+import numpy as np
+import pytest
+
+from app.services import ml_batch_service as mb
+
+
+def _series(n, noise, seed=0, phase=0):
+    t = np.arange(n)
+    rng = np.random.default_rng(seed)
+    return list(100 + 30 * np.sin(2 * np.pi * (t + phase) / 12) + 0.1 * t + rng.normal(0, noise, n))
+
+
+def test_batch_linear_seasonal_matches_per_series_model():
+    series = [_series(n, 3, seed=n, phase=n) for n in (13, 30, 96, 257)]
+    batch = mb.forecast_batch(series, 36, "linear_seasonal")
+    for i, s in enumerate(series):
+        assert batch.values[i] == pytest.approx(mb._forecast_linear_seasonal(s, 36))
+        expected = (mb._mape(s[-12:], mb._forecast_linear_seasonal(s[:-12], 12))
+                    if len(s) >= 24 else None)
+        if expected is None:
+            assert math.isnan(batch.holdout_mape[i])
+        else:
+            assert batch.holdout_mape[i] == pytest.approx(expected)
+    assert (batch.upper > batch.values).all() and (batch.lower < batch.values).all()
+    # Seri başına HW / linear yoluyla aynı ±%10 bant
+    assert batch.upper == pytest.approx(batch.values + 0.1 * np.abs(batch.values))
+    assert batch.lower == pytest.approx(batch.values - 0.1 * np.abs(batch.values))
+
+
+def test_fast_tier_picks_per_row_and_leaves_short_series_for_sarimax():
+    clean = _series(120, 0.5)
+    series = [clean, _series(18, 1), _series(60, 15, seed=3)]
+    best = mb.select_best_fast_batch(series, 24)
+    assert best.values.shape == (3, 24)
+    assert best.methods[0] in ("holt_winters", "linear_seasonal")
+    assert best.methods[1] is None and np.isnan(best.holdout_mape[1])
+    assert best.holdout_mape[0] < 0.02 < best.holdout_mape[2]
+
+    t = np.arange(120, 144)
+    truth = 100 + 30 * np.sin(2 * np.pi * t / 12) + 0.1 * t
+    hw = mb.forecast_batch([clean], 24, "holt_winters")
+    assert np.abs(hw.values[0] - truth).max() < 5
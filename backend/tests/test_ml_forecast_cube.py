@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from app.services.ml_forecast_cube import _decode, _encode, build_cubes, iter_cubes
+
+
+def _rows():
+    rows = []
+    for scenario, factor in (("baseline", 1.0), ("rcp85", 2.0)):
+        for i, prov in enumerate(("Ankara", "Afyon", "Konya")):
+            for month in range(1, 13):
+                if prov == "Konya" and month > 6:
+                    continue                       # eksik aylar → yıllık = mevcutların ort.
+                rows.append(("province", prov, None, "solar", "sunshine", scenario,
+                              2027, month, factor * (10 * (i + 1) + month)))
+        rows.append(("district", "Ankara", "Çankaya", "solar", "sunshine", scenario,
+                     2027, 1, factor * 7.0))
+    return rows
+
+
+def _cube(cubes, scenario, level):
+    return next(c for c in cubes if c.scenario == scenario and c.level == level)
+
+
+def test_slice_matches_choropleth_response():
+    cubes = build_cubes(_rows())
+    assert len(cubes) == 4
+
+    annual = _cube(cubes, "baseline", "province").slice(2027)
+    assert annual["scores"]["Ankara"] == 16.5
+    assert annual["scores"]["Konya"] == 33.5                  # 30 + ort(1..6)
+    # GADM alias genişletmesi: 'Afyon' → 'Afyonkarahisar'
+    assert annual["scores"]["Afyonkarahisar"] == annual["scores"]["Afyon"] == 26.5
+    assert (annual["min"], annual["max"]) == (16.5, 33.5)
+    assert (annual["norm_min"], annual["norm_max"]) == (16.5, 33.5)
+
+    # RCP: değerler kayar, renk ölçeği baseline'da kalır
+    rcp = _cube(cubes, "rcp85", "province").slice(2027, month=7)
+    assert "Konya" not in rcp["scores"] and rcp["scores"]["Ankara"] == 34.0
+    assert (rcp["norm_min"], rcp["norm_max"]) == (17.0, 27.0)
+
+    dist = _cube(cubes, "baseline", "district")
+    jan = dist.slice(2027, month=1)
+    assert jan["scores"]["Ankara|Çankaya"] == 7.0 and jan["scores"]["Ankara"] == 11.0
+    assert (jan["norm_min"], jan["norm_max"]) == (7.0, 7.0)
+    # İlçe baseline'ı olmayan ay → il aralığı
+    assert dist.slice(2027, month=3)["norm_min"] == 13.0
+    assert dist.slice(2031)["scores"] == {} and dist.slice(2031)["norm_min"] is None
+
+
+def test_codec_roundtrip():
+    arr = np.array([[[1.5, np.nan], [3.25, 4.0]]])
+    out = _decode(_encode(arr), arr.shape)
+    assert np.array_equal(out, arr, equal_nan=True)
+
+
+def test_iter_cubes_groups_sorted_stream_and_rejects_unsorted():
+    wind = [(r[0], r[1], r[2], "wind", "capacity", *r[5:]) for r in _rows()]
+    solar = _rows()
+    # build_cubes sıralar; akış sırası (metric, resource)
+    cubes = build_cubes(solar[:5] + wind + solar[5:])
+    assert [(c.metric, c.level) for c in cubes[::2]] == [("capacity", "province")] * 2 + [("sunshine", "province")] * 2
+    with pytest.raises(ValueError):
+        list(iter_cubes(solar[:5] + wind + solar[5:]))
@@ -0,0 +1,47 @@
+from datetime import date
+
+import numpy as np
+
+from app.services.ml_batch_service import MonthlySeriesBank
+
+_M0 = 2020 * 12      # 2020-01
+
+
+def _bank():
+    bank = MonthlySeriesBank()
+    # İki ilçe (farklı yazımlı il adlarıyla) × 3 ay, radyasyon kolonu
+    bank.daily_index = {("Balikesir", "Merkez"): 0, ("Balıkesir", "Edremit"): 1}
+    bank.daily_rows_by_prov = {"Balikesir": [0], "Balıkesir": [1]}
+    bank.daily_month0 = _M0
+    bank.daily_count["shortwave_radiation_sum"] = np.array([[30, 5, 31], [30, 31, 0]])
+    bank.daily_sum["shortwave_radiation_sum"] = np.array([[300.0, 60.0, 620.0],
+                                                          [900.0, 310.0, 0.0]])
+    # monthly_climate: 30 ay, ilk 4 ay yağış yok
+    precip = np.arange(30, dtype=float)
+    precip[:4] = np.nan
+    bank.mc_index = {"Balıkesir": 0}
+    bank.mc_month0 = _M0
+    bank.mc_values["precipitation_sum"] = precip[None, :]
+    return bank
+
+
+def test_daily_series_pool_province_across_districts_and_spellings():
+    bank = _bank()
+    # İlçe: yalnız ≥10 günlük aylar (ay 2 atlanır — 5 gün)
+    assert bank.daily("Balıkesir", "Merkez", "sunshine") == ([10.0, 20.0], date(2020, 1, 1))
+    # İl: ilçelerin gün toplamları üzerinden ortalama (AVG over rows, SUM/COUNT)
+    values, start = bank.daily("Balikesir", None, "sunshine")
+    assert start == date(2020, 1, 1)
+    assert values == [1200 / 60, 370 / 36, 620 / 31]
+    assert bank.daily("Balikesir", None, "wind") == ([], None)
+
+
+def test_best_prefers_monthly_climate_for_provinces():
+    bank = _bank()
+    values, start = bank.best("Balikesir", None, "precipitation")
+    assert start == date(2020, 5, 1) and values == list(np.arange(4.0, 30.0))
+    # İlçe scope'ta monthly_climate kullanılmaz
+    assert bank.best("Balıkesir", "Edremit", "precipitation") == ([], None)
+    # <24 ay → daily'ye düşer
+    bank.mc_values["precipitation_sum"][0, :10] = np.nan
+    assert bank.best("Balikesir", None, "precipitation") == ([], None)
@@ -0,0 +1,71 @@
+from app.routers.tiles import _combined_tile_sql
+from app.services import mvt_generalize as mg
+
+
+def test_bands_cover_all_zooms_and_tolerance_shrinks():
+    assert mg.band_of(0) == mg.band_of(7) == (0, 7)
+    assert mg.band_of(11) == (10, 11)
+    assert mg.band_of(22) == mg.ZOOM_BANDS[-1]
+    tols = [mg.band_tolerance(b) for b in mg.ZOOM_BANDS]
+    assert tols == sorted(tols, reverse=True)
+    # z7 grid birimi ≈ 76 m; bir ekran pikseli (16 birim) karesi
+    assert abs(mg.band_tolerance((0, 7)) - 76.437) < 0.01
+    assert abs(mg.band_min_size((0, 7)) - (76.437 * 16) ** 2) < 1e3
+
+
+def test_combined_tile_is_one_statement_over_active_layers():
+    sql = str(_combined_tile_sql(("hydro", "restricted", "energy"),
+                                 frozenset({"hydro", "restricted", "energy"})))
+    assert sql.count("ST_AsMVT(l.*") == 3
+    assert "mvt_features" in sql and "ST_Transform(t.geom" not in sql
+    assert "ORDER BY f.priority DESC" in sql
+
+    raw = str(_combined_tile_sql(("hydro",)))
+    assert "hydro_features" in raw and "energy_corridors" not in raw
+    assert "ORDER BY ST_Area(t.geom) DESC" in raw
+
+
+def test_partially_built_layers_fall_back_to_raw_tables():
+    # Yalnız restricted kuruldu (backfill) → hydro/energy ham tablolardan
+    sql = str(_combined_tile_sql(("hydro", "restricted", "energy"), frozenset({"restricted"})))
+    assert "f.layer = 'restricted'" in sql and "f.layer = 'hydro'" not in sql
+    assert "FROM hydro_features t" in sql and "FROM energy_corridors t" in sql
+    assert "FROM restricted_zones t" not in sql
+
+
+def test_points_survive_size_filter_and_short_lines_drop():
+    """`_INSERT_SQL` sqlite'ta — ST_* fonksiyonları "tip:alan:uzunluk"
+    metninden okuyan sahtelerle."""
+    import sqlite3
+
+    def part(i, cast=float):
+        return lambda g: cast(g.split(":")[i])
+
+    conn = sqlite3.connect(":memory:")
+    conn.create_function("GeometryType", 1, part(0, str))
+    conn.create_function("ST_Area", 1, part(1))
+    conn.create_function("ST_Length", 1, part(2))
+    conn.create_function("GREATEST", 2, max)
+    conn.create_function("ST_SimplifyPreserveTopology", 2, lambda g, tol: g)
+    conn.execute("CREATE TABLE _mvt_src (min_zoom, feature_type, description, energy_capacity_mw, g)")
+    conn.execute("CREATE TABLE mvt_features (layer, zoom_band, priority, min_zoom, feature_type, "
+                 "description, energy_capacity_mw, geom)")
+
+    band = (0, 7)
+    px = mg.band_pixel(band)
+    conn.executemany("INSERT INTO _mvt_src VALUES (0, ?, NULL, NULL, ?)", [
+        ("peak", "POINT:0:0"),
+        ("springs", "MULTIPOINT:0:0"),
+        ("pond", f"POLYGON:{px * px / 2}:0"),
+        ("stream", f"LINESTRING:0:{px * 2}"),
+        ("ditch", f"LINESTRING:0:{px / 2}"),
+    ])
+    sql = mg._INSERT_SQL
+    for name in ("layer", "band", "band_last", "tol", "px", "min_size"):
+        sql = sql.replace(f":{name}", f"@{name}")
+    conn.execute(sql, {"layer": "restricted", "band": band[0], "band_last": band[1],
+                       "tol": mg.band_tolerance(band), "px": px,
+                       "min_size": mg.band_min_size(band)})
+    rows = dict(conn.execute("SELECT feature_type, priority FROM mvt_features"))
+    assert set(rows) == {"peak", "springs", "stream"}
+    assert rows["peak"] == mg.band_min_size(band) < rows["stream"]
@@ -0,0 +1,20 @@
+import json
+
+from app.services import ndjson_stream as nd
+
+
+def test_wants_ndjson():
+    assert nd.wants_ndjson(None, stream=True)
+    assert not nd.wants_ndjson(None)
+    assert not nd.wants_ndjson("application/json")
+    assert nd.wants_ndjson("application/json, application/x-ndjson; q=0.9")
+
+
+def test_line_and_range():
+    line = nd.ndjson_line({"type": "frame", "vals": {"İzmir|Konak": 1.5}})
+    assert line.endswith(b"\n") and line.count(b"\n") == 1
+    assert json.loads(line)["vals"] == {"İzmir|Konak": 1.5}
+
+    rng = nd.RunningRange()
+    rng.extend([3.0, -1.0, 2.0])
+    assert (rng.lo, rng.hi) == (-1.0, 3.0)
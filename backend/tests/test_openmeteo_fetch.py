@@ -0,0 +1,86 @@
+import asyncio
+import threading
+import time
+
+import pytest
+from aiohttp import web
+
+from app.services.collectors import async_fetch
+from app.services.collectors.async_fetch import FetchJob, TokenBucket, fetch_pipeline
+
+
+def _message(n: int) -> bytes:
+    """Uzunluk önekli sahte FlatBuffers yanıtı (n lokasyon)."""
+    return b"".join((8).to_bytes(4, "little") + bytes(8) for _ in range(n))
+
+
+@pytest.fixture
+def server():
+    state = {"requests": [], "limit_first": 0}
+
+    async def forecast(request):
+        state["requests"].append(dict(request.query))
+        if state["limit_first"] > 0:
+            state["limit_first"] -= 1
+            return web.json_response(
+                {"error": True, "reason": "Minutely API request limit exceeded."}, status=429)
+        n = len(request.query["latitude"].split(","))
+        return web.Response(body=_message(n))
+
+    loop = asyncio.new_event_loop()
+    app = web.Application()
+    app.router.add_get("/v1/forecast", forecast)
+    runner = web.AppRunner(app)
+    loop.run_until_complete(runner.setup())
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    loop.run_until_complete(site.start())
+    port = site._server.sockets[0].getsockname()[1]
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    state["url"] = f"http://127.0.0.1:{port}/v1/forecast"
+    yield state
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(2)
+
+
+def test_bucket_spacing_burst_and_aimd():
+    now = [100.0]
+    b = TokenBucket(rate=2.0, burst=2, max_rate=3.0, increase=0.5, cooldown=60,
+                    clock=lambda: now[0])
+    assert [b.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+
+    b.on_success()
+    b.on_success()
+    b.on_success()
+    assert b.rate == 3.0                               # max_rate'te durur
+
+    b.on_rate_limit()
+    assert b.rate == 1.5 and b.paused_until == 160.0
+    b.on_rate_limit()                                  # aynı duraklamada ikinci kez düşmez
+    assert b.rate == 1.5 and b.rate_limited == 2
+    assert b.reserve() == pytest.approx(60.0)
+
+
+def test_pipeline_retries_rate_limit_and_writes_in_one_thread(server, monkeypatch):
+    server["limit_first"] = 1
+    monkeypatch.setattr(async_fetch, "ERROR_BACKOFF", 0)
+    writer_threads = set()
+
+    def write(responses, batch):
+        writer_threads.add(threading.get_ident())
+        time.sleep(0.02)
+        assert len(responses) == len(batch)
+        return len(responses) * 24
+
+    jobs = [FetchJob(server["url"], {"latitude": [39.0 + i, 40.0], "longitude": [32.0, 33.0],
+                                      "hourly": ["temperature_2m", "wind_speed_100m"]},
+                     payload=["a", "b"], label=f"b{i}")
+            for i in range(5)]
+    bucket = TokenBucket(rate=100.0, burst=5, cooldown=0.05)
+    assert fetch_pipeline(jobs, write, bucket, concurrency=3) == 5 * 2 * 24
+
+    assert bucket.rate_limited == 1 and bucket.rate < 100.0
+    assert len(server["requests"]) == 6                # 429 alan istek yeniden denendi
+    q = server["requests"][-1]
+    assert q["hourly"] == "temperature_2m,wind_speed_100m" and q["format"] == "flatbuffers"
+    assert len(writer_threads) == 1 and threading.get_ident() not in writer_threads
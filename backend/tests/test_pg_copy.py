@@ -0,0 +1,97 @@
+import struct
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from app.services.collectors import hourly
+from app.services.collectors.pg_copy import DATE, FLOAT8, TEXT, TIMESTAMP, encode_rows
+
+_PG_EPOCH = datetime(2000, 1, 1)
+
+
+def _parse(body: bytes, kinds):
+    """İkili COPY satırlarını çöz (test için referans okuyucu)."""
+    rows, pos = [], 0
+    while pos < len(body):
+        (n,) = struct.unpack_from(">h", body, pos)
+        pos += 2
+        assert n == len(kinds)
+        row = []
+        for kind in kinds:
+            (length,) = struct.unpack_from(">i", body, pos)
+            pos += 4
+            if length == -1:
+                row.append(None)
+                continue
+            raw = body[pos:pos + length]
+            pos += length
+            if kind == TEXT:
+                row.append(raw.decode("utf-8"))
+            elif kind == FLOAT8:
+                row.append(struct.unpack(">d", raw)[0])
+            elif kind == TIMESTAMP:
+                row.append(_PG_EPOCH + timedelta(microseconds=struct.unpack(">q", raw)[0]))
+            elif kind == DATE:
+                row.append(date(2000, 1, 1) + timedelta(days=struct.unpack(">i", raw)[0]))
+        rows.append(row)
+    return rows
+
+
+def test_encode_rows_matches_copy_binary_layout():
+    ts = np.array([1704067200, 1704070800])               # 2024-01-01 00:00 / 01:00 UTC
+    days = ts // 86400
+    body = encode_rows(2, [
+        (TEXT, "Balıkesir"), (TEXT, None), (FLOAT8, 39.65),
+        (TIMESTAMP, ts), (DATE, days), (FLOAT8, np.array([1.5, np.nan])),
+    ])
+    rows = _parse(body, [TEXT, TEXT, FLOAT8, TIMESTAMP, DATE, FLOAT8])
+    assert rows[0] == ["Balıkesir", None, 39.65, datetime(2024, 1, 1, 0), date(2024, 1, 1), 1.5]
+    assert rows[1][3] == datetime(2024, 1, 1, 1) and np.isnan(rows[1][5])
+    assert encode_rows(0, [(TEXT, "x")]) == b""
+
+
+class _Var:
+    def __init__(self, values):
+        self.values = values
+
+    def ValuesAsNumpy(self):
+        return self.values
+
+
+class _Block:
+    def __init__(self, t0, n, variables):
+        self.t0, self.n, self.variables = t0, n, variables
+
+    def Time(self):
+        return self.t0
+
+    def TimeEnd(self):
+        return self.t0 + self.n * 3600
+
+    def Interval(self):
+        return 3600
+
+    def Variables(self, i):
+        return _Var(self.variables[i])
+
+
+class _Response:
+    def __init__(self, block):
+        self.block = block
+
+    def Hourly(self):
+        return self.block
+
+
+def test_hourly_response_rows_are_vectorized_and_canonical():
+    n = 48
+    variables = [np.full(n, i, dtype=np.float32) for i in range(len(hourly.HOURLY_PARAMS))]
+    variables[0][3] = np.nan
+    city = {"name": "Balikesir", "lat": 39.65, "lon": 27.88, "code": "bal0"}
+    count, body = hourly.process_response(_Response(_Block(1704067200, n, variables)), city)
+    kinds = [TEXT, TEXT, TEXT, FLOAT8, FLOAT8, TIMESTAMP] + [FLOAT8] * len(hourly.HOURLY_PARAMS)
+    rows = _parse(body, kinds)
+    assert count == len(rows) == n
+    assert rows[0][:6] == ["Balıkesir", "Merkez", "bal0", 39.65, 27.88, datetime(2024, 1, 1)]
+    assert rows[-1][5] == datetime(2024, 1, 2, 23)
+    assert np.isnan(rows[3][6]) and rows[3][7] == 1.0     # NaN merge'de NULL olur
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+from app.services.pin_batch_service import PinJob, group_jobs_by_location
+from app.services.station_index import Station, StationIndex
+
+
+def _index(*coords):
+    return StationIndex(
+        [Station(f"İl{i}", None, lat, lon, None, datetime(2026, 1, 1)) for i, (lat, lon) in enumerate(coords)],
+        "raw",
+    )
+
+
+def test_group_jobs_by_location_shares_one_group_per_location():
+    index = _index((39.0, 32.0), (41.0, 29.0))
+    jobs = [
+        PinJob(1, 41.05, 29.02, "Rüzgar Türbini"),
+        PinJob(2, 39.10, 32.10, "Güneş Paneli"),
+        PinJob(3, 40.90, 28.95, "Güneş Paneli"),
+    ]
+    groups = {loc.city_name: [j.pin_id for j in grp] for loc, grp in group_jobs_by_location(jobs, index)}
+    assert groups == {"İl1": [1, 3], "İl0": [2]}
+
+
+def test_group_jobs_without_stations_is_single_unlocated_group():
+    jobs = [PinJob(1, 39.0, 32.0, "Güneş Paneli")]
+    assert group_jobs_by_location(jobs, _index()) == [(None, jobs)]
+    assert group_jobs_by_location([], _index((1.0, 1.0))) == []
@@ -0,0 +1,70 @@
+import gzip
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.routers import contour_tiles
+from app.services import pmtiles
+
+
+def _tiles():
+    out = []
+    for z in range(0, 6):
+        for x in range(1 << z):
+            for y in range(1 << z):
+                # Çok sayıda aynı içerik (deniz) + benzersiz tile'lar
+                body = b"sea" if (x + y) % 3 else f"{z}/{x}/{y}".encode()
+                out.append((z, x, y, gzip.compress(body, mtime=0)))
+    return out
+
+
+def test_tileid_matches_spec_vectors():
+    assert [pmtiles.zxy_to_tileid(*t) for t in
+            [(0, 0, 0), (1, 0, 0), (1, 0, 1), (1, 1, 1), (1, 1, 0), (2, 0, 0)]] == [0, 1, 2, 3, 4, 5]
+    assert pmtiles.zxy_to_tileid(12, 3423, 1763) == 19078479
+
+
+def test_roundtrip_with_leaf_directories(tmp_path, monkeypatch):
+    # Kök dizini küçült → yaprak dizin yolu da sınansın
+    monkeypatch.setattr(pmtiles, "ROOT_MAX_BYTES", 64)
+    path = str(tmp_path / "t.pmtiles")
+    tiles = _tiles()
+    assert pmtiles.write_pmtiles(path, tiles, metadata={"name": "t"}) == len(tiles)
+
+    reader = pmtiles.PMTilesReader(path)
+    assert reader.header.leaf_length > 0
+    assert reader.header.tile_contents < len(tiles)      # tekilleştirme
+    assert reader.metadata() == {"name": "t"}
+    for z, x, y, data in tiles:
+        assert reader.get_tile(z, x, y) == data
+    assert reader.get_tile(6, 0, 0) is None
+    reader.close()
+
+
+def test_contour_endpoint_serves_pmtiles_with_etag(tmp_path, monkeypatch):
+    path = str(tmp_path / "contour.pmtiles")
+    pmtiles.write_pmtiles(path, _tiles())
+    monkeypatch.setattr(contour_tiles, "_PMTILES_PATH", path)
+    monkeypatch.setattr(contour_tiles, "_pm_state", (None, None))
+    app = FastAPI()
+    app.include_router(contour_tiles.router, prefix="/t")
+    client = TestClient(app)
+
+    r = client.get("/t/contour/3/1/2.pbf")
+    assert r.status_code == 200
+    assert r.headers["content-encoding"] == "gzip"
+    assert r.content == b"3/1/2"
+    etag = r.headers["etag"]
+    assert etag.endswith('-gz"') and r.headers["vary"] == "Accept-Encoding"
+
+    assert client.get("/t/contour/3/1/2.pbf", headers={"If-None-Match": etag}).status_code == 304
+    assert client.get("/t/contour/5/0/0.pbf").headers["etag"] != etag
+    assert client.get("/t/contour/8/0/0.pbf").status_code == 204
+    raw = client.get("/t/contour/3/1/2.pbf", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in raw.headers and raw.content == b"3/1/2"
+    # Açılmış gövdenin ETag'i gzip'li temsili doğrulamaz (ve tersi)
+    assert raw.headers["etag"] != etag and raw.headers["vary"] == "Accept-Encoding"
+    assert client.get("/t/contour/3/1/2.pbf", headers={
+        "Accept-Encoding": "identity", "If-None-Match": etag}).status_code == 200
+    assert client.get("/t/contour/3/1/2.pbf", headers={
+        "Accept-Encoding": "identity", "If-None-Match": raw.headers["etag"]}).status_code == 304
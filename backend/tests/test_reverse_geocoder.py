@@ -0,0 +1,67 @@
+from math import atan2, cos, radians, sin, sqrt
+
+import numpy as np
+from shapely.geometry import Polygon, box
+
+from app.services.reverse_geocoder import NamedLocationIndex, ReverseGeocoder
+
+
+def _grid(n=6):
+    geoms, provs, dists = [], [], []
+    for i in range(n):
+        for j in range(n):
+            geoms.append(box(26 + j, 36 + i, 27 + j, 37 + i))
+            provs.append(f"İl{i}")
+            dists.append(f"İlçe{j}")
+    return ReverseGeocoder(geoms, provs, dists)
+
+
+def test_locate_many_matches_per_point_contains():
+    g = _grid()
+    rng = np.random.default_rng(0)
+    lats, lons = rng.uniform(35, 43, 2000), rng.uniform(25, 33, 2000)
+    got = g.locate_many(lats, lons)
+    for lat, lon, res in zip(lats, lons, got):
+        i, j = int(lat - 36), int(lon - 26)
+        if 36 < lat < 42 and 26 < lon < 32:
+            assert res == {"province": f"İl{i}", "district": f"İlçe{j}"}
+        else:
+            assert res == {"province": "", "district": ""}
+
+
+def test_overlap_prefers_first_polygon_and_boundary_is_outside():
+    g = ReverseGeocoder(
+        [Polygon([(0, 0), (2, 0), (2, 2), (0, 2)]), box(1, 1, 3, 3)],
+        ["A", "B"], ["a", "b"],
+    )
+    assert g.locate_many([1.5, 2.5, 0.0], [1.5, 2.5, 1.0]) == [
+        {"province": "A", "district": "a"},
+        {"province": "B", "district": "b"},
+        {"province": "", "district": ""},
+    ]
+
+
+def test_locate_uses_quantized_lru():
+    g = _grid()
+    assert g.locate(38.50001, 28.50001) == {"province": "İl2", "district": "İlçe2"}
+    assert g.locate(38.50002, 28.49999)["district"] == "İlçe2"
+    info = g.cache_info()
+    assert info.hits == 1 and info.misses == 1
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    d_lat, d_lon = radians(lat2 - lat1), radians(lon2 - lon1)
+    a = sin(d_lat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(d_lon / 2) ** 2
+    return 2 * atan2(sqrt(a), sqrt(1 - a))
+
+
+def test_named_locations_match_haversine_scan():
+    rng = np.random.default_rng(1)
+    locs = [{"name": f"L{i}", "lat": float(a), "lon": float(o)}
+            for i, (a, o) in enumerate(zip(rng.uniform(36, 42, 400), rng.uniform(26, 45, 400)))]
+    index = NamedLocationIndex(locs)
+    lats, lons = rng.uniform(36, 42, 300), rng.uniform(26, 45, 300)
+    got = index.nearest_many(lats, lons)
+    for lat, lon, loc in zip(lats, lons, got):
+        best = min(locs, key=lambda c: _haversine(lat, lon, c["lat"], c["lon"]))
+        assert loc is best
@@ -0,0 +1,59 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+pytest.importorskip("statsmodels")
+
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from app.services import redis_cache
+from app.services.ml_sarimax_service import SARIMAXForecaster
+
+
+@pytest.fixture
+def fits(monkeypatch):
+    store, calls = {}, []
+    monkeypatch.setattr(redis_cache, "cache_get", store.get)
+    monkeypatch.setattr(redis_cache, "cache_set",
+                        lambda key, value, ttl_seconds=0: store.__setitem__(key, value))
+    real_fit = SARIMAX.fit
+
+    def counting_fit(self, *args, **kwargs):
+        calls.append(kwargs.get("start_params"))
+        return real_fit(self, *args, **kwargs)
+
+    monkeypatch.setattr(SARIMAX, "fit", counting_fit)
+    return calls
+
+
+def _series(n=72):
+    t = np.arange(n)
+    rng = np.random.default_rng(7)
+    return list(100 + 30 * np.sin(2 * np.pi * t / 12) + 0.2 * t + rng.normal(0, 2, n))
+
+
+def test_new_horizon_and_confidence_reuse_params_without_refit(fits):
+    series = _series()
+    fc = SARIMAXForecaster(use_auto_arima=False)
+    short = fc.forecast(series, date(2018, 1, 1), 12, target_label="konya_sun")
+    assert len(fits) == 1
+
+    long = fc.forecast(series, date(2018, 1, 1), 36, target_label="konya_sun",
+                       confidence_level=0.8)
+    assert len(fits) == 1                       # optimizasyon yok
+    assert long.method == short.method and long.order == short.order
+    assert [p.value for p in long.points[:12]] == pytest.approx(
+        [p.value for p in short.points])
+    # Dar güven düzeyi → dar bant
+    assert long.points[0].upper - long.points[0].lower < short.points[0].upper - short.points[0].lower
+
+
+def test_changed_series_warm_starts_from_same_label(fits):
+    series = _series()
+    fc = SARIMAXForecaster(use_auto_arima=False)
+    fc.forecast(series[:-12], date(2018, 1, 1), 12, target_label="konya_sun")
+    fc.forecast(series, date(2018, 1, 1), 12, target_label="konya_sun")
+    fc.forecast(series, date(2018, 1, 1), 12, target_label="ankara_sun", with_exog=False)
+    assert fits[0] is None and fits[1] is not None
+    assert fits[2] is None                      # farklı etiket/konfigürasyon → soğuk
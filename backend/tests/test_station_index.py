@@ -0,0 +1,71 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.services.station_index import Station, StationIndex
+
+
+def _stations(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    lats = rng.uniform(36.0, 42.0, n)
+    lons = rng.uniform(26.0, 45.0, n)
+    seen = [datetime(2026, 10, 1) if i % 3 else datetime(2025, 1, 1) for i in range(n)]
+    return [Station(f"İl{i}", None, float(a), float(o), None, s) for i, (a, o, s) in enumerate(zip(lats, lons, seen))]
+
+
+def test_nearest_many_matches_brute_force_squared_distance():
+    stations = _stations()
+    index = StationIndex(stations, "raw")
+    rng = np.random.default_rng(1)
+    lats, lons = rng.uniform(36, 42, 500), rng.uniform(26, 45, 500)
+    c = np.array([(s.latitude, s.longitude) for s in stations])
+    d2 = (lats[:, None] - c[None, :, 0]) ** 2 + (lons[:, None] - c[None, :, 1]) ** 2
+    assert index.nearest_many(lats, lons).tolist() == np.argmin(d2, axis=1).tolist()
+
+
+def test_since_skips_stations_without_recent_data():
+    stations = _stations()
+    index = StationIndex(stations, "raw")
+    since = datetime(2026, 1, 1)
+    c = np.array([(s.latitude, s.longitude) for s in stations])
+    active = np.array([s.last_seen >= since for s in stations])
+    rng = np.random.default_rng(2)
+    for lat, lon in zip(rng.uniform(36, 42, 200), rng.uniform(26, 45, 200)):
+        d2 = (lat - c[:, 0]) ** 2 + (lon - c[:, 1]) ** 2
+        d2[~active] = np.inf
+        assert index.nearest(lat, lon, since) == stations[int(np.argmin(d2))]
+
+
+def test_empty_or_inactive_index_returns_none():
+    assert StationIndex([], "packed").nearest(39.0, 32.0) is None
+    old = StationIndex([Station("A", None, 39.0, 32.0, None, datetime(2020, 1, 1))], "raw")
+    assert old.nearest(39.0, 32.0, datetime(2026, 1, 1)) is None
+    assert old.active(datetime(2026, 1, 1)) == []
+
+
+def test_get_index_serves_stale_index_and_raw_keeps_old_stations(monkeypatch):
+    from app.services import station_index as si
+
+    # Paket boş + toplama haftalardır durmuş: ham lokasyonlar yine de indekste
+    raw = [("A", None, 39.0, 32.0, "06", datetime(2026, 9, 1, 5)),
+           ("B", "X", 40.0, 33.0, None, datetime(2025, 3, 1))]
+
+    class _DB:
+        def execute(self, *_a, **_k):
+            class _R:
+                def fetchall(self):
+                    return raw
+            return _R()
+
+    index = StationIndex(si._load_stations(_DB(), "raw"), "raw")
+    assert index.nearest(39.9, 32.9, datetime(2026, 8, 1)).city_name == "A"
+    assert index.nearest(39.9, 32.9).city_name == "B"
+
+    builds = []
+    monkeypatch.setattr(si, "_INDEXES", {})
+    monkeypatch.setattr(si, "build_index", lambda db, source: builds.append(source) or StationIndex([], source))
+    first = si.get_index(None, "raw")
+    first.built_at -= 10 ** 6                     # ne kadar bayat olursa olsun
+    assert si.get_index(None, "raw") is first and builds == ["raw"]
+    si.refresh(None, ("raw",))
+    assert si.get_index(None, "raw") is not first and builds == ["raw", "raw"]
@@ -0,0 +1,113 @@
+import math
+
+import numpy as np
+import pytest
+
+rasterio = pytest.importorskip("rasterio")
+from rasterio.transform import from_origin  # noqa: E402
+
+from app.services.terrain_provider import (  # noqa: E402
+    DemTerrainProvider, TerrainProvider, TerrainSample, horn_slope_aspect,
+)
+
+RES = 0.001  # derece
+WEST, NORTH = 32.0, 40.0
+SIZE = 400
+
+
+def _write_dem(path, fn):
+    rows, cols = np.mgrid[0:SIZE, 0:SIZE]
+    lat = NORTH - (rows + 0.5) * RES
+    lon = WEST + (cols + 0.5) * RES
+    data = fn(lat, lon).astype(np.float32)
+    data[0:5, 0:5] = -9999
+    with rasterio.open(
+        path, "w", driver="GTiff", height=SIZE, width=SIZE, count=1, dtype="float32",
+        crs="EPSG:4326", transform=from_origin(WEST, NORTH, RES, RES), nodata=-9999,
+        tiled=True, blockxsize=128, blockysize=128,
+    ) as ds:
+        ds.write(data, 1)
+
+
+class _Fixed(TerrainProvider):
+    def sample(self, lats, lons):
+        n = len(lats)
+        return TerrainSample(np.full(n, 7.0), np.full(n, 1.0), np.full(n, np.nan))
+
+
+def test_horn_plane_slope_and_aspect():
+    # Doğuya doğru 1 m / 10 m yükselen düzlem → eğim atan(0.1), bakı batı (270°)
+    cols = np.arange(3) * 1.0
+    win = np.tile(cols, (3, 1))[None]
+    slope, aspect = horn_slope_aspect(win, np.array([10.0]), np.array([10.0]))
+    assert slope[0] == pytest.approx(math.degrees(math.atan(0.1)))
+    assert aspect[0] == pytest.approx(270.0)
+    flat_slope, flat_aspect = horn_slope_aspect(np.zeros((1, 3, 3)), np.ones(1), np.ones(1))
+    assert flat_slope[0] == 0.0 and flat_aspect[0] == -1.0
+
+
+def test_dem_provider_reads_windows_and_falls_back(tmp_path):
+    path = tmp_path / "dem.tif"
+    # Kuzeye doğru yükselen düzlem: 0.05 m/m
+    _write_dem(path, lambda lat, lon: 1000.0 + (lat - 39.8) * 110_540.0 * 0.05)
+    dem = DemTerrainProvider([path], fallback=_Fixed())
+
+    lats = np.array([39.85, 39.7205, 39.9995, 41.0])
+    lons = np.array([32.10, 32.3005, 32.0005, 30.0])
+    s = dem.sample(lats, lons)
+    assert s.elevation[0] == pytest.approx(1000.0 + 0.05 * 110_540.0 * (39.8495 - 39.8), abs=0.5)
+    assert s.slope[0] == pytest.approx(math.degrees(math.atan(0.05)), abs=0.01)
+    assert s.aspect[0] == pytest.approx(180.0)          # güneye bakan yamaç
+    assert not math.isnan(s.elevation[1])
+    assert s.elevation[2] == 7.0 and s.elevation[3] == 7.0   # nodata / kapsam dışı → fallback
+
+    assert dem.elevations([39.85], [32.10]) == pytest.approx([float(s.elevation[0])])
+    terrain = dem.terrain([39.85, 41.0], [32.10, 30.0])
+    assert terrain[0][1] == round(math.degrees(math.atan(0.05)), 2)
+    assert terrain[1] == (7.0, 1.0)
+
+
+def test_spread_points_use_per_point_windows(tmp_path, monkeypatch):
+    from app.services import terrain_provider
+
+    path = tmp_path / "dem.tif"
+    _write_dem(path, lambda lat, lon: (lon - WEST) * 1000.0)
+    dem = DemTerrainProvider([path])
+    lats, lons = np.array([39.95, 39.65]), np.array([32.05, 32.35])
+    shared = dem.sample(lats, lons)
+    monkeypatch.setattr(terrain_provider, "_MAX_SHARED_WINDOW_PX", 4)
+    per_point = dem.sample(lats, lons)
+    np.testing.assert_allclose(shared.elevation, per_point.elevation)
+    np.testing.assert_allclose(shared.slope, per_point.slope)
+
+
+def test_open_meteo_elevations_query_exact_points_only(monkeypatch):
+    import requests
+
+    from app.services.terrain_provider import OpenMeteoTerrainProvider
+
+    calls = []
+
+    class _Resp:
+        def __init__(self, n):
+            self.n = n
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return {"elevation": [100.0 + i for i in range(self.n)]}
+
+    def fake_get(url, params, timeout):
+        calls.append((params, timeout))
+        return _Resp(len(params["latitude"].split(",")))
+
+    monkeypatch.setattr(requests, "get", fake_get)
+    om = OpenMeteoTerrainProvider()
+    # Eğim komşuları yok, 0.001° yuvarlama yok, eski timeout
+    assert om.elevations([39.12345, 39.12349], [32.5, 32.6]) == [100.0, 101.0]
+    assert calls == [({"latitude": "39.12345,39.12349", "longitude": "32.5,32.6"}, 10)]
+
+    dem_fallback = DemTerrainProvider([], fallback=om)
+    assert dem_fallback.elevations([41.0], [30.0]) == [100.0]
+    assert calls[-1][0] == {"latitude": "41.0", "longitude": "30.0"}
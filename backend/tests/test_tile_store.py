@@ -0,0 +1,58 @@
+import pytest
+
+from app.services import data_versions, tile_store
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(tile_store, "_TILES_DIR", str(tmp_path))
+    monkeypatch.setattr(tile_store, "MBTILES_PATH", str(tmp_path / "vector.mbtiles"))
+    monkeypatch.setattr(tile_store, "_state", (None, None))
+    monkeypatch.setattr(tile_store, "_local", type(tile_store._local)())
+    registry = {}
+
+    def fake_bump(*datasets):
+        for d in datasets:
+            registry[d] = registry.get(d, 0) + 1
+        data_versions.invalidate()
+
+    monkeypatch.setattr(data_versions, "_load", lambda: dict(registry))
+    monkeypatch.setattr(data_versions, "bump", fake_bump)
+    data_versions.invalidate()
+    yield tile_store
+    data_versions.invalidate()
+
+
+def test_tile_math():
+    assert tile_store.lonlat_to_tile(0.0, 0.0, 1) == (1, 1)
+    assert tile_store.lonlat_to_tile(-180.0, 85.0511, 3) == (0, 0)
+    # Ankara z6 → (37, 24)
+    assert tile_store.lonlat_to_tile(32.85, 39.93, 6) == (37, 24)
+    x0, y0, x1, y1 = tile_store.tile_range(tile_store.TR_BBOX, 6)
+    assert x0 <= 37 <= x1 and y0 <= 24 <= y1
+
+
+def test_seeded_tiles_served_until_version_bump(store):
+    assert store.get_tile(6, 37, 24) is None          # depo yok → canlı
+
+    data_versions.bump(data_versions.VECTOR)
+    version = store.current_version()
+    writer = store.TileWriter(version, 6, 7, store.TR_BBOX)
+    writer.write([(6, 37, 24, b"\x1a\x02ab"), (6, 38, 24, b"")])
+    writer.commit()
+
+    assert store.get_tile(6, 37, 24) == b"\x1a\x02ab"
+    assert store.get_tile(6, 38, 24) == b""            # kapsanan boş tile
+    assert store.get_tile(8, 150, 98) is None          # tohumlanmamış zoom
+    assert store.get_tile(6, 0, 0) is None             # bbox dışı
+
+    data_versions.bump(data_versions.VECTOR)
+    assert store.store_info() is None
+    assert store.get_tile(6, 37, 24) is None           # bayat depo kullanılmaz
+
+
+def test_aborted_writer_leaves_store_untouched(store):
+    writer = store.TileWriter(store.current_version(), 6, 6, store.TR_BBOX)
+    writer.write([(6, 37, 24, b"x")])
+    writer.abort()
+    assert store.store_info() is None
@@ -0,0 +1,74 @@
+from datetime import date, datetime
+
+from app.services import weather_rollup_service as wr
+
+
+class _Result(list):
+    def first(self):
+        return self[0] if self else None
+
+    def fetchall(self):
+        return list(self)
+
+
+class _DB:
+    """SQL metnine göre sabit sonuç dönen sahte oturum."""
+
+    def __init__(self, firsts, raw_before=False):
+        self.firsts, self.raw_before, self.window_params = firsts, raw_before, None
+
+    def execute(self, stmt, params):
+        sql = str(stmt)
+        if "unnest" in sql:
+            return _Result(self.firsts)
+        if "hourly_weather_data" in sql:
+            return _Result([(1,)] if self.raw_before else [])
+        self.window_params = params
+        return _Result()
+
+
+def test_window_split_reads_edge_months_from_daily_rows():
+    # 15 Mart → 10 Haziran: Nisan + Mayıs aylık, kenarlar günlük
+    assert wr._window_split(date(2025, 3, 15), date(2025, 6, 10)) == (date(2025, 4, 1), date(2025, 6, 1))
+    # Ay başında başlayan pencere ilk ayı tam sayar; yıl devri
+    assert wr._window_split(date(2024, 12, 1), date(2025, 1, 31)) == (date(2024, 12, 1), date(2025, 1, 1))
+    # Ayın 31'i (bir sonraki ayda 31 yok)
+    assert wr._window_split(date(2025, 1, 31), date(2025, 4, 2)) == (date(2025, 2, 1), date(2025, 4, 1))
+    # Tam ay yok → tümü günlük
+    assert wr._window_split(date(2025, 3, 5), date(2025, 4, 20)) == (date(2025, 4, 21), date(2025, 4, 21))
+
+
+def test_partial_backfill_falls_back_to_raw_table():
+    start, end = datetime(2025, 3, 15, 8), datetime(2026, 3, 15)
+    firsts = [("wind", date(2025, 1, 1)), ("solar", date(2025, 6, 1))]
+
+    # solar rollup'u pencere başından sonra başlıyor ve öncesinde ham veri var
+    db = _DB(firsts, raw_before=True)
+    assert wr.window_aggregates(db, start, end, metrics=("wind", "solar")) == {}
+    assert db.window_params is None
+
+    # Ham veri de o tarihte başlıyor → kapsama tam, rollup okunur
+    db = _DB(firsts, raw_before=False)
+    wr.window_aggregates(db, start, end, metrics=("wind", "solar"))
+    assert db.window_params["mf"] == date(2025, 4, 1) and db.window_params["ml"] == date(2026, 3, 1)
+
+    # Rollup'ta hiç olmayan metrik
+    assert wr.window_aggregates(_DB([("wind", None)]), start, end, metrics=("wind",)) == {}
+
+
+def test_analysis_rollup_and_raw_paths_share_window_end(monkeypatch):
+    from types import SimpleNamespace
+
+    from app.services import analysis_service as an
+
+    ends = []
+    monkeypatch.setattr(an, "_build_province_map",
+                        lambda: SimpleNamespace(city_to_province={}, provinces=[]))
+    monkeypatch.setattr(an, "_aggregate_window_rollup",
+                        lambda db, cutoff, end: ends.append(end) or [])
+    monkeypatch.setattr(an, "_aggregate_window_raw",
+                        lambda db, cutoff, end: ends.append(end) or [])
+    before = datetime.utcnow()
+    an._aggregate_window(None, datetime(2025, 10, 17))
+    # Rollup boş → ham yol aynı bitişle (şimdi; tablodaki forecast saatleri hariç)
+    assert len(ends) == 2 and ends[0] is ends[1] and before <= ends[0] <= datetime.utcnow()
@@ -0,0 +1,42 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from app.services import solar_service, wind_service, yield_engine
+
+
+def _hours(n=2000):
+    rng = np.random.default_rng(0)
+    start = datetime(2025, 1, 20)
+    return [
+        {
+            "ts": start + timedelta(hours=i),
+            "wind100_ms": float(abs(rng.normal(7, 4))),
+            "ghi_wm2": float(max(0.0, rng.normal(250, 300))),
+            "temp_c": float(rng.normal(15, 8)),
+        }
+        for i in range(n)
+    ]
+
+
+def test_power_curve_interp_matches_table():
+    curve = wind_service.EXAMPLE_TURBINE_POWER_CURVE
+    speeds = np.array([-1.0, 0.0, 3.0, 3.5, 12.0, 14.5, 25.0, 27.5, 30.0, 31.0])
+    expected = [0, 0, 50, 100, 3000, 3300, 3300, 1650, 0, 0]
+    np.testing.assert_allclose(yield_engine.power_from_curve(speeds, curve), expected)
+    assert wind_service.get_power_from_curve(3.5) == 100.0
+
+
+def test_monthly_sums_bucket_by_calendar_month():
+    ts = np.array(["2025-01-31T23", "2025-02-01T00", "2025-02-01T01"], dtype="datetime64[h]")
+    sums, counts = yield_engine.monthly_sums(ts, np.array([1.0, 2.0, 3.0]))
+    assert sums[0] == 1.0 and sums[1] == 5.0
+    assert counts.tolist()[:3] == [1, 2, 0]
+
+
+def test_services_accept_hour_list_and_arrays():
+    hours = _hours()
+    arrays = yield_engine.arrays_from_hours(hours, ("wind100_ms", "ghi_wm2", "temp_c"))
+
+    assert wind_service.calculate_wind_from_hourly(hours) == wind_service.calculate_wind_from_hourly(arrays)
+    assert solar_service.calculate_solar_from_hourly(hours) == solar_service.calculate_solar_from_hourly(arrays)